@@ -0,0 +1,155 @@
+# © 2024-2026 Fraunhofer-Gesellschaft e.V., München
+#
+# SPDX-License-Identifier: AGPL-3.0-or-later
+
+# This module includes shared functionality of the benchmark scripts:
+# * measuring the run time of a function
+# * writing the results to a JSON file
+# * comparing the results with a saved baseline
+# The benchmark scripts are not part of the unit tests. Run them with
+# the src folder on the python path, e.g.
+# PYTHONPATH=src python benchmark/table_benchmark.py --output results.json --baseline baseline.json
+
+import argparse
+import datetime
+import json
+import platform
+import statistics
+import sys
+import time
+
+import numpy as np
+import pandas as pd
+
+from micat.log.logger import Logger
+
+# A case is reported as regression if its median time exceeds the baseline by this factor
+DEFAULT_THRESHOLD = 1.2
+
+
+def parse_arguments(description, arguments=None):
+    parser = create_parser(description)
+    return parser.parse_args(arguments)
+
+
+def create_parser(description):
+    # Creates a parser with the options that are shared by all benchmark scripts
+    parser = argparse.ArgumentParser(description=description)
+    parser.add_argument("--output", help="path of the JSON file for the results")
+    parser.add_argument("--baseline", help="path of a JSON results file to compare with")
+    parser.add_argument(
+        "--threshold",
+        type=float,
+        default=DEFAULT_THRESHOLD,
+        help="factor of the baseline median time above which a case is reported as regression",
+    )
+    parser.add_argument("--repetitions", type=int, default=5, help="number of timed runs per case")
+    parser.add_argument("--quick", action="store_true", help="only run the small input sizes")
+    return parser
+
+
+def measure(function, number_of_repetitions=5, number_of_warm_up_runs=1):
+    for _index in range(number_of_warm_up_runs):
+        function()
+    durations = []
+    for _index in range(number_of_repetitions):
+        start_time = time.perf_counter()
+        function()
+        durations.append(time.perf_counter() - start_time)
+    result = {
+        "numberOfRepetitions": number_of_repetitions,
+        "minInSeconds": min(durations),
+        "medianInSeconds": statistics.median(durations),
+        "meanInSeconds": statistics.mean(durations),
+        "maxInSeconds": max(durations),
+    }
+    return result
+
+
+def run_cases(cases, number_of_repetitions):
+    # cases is a list of (name, function) tuples
+    results = {}
+    for name, function in cases:
+        # repeated warnings of the measured functions are only logged once per case
+        with Logger.scope():
+            results[name] = measure(function, number_of_repetitions)
+        print(f"{name:<70} {results[name]['medianInSeconds'] * 1000:>12.3f} ms")
+    return results
+
+
+def metadata():
+    return {
+        "created": datetime.datetime.now(datetime.timezone.utc).isoformat(),
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "numpy": np.__version__,
+        "pandas": pd.__version__,
+    }
+
+
+def write_results(results, file_path):
+    content = {"metadata": metadata(), "results": results}
+    with open(file_path, "w", encoding="utf-8") as file:
+        json.dump(content, file, indent=2)
+
+
+def read_results(file_path):
+    with open(file_path, encoding="utf-8") as file:
+        return json.load(file)["results"]
+
+
+def compare(results, baseline_results, threshold=DEFAULT_THRESHOLD, metric="medianInSeconds"):
+    rows = []
+    for name, result in results.items():
+        baseline_result = baseline_results.get(name)
+        if baseline_result is None:
+            rows.append({"name": name, "baseline": None, "current": result[metric], "ratio": None})
+            continue
+        ratio = result[metric] / baseline_result[metric]
+        rows.append(
+            {
+                "name": name,
+                "baseline": baseline_result[metric],
+                "current": result[metric],
+                "ratio": ratio,
+            }
+        )
+    for row in rows:
+        row["status"] = _status(row["ratio"], threshold)
+    return rows
+
+
+def comparison_report(rows):
+    lines = [f"{'case':<70} {'baseline ms':>12} {'current ms':>12} {'ratio':>7}  status"]
+    for row in rows:
+        baseline = "-" if row["baseline"] is None else f"{row['baseline'] * 1000:.3f}"
+        ratio = "-" if row["ratio"] is None else f"{row['ratio']:.2f}"
+        lines.append(f"{row['name']:<70} {baseline:>12} {row['current'] * 1000:>12.3f} {ratio:>7}  {row['status']}")
+    return "\n".join(lines)
+
+
+def finish(results, arguments, metric="medianInSeconds"):
+    # Writes the results, prints the comparison with the baseline and returns the exit
+    # code: 1 if any case is slower than the baseline by more than the threshold
+    if arguments.output:
+        write_results(results, arguments.output)
+    if not arguments.baseline:
+        return 0
+    rows = compare(results, read_results(arguments.baseline), arguments.threshold, metric)
+    print()
+    print(comparison_report(rows))
+    number_of_regressions = len([row for row in rows if row["status"] == "regression"])
+    if number_of_regressions > 0:
+        print(f"\n{number_of_regressions} regression(s) above threshold {arguments.threshold}", file=sys.stderr)
+        return 1
+    return 0
+
+
+def _status(ratio, threshold):
+    if ratio is None:
+        return "new"
+    if ratio > threshold:
+        return "regression"
+    if ratio < 1 / threshold:
+        return "improvement"
+    return "ok"
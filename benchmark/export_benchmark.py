@@ -0,0 +1,144 @@
+# © 2024-2026 Fraunhofer-Gesellschaft e.V., München
+#
+# SPDX-License-Identifier: AGPL-3.0-or-later
+
+# Benchmark for the Excel export of /export-results with an increasing number of
+# programs. The synthetic export is written to a temporary file, as done by the route,
+# and to a BytesIO whose content is copied to a response, as done before. For both
+# targets, the run time, the peak traced memory and the size of the file are reported.
+# Example:
+# PYTHONPATH=src python benchmark/export_benchmark.py --programs 1,10,50
+
+import functools
+import io
+import random
+import sys
+import tempfile
+import tracemalloc
+
+import pandas as pd
+
+import benchmark_utils
+from micat.export import results_export
+
+PROGRAM_COUNTS = [1, 10, 50]
+QUICK_PROGRAM_COUNTS = [1, 10]
+NUMBER_OF_MEASUREMENTS = 30
+NUMBER_OF_ROWS = 20
+YEARS = list(range(2020, 2051))
+
+
+def synthetic_export(number_of_programs, seed=0):
+    # Returns the JSON of an export request with the given number of programs. Each program
+    # has NUMBER_OF_MEASUREMENTS results with NUMBER_OF_ROWS rows for each year of YEARS.
+    generator = random.Random(seed)
+    identifiers = ["indicator_" + str(index) for index in range(NUMBER_OF_MEASUREMENTS)]
+    half = NUMBER_OF_MEASUREMENTS // 2
+    categories = {
+        "quantification": {"title": "Quantification", "measurements": _measurements(identifiers[:half])},
+        "monetization": {"title": "Monetization", "measurements": _measurements(identifiers[half:])},
+    }
+    names = ["program " + str(index) for index in range(number_of_programs)]
+    return {
+        "region": 0,
+        "years": YEARS,
+        "programs": [_program(name, generator) for name in names],
+        "results": [{"name": name, "data": _data(identifiers, generator)} for name in names],
+        "categories": categories,
+        "cbaData": [_cba_data(name, generator) for name in names],
+    }
+
+
+def write_to_temporary_file(data, database):
+    with tempfile.TemporaryFile() as output:
+        results_export.write_results_workbook(data, database, output)
+        return output.tell()
+
+
+def write_to_bytes(data, database):
+    output = io.BytesIO()
+    results_export.write_results_workbook(data, database, output)
+    return len(output.getvalue())
+
+
+def peak_traced_memory(function):
+    tracemalloc.start()
+    try:
+        function()
+        return tracemalloc.get_traced_memory()[1]
+    finally:
+        tracemalloc.stop()
+
+
+def main(arguments=None):
+    parser = benchmark_utils.create_parser("Benchmark for the Excel export of /export-results")
+    parser.add_argument("--programs", help="comma separated numbers of programs, e.g. 1,10,100")
+    arguments = parser.parse_args(arguments)
+    database = _RegionDatabase()
+    results = {}
+    for number_of_programs in _program_counts(arguments):
+        data = synthetic_export(number_of_programs)
+        for name, write in [("temporaryFile", write_to_temporary_file), ("bytes", write_to_bytes)]:
+            case = f"{name}[programs={number_of_programs}]"
+            function = functools.partial(write, data, database)
+            results[case] = benchmark_utils.measure(function, arguments.repetitions)
+            results[case]["peakMemoryInBytes"] = peak_traced_memory(function)
+            results[case]["sizeInBytes"] = function()
+            print(
+                f"{case:<40} {results[case]['medianInSeconds'] * 1000:>12.3f} ms"
+                + f" {results[case]['peakMemoryInBytes'] / 1024 / 1024:>10.1f} MB"
+                + f" {results[case]['sizeInBytes'] / 1024:>10.1f} kB"
+            )
+    return benchmark_utils.finish(results, arguments)
+
+
+class _RegionDatabase:
+    # Replaces the database; the export only reads the label of the region
+    def table(self, _table_name, _where_clause):
+        return pd.DataFrame({"id": [0], "label": ["Region"]})
+
+
+def _measurements(identifiers):
+    return [{"identifier": identifier, "title": identifier, "yAxis": "M€"} for identifier in identifiers]
+
+
+def _program(name, generator):
+    improvements = [
+        {"id": index, "values": {str(year): round(generator.uniform(1, 1000), 3) for year in YEARS}}
+        for index in range(5)
+    ]
+    return {"name": name, "unitName": "ktoe", "subsector": 1, "improvements": improvements}
+
+
+def _data(identifiers, generator):
+    return {
+        identifier: {
+            "idColumnNames": ["id_measure", "id_final_energy_carrier"],
+            "yearColumnNames": [str(year) for year in YEARS],
+            "rows": [
+                [1, "carrier " + str(index)] + [generator.uniform(0, 1000) for _year in YEARS]
+                for index in range(NUMBER_OF_ROWS)
+            ],
+        }
+        for identifier in identifiers
+    }
+
+
+def _cba_data(name, generator):
+    return {
+        "name": name,
+        "netPresentValue": generator.uniform(0, 1000),
+        "annualSavings": [generator.uniform(0, 1000) for _year in YEARS],
+        "years": YEARS,
+        "parameters": {"discountRate": 0.03},
+    }
+
+
+def _program_counts(arguments):
+    if arguments.programs:
+        return [int(count) for count in arguments.programs.split(",")]
+    return QUICK_PROGRAM_COUNTS if arguments.quick else PROGRAM_COUNTS
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,345 @@
+# © 2024-2026 Fraunhofer-Gesellschaft e.V., München
+#
+# SPDX-License-Identifier: AGPL-3.0-or-later
+
+# End-to-end load test for the back end. For each configuration, the BackEnd is
+# started in a separate server process (waitress). Then a mix of generated
+# /indicator_data payloads is replayed with several client threads. The report
+# includes p50/p95/p99 latency, throughput and the peak resident memory of the
+# server process and its workers. The configurations override the settings of
+# .settings.default.json, so that execution modes and cache settings can be compared.
+# Example:
+# PYTHONPATH=src python benchmark/load_test.py --requests 100 --concurrency 4 \
+#   --configuration threads --configuration calculationPool --output load_results.json
+
+import argparse
+import copy
+import json
+import os
+import random
+import signal
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+import urllib.error
+import urllib.request
+from concurrent.futures import ThreadPoolExecutor
+from urllib.parse import urlencode
+
+import benchmark_utils
+from payload_generator import PayloadGenerator
+
+DEFAULT_DATABASE_PATH = "src/micat/data/public.sqlite"
+DEFAULT_CONFIDENTIAL_DATABASE_PATH = "src/micat/data/confidential_dummy.sqlite"
+
+# Share of requests, number of measures and renewables for the default payload mix
+DEFAULT_MIX = [
+    {"name": "single", "weight": 5, "numberOfMeasures": 1, "renewable": False},
+    {"name": "medium", "weight": 3, "numberOfMeasures": 5, "renewable": False},
+    {"name": "large", "weight": 1, "numberOfMeasures": 20, "renewable": False},
+    {"name": "renewable", "weight": 1, "numberOfMeasures": 2, "renewable": True},
+]
+
+# Settings overrides of all configurations. The warm-up and the template pre-generation would
+# compete with the measured requests, because _wait_until_ready does not wait for the pre-generation.
+COMMON_OVERRIDES = {"warmUp": {"enabled": False}, "templateCache": {"preGeneration": False}}
+
+# Settings overrides of the built-in configurations
+CONFIGURATIONS = {
+    "threads": {
+        "calculationPool": {"enabled": False},
+        "resultStore": {"enabled": False},
+        "admissionControl": {"enabled": True},
+    },
+    "calculationPool": {
+        "calculationPool": {"enabled": True},
+        "resultStore": {"enabled": False},
+        "admissionControl": {"enabled": True},
+    },
+    "resultStore": {
+        "calculationPool": {"enabled": False},
+        "resultStore": {"enabled": True},
+        "admissionControl": {"enabled": True},
+    },
+    "withoutAdmissionControl": {
+        "calculationPool": {"enabled": False},
+        "resultStore": {"enabled": False},
+        "admissionControl": {"enabled": False},
+    },
+}
+
+READY_TIMEOUT_IN_SECONDS = 300
+
+
+def main(arguments=None):
+    parser = benchmark_utils.create_parser("Load test for the back end")
+    parser.add_argument("--database", default=DEFAULT_DATABASE_PATH, help="path of the public database")
+    parser.add_argument("--confidential-database", default=DEFAULT_CONFIDENTIAL_DATABASE_PATH)
+    parser.add_argument("--requests", type=int, default=100, help="number of requests per configuration")
+    parser.add_argument("--concurrency", type=int, default=4, help="number of client threads")
+    parser.add_argument("--mix", help="JSON file with the payload mix, see DEFAULT_MIX")
+    parser.add_argument(
+        "--configuration",
+        action="append",
+        help="name of a built-in configuration (" + ", ".join(CONFIGURATIONS) + ") or a JSON file with settings",
+    )
+    parser.add_argument("--port", type=int, default=8765)
+    parser.add_argument("--seed", type=int, default=0)
+    # only used internally to start the server process
+    parser.add_argument("--serve", help=argparse.SUPPRESS)
+    arguments = parser.parse_args(arguments)
+
+    if arguments.serve is not None:
+        return _serve(arguments)
+
+    mix = DEFAULT_MIX
+    if arguments.mix:
+        mix = _read_json(arguments.mix)
+    payloads = _payloads(arguments, mix)
+
+    results = {}
+    for name in arguments.configuration or ["threads"]:
+        settings = _settings(name)
+        print(f"Running {len(payloads)} requests with configuration {name} ...")
+        results[name] = _run_configuration(arguments, settings, payloads)
+    print()
+    print(report(results))
+    return benchmark_utils.finish(results, arguments, metric="p95InSeconds")
+
+
+def report(results):
+    lines = [
+        f"{'configuration':<28} {'p50 ms':>10} {'p95 ms':>10} {'p99 ms':>10} {'req/s':>8} {'errors':>7} {'peak RSS MB':>12}"
+    ]
+    for name, result in results.items():
+        peak_rss = "-" if result["peakRssInBytes"] is None else f"{result['peakRssInBytes'] / 1024 / 1024:.1f}"
+        lines.append(
+            f"{name:<28} {result['p50InSeconds'] * 1000:>10.1f} {result['p95InSeconds'] * 1000:>10.1f}"
+            + f" {result['p99InSeconds'] * 1000:>10.1f} {result['throughputPerSecond']:>8.2f}"
+            + f" {result['numberOfErrors']:>7} {peak_rss:>12}"
+        )
+    return "\n".join(lines)
+
+
+def percentile(sorted_values, fraction):
+    # nearest-rank percentile of a sorted list
+    if not sorted_values:
+        return None
+    index = min(len(sorted_values) - 1, max(0, round(fraction * len(sorted_values) + 0.5) - 1))
+    return sorted_values[index]
+
+
+def _payloads(arguments, mix):
+    # The payloads are generated once, so that all configurations replay the same requests
+    from micat.input.database import Database  # pylint: disable=import-outside-toplevel
+
+    generator = PayloadGenerator(Database(arguments.database), arguments.seed)
+    weights = [entry["weight"] for entry in mix]
+    entries = random.Random(arguments.seed).choices(mix, weights=weights, k=arguments.requests)
+    payloads = []
+    for entry in entries:
+        query_parameters, body = generator.payload(
+            id_region=entry.get("idRegion"),
+            number_of_measures=entry.get("numberOfMeasures", 1),
+            is_renewable=entry.get("renewable", False),
+        )
+        payloads.append((entry["name"], query_parameters, body))
+    return payloads
+
+
+def _settings(name):
+    settings = _read_json(os.path.join(os.path.dirname(__file__), "..", ".settings.default.json"))["backEnd"]["api"]
+    if name in CONFIGURATIONS:
+        overrides = CONFIGURATIONS[name]
+    else:
+        overrides = _read_json(name)
+    return _merge(_merge(settings, COMMON_OVERRIDES), overrides)
+
+
+def _merge(settings, overrides):
+    merged = copy.deepcopy(settings)
+    for key, value in overrides.items():
+        if isinstance(value, dict) and isinstance(merged.get(key), dict):
+            merged[key] = _merge(merged[key], value)
+        else:
+            merged[key] = value
+    return merged
+
+
+def _run_configuration(arguments, settings, payloads):
+    with tempfile.TemporaryDirectory() as directory:
+        result_store_settings = settings.setdefault("resultStore", {})
+        result_store_settings["path"] = os.path.join(directory, "result_store.sqlite")
+        settings["openBrowserWindow"] = False
+        process = _start_server(arguments, settings)
+        try:
+            base_url = f"http://127.0.0.1:{arguments.port}"
+            _wait_until_ready(base_url, process)
+            start_time = time.perf_counter()
+            with ThreadPoolExecutor(max_workers=arguments.concurrency) as executor:
+                samples = list(executor.map(lambda payload: _send(base_url, payload), payloads))
+            duration = time.perf_counter() - start_time
+            peak_rss = _peak_rss_in_bytes(process.pid)
+        finally:
+            _stop_server(process)
+    return _result(samples, duration, peak_rss)
+
+
+def _start_server(arguments, settings):
+    command = [
+        sys.executable,
+        os.path.abspath(__file__),
+        "--serve",
+        json.dumps(settings),
+        "--port",
+        str(arguments.port),
+        "--database",
+        os.path.abspath(arguments.database),
+        "--confidential-database",
+        os.path.abspath(arguments.confidential_database),
+    ]
+    return subprocess.Popen(  # pylint: disable=consider-using-with
+        command,
+        stdout=subprocess.DEVNULL,
+        start_new_session=True,
+    )
+
+
+def _stop_server(process):
+    # The server runs in its own process group, so that the workers of the
+    # calculation pool are stopped together with the server process
+    try:
+        os.killpg(process.pid, signal.SIGTERM)
+    except OSError:
+        pass
+    process.wait()
+
+
+def _serve(arguments):
+    # Runs in the server process
+    import flask  # pylint: disable=import-outside-toplevel
+    from waitress import serve  # pylint: disable=import-outside-toplevel
+
+    from micat.back_end import BackEnd  # pylint: disable=import-outside-toplevel
+
+    settings = json.loads(arguments.serve)
+    back_end = BackEnd(
+        serve,
+        flask,
+        None,
+        database_path=arguments.database,
+        confidential_database_path=arguments.confidential_database,
+        settings=settings,
+    )
+    back_end.start(host="127.0.0.1", application_port=arguments.port)
+    return 0
+
+
+def _wait_until_ready(base_url, process):
+    deadline = time.monotonic() + READY_TIMEOUT_IN_SECONDS
+    while time.monotonic() < deadline:
+        if process.poll() is not None:
+            raise RuntimeError("Server process exited with code " + str(process.returncode))
+        try:
+            with urllib.request.urlopen(base_url + "/ready", timeout=5) as response:
+                if response.status == 200:
+                    return
+        except (urllib.error.URLError, ConnectionError):
+            pass
+        time.sleep(0.5)
+    raise TimeoutError("Server did not get ready within " + str(READY_TIMEOUT_IN_SECONDS) + " seconds")
+
+
+def _send(base_url, payload):
+    name, query_parameters, body = payload
+    request = urllib.request.Request(
+        base_url + "/indicator_data?" + urlencode(query_parameters),
+        data=json.dumps(body).encode("utf-8"),
+        headers={"Content-Type": "application/json"},
+        method="POST",
+    )
+    start_time = time.perf_counter()
+    try:
+        with urllib.request.urlopen(request, timeout=600) as response:
+            text = response.read().decode("utf-8")
+            status_code = response.status
+        # errors of the calculation are returned as JSON with status code 200, see BackEnd._handle_exception
+        is_error = text.startswith('{"error"')
+    except urllib.error.HTTPError as error:
+        status_code = error.code
+        is_error = True
+    return {
+        "name": name,
+        "durationInSeconds": time.perf_counter() - start_time,
+        "statusCode": status_code,
+        "isError": is_error,
+    }
+
+
+def _result(samples, duration, peak_rss):
+    durations = sorted(sample["durationInSeconds"] for sample in samples)
+    status_codes = {}
+    for sample in samples:
+        status_codes[str(sample["statusCode"])] = status_codes.get(str(sample["statusCode"]), 0) + 1
+    result = {
+        "numberOfRequests": len(samples),
+        "numberOfErrors": len([sample for sample in samples if sample["isError"]]),
+        "statusCodes": status_codes,
+        "p50InSeconds": percentile(durations, 0.50),
+        "p95InSeconds": percentile(durations, 0.95),
+        "p99InSeconds": percentile(durations, 0.99),
+        "medianInSeconds": statistics.median(durations),
+        "meanInSeconds": statistics.mean(durations),
+        "throughputPerSecond": len(samples) / duration,
+        "peakRssInBytes": peak_rss,
+        "latencyByPayload": _latency_by_payload(samples),
+    }
+    return result
+
+
+def _latency_by_payload(samples):
+    durations = {}
+    for sample in samples:
+        durations.setdefault(sample["name"], []).append(sample["durationInSeconds"])
+    return {
+        name: {"count": len(values), "p50InSeconds": percentile(sorted(values), 0.50)}
+        for name, values in durations.items()
+    }
+
+
+def _peak_rss_in_bytes(pid):
+    # Sum of the peak resident memory (VmHWM) of the server process and its child
+    # processes, e.g. the workers of the calculation pool. Only available on Linux.
+    total = 0
+    for process_id in [pid] + _descendants(pid):
+        try:
+            with open(f"/proc/{process_id}/status", encoding="utf-8") as file:
+                for line in file:
+                    if line.startswith("VmHWM:"):
+                        total += int(line.split()[1]) * 1024
+        except OSError:
+            continue
+    return total or None
+
+
+def _descendants(pid):
+    try:
+        with open(f"/proc/{pid}/task/{pid}/children", encoding="utf-8") as file:
+            children = [int(child) for child in file.read().split()]
+    except OSError:
+        return []
+    descendants = []
+    for child in children:
+        descendants += [child] + _descendants(child)
+    return descendants
+
+
+def _read_json(file_path):
+    with open(file_path, encoding="utf-8") as file:
+        return json.load(file)
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,115 @@
+# © 2024-2026 Fraunhofer-Gesellschaft e.V., München
+#
+# SPDX-License-Identifier: AGPL-3.0-or-later
+
+# Generates valid payloads for the route /indicator_data. The combinations of
+# subsectors and action types are taken from the table mapping__subsector__action_type
+# of the public database, so that the generated measures can be calculated.
+
+import random
+
+# Subsectors with an id of at least this value are renewables, see calculation.calculate_indicator_data
+FIRST_RENEWABLE_ID_SUBSECTOR = 30
+
+DEFAULT_YEARS = [2020, 2025, 2030]
+
+# Parameters of the optional details blocks, as used in test_integration/calculation/test_calculation.py
+CONSTANT_PARAMETER_IDS = [36]
+ANNUAL_PARAMETER_IDS = [40, 35]
+# share of final energy carriers in percent
+FINAL_PARAMETER_ID = 16
+
+
+def year_range(first_year, last_year, step=5):
+    years = list(range(first_year, last_year + 1, step))
+    if years[-1] != last_year:
+        years.append(last_year)
+    return years
+
+
+class PayloadGenerator:
+    def __init__(self, database, seed=0):
+        self._random = random.Random(seed)
+        self._id_regions = [int(id_region) for id_region in database.id_table("id_region").id_values]
+        self._final_energy_carrier_ids = [
+            int(id_final_energy_carrier)
+            for id_final_energy_carrier in database.id_table("id_final_energy_carrier").id_values
+        ]
+        mapping_table = database.mapping_table("mapping__subsector__action_type")
+        self._action_types = {}
+        for id_subsector in database.id_table("id_subsector").id_values:
+            action_type_ids = mapping_table.target_ids(int(id_subsector))
+            if action_type_ids:
+                self._action_types[int(id_subsector)] = [int(id_action_type) for id_action_type in action_type_ids]
+
+    @property
+    def id_regions(self):
+        return list(self._id_regions)
+
+    def subsector_ids(self, is_renewable=False):
+        return [
+            id_subsector
+            for id_subsector in self._action_types
+            if (id_subsector >= FIRST_RENEWABLE_ID_SUBSECTOR) == is_renewable
+        ]
+
+    # pylint: disable=too-many-arguments, too-many-positional-arguments
+    def payload(
+        self,
+        id_region=None,
+        number_of_measures=1,
+        is_renewable=False,
+        years=None,
+        id_subsector=None,
+        with_details=False,
+    ):
+        # Returns the query parameters and the JSON body of a request. All measures of a
+        # payload belong to a single subsector (a program), as sent by the front end.
+        # With details, each measure includes measure specific parameters.
+        if id_region is None:
+            id_region = self._random.choice(self._id_regions)
+        if years is None:
+            years = DEFAULT_YEARS
+        if id_subsector is None:
+            id_subsector = self._random.choice(self.subsector_ids(is_renewable))
+        measures = [
+            self._measure(id_measure, id_subsector, years, with_details)
+            for id_measure in range(1, number_of_measures + 1)
+        ]
+        body = {"measures": measures, "parameters": {}}
+        return {"id_region": id_region}, body
+
+    def _measure(self, id_measure, id_subsector, years, with_details):
+        savings = {str(year): round(self._random.uniform(1, 1000), 3) for year in years}
+        savings["details"] = {"parameters": [], "finalParameters": [], "constants": []}
+        if with_details:
+            savings["details"] = self._details(years)
+        savings["id_measure"] = id_measure
+        savings["id_subsector"] = id_subsector
+        savings["id_action_type"] = self._random.choice(self._action_types[id_subsector])
+        return {"id": id_measure, "savings": savings, "parameters": {}}
+
+    def _details(self, years):
+        constants = [
+            {"id_parameter": id_parameter, "value": round(self._random.uniform(1, 50), 3)}
+            for id_parameter in CONSTANT_PARAMETER_IDS
+        ]
+        parameters = [
+            {"id_parameter": id_parameter} | {str(year): round(self._random.uniform(1, 1000), 3) for year in years}
+            for id_parameter in ANNUAL_PARAMETER_IDS
+        ]
+        final_parameters = [
+            {"id_parameter": FINAL_PARAMETER_ID, "id_final_energy_carrier": id_final_energy_carrier}
+            for id_final_energy_carrier in self._final_energy_carrier_ids
+        ]
+        for year in years:
+            shares = self._shares(len(final_parameters))
+            for final_parameter, share in zip(final_parameters, shares):
+                final_parameter[str(year)] = share
+        return {"parameters": parameters, "finalParameters": final_parameters, "constants": constants}
+
+    def _shares(self, number_of_shares):
+        # random shares in percent that sum up to 100
+        weights = [self._random.random() for _index in range(number_of_shares)]
+        total = sum(weights)
+        return [round(100 * weight / total, 3) for weight in weights]
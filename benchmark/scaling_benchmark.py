@@ -0,0 +1,212 @@
+# © 2024-2026 Fraunhofer-Gesellschaft e.V., München
+#
+# SPDX-License-Identifier: AGPL-3.0-or-later
+
+# Scaling benchmark for the calculation of /indicator_data. For an increasing number
+# of measures N, generated payloads are calculated in-process and the run time and the
+# peak memory of each indicator group (span of calculation.calculate_indicator_data)
+# are recorded. The groups are calculated one after another, so the peak memory of a
+# group is the peak of the traced allocations while the group is running, including
+# the interim data that is shared by all groups.
+# With the option --plot, the results are plotted with matplotlib (if installed).
+# Example:
+# PYTHONPATH=src python benchmark/scaling_benchmark.py --sizes 1,10,50 --details --plot scaling.png
+
+import json
+import sys
+import tracemalloc
+
+import benchmark_utils
+from micat.log.logger import Logger
+from micat.monitoring import span
+from micat.server.calculation_pool import WorkerRequest
+from payload_generator import PayloadGenerator, year_range
+
+DEFAULT_DATABASE_PATH = "src/micat/data/public.sqlite"
+DEFAULT_CONFIDENTIAL_DATABASE_PATH = "src/micat/data/confidential_dummy.sqlite"
+
+SIZES = [1, 5, 10, 20, 50, 100]
+QUICK_SIZES = [1, 5, 10]
+
+INDICATOR_GROUPS = [
+    "interim_data",
+    "social_indicators",
+    "ecologic_indicators",
+    "economic_indicators",
+    "cost_benefit_analysis",
+]
+
+
+def main(arguments=None):
+    parser = benchmark_utils.create_parser("Scaling of the indicator calculation with the number of measures")
+    parser.add_argument("--database", default=DEFAULT_DATABASE_PATH, help="path of the public database")
+    parser.add_argument("--confidential-database", default=DEFAULT_CONFIDENTIAL_DATABASE_PATH)
+    parser.add_argument("--sizes", help="comma separated numbers of measures, e.g. 1,10,100")
+    parser.add_argument("--id-region", type=int, help="region of the payloads; random if not given")
+    parser.add_argument("--id-subsector", type=int, help="subsector of the payloads; random if not given")
+    parser.add_argument("--details", action="store_true", help="include measure specific parameters")
+    parser.add_argument("--first-year", type=int, default=2020)
+    parser.add_argument("--last-year", type=int, default=2030)
+    parser.add_argument("--year-step", type=int, default=5)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--plot", help="path of an image file for the plot of run time and memory against N")
+    arguments = parser.parse_args(arguments)
+
+    from micat.input.database import Database  # pylint: disable=import-outside-toplevel
+
+    database = Database(arguments.database)
+    confidential_database = Database(arguments.confidential_database)
+    sizes = _sizes(arguments)
+    generator = PayloadGenerator(database, arguments.seed)
+    years = year_range(arguments.first_year, arguments.last_year, arguments.year_step)
+
+    results = {}
+    for number_of_measures in sizes:
+        query_parameters, body = generator.payload(
+            id_region=arguments.id_region,
+            number_of_measures=number_of_measures,
+            years=years,
+            id_subsector=arguments.id_subsector,
+            with_details=arguments.details,
+        )
+        http_request = WorkerRequest(
+            {
+                "path": "/indicator_data",
+                "queryString": "id_region=" + str(query_parameters["id_region"]),
+                "contentType": "application/json",
+                "body": json.dumps(body),
+            }
+        )
+        name = f"indicator_data[measures={number_of_measures}]"
+        with Logger.scope():
+            results[name] = measure_groups(
+                lambda request=http_request: _calculate(request, database, confidential_database),
+                arguments.repetitions,
+            )
+        results[name]["numberOfMeasures"] = number_of_measures
+        print(
+            f"{name:<40} {results[name]['medianInSeconds'] * 1000:>12.3f} ms"
+            + f" {results[name]['peakMemoryInBytes'] / 1024 / 1024:>10.1f} MB"
+        )
+
+    print()
+    print(report(results))
+    if arguments.plot:
+        plot(results, arguments.plot)
+    return benchmark_utils.finish(results, arguments)
+
+
+def measure_groups(function, number_of_repetitions=5):
+    # Run time of the whole calculation and median run time of each indicator group.
+    # The memory is traced in a separate run, because tracing slows down the calculation.
+    result = benchmark_utils.measure(function, number_of_repetitions)
+    group_durations = {}
+    for _index in range(number_of_repetitions):
+        with span.recording() as recorder:
+            function()
+        for name, duration in recorder.breakdown().items():
+            group_durations.setdefault(name, []).append(duration)
+    memory_recorder = _MemoryRecorder()
+    tracemalloc.start()
+    try:
+        token = span._current_recorder.set(memory_recorder)  # pylint: disable=protected-access
+        try:
+            function()
+        finally:
+            span._current_recorder.reset(token)  # pylint: disable=protected-access
+        result["peakMemoryInBytes"] = tracemalloc.get_traced_memory()[1]
+    finally:
+        tracemalloc.stop()
+    result["groups"] = {
+        name: {
+            "medianInSeconds": sorted(durations)[len(durations) // 2],
+            "peakMemoryInBytes": memory_recorder.peaks.get(name),
+        }
+        for name, durations in group_durations.items()
+    }
+    result["peakMemoryInBytes"] = max([result["peakMemoryInBytes"]] + list(memory_recorder.peaks.values()))
+    return result
+
+
+def report(results):
+    groups = _groups(results)
+    lines = [f"{'N':>6} " + " ".join(f"{group[:20]:>21}" for group in groups)]
+    for result in results.values():
+        cells = []
+        for group in groups:
+            entry = result["groups"].get(group)
+            if entry is None:
+                cells.append(f"{'-':>21}")
+                continue
+            memory = entry["peakMemoryInBytes"] or 0
+            cells.append(f"{entry['medianInSeconds'] * 1000:>9.1f} ms {memory / 1024 / 1024:>6.1f} MB")
+        lines.append(f"{result['numberOfMeasures']:>6} " + " ".join(cells))
+    return "\n".join(lines)
+
+
+def plot(results, file_path):
+    try:
+        from matplotlib import pyplot  # pylint: disable=import-outside-toplevel
+    except ImportError:
+        print("matplotlib is not installed; skipping the plot " + file_path, file=sys.stderr)
+        return
+    sizes = [result["numberOfMeasures"] for result in results.values()]
+    figure, (time_axis, memory_axis) = pyplot.subplots(1, 2, figsize=(12, 5))
+    for group in _groups(results):
+        entries = [result["groups"].get(group) for result in results.values()]
+        time_axis.plot(sizes, [_value(entry, "medianInSeconds") for entry in entries], marker="o", label=group)
+        memory_axis.plot(
+            sizes,
+            [_value(entry, "peakMemoryInBytes", 1 / 1024 / 1024) for entry in entries],
+            marker="o",
+            label=group,
+        )
+    time_axis.set_xlabel("number of measures")
+    time_axis.set_ylabel("median run time in s")
+    memory_axis.set_xlabel("number of measures")
+    memory_axis.set_ylabel("peak traced memory in MB")
+    time_axis.legend()
+    figure.tight_layout()
+    figure.savefig(file_path)
+    print("Plot written to " + file_path)
+
+
+class _MemoryRecorder:
+    # Is used instead of the SpanRecorder: it stores the peak of the traced memory
+    # between the end of the previous span and the end of the current span
+    def __init__(self):
+        self.peaks = {}
+
+    def record(self, name, _duration_in_seconds):
+        peak = tracemalloc.get_traced_memory()[1]
+        self.peaks[name] = max(self.peaks.get(name, 0), peak)
+        tracemalloc.reset_peak()
+
+
+def _calculate(http_request, database, confidential_database):
+    from micat.calculation import calculation  # pylint: disable=import-outside-toplevel
+
+    return calculation.calculate_indicator_data(http_request, database, confidential_database)
+
+
+def _sizes(arguments):
+    if arguments.sizes:
+        return [int(size) for size in arguments.sizes.split(",")]
+    return QUICK_SIZES if arguments.quick else SIZES
+
+
+def _groups(results):
+    groups = [group for group in INDICATOR_GROUPS if any(group in result["groups"] for result in results.values())]
+    for result in results.values():
+        groups += [group for group in result["groups"] if group not in groups]
+    return groups
+
+
+def _value(entry, key, factor=1):
+    if entry is None or entry[key] is None:
+        return None
+    return entry[key] * factor
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,126 @@
+# © 2024-2026 Fraunhofer-Gesellschaft e.V., München
+#
+# SPDX-License-Identifier: AGPL-3.0-or-later
+
+# Benchmarks for the table algebra and the extrapolation, using synthetic
+# Table/ValueTable inputs with a range of row counts and year spans.
+# Example:
+# PYTHONPATH=src python benchmark/table_benchmark.py --output table_results.json
+# PYTHONPATH=src python benchmark/table_benchmark.py --baseline table_results.json
+
+import sys
+
+import numpy as np
+import pandas as pd
+
+import benchmark_utils
+from micat.calculation import extrapolation
+from micat.table.table import Table
+from micat.table.value_table import ValueTable
+
+ROW_COUNTS = [100, 1000, 10000]
+YEAR_SPANS = [5, 20, 40]
+QUICK_ROW_COUNTS = [100, 1000]
+QUICK_YEAR_SPANS = [5, 20]
+
+# Number of final energy carriers per measure; the second index level of the synthetic tables
+NUMBER_OF_CARRIERS = 6
+FIRST_YEAR = 2000
+
+
+def synthetic_data_frame(number_of_rows, year_span, seed=0):
+    generator = np.random.default_rng(seed)
+    row_numbers = np.arange(number_of_rows)
+    data_frame = pd.DataFrame(
+        {
+            "id_measure": row_numbers // NUMBER_OF_CARRIERS + 1,
+            "id_final_energy_carrier": row_numbers % NUMBER_OF_CARRIERS + 1,
+        }
+    )
+    for year in range(FIRST_YEAR, FIRST_YEAR + year_span):
+        data_frame[str(year)] = generator.uniform(1, 100, number_of_rows)
+    return data_frame
+
+
+def synthetic_table(number_of_rows, year_span, seed=0):
+    return Table(synthetic_data_frame(number_of_rows, year_span, seed))
+
+
+def synthetic_value_table(seed=0):
+    generator = np.random.default_rng(seed)
+    data_frame = pd.DataFrame(
+        {
+            "id_final_energy_carrier": range(1, NUMBER_OF_CARRIERS + 1),
+            "value": generator.uniform(1, 10, NUMBER_OF_CARRIERS),
+        }
+    )
+    return ValueTable(data_frame)
+
+
+def sparse_table(number_of_rows, year_span):
+    # Only every fifth year is given, the other years are NaN
+    data_frame = synthetic_data_frame(number_of_rows, year_span)
+    for year in range(FIRST_YEAR, FIRST_YEAR + year_span):
+        if (year - FIRST_YEAR) % 5 != 0 and year != FIRST_YEAR + year_span - 1:
+            data_frame[str(year)] = np.nan
+    return Table(data_frame)
+
+
+def supporting_year_table(number_of_rows, year_span):
+    # Table with the supporting years only, as it is passed to the extrapolation
+    data_frame = synthetic_data_frame(number_of_rows, year_span)
+    last_year = FIRST_YEAR + year_span - 1
+    year_columns = [str(year) for year in range(FIRST_YEAR, last_year, 5)] + [str(last_year)]
+    return Table(data_frame[["id_measure", "id_final_energy_carrier"] + year_columns])
+
+
+def cases(row_counts, year_spans):
+    cases_ = []
+    for number_of_rows in row_counts:
+        for year_span in year_spans:
+            cases_ += _cases_for_size(number_of_rows, year_span)
+    return cases_
+
+
+def _cases_for_size(number_of_rows, year_span):
+    table = synthetic_table(number_of_rows, year_span)
+    other_table = synthetic_table(number_of_rows, year_span, seed=1)
+    value_table = synthetic_value_table()
+    update_table = synthetic_table(number_of_rows // 2, year_span, seed=2)
+    sparse = sparse_table(number_of_rows, year_span)
+    supporting_years = supporting_year_table(number_of_rows, year_span)
+    year_numbers = list(range(FIRST_YEAR, FIRST_YEAR + year_span))
+    carriers = [1, 2, 3]
+
+    suffix = f"[rows={number_of_rows},years={year_span}]"
+    cases_ = [
+        ("Table.__mul__(Table)" + suffix, lambda: table * other_table),
+        ("Table.__mul__(ValueTable)" + suffix, lambda: table * value_table),
+        ("Table.__truediv__(Table)" + suffix, lambda: table / other_table),
+        (
+            "Table._join_and_multiply_value_table" + suffix,
+            lambda: table._join_and_multiply_value_table(value_table),  # pylint: disable=protected-access
+        ),
+        ("Table.insert_index_column" + suffix, lambda: table.insert_index_column("id_region", 0, 1)),
+        ("Table.reduce" + suffix, lambda: table.reduce("id_final_energy_carrier", carriers)),
+        ("Table.aggregate_to" + suffix, lambda: table.aggregate_to(["id_final_energy_carrier"])),
+        ("Table.update" + suffix, lambda: table.update(update_table)),
+        ("Table.fill_nan_values_by_extrapolation" + suffix, sparse.fill_nan_values_by_extrapolation),
+        ("extrapolation.extrapolate" + suffix, lambda: extrapolation.extrapolate(supporting_years, year_numbers)),
+    ]
+    # The mapping calls a python function for each cell and is only timed for small tables
+    if number_of_rows * year_span <= 20000:
+        cases_.append(("Table.map" + suffix, lambda: table.map(lambda value, _index, _column: value * 2)))
+    return cases_
+
+
+def main(arguments=None):
+    arguments = benchmark_utils.parse_arguments("Benchmarks for Table algebra and extrapolation", arguments)
+    row_counts = QUICK_ROW_COUNTS if arguments.quick else ROW_COUNTS
+    year_spans = QUICK_YEAR_SPANS if arguments.quick else YEAR_SPANS
+    results = benchmark_utils.run_cases(cases(row_counts, year_spans), arguments.repetitions)
+    return benchmark_utils.finish(results, arguments)
+
+
+if __name__ == "__main__":
+    sys.exit(main())
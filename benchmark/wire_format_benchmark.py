@@ -0,0 +1,57 @@
+# © 2024-2026 Fraunhofer-Gesellschaft e.V., München
+#
+# SPDX-License-Identifier: AGPL-3.0-or-later
+
+# Compares the row format (Table.to_custom_json) and the columnar format
+# (Table.to_columnar_json) of /indicator_data: serialization time and payload size,
+# uncompressed and gzip compressed, for synthetic result tables.
+# Example:
+# PYTHONPATH=src python benchmark/wire_format_benchmark.py --output wire_format_results.json
+
+import gzip
+import json
+import sys
+
+import benchmark_utils
+from table_benchmark import synthetic_table
+
+NUMBER_OF_TABLES = 30
+ROW_COUNTS = [100, 1000, 10000]
+QUICK_ROW_COUNTS = [100, 1000]
+YEAR_SPAN = 11
+
+
+def row_format(tables):
+    return json.dumps({key: table.to_custom_json() for key, table in tables.items()}, sort_keys=True)
+
+
+def columnar_format(tables):
+    return json.dumps({key: table.to_columnar_json() for key, table in tables.items()}, sort_keys=True)
+
+
+def main(arguments=None):
+    arguments = benchmark_utils.parse_arguments("Benchmarks for the wire formats of /indicator_data", arguments)
+    row_counts = QUICK_ROW_COUNTS if arguments.quick else ROW_COUNTS
+    cases = []
+    sizes = {}
+    for number_of_rows in row_counts:
+        tables = {
+            "indicator_" + str(index): synthetic_table(number_of_rows // NUMBER_OF_TABLES + 1, YEAR_SPAN, seed=index)
+            for index in range(NUMBER_OF_TABLES)
+        }
+        suffix = f"[rows={number_of_rows}]"
+        for name, function in [("row", row_format), ("columnar", columnar_format)]:
+            cases.append((name + suffix, lambda function=function, tables=tables: function(tables)))
+            payload = function(tables).encode("utf-8")
+            sizes[name + suffix] = {"sizeInBytes": len(payload), "gzipSizeInBytes": len(gzip.compress(payload))}
+    results = benchmark_utils.run_cases(cases, arguments.repetitions)
+    print()
+    print(f"{'case':<30} {'size kB':>10} {'gzip kB':>10}")
+    for name, size in sizes.items():
+        results[name] |= size
+        print(f"{name:<30} {size['sizeInBytes'] / 1024:>10.1f} {size['gzipSizeInBytes'] / 1024:>10.1f}")
+    return benchmark_utils.finish(results, arguments)
+
+
+if __name__ == "__main__":
+    sys.exit(main())
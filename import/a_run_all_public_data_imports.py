@@ -1,23 +1,40 @@
 # © 2024 Fraunhofer-Gesellschaft e.V., München
 #
 # SPDX-License-Identifier: AGPL-3.0-or-later
+import argparse
 import os
 import sys
 
 src_path = os.path.join(os.path.dirname(__file__), "../src")
 sys.path.append(src_path)
 
+from config import import_config
+
 from micat.data_import.database_import import DatabaseImport
+from micat.data_import.import_metadata import ImportMetadata
 
 
 def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument(
+        '--full', action='store_true', help='Run all import scripts, even if their inputs did not change'
+    )
+    args = parser.parse_args()
+
     current_directory = os.getcwd()
     current_script_name = os.path.join(os.getcwd(), os.path.basename(__file__))
     excluded_scripts = [current_script_name]
+
+    metadata = None
+    if not args.full:
+        public_database_path, raw_data_path = import_config.get_paths()
+        metadata = ImportMetadata(public_database_path, raw_data_path)
+
     DatabaseImport.execute_import_scripts_in_folder(
         src_path,
         current_directory,
         excluded_scripts,
+        metadata=metadata,
     )
 
 
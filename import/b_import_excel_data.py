@@ -7,6 +7,12 @@ from config import import_config
 from micat.data_import.database_import import DatabaseImport
 from micat.utils.file import delete_file_if_exists
 
+# This script recreates the database, see micat.data_import.import_orchestrator
+READS = []
+WRITES = ["*"]
+# Raw input files, see micat.data_import.import_metadata
+RAW_INPUTS = ["id_*.xlsx", "mapping__*.xlsx"]
+
 
 def main():
     public_database_path, raw_data_path = import_config.get_paths()
@@ -16,6 +16,26 @@ from micat.table.table import Table
 pd.options.mode.chained_assignment = None  # default='warn'
 
 
+# Tables that are read and written by this script, see micat.data_import.import_orchestrator
+READS = [
+    "id_region",
+    "id_parameter",
+    "id_subsector",
+    "id_action_type",
+    "id_final_energy_carrier",
+    "id_primary_energy_carrier",
+    "mapping__subsector__action_type",
+]
+WRITES = [
+    "primes_parameters",
+    "primes_primary_parameters",
+    "investments_res",
+    "primes_technology_parameters",
+]
+# Raw input files, see micat.data_import.import_metadata
+RAW_INPUTS = ["primes/**"]
+
+
 def main():
     public_database_path, raw_data_path = import_config.get_paths()
 
@@ -2,19 +2,41 @@
 #
 # SPDX-License-Identifier: AGPL-3.0-or-later
 
-import gzip
 from warnings import warn
 
 import numpy as np
 import pandas as pd
-import requests
 from config import import_config
 
 from micat.calculation import extrapolation
+from micat.data_import import eurostat_stream
 from micat.data_import.database_import import DatabaseImport
+from micat.data_import.eurostat_stream import DownloadCache
 from micat.table.table import Table
 
 
+# Tables that are read and written by this script, see micat.data_import.import_orchestrator
+READS = [
+    "id_region",
+    "id_parameter",
+    "id_subsector",
+    "id_action_type",
+    "id_final_energy_carrier",
+    "id_primary_energy_carrier",
+    "mapping__subsector__action_type",
+]
+WRITES = [
+    "eurostat_energy_poverty_parameters",
+    "eurostat_final_energy_consumption",
+    "eurostat_final_parameters",
+    "eurostat_primary_parameters",
+    "eurostat_parameters",
+    "eurostat_partner_parameters",
+    "eurostat_partner_relation_parameters",
+    "eurostat_technology_parameters",
+]
+
+
 # pylint: disable=too-many-locals
 def main():
     public_database_path, raw_data_path = import_config.get_paths()
@@ -27,7 +49,7 @@ def main():
         "https://ec.europa.eu/eurostat/documents/38154/4956218/Energy-Balance-Formulas.xlsx/cc2f9ade"
         "-5c0b-47b5-b83d-c05fe86eef6c"
     )
-    siec_relation_file_path = import_folder + "/energy_balance_formulas.xlsx"
+    siec_relation_file_name = "energy_balance_formulas.xlsx"
 
     utilization_file_path = (
         import_folder + "/renewable_energy_system_utilization_eurostat.xlsx"
@@ -40,11 +62,19 @@ def main():
     # risk_coefficient_file_path = import_folder + "/risk_coefficient_of_suppliers.xlsx"
     # imported_energy_file_path = import_folder + "/average_monthly_imported_energy.xlsx"
 
+    # filtered rows of the downloaded files, see eurostat_stream.stage
+    staging_database_path = import_folder + "/eurostat_staging.sqlite"
+
+    # If True, the previously downloaded files are used
     is_skipping_download = False
+    download_cache = DownloadCache(import_folder, is_offline=is_skipping_download)
 
-    if not is_skipping_download:
-        download_relations(siec_relation_url, siec_relation_file_path)
     try:
+        siec_relation_file_path = download_cache.fetch(
+            siec_relation_url,
+            siec_relation_file_name,
+            headers={"User-Agent": "Mozilla/5.0", "Accept": "*/*"},
+        )
         siec_relations = read_siec_relations(siec_relation_file_path)
     except FileNotFoundError as exception:
         raise AttributeError(
@@ -55,26 +85,23 @@ def main():
         {
             "code": "nrg_bal_c",
             "filter": {"unit": "KTOE", "siec": True},
+            # rows that are kept while parsing the downloaded file
+            "rows": {"freq": "A", "unit": "KTOE"},
         },
         {
             "code": "sdg_07_60",
             "filter": {"siec": False},
+            "rows": {"freq": "A"},
         },
     ]:
         url = f"https://ec.europa.eu/eurostat/api/dissemination/sdmx/2.1/data/{dataset['code']}/?format=TSV&compressed=true"
-        zip_file_path = import_folder + f"/estat_{dataset['code']}.tsv.gz"
-        file_path = import_folder + f"/estat_{dataset['code']}.tsv"
-
-        if not is_skipping_download:
-            print("Downloading eurostat data...")
-            download_energy_balance_data(url, zip_file_path)
 
-        print("Transforming eurostat data...")
-        unzip_and_transform_energy_balance_data(zip_file_path, file_path)
+        print("Downloading eurostat data...")
+        zip_file_path = download_cache.fetch(url, f"estat_{dataset['code']}.tsv.gz")
 
         print("Reading eurostat data...")
-        original_data_frame = pd.read_csv(file_path, sep="\t", decimal=".")
-        original_data_frame.rename(columns={"geo\\TIME_PERIOD": "geo"}, inplace=True)
+        eurostat_stream.stage(zip_file_path, staging_database_path, dataset["code"], dataset["rows"])
+        original_data_frame = eurostat_stream.read_staged(staging_database_path, dataset["code"])
         year_column_names = original_data_frame.columns.to_list()[5:][
             ::-1
         ]  # Filter out non-year columns
@@ -184,8 +211,8 @@ def main():
             result["id_region"] = id_region.values
             table = Table(result)
             table = table.insert_index_column("id_parameter", 1, 25)
-            # IMPORTANT: This action clears the whole table, hence the Wuppertal import must be run after this one
-            database_import.write_to_sqlite(table, "wuppertal_parameters")
+            # The parameter is combined with the Wuppertal parameters in i_import_wuppertal_energy_poverty_and_health.py
+            database_import.write_to_sqlite(table, "eurostat_energy_poverty_parameters")
 
 
 def _create_data_for_final_energy_carrier(
@@ -787,19 +814,6 @@ def join_and_merge_primary_energy_carriers(
     return data_frame
 
 
-def download_relations(relation_url, relation_file_path):
-    headers = {
-        "User-Agent": "Mozilla/5.0",
-        "Accept": "*/*",
-    }
-    with requests.get(relation_url, stream=True, headers=headers) as r:
-        r.raise_for_status()
-        with open(relation_file_path, "wb") as f:
-            for chunk in r.iter_content(chunk_size=8192):
-                if chunk:
-                    f.write(chunk)
-
-
 def read_siec_relations(relation_file_path):
     siec_groups_df = pd.read_excel(
         relation_file_path,
@@ -825,34 +839,6 @@ def read_siec_relations(relation_file_path):
     return siec_relations
 
 
-def download_energy_balance_data(url, zip_file_path):
-    zip_file_ref = requests.get(url, allow_redirects=True, timeout=None)
-    with open(zip_file_path, "wb") as file:
-        file.write(zip_file_ref.content)
-
-
-def unzip_and_transform_energy_balance_data(zip_file_path, file_path):
-    # The format of the tsv files is special because it does not only use tabs
-    # as separators but also commas and spaces. Each data column entry can be a pair
-    # of a value and a flag, separated by a space. If no flag is present, the entry
-    # ends with a space. Also see documentation of the data format at
-    # https://ec.europa.eu/eurostat/estat-navtree-portlet-prod/BulkDownloadListing?file=BulkDownload_Guidelines.pdf
-    # https://ec.europa.eu/eurostat/data/database/information
-    # https://ec.europa.eu/eurostat/statistics-explained/index.php/Tutorial:Symbols_and_abbreviations
-
-    with gzip.open(zip_file_path, "rt", encoding="utf8") as f_in:
-        with open(file_path, "wt", encoding="utf8") as f_out:
-            for line in f_in:
-                new_line = (
-                    line.replace(",", "\t")
-                    .replace(" \t", "\t")
-                    .replace(" ", "")
-                    .replace(":z", "NaN")
-                    .replace(":", "NaN")
-                )
-                f_out.write(new_line)
-
-
 def clean_and_remove_redundant_rows(dataset, df, siec_relations):
     if dataset["filter"].get("unit"):
         df = filter_by_unit(df, dataset["filter"]["unit"])
@@ -17,6 +17,22 @@ from micat.table.table import Table
 pd.options.mode.chained_assignment = None  # default='warn'
 
 
+# Tables that are read and written by this script, see micat.data_import.import_orchestrator
+READS = [
+    "id_region",
+    "id_parameter",
+    "id_subsector",
+    "id_action_type",
+    "id_final_energy_carrier",
+    "id_primary_energy_carrier",
+    "mapping__subsector__action_type",
+    "eurostat_final_energy_consumption",
+]
+WRITES = ["eurostat_final_sector_parameters", "mixed_final_constant_parameters"]
+# Raw input files, see micat.data_import.import_metadata
+RAW_INPUTS = ["action_type_fuel_split_coefficient/**"]
+
+
 def main():
     parser = argparse.ArgumentParser()
     parser.add_argument(
@@ -14,6 +14,24 @@ from micat.input.database import Database
 from micat.table.table import Table
 
 
+# Tables that are read and written by this script, see micat.data_import.import_orchestrator
+READS = [
+    "id_region",
+    "id_parameter",
+    "id_subsector",
+    "id_action_type",
+    "id_final_energy_carrier",
+    "id_primary_energy_carrier",
+    "mapping__subsector__action_type",
+]
+WRITES = [
+    "iiasa_final_subsector_parameters",
+    "iiasa_final_subsector_parameters_generation",
+]
+# Raw input files, see micat.data_import.import_metadata
+RAW_INPUTS = ["iiasa/**"]
+
+
 def main():  # pylint: disable=too-many-locals
     parser = argparse.ArgumentParser()
     parser.add_argument(
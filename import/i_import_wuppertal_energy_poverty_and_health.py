@@ -12,6 +12,34 @@ from micat.table.table import Table
 from micat.table.value_table import ValueTable
 
 
+# Tables that are read and written by this script, see micat.data_import.import_orchestrator
+READS = [
+    "id_region",
+    "id_parameter",
+    "id_subsector",
+    "id_action_type",
+    "id_final_energy_carrier",
+    "id_primary_energy_carrier",
+    "mapping__subsector__action_type",
+    "eurostat_energy_poverty_parameters",
+]
+WRITES = [
+    "wuppertal_material_intensity",
+    "wuppertal_supply_risk_factor",
+    "wuppertal_landuse_res",
+    "wuppertal_landuse_conventional",
+    "wuppertal_energy_system_cost",
+    "wuppertal_decile_parameters",
+    "wuppertal_sector_parameters",
+    "wuppertal_constant_parameters",
+    "wuppertal_parameters",
+    "wuppertal_health_parameters",
+    "id_decile",
+]
+# Raw input files, see micat.data_import.import_metadata
+RAW_INPUTS = ["wuppertal/**"]
+
+
 def main():
     public_database_path, raw_data_path = import_config.get_paths()
 
@@ -104,7 +132,7 @@ def main():
     database_import.write_to_sqlite(
         constant_parameters, "wuppertal_constant_parameters"
     )
-    # We enhance the table only, since it's are already in the database due to d_download_and_import_eurostat_data.py
+    # The table also includes the parameter of d_download_and_import_eurostat_data.py
     # We need to interpolate missing values though
     missing_years = sorted(
         set(range(2000, 2051))
@@ -116,11 +144,11 @@ def main():
     extended_parameters._data_frame = extended_parameters._data_frame.interpolate(
         axis=1
     )
-    # Combine already existing entries
+    # Combine with the entries of d_download_and_import_eurostat_data.py
     extended_parameters._data_frame = pd.concat(
         [
             extended_parameters._data_frame,
-            database.table("wuppertal_parameters", {})._data_frame,
+            database.table("eurostat_energy_poverty_parameters", {})._data_frame,
         ],
         ignore_index=False,
         sort=False,
@@ -8,6 +8,25 @@ import pandas as pd
 from micat.data_import.database_import import DatabaseImport
 from micat.table.table import Table
 
+# Tables that are read and written by this script, see micat.data_import.import_orchestrator
+READS = [
+    "id_region",
+    "id_parameter",
+    "id_subsector",
+    "id_action_type",
+    "id_final_energy_carrier",
+    "id_primary_energy_carrier",
+    "mapping__subsector__action_type",
+]
+WRITES = [
+    "e3m_parameters",
+    "e3m_parameters_res",
+    "e3m_global_parameters",
+    "e3m_energy_prices",
+]
+# Raw input files, see micat.data_import.import_metadata
+RAW_INPUTS = ["e3m/**"]
+
 
 def main():
     public_database_path, raw_data_path = import_config.get_paths()
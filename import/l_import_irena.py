@@ -9,6 +9,20 @@ from config import import_config
 from micat.data_import.database_import import DatabaseImport
 from micat.table.table import Table
 
+# Tables that are read and written by this script, see micat.data_import.import_orchestrator
+READS = [
+    "id_region",
+    "id_parameter",
+    "id_subsector",
+    "id_action_type",
+    "id_final_energy_carrier",
+    "id_primary_energy_carrier",
+    "mapping__subsector__action_type",
+]
+WRITES = ["irena_parameters", "irena_technology_parameters"]
+# Raw input files, see micat.data_import.import_metadata
+RAW_INPUTS = ["irena/**"]
+
 
 def main():
     public_database_path, raw_data_path = import_config.get_paths()
@@ -9,6 +9,27 @@ from micat.data_import.database_import import DatabaseImport
 from micat.series.annual_series import AnnualSeries
 from micat.table.table import Table
 
+# Tables that are read and written by this script, see micat.data_import.import_orchestrator
+READS = [
+    "id_region",
+    "id_parameter",
+    "id_subsector",
+    "id_action_type",
+    "id_final_energy_carrier",
+    "id_primary_energy_carrier",
+    "mapping__subsector__action_type",
+]
+WRITES = [
+    "fraunhofer_constant_parameters",
+    "fraunhofer_capacity_factors",
+    "fraunhofer_hydrogen_synthetic_fuels_generation",
+    "fraunhofer_conversion_efficiency",
+    "fraunhofer_efficiency_res",
+    "fraunhofer_substitution_factors",
+]
+# Raw input files, see micat.data_import.import_metadata
+RAW_INPUTS = ["fraunhofer/**"]
+
 
 def main():
     public_database_path, raw_data_path = import_config.get_paths()
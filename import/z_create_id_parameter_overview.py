@@ -4,8 +4,13 @@
 
 from config import import_config
 
+from micat.data_import.import_metadata import METADATA_TABLE_NAME
 from micat.input.database import Database
 
+# Tables that are read and written by this script, see micat.data_import.import_orchestrator
+READS = ["*"]
+WRITES = []
+
 
 def main():
     public_database_path, _raw_data_path = import_config.get_paths()
@@ -27,6 +32,8 @@ def _create_id_to_table_mapping(database):
             continue
         if table_name.startswith('mapping'):
             continue
+        if table_name == METADATA_TABLE_NAME:
+            continue
 
         table = database.table(table_name, {})
         id_column_names, _, _ = table.column_names
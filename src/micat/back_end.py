@@ -3,27 +3,64 @@
 # SPDX-License-Identifier: AGPL-3.0-or-later
 
 import csv
+import hmac
 import io
 import json
 import logging
 import os
+import tempfile
+import time
 import traceback
 from decimal import Decimal
 from urllib.parse import parse_qs
 
 import pandas as pd
-import xlsxwriter
 from flask_compress import Compress
 from flask_cors import CORS
+from werkzeug.test import EnvironBuilder
 
+from micat.cache.result_store import ResultStore
+from micat.cache.template_cache import TemplateCache
 from micat.calculation import calculation
 from micat.description import descriptions as descriptions_
+from micat.export import result_tables_export, results_export
 from micat.input.database import Database
+from micat.log.logger import Logger
+from micat.monitoring import metrics, peak_memory
+from micat.monitoring.metrics import REGISTRY
+from micat.monitoring.query_profiler import QUERY_PROFILER
+from micat.monitoring.request_profiler import RequestProfiler
+from micat.monitoring.span import SpanStatistics, recording, span
+from micat.server.admission_control import AdmissionControl, RouteSaturatedError
+from micat.server.calculation_pool import CalculationPool
+from micat.server.warm_up import WarmUp
 from micat.template import (
     measure_specific_parameters_template,
     parameters_template,
     savings_template,
 )
+from micat.utils import api, json_stream
+from micat.utils.single_flight import SingleFlight
+
+# Media type of the columnar format of /indicator_data, see Table.to_columnar_json
+COLUMNAR_JSON_MIME_TYPE = "application/vnd.micat.columnar+json"
+
+# Identifies a result in the result store; it is sent with the results of /indicator_data
+# and can be passed to /export-results/<result_id> to export the stored result
+RESULT_ID_HEADER = "X-Micat-Result-Id"
+
+# Response types that are compressed by flask_compress
+COMPRESSED_MIME_TYPES = [
+    "text/html",
+    "text/css",
+    "text/plain",
+    "text/csv",
+    "text/xml",
+    "text/javascript",
+    "application/javascript",
+    "application/json",
+    COLUMNAR_JSON_MIME_TYPE,
+]
 
 
 class BackEnd:
@@ -36,15 +73,57 @@ class BackEnd:
         debug_mode=False,
         database_path="./data/public.sqlite",
         confidential_database_path="./data/confidential.sqlite",
+        settings=None,
     ):
+        if settings is None:
+            settings = {}
         self._serve = injected_serve
         self._flask = injected_flask
         self._debug_mode = debug_mode
         self._cache = {}
+        # coalesces identical calculation requests that are processed at the same time
+        self._single_flight = SingleFlight()
         self._database = Database(database_path)
         self._confidential_database = Database(confidential_database_path)
+        self._result_store = self._create_result_store(settings, database_path)
+        # reuses the generated parameter templates of the regions, see _parameters_template_bytes
+        self._template_cache = self._create_template_cache(settings)
+        template_cache_settings = settings.get("templateCache", {})
+        self._is_template_pre_generation_enabled = template_cache_settings.get("preGeneration", False)
+        self._pre_generated_orients = template_cache_settings.get("preGeneratedOrients", ["records"])
+        # The cached templates depend on the years, so the default years of the front end are pre-generated
+        self._pre_generated_years = template_cache_settings.get("preGeneratedYears", [2025, 2030])
+        # limits the number of concurrent heavy requests, so that lookups stay fast
+        self._admission_control = self._create_admission_control(settings)
+        self._threads = settings.get("threads", 16)
+        # durations of the calculation stages, aggregated across requests
+        self._span_statistics = SpanStatistics()
+        self._is_timing_header_enabled = settings.get("timing", {}).get("responseHeader", False)
+        # admin routes are only available if a secret is configured
+        self._admin_secret = os.environ.get("MICAT_ADMIN_SECRET", settings.get("adminSecret"))
+        # profiles single requests on demand of an admin, see _requested_profile_modes
+        self._request_profiler = self._create_request_profiler(settings, database_path)
+        # optionally runs calculations in worker processes to escape the GIL
+        self._calculation_pool = self._create_calculation_pool(
+            settings,
+            database_path,
+            confidential_database_path,
+        )
+        # Streams the indicator data in chunks instead of creating the complete JSON string.
+        # Streamed results are compressed on the fly by flask_compress, if enabled.
+        json_streaming_settings = settings.get("jsonStreaming", {})
+        self._is_json_streaming_enabled = json_streaming_settings.get("enabled", False)
+        self._number_of_rows_per_chunk = json_streaming_settings.get(
+            "numberOfRowsPerChunk",
+            json_stream.NUMBER_OF_ROWS_PER_CHUNK,
+        )
+        self._is_stream_compression_enabled = json_streaming_settings.get("compression", True)
+        # releases interim tables early and serializes the indicators incrementally
+        self._is_memory_bounded = settings.get("memoryBoundedCalculation", {}).get("enabled", False)
         self._static_path = "../../static"
         self._app = self.create_application()
+        self._warm_up = self._create_warm_up(settings)
+        self._register_metric_collectors()
         # allowed_origins = [
         #    "http://127.0.0.1:" + str(front_end_port),
         #    "https://micat.bitlabstudio.com",
@@ -56,10 +135,16 @@ class BackEnd:
         # if you adapt the port, also consider port forwarding setting in .htaccess
         # file of this project / on web server
         print("Starting flask application at ", host, ":", application_port)
+        if self._warm_up is not None:
+            self._warm_up.start()
+        if self._template_cache is not None and self._is_template_pre_generation_enabled:
+            self._template_cache.start_pre_generation(self._id_regions, self._pre_generate_templates)
         if self._debug_mode:
             self._app.run(host=host, port=application_port, debug=True)
         else:
-            self._serve(self._app, host=host, port=application_port)
+            self._serve(self._app, host=host, port=application_port, threads=self._threads)
+        if self._calculation_pool is not None:
+            self._calculation_pool.shutdown()
 
     # pylint: disable=too-many-locals
     # pylint: disable=unused-variable
@@ -77,6 +162,33 @@ class BackEnd:
 
         # For CORS settings / cross-origin access, see function _create_response_from_string
 
+        # request proxy of the injected flask module, used for the request metrics
+        flask_request = self._flask.request
+
+        @app.before_request
+        def start_request_timer():
+            flask_request.environ["micat.request_start_time"] = time.perf_counter()
+            flask_request.environ["micat.query_profile"] = QUERY_PROFILER.start_profile(flask_request.path)
+            # repeated warnings are only logged once per request
+            flask_request.environ["micat.log_scope"] = Logger.start_scope()
+
+        @app.teardown_request
+        def finish_query_profile(_exception):
+            QUERY_PROFILER.finish_profile(flask_request.environ.pop("micat.query_profile", None))
+            log_scope = flask_request.environ.pop("micat.log_scope", None)
+            if log_scope is not None:
+                Logger.finish_scope(log_scope)
+
+        @app.after_request
+        def observe_request(response):
+            request = flask_request
+            start_time = request.environ.get("micat.request_start_time")
+            if start_time is not None:
+                route = request.url_rule.rule if request.url_rule is not None else "unmatched"
+                duration = time.perf_counter() - start_time
+                REGISTRY.observe_request(route, request.method, response.status_code, duration)
+            return response
+
         @app.before_request
         def handle_preflight_options_request():
             # handles preflight OPTIONS requests for "unsafe" requests.
@@ -89,6 +201,122 @@ class BackEnd:
             else:
                 return None
 
+        @app.before_request
+        def admit_request():
+            # Heavy requests have to pass the admission control. If their route class
+            # is saturated, they are rejected fast instead of blocking a server thread.
+            if self._admission_control is None:
+                return None
+            route_class = self._admission_control.route_class(self._flask.request.path)
+            if route_class is None:
+                return None
+            try:
+                self._admission_control.acquire(route_class)
+            except RouteSaturatedError as error:
+                return self._create_saturated_response(error)
+            self._flask.request.environ["micat.admitted_route_class"] = route_class
+            return None
+
+        @app.teardown_request
+        def release_request(_exception):
+            if self._admission_control is None:
+                return
+            route_class = self._flask.request.environ.pop("micat.admitted_route_class", None)
+            if route_class is not None:
+                self._admission_control.release(route_class)
+
+        @app.route("/ready")
+        def ready():
+            # Reports if the instance is ready to serve traffic, e.g. for a load balancer.
+            # Returns 503 until the warm-up has finished.
+            # Example query:
+            # https://micatool-dev.eu/ready
+            status = {"ready": True}
+            if self._warm_up is not None:
+                status = self._warm_up.status()
+            json_string = self._flask.json.dumps(status)
+            response = self._create_response_from_string(json_string)
+            if not status["ready"]:
+                response.status_code = 503
+            return response
+
+        @app.route("/admin/query_profiler", methods=["GET", "POST"])
+        def query_profiler():
+            # Returns the query reports of the latest requests. The profiler can be
+            # switched on and off at runtime with a POST request.
+            # Example query:
+            # https://micatool-dev.eu/admin/query_profiler
+            # Header: X-Micat-Admin-Secret: <adminSecret from settings>
+            # Example content (optional):
+            # {"enabled": true, "planThresholdInMilliseconds": 50, "clear": true}
+            request = self._flask.request
+            if not self._is_admin_request(request):
+                return self._create_forbidden_response()
+            if request.method == "POST":
+                self._configure_query_profiler(request.get_json(silent=True) or {})
+            status = {
+                "enabled": QUERY_PROFILER.is_enabled,
+                "planThresholdInMilliseconds": QUERY_PROFILER.plan_threshold_in_seconds * 1000,
+                "reports": QUERY_PROFILER.reports(),
+            }
+            json_string = self._flask.json.dumps(status)
+            return self._create_response_from_string(json_string)
+
+        @app.route("/admin/profiles")
+        def profiles():
+            # Lists the stored request profiles, newest first. A request is profiled if an
+            # admin sends the header X-Micat-Profile (or the query parameter profile) with
+            # the value cpu, memory or cpu,memory.
+            # Example query:
+            # https://micatool-dev.eu/admin/profiles
+            # Header: X-Micat-Admin-Secret: <adminSecret from settings>
+            if not self._is_admin_request(self._flask.request):
+                return self._create_forbidden_response()
+            json_string = self._flask.json.dumps(self._request_profiler.profiles())
+            return self._create_response_from_string(json_string)
+
+        @app.route("/admin/profiles/<file_name>")
+        def profile_file(file_name):
+            # Downloads a .prof file (e.g. for snakeviz) or the allocations of a profile
+            # Example query:
+            # https://micatool-dev.eu/admin/profiles/20260101-120000_indicator_data_0123abcd.prof
+            # Header: X-Micat-Admin-Secret: <adminSecret from settings>
+            if not self._is_admin_request(self._flask.request):
+                return self._create_forbidden_response()
+            file_path = self._request_profiler.file_path(file_name)
+            if file_path is None:
+                return self._create_error_response("NotFound", 404)
+            return self._flask.send_file(os.path.abspath(file_path), as_attachment=True)
+
+        @app.route("/metrics")
+        def prometheus_metrics():
+            # Returns request, query, cache and process metrics in the
+            # Prometheus text exposition format
+            # Example query:
+            # https://micatool-dev.eu/metrics
+            response = self._flask.Response(REGISTRY.exposition())
+            response.headers.set("Content-Type", metrics.CONTENT_TYPE)
+            return response
+
+        @app.route("/timing_metrics")
+        def timing_metrics():
+            # Returns the durations of the calculation stages, aggregated across requests
+            # Example query:
+            # https://micatool-dev.eu/timing_metrics
+            json_string = self._flask.json.dumps(self._span_statistics.summary())
+            return self._create_response_from_string(json_string)
+
+        @app.route("/admission_metrics")
+        def admission_metrics():
+            # Returns queue depth and wait times of the admission control
+            # Example query:
+            # https://micatool-dev.eu/admission_metrics
+            metrics = {}
+            if self._admission_control is not None:
+                metrics = self._admission_control.metrics()
+            json_string = self._flask.json.dumps(metrics)
+            return self._create_response_from_string(json_string)
+
         # API routes for id tables
 
         @app.route("/id_region")
@@ -172,13 +400,35 @@ class BackEnd:
             #   "parameters": {}
             # }
             request = self._flask.request
-            json_object = calculation.calculate_indicator_data(
-                request, self._database, self._confidential_database
-            )
-            # Create dummy response while developing
-            # json_object = _dummy_indicator_data()
-            json_string = self._flask.json.dumps(json_object)
-            response = self._create_response_from_string(json_string)
+            # The compact columnar format is sent if it is preferred by the Accept header
+            is_columnar = BackEnd._is_columnar_format_accepted(request)
+            request_key = api.request_key(request)
+            if is_columnar:
+                request_key += "|" + COLUMNAR_JSON_MIME_TYPE
+            profile_modes = self._requested_profile_modes(request)
+            with recording(self._span_statistics) as recorder:
+                if profile_modes:
+                    # profiled requests are always calculated in this process
+                    job = _columnar_indicator_data_job if is_columnar else _indicator_data_job
+                    with self._request_profiler.profiling(request.path, profile_modes):
+                        json_string = job(request, self._database, self._confidential_database)
+                    response = self._create_response_from_string(json_string)
+                elif self._is_json_streaming_enabled and self._calculation_pool is None and not is_columnar:
+                    response = self._create_response_from_string(self._indicator_data_chunks(request))
+                else:
+                    json_string = self._single_flight.do(
+                        request_key,
+                        lambda: self._indicator_data(request, request_key, is_columnar),
+                    )
+                    response = self._create_response_from_string(json_string)
+                    if self._result_store is not None:
+                        response.headers.set(RESULT_ID_HEADER, self._result_key(request_key))
+            if is_columnar:
+                response.headers.set("Content-Type", COLUMNAR_JSON_MIME_TYPE)
+            response.headers.add("Vary", "Accept")
+            server_timing = recorder.server_timing()
+            if self._is_timing_header_enabled and server_timing:
+                response.headers.set("Server-Timing", server_timing)
             return response
 
         @app.route("/parameters")
@@ -187,9 +437,14 @@ class BackEnd:
             # Example query:
             # https://micatool-dev.eu/parameters?id_region=0&file_name=parameters.xlsx
             request = self._flask.request
-            parameter_bytes = parameters_template.parameters_template(
-                request, self._database
-            )
+            profile_modes = self._requested_profile_modes(request)
+            if profile_modes:
+                with self._request_profiler.profiling(request.path, profile_modes):
+                    parameter_bytes = parameters_template.parameters_template(
+                        request, self._database
+                    )
+                return self.create_excel_file_response(parameter_bytes, request)
+            parameter_bytes = io.BytesIO(self._parameters_template_bytes(request))
             return self.create_excel_file_response(parameter_bytes, request)
 
         @app.route("/json_parameters")
@@ -201,12 +456,38 @@ class BackEnd:
             # https://pandas.pydata.org/pandas-docs/stable/reference/api/pandas.DataFrame.to_json.html
             # also see
             request = self._flask.request
-            parameter_bytes = parameters_template.parameters_template(
-                request,
-                self._database,
-                self._confidential_database,
+            profile_modes = self._requested_profile_modes(request)
+            if profile_modes:
+                with self._request_profiler.profiling(request.path, profile_modes):
+                    return _json_parameters_job(request, self._database, self._confidential_database)
+            return self._json_parameters(request)
+
+        @app.route("/json_measures", methods=["POST"])
+        def json_measures():
+            # Returns the measure specific parameter templates for a list of measures as json,
+            # in the order of the measures. The measures share the queried and extrapolated data.
+            # Example query:
+            # https://micatool-dev.eu/json_measures?id_region=0
+            # Content-Type: application/json
+            # Example Content: list of measures, each as the content of /json_measure
+
+            request = self._flask.request
+            profile_modes = self._requested_profile_modes(request)
+            if profile_modes:
+                with self._request_profiler.profiling(request.path, profile_modes):
+                    json_string = _json_measures_job(request, self._database, self._confidential_database)
+                return self._create_response_from_string(json_string)
+            if self._calculation_pool is not None:
+                json_string = self._single_flight.do(
+                    api.request_key(request),
+                    lambda: self._calculation_pool.run(_json_measures_job, request),
+                )
+                return self._create_response_from_string(json_string)
+            json_string = self._single_flight.do(
+                api.request_key(request),
+                lambda: _json_measures_job(request, self._database, self._confidential_database),
             )
-            return self.create_json_parameters_response(parameter_bytes, request)
+            return self._create_response_from_string(json_string)
 
         @app.route("/json_measure", methods=["POST"])
         def json_measure():
@@ -219,251 +500,64 @@ class BackEnd:
             # Example Content: see measure route
 
             request = self._flask.request
-            return measure_specific_parameters_template.measure_specific_parameters_template(
-                request,
-                self._database,
-                self._confidential_database,
-            )
+            profile_modes = self._requested_profile_modes(request)
+            if profile_modes:
+                with self._request_profiler.profiling(request.path, profile_modes):
+                    json_string = _json_measure_job(request, self._database, self._confidential_database)
+                return self._create_response_from_string(json_string)
+            json_string = self._single_flight.do(api.request_key(request), lambda: self._json_measure(request))
+            return self._create_response_from_string(json_string)
 
         @app.route("/export-results", methods=["POST"])
         def export_results():
-            request = self._flask.request
-            data = request.json
-            output = io.BytesIO()
-            workbook = xlsxwriter.workbook.Workbook(output)
-            bold = workbook.add_format({"bold": True})
-            italic = workbook.add_format({"italic": True})
-            number_format = workbook.add_format({"num_format": "#,##0.00#######"})
-
-            # Inputs
-            worksheet = workbook.add_worksheet("Inputs")
-            row_idx = 0
-            for program in data["programs"]:
-                worksheet.write(row_idx, 0, "Program")
-                worksheet.write(row_idx, 1, program["name"], bold)
-                row_idx += 1
-                worksheet.write(row_idx, 0, "Unit")
-                worksheet.write(row_idx, 1, program["unitName"], bold)
-                row_idx += 1
-                worksheet.write(row_idx, 0, "Region")
-                where_clause = {"id": str(data["region"])}
-                region = self._database.table("id_region", where_clause)
-                worksheet.write(row_idx, 1, region["label"].values[0], bold)
-                row_idx += 1
-                worksheet.write(row_idx, 0, "Subsector")
-                worksheet.write(
-                    row_idx, 1, program.get("subsectorName", program["subsector"]), bold
-                )
-                row_idx += 2
-                for improvement in program["improvements"]:
-                    worksheet.write(
-                        row_idx, 0, improvement.get("name", improvement["id"]), italic
-                    )
-                    row_idx += 1
-                    col_idx = 0
-                    for key, value in improvement["values"].items():
-                        worksheet.write(row_idx, col_idx, key, bold)
-                        worksheet.write(row_idx + 1, col_idx, value, number_format)
-                        col_idx += 1
-                    row_idx += 2
-                row_idx += 5
-
-            # Outputs
-            for program in data["results"]:
-                aggregation_measurements = []
-                title_appendix = (
-                    f" ({program['name']})" if len(data["results"]) > 1 else ""
-                )
-                for key, category in data["categories"].items():
-                    if key not in ["quantification", "monetization"]:
-                        continue
-                    worksheet = workbook.add_worksheet(
-                        f"{category['title']}{title_appendix}"
-                    )
-                    row_idx = 0
-                    for measurement in category["measurements"]:
-                        try:
-                            result = program["data"][measurement["identifier"]]
-                        except KeyError:
-                            continue
-                        if (
-                            key == "monetization"
-                            or measurement["identifier"]
-                            == "impactOnGrossDomesticProduct"
-                        ):
-                            aggregation_measurements.append(measurement)
-                        if row_idx > 0:
-                            row_idx += 1
-                        # title
-                        title = (
-                            f"[{measurement['subcategory']}] {measurement['title']}"
-                            if measurement.get("subcategory")
-                            else measurement["title"]
-                        )
-                        worksheet.write(row_idx, 0, title, bold)
-                        row_idx += 1
-                        # unit
-                        worksheet.write(row_idx, 0, measurement["yAxis"], italic)
-                        row_idx += 1
-                        for year_idx, year in enumerate(result["yearColumnNames"]):
-                            worksheet.write(row_idx, year_idx + 1, year, bold)
-                        row_idx += 1
-                        col_idx = 0
-                        total = [0 for x in result["yearColumnNames"]]
-                        for row in result["rows"]:
-                            for idx, entry in enumerate(row):
-                                try:
-                                    column_name = result["idColumnNames"][idx]
-                                except IndexError:
-                                    if col_idx == 0:
-                                        col_idx += 1
-                                    worksheet.write(
-                                        row_idx, col_idx, entry, number_format
-                                    )
-                                    total[col_idx - 1] += entry
-                                else:
-                                    if column_name == "id_measure":
-                                        continue
-                                    else:
-                                        worksheet.write(
-                                            row_idx, col_idx, entry, number_format
-                                        )
-                                col_idx += 1
-                            row_idx += 1
-                            col_idx = 0
-                        if len(result["rows"]) > 1:
-                            # Write total row
-                            worksheet.write(row_idx, 0, "Total", bold)
-                            for idx, entry in enumerate(total):
-                                worksheet.write(row_idx, idx + 1, entry, number_format)
-                        row_idx += 1
-
-                # Aggregation
-                worksheet = workbook.add_worksheet(f"Aggregation{title_appendix}")
-                col_idx = 1
-                for year in data["years"]:
-                    worksheet.write(0, col_idx, year, bold)
-                    col_idx += 1
-                row_idx = 1
-                for measurement in aggregation_measurements:
-                    worksheet.write(row_idx, 0, measurement["title"], bold)
-                    result = program["data"][measurement["identifier"]]
-                    col_idx = 0
-                    for row in result["rows"]:
-                        for idx, entry in enumerate(row):
-                            try:
-                                column_name = result["idColumnNames"][idx]
-                            except IndexError:
-                                if col_idx == 0:
-                                    col_idx += 1
-                                worksheet.write(row_idx, col_idx, entry, number_format)
-                            else:
-                                if column_name == "id_measure":
-                                    continue
-                                else:
-                                    worksheet.write(
-                                        row_idx, col_idx, entry, number_format
-                                    )
-                            col_idx += 1
-                        row_idx += 1
-                        col_idx = 0
-
-            # CBA
-            for program in data["cbaData"]:
-                worksheet = workbook.add_worksheet(
-                    f"CBA ({program['name']})" if len(data["results"]) > 1 else "CBA"
-                )
-                row_idx = 0
-
-                # Add unit
-                worksheet.write(row_idx, 0, "unit", bold)
-                worksheet.write(row_idx, 1, "Euro", italic)
-                row_idx += 1
-
-                list_results = {}
-                for key, result in program.items():
-                    if key in ["parameters", "years"]:
-                        continue
-                    if isinstance(result, list):
-                        list_results[key] = result
-                        continue
-                    worksheet.write(row_idx, 0, key, bold)
-                    worksheet.write(row_idx, 1, result, number_format)
-                    row_idx += 1
-
-                row_idx += 1
-                col_idx = 1
-                for year in program["years"]:
-                    worksheet.write(row_idx, col_idx, year, bold)
-                    col_idx += 1
-
-                for key, result in list_results.items():
-                    row_idx += 1
-                    worksheet.write(row_idx, 0, key, bold)
-                    col_idx = 1
-                    for row in result:
-                        worksheet.write(row_idx, col_idx, row, number_format)
-                        col_idx += 1
-
-                # Add parameters
-                row_idx += 2
-                worksheet.write(row_idx, 0, "Parameters", bold)
-                row_idx += 1
-                for key, value in program["parameters"].items():
-                    worksheet.write(row_idx, 0, key, bold)
-                    worksheet.write(row_idx, 1, value)
-                    row_idx += 1
-
-            # years = cbaData.pop("years")
-            # del cbaData["supportingYears"]
-            # for key, charts in cbaData.items():
-            #     row_idx = 0
-            #     worksheet = workbook.add_worksheet(f"CBA - {key}"[:30])
-            #     for chart_key, chart in charts.items():
-            #         worksheet.write(row_idx, 0, chart_key, bold)
-            #         row_idx += 1
-            #         col_idx = 1 if key == "marginalCostCurves" else 0
-            #         worksheet.write(row_idx, 0, "€", italic)
-            #         row_idx += 1
-            #         for year in years:
-            #             worksheet.write(row_idx, col_idx, year)
-            #             col_idx += 1
-            #         row_idx += 1
-            #         col_idx = 0
-            #         for row in chart:
-            #             if key == "marginalCostCurves":
-            #                 legend = {
-            #                     "x": "Totally generated energy savings"
-            #                     if chart_key == "marginalEnergySavingsCostCurves"
-            #                     else "Totally generated CO2 savings",
-            #                     "y": "Totally saved energy savings"
-            #                     if chart_key == "marginalEnergySavingsCostCurves"
-            #                     else "Totally saved CO2 savings",
-            #                 }
-            #                 worksheet.write(row_idx, col_idx, legend["x"])
-            #                 row_idx += 1
-            #                 worksheet.write(row_idx, col_idx, legend["y"])
-            #                 row_idx -= 1
-            #                 col_idx += 1
-            #             for year, value in row["data"].items():
-            #                 if key == "marginalCostCurves":
-            #                     worksheet.write(row_idx, col_idx, value["x"])
-            #                     row_idx += 1
-            #                     worksheet.write(row_idx, col_idx, value["y"])
-            #                     row_idx -= 1
-            #                 else:
-            #                     worksheet.write(row_idx, col_idx, value)
-            #                 col_idx += 1
-            #         row_idx += 2
-            workbook.close()
-            response = self._flask.make_response(output.getvalue())
-            response.headers["Content-Disposition"] = (
-                "attachment; filename=MICAT_results.xlsx"
+            # The workbook is written to a temporary file, that is streamed to the client
+            # and removed when the response is closed
+            data = self._flask.request.json
+            output = tempfile.TemporaryFile()
+            try:
+                results_export.write_results_workbook(data, self._database, output)
+            except Exception:
+                output.close()
+                raise
+            output.seek(0)
+            return self._flask.send_file(
+                output,
+                mimetype=results_export.XLSX_MIME_TYPE,
+                as_attachment=True,
+                download_name="MICAT_results.xlsx",
             )
-            response.headers["Content-type"] = (
-                "application/vnd.openxmlformats-officedocument.spreadsheetml.sheet"
+
+        @app.route("/export-results/<result_id>")
+        def export_stored_results(result_id):
+            # Exports a stored result of /indicator_data without uploading it again
+            # Example query:
+            # https://micatool-dev.eu/export-results/<X-Micat-Result-Id of the result>?format=csv
+            # Supported formats: xlsx (default), csv, parquet
+            export_format = self._flask.request.args.get("format", "xlsx")
+            if export_format not in result_tables_export.MIME_TYPES:
+                return self._create_error_response("BadRequest", 400)
+            json_string = None
+            if self._result_store is not None:
+                json_string = self._result_store.get_string(result_id)
+            if json_string is None:
+                return self._create_error_response("NotFound", 404)
+            output = tempfile.TemporaryFile()
+            try:
+                result_tables_export.write_result_tables(json_string, export_format, output)
+            except ImportError:
+                # Parquet requires the optional dependency pyarrow
+                output.close()
+                return self._create_error_response("NotImplemented", 501)
+            except Exception:
+                output.close()
+                raise
+            output.seek(0)
+            return self._flask.send_file(
+                output,
+                mimetype=result_tables_export.MIME_TYPES[export_format],
+                as_attachment=True,
+                download_name="MICAT_results." + export_format,
             )
-            return response
 
         @app.route("/export-input", methods=["POST"])
         def export_input():
@@ -571,6 +665,8 @@ class BackEnd:
             response = self._handle_exception(exception)
             return response
 
+        app.config["COMPRESS_MIMETYPES"] = COMPRESSED_MIME_TYPES
+        app.config["COMPRESS_STREAMS"] = self._is_stream_compression_enabled
         Compress(app)
 
         # add error handling function as property for easier testing
@@ -585,6 +681,290 @@ class BackEnd:
         where_clause = {k: v[0] for k, v in query_parameters.items()}
         return where_clause
 
+    @staticmethod
+    def _create_result_store(settings, database_path):
+        # The result store is disabled by default and can be enabled in the
+        # settings file, see entry "resultStore" in .settings.default.json
+        result_store_settings = settings.get("resultStore", {})
+        if not result_store_settings.get("enabled", False):
+            return None
+        store_path = result_store_settings.get("path")
+        if store_path is None:
+            store_path = os.path.join(os.path.dirname(database_path), "result_store.sqlite")
+        max_size_in_megabytes = result_store_settings.get("maxSizeInMegabytes", 500)
+        return ResultStore(store_path, max_size_in_megabytes * 1024 * 1024)
+
+    @staticmethod
+    def _create_template_cache(settings):
+        # The template cache is disabled by default and can be enabled in the
+        # settings file, see entry "templateCache" in .settings.default.json
+        template_cache_settings = settings.get("templateCache", {})
+        if not template_cache_settings.get("enabled", False):
+            return None
+        return TemplateCache(template_cache_settings.get("maxNumberOfEntries", 200))
+
+    @staticmethod
+    def _create_admission_control(settings):
+        # The admission control is disabled by default and can be enabled in the
+        # settings file, see entry "admissionControl" in .settings.default.json
+        admission_control_settings = settings.get("admissionControl", {})
+        if not admission_control_settings.get("enabled", False):
+            return None
+        return AdmissionControl(admission_control_settings.get("routeClasses"))
+
+    @staticmethod
+    def _create_calculation_pool(settings, database_path, confidential_database_path):
+        # The calculation pool is disabled by default and can be enabled in the
+        # settings file, see entry "calculationPool" in .settings.default.json
+        calculation_pool_settings = settings.get("calculationPool", {})
+        if not calculation_pool_settings.get("enabled", False):
+            return None
+        return CalculationPool(
+            database_path,
+            confidential_database_path,
+            number_of_workers=calculation_pool_settings.get("numberOfWorkers"),
+            max_jobs_per_worker=calculation_pool_settings.get("maxJobsPerWorker", 100),
+        )
+
+    @staticmethod
+    def _create_request_profiler(settings, database_path):
+        # The profiles are stored next to the database by default, see
+        # entry "requestProfiler" in .settings.default.json
+        request_profiler_settings = settings.get("requestProfiler", {})
+        directory = request_profiler_settings.get("directory")
+        if directory is None:
+            directory = os.path.join(os.path.dirname(database_path), "profiles")
+        max_number_of_profiles = request_profiler_settings.get("maxNumberOfProfiles", 20)
+        return RequestProfiler(directory, max_number_of_profiles)
+
+    def _create_warm_up(self, settings):
+        # The warm-up is disabled by default and can be enabled in the
+        # settings file, see entry "warmUp" in .settings.default.json
+        warm_up_settings = settings.get("warmUp", {})
+        if not warm_up_settings.get("enabled", False):
+            return None
+        synthetic_request = None
+        if warm_up_settings.get("syntheticRequests", False):
+            synthetic_request = self._synthetic_request
+        return WarmUp([self._database, self._confidential_database], synthetic_request)
+
+    def _synthetic_request(self, id_region):
+        # Creates the global parameters of the region, which includes the
+        # extrapolation of the region specific parameter tables
+        query = {"id_region": id_region, "years": self._pre_generated_years}
+        self._json_parameters(BackEnd._synthetic_http_request("/json_parameters", query))
+
+    def _pre_generate_templates(self, id_region):
+        # Creates the templates of the region, so that they are put into the template cache
+        query = {"id_region": id_region, "years": self._pre_generated_years}
+        self._parameters_template_bytes(BackEnd._synthetic_http_request("/parameters", query))
+        for orient in self._pre_generated_orients:
+            self._json_parameters(BackEnd._synthetic_http_request("/json_parameters", {**query, "orient": orient}))
+
+    @staticmethod
+    def _synthetic_http_request(path, query):
+        # The synthetic requests are passed to the template builders directly instead of the routes.
+        # Therefore, their errors are raised, and they are neither subject to the admission
+        # control nor counted in the request metrics.
+        return EnvironBuilder(path=path, query_string=query).get_request()
+
+    def _id_regions(self):
+        id_region_table = self._database.id_table("id_region")
+        return [int(id_region) for id_region in id_region_table.id_values]
+
+    def _json_measure(self, request):
+        # Returns the template as JSON string, with or without the calculation pool
+        if self._calculation_pool is not None:
+            return self._calculation_pool.run(_json_measure_job, request)
+        return _json_measure_job(request, self._database, self._confidential_database)
+
+    def _parameters_template_bytes(self, request):
+        # The Excel template is created without the confidential database
+        def create():
+            return parameters_template.parameters_template(request, self._database).getvalue()
+
+        if self._template_cache is None:
+            return create()
+        key = self._template_key("xlsx", request, [self._database.fingerprint()])
+        return self._template_cache.get_or_create(key, create)
+
+    def _json_parameters(self, request):
+        def create():
+            if self._calculation_pool is not None:
+                return self._calculation_pool.run(_json_parameters_job, request)
+            return _json_parameters_job(request, self._database, self._confidential_database)
+
+        if self._template_cache is None:
+            return create()
+        database_fingerprints = [
+            self._database.fingerprint(),
+            self._confidential_database.fingerprint(),
+        ]
+        template_format = "json:" + BackEnd.json_parameters_orient(request)
+        key = self._template_key(template_format, request, database_fingerprints)
+        return self._template_cache.get_or_create(key, create)
+
+    @staticmethod
+    def _template_key(template_format, request, database_fingerprints):
+        id_region = request.args.get("id_region")
+        years = request.args.getlist("years")
+        return TemplateCache.key(template_format, id_region, years, database_fingerprints)
+
+    def _is_admin_request(self, http_request):
+        if not self._admin_secret:
+            return False
+        secret = http_request.headers.get("X-Micat-Admin-Secret", "")
+        return hmac.compare_digest(secret.encode(), self._admin_secret.encode())
+
+    def _requested_profile_modes(self, http_request):
+        # Profiling is only done for admin requests; other requests ignore the flag
+        value = http_request.headers.get("X-Micat-Profile") or http_request.args.get("profile")
+        profile_modes = RequestProfiler.parse_modes(value)
+        if not profile_modes or not self._is_admin_request(http_request):
+            return []
+        return profile_modes
+
+    def _create_forbidden_response(self):
+        return self._create_error_response("Forbidden", 403)
+
+    def _create_error_response(self, error_type, status_code):
+        json_string = self._flask.json.dumps({"error": {"type": error_type, "code": status_code}})
+        response = self._create_response_from_string(json_string)
+        response.status_code = status_code
+        return response
+
+    @staticmethod
+    def _configure_query_profiler(configuration):
+        if "enabled" in configuration:
+            QUERY_PROFILER.is_enabled = bool(configuration["enabled"])
+        if "planThresholdInMilliseconds" in configuration:
+            QUERY_PROFILER.plan_threshold_in_seconds = float(configuration["planThresholdInMilliseconds"]) / 1000
+        if configuration.get("clear", False):
+            QUERY_PROFILER.clear()
+
+    def _register_metric_collectors(self):
+        REGISTRY.register_collector(
+            "micat_active_calculations",
+            "gauge",
+            "Number of calculations that are currently running.",
+            self._single_flight.number_of_calls_in_flight,
+        )
+        REGISTRY.register_collector(
+            "micat_coalesced_requests_total",
+            "counter",
+            "Number of requests that shared the result of an identical running calculation.",
+            lambda: self._single_flight.number_of_coalesced_calls,
+        )
+        REGISTRY.register_collector(
+            "micat_admission_queue_length",
+            "gauge",
+            "Number of requests waiting for admission, by route class.",
+            lambda: self._admission_metric("queueLength"),
+        )
+        REGISTRY.register_collector(
+            "micat_admission_active_requests",
+            "gauge",
+            "Number of admitted requests that are currently running, by route class.",
+            lambda: self._admission_metric("activeRequests"),
+        )
+        REGISTRY.register_collector(
+            "micat_template_cache_requests_total",
+            "counter",
+            "Number of parameter template requests, by template cache result.",
+            self._template_cache_metric,
+        )
+
+    def _template_cache_metric(self):
+        if self._template_cache is None:
+            return []
+        return [
+            ({"result": "hit"}, self._template_cache.number_of_hits),
+            ({"result": "miss"}, self._template_cache.number_of_misses),
+        ]
+
+    def _admission_metric(self, key):
+        if self._admission_control is None:
+            return []
+        admission_metrics = self._admission_control.metrics()
+        return [({"route_class": name}, entry[key]) for name, entry in admission_metrics.items()]
+
+    def _create_saturated_response(self, error):
+        json_object = self._exception_to_json(error)
+        json_string = self._flask.json.dumps(json_object)
+        response = self._create_response_from_string(json_string)
+        response.status_code = error.status_code
+        response.headers.set("Retry-After", str(error.retry_after_in_seconds))
+        return response
+
+    def _indicator_data(self, request, request_key, is_columnar=False):
+        if self._result_store is None:
+            return self._calculate_indicator_data(request, is_columnar)
+
+        result_key = self._result_key(request_key)
+        json_string = self._result_store.get_string(result_key)
+        REGISTRY.count_cache_access("result_store", json_string is not None)
+        if json_string is None:
+            json_string = self._calculate_indicator_data(request, is_columnar)
+            self._result_store.put_string(result_key, json_string)
+        return json_string
+
+    def _result_key(self, request_key):
+        database_fingerprints = [
+            self._database.fingerprint(),
+            self._confidential_database.fingerprint(),
+        ]
+        return ResultStore.key(request_key, database_fingerprints)
+
+    def _calculate_indicator_data(self, request, is_columnar=False):
+        if is_columnar:
+            if self._calculation_pool is not None:
+                return self._calculation_pool.run(_columnar_indicator_data_job, request)
+            return _columnar_indicator_data_job(request, self._database, self._confidential_database)
+        if self._is_memory_bounded:
+            return self._calculate_indicator_data_with_bounded_memory(request)
+        if self._calculation_pool is not None:
+            return self._calculation_pool.run(_indicator_data_job, request)
+        json_object = calculation.calculate_indicator_data(
+            request, self._database, self._confidential_database
+        )
+        # Create dummy response while developing
+        # json_object = _dummy_indicator_data()
+        with span("json_serialization"):
+            json_string = self._flask.json.dumps(json_object)
+        return json_string
+
+    def _indicator_data_chunks(self, request):
+        # Streamed results are calculated in this process and neither coalesced with
+        # identical requests nor stored in the result store, which needs complete strings.
+        # The calculation finishes before the first chunk is sent, so that errors are
+        # still returned as regular error responses.
+        result_tables = calculation.calculate_indicator_tables(
+            request,
+            self._database,
+            self._confidential_database,
+        )
+        return json_stream.result_table_chunks(result_tables, self._number_of_rows_per_chunk)
+
+    def _calculate_indicator_data_with_bounded_memory(self, request):
+        if self._calculation_pool is not None:
+            json_string, peak_memory_in_bytes = self._calculation_pool.run(_memory_bounded_indicator_data_job, request)
+        else:
+            json_string, peak_memory_in_bytes = _memory_bounded_indicator_data_job(
+                request,
+                self._database,
+                self._confidential_database,
+            )
+        if peak_memory_in_bytes is not None:
+            REGISTRY.observe_process_peak_memory(peak_memory_in_bytes)
+            peak_memory_in_megabytes = peak_memory_in_bytes / 1024 / 1024
+            Logger.info("Peak memory of process during calculation: " + f"{peak_memory_in_megabytes:.1f}" + " MB")
+        return json_string
+
+    @staticmethod
+    def _is_columnar_format_accepted(request):
+        best_match = request.accept_mimetypes.best_match(["application/json", COLUMNAR_JSON_MIME_TYPE])
+        return best_match == COLUMNAR_JSON_MIME_TYPE
+
     @staticmethod
     def _catch_all(path, app, flask):
         if "index.html" in path:
@@ -600,17 +980,22 @@ class BackEnd:
             return flask.send_from_directory(os.path.join(directory_path), "index.html")
 
     @staticmethod
-    def create_json_parameters_response(parameter_bytes, request):
+    def create_json_parameters_response(df_dict, request):
+        # df_dict includes a data frame for each sheet of the parameters template
+        orient = BackEnd.json_parameters_orient(request)
+        for sheet_name in df_dict:
+            df_dict[sheet_name] = json.loads(df_dict[sheet_name].to_json(orient=orient))
+        return json.dumps(df_dict, indent=2)
+
+    @staticmethod
+    def json_parameters_orient(request):
         orient = request.args.get("orient", "records")
         allowed_orients = ["split", "records", "index", "columns", "values", "table"]
         # for the meaning of orients also see
         # https://pandas.pydata.org/pandas-docs/stable/reference/api/pandas.DataFrame.to_json.html
         if orient not in allowed_orients:
             orient = "records"
-        df_dict = pd.read_excel(parameter_bytes, sheet_name=None)
-        for sheet_name in df_dict:
-            df_dict[sheet_name] = json.loads(df_dict[sheet_name].to_json(orient=orient))
-        return json.dumps(df_dict, indent=2)
+        return orient
 
     @staticmethod
     def _exception_to_json(exception):
@@ -647,6 +1032,7 @@ class BackEnd:
 
     def _get_table(self, table_name, http_request):
         key = table_name + str(http_request.query_string)
+        REGISTRY.count_cache_access("table", key in self._cache)
         if key in self._cache:
             json_string = self._cache[key]
         else:
@@ -704,3 +1090,51 @@ class BackEnd:
             "application/vnd.openxmlformats-officedocument.spreadsheetml.sheet"
         )
         return output
+
+
+# Jobs for the calculation pool. They are executed in worker processes and
+# therefore return JSON strings instead of flask responses.
+
+
+def _indicator_data_job(request, database, confidential_database):
+    json_object = calculation.calculate_indicator_data(request, database, confidential_database)
+    return json.dumps(json_object, sort_keys=True)
+
+
+def _columnar_indicator_data_job(request, database, confidential_database):
+    result_tables = calculation.calculate_indicator_tables(request, database, confidential_database)
+    with span("convert_result_tables_to_json"):
+        columnar_json = {key: table.to_columnar_json() for key, table in result_tables.items()}
+    with span("json_serialization"):
+        return json.dumps(columnar_json, sort_keys=True)
+
+
+def _memory_bounded_indicator_data_job(request, database, confidential_database):
+    # Returns the JSON string and the peak resident memory of the process during the calculation in bytes
+    with peak_memory.measuring() as measured_peak_memory:
+        json_string = calculation.calculate_indicator_data_with_bounded_memory(request, database, confidential_database)
+    return json_string, measured_peak_memory.in_bytes
+
+
+def _json_parameters_job(request, database, confidential_database):
+    # The sheets of the template are created as data frames, without the Excel file
+    df_dict = parameters_template.parameters_data_frames(request, database, confidential_database)
+    return BackEnd.create_json_parameters_response(df_dict, request)
+
+
+def _json_measure_job(request, database, confidential_database):
+    json_object = measure_specific_parameters_template.measure_specific_parameters_template(
+        request,
+        database,
+        confidential_database,
+    )
+    return json.dumps(json_object, sort_keys=True)
+
+
+def _json_measures_job(request, database, confidential_database):
+    json_object = measure_specific_parameters_template.batch_measure_specific_parameters_template(
+        request,
+        database,
+        confidential_database,
+    )
+    return json.dumps(json_object, sort_keys=True)
@@ -0,0 +1,114 @@
+# © 2024-2026 Fraunhofer-Gesellschaft e.V., München
+#
+# SPDX-License-Identifier: AGPL-3.0-or-later
+
+import hashlib
+import sqlite3
+import time
+import zlib
+
+from micat.log.logger import Logger
+
+
+class ResultStore:
+    # Persistent, content-addressed store for calculation results.
+    # Results are saved as compressed blobs in a local sqlite file, so that they
+    # survive restarts and can be shared between several worker processes.
+    # If the total size of the stored blobs exceeds the given maximum size,
+    # the least recently used results are evicted.
+
+    def __init__(self, store_path, max_size_in_bytes=500 * 1024 * 1024):
+        self._store_path = store_path
+        self._max_size_in_bytes = max_size_in_bytes
+        self._create_table_if_not_exists()
+
+    @staticmethod
+    def key(request_key, database_fingerprints):
+        # The result of a calculation only depends on the request and on the content
+        # of the databases. Therefore, both are included in the key.
+        key_parts = [request_key] + [str(fingerprint) for fingerprint in database_fingerprints]
+        key_string = "|".join(key_parts)
+        key = hashlib.sha256(key_string.encode("utf-8")).hexdigest()
+        return key
+
+    def get(self, key):
+        with self._connect() as connection:
+            cursor = connection.cursor()
+            cursor.execute("SELECT value FROM result WHERE key=?", (key,))
+            row = cursor.fetchone()
+            if row is None:
+                return None
+            cursor.execute(
+                "UPDATE result SET last_access=? WHERE key=?",
+                (time.time(), key),
+            )
+        value = zlib.decompress(row[0])
+        return value
+
+    def get_string(self, key):
+        value = self.get(key)
+        if value is None:
+            return None
+        return value.decode("utf-8")
+
+    def put(self, key, value):
+        compressed_value = zlib.compress(value)
+        size = len(compressed_value)
+        if size > self._max_size_in_bytes:
+            Logger.warn("Result is too large to be stored: " + str(size) + " bytes")
+            return
+        now = time.time()
+        with self._connect() as connection:
+            cursor = connection.cursor()
+            cursor.execute(
+                "INSERT OR REPLACE INTO result (key, value, size, created, last_access) VALUES (?, ?, ?, ?, ?)",
+                (key, compressed_value, size, now, now),
+            )
+            self._evict(cursor)
+
+    def put_string(self, key, string):
+        self.put(key, string.encode("utf-8"))
+
+    def size(self):
+        with self._connect() as connection:
+            cursor = connection.cursor()
+            return self._total_size(cursor)
+
+    def _connect(self):
+        connection = sqlite3.connect(self._store_path, timeout=30)
+        return connection
+
+    def _create_table_if_not_exists(self):
+        with self._connect() as connection:
+            cursor = connection.cursor()
+            # write ahead logging allows concurrent readers from several processes
+            cursor.execute("PRAGMA journal_mode=WAL")
+            cursor.execute(
+                "CREATE TABLE IF NOT EXISTS result ("
+                + "key text PRIMARY KEY NOT NULL, "
+                + "value blob NOT NULL, "
+                + "size integer NOT NULL, "
+                + "created real NOT NULL, "
+                + "last_access real NOT NULL"
+                + ")"
+            )
+            cursor.execute("CREATE INDEX IF NOT EXISTS result_last_access ON result (last_access)")
+
+    def _evict(self, cursor):
+        total_size = self._total_size(cursor)
+        if total_size <= self._max_size_in_bytes:
+            return
+        cursor.execute("SELECT key, size FROM result ORDER BY last_access")
+        keys_to_delete = []
+        for key, size in cursor.fetchall():
+            if total_size <= self._max_size_in_bytes:
+                break
+            keys_to_delete.append((key,))
+            total_size -= size
+        cursor.executemany("DELETE FROM result WHERE key=?", keys_to_delete)
+
+    @staticmethod
+    def _total_size(cursor):
+        cursor.execute("SELECT COALESCE(SUM(size), 0) FROM result")
+        total_size = cursor.fetchone()[0]
+        return total_size
@@ -0,0 +1,98 @@
+# © 2024-2026 Fraunhofer-Gesellschaft e.V., München
+#
+# SPDX-License-Identifier: AGPL-3.0-or-later
+
+import collections
+import threading
+import time
+
+from micat.log.logger import Logger
+from micat.utils.single_flight import SingleFlight
+
+
+class TemplateCache:
+    # In-memory cache for the generated parameter templates. The content of a template
+    # only depends on the region, the years and the content of the databases, so that the
+    # finished Excel bytes and JSON strings can be reused for all requests of a region.
+    # Concurrent misses for the same key generate the template only once.
+    # If the number of entries exceeds the given maximum, the least recently used
+    # entries are evicted.
+
+    def __init__(self, max_number_of_entries=200):
+        self._max_number_of_entries = max_number_of_entries
+        self._lock = threading.Lock()
+        self._entries = collections.OrderedDict()
+        self._single_flight = SingleFlight()
+        self.number_of_hits = 0
+        self.number_of_misses = 0
+
+    @staticmethod
+    def key(template_format, id_region, years, database_fingerprints):
+        # template_format is for example "xlsx" or "json:records". The order of the years
+        # is kept because it determines the order of the columns in the template.
+        key = (
+            template_format,
+            str(id_region),
+            tuple(str(year) for year in years),
+            tuple(str(fingerprint) for fingerprint in database_fingerprints),
+        )
+        return key
+
+    def get_or_create(self, key, create):
+        with self._lock:
+            if key in self._entries:
+                self._entries.move_to_end(key)
+                self.number_of_hits += 1
+                return self._entries[key]
+            self.number_of_misses += 1
+        return self._single_flight.do(key, lambda: self._create(key, create))
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+
+    def __len__(self):
+        with self._lock:
+            return len(self._entries)
+
+    def start_pre_generation(self, id_regions_provider, generate):
+        # Runs the pre-generation in a background thread, so that the server is available
+        # while the templates are generated
+        thread = threading.Thread(
+            target=self.pre_generate,
+            args=(id_regions_provider, generate),
+            name="template-cache",
+            daemon=True,
+        )
+        thread.start()
+        return thread
+
+    def pre_generate(self, id_regions_provider, generate):
+        # Calls generate(id_region) for each region; generate is expected to put the
+        # templates of the region into this cache. The pre-generation is best effort:
+        # errors are logged and the remaining regions are generated anyway.
+        start_time = time.monotonic()
+        number_of_regions = 0
+        try:
+            for id_region in id_regions_provider():
+                try:
+                    generate(id_region)
+                    number_of_regions += 1
+                except Exception as exception:  # pylint: disable=broad-except
+                    Logger.warn(
+                        "Pre-generation of templates failed for region " + str(id_region) + ": " + str(exception)
+                    )
+        except Exception as exception:  # pylint: disable=broad-except
+            Logger.warn("Pre-generation of templates failed: " + str(exception))
+        duration_in_seconds = time.monotonic() - start_time
+        Logger.info(f"Pre-generated templates of {number_of_regions} regions in {duration_in_seconds:.1f} s")
+        return number_of_regions
+
+    def _create(self, key, create):
+        value = create()
+        with self._lock:
+            self._entries[key] = value
+            self._entries.move_to_end(key)
+            while len(self._entries) > self._max_number_of_entries:
+                self._entries.popitem(last=False)
+        return value
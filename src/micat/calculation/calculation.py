@@ -3,6 +3,7 @@
 # SPDX-License-Identifier: AGPL-3.0-or-later
 
 # pylint: disable = import-self
+import json
 from urllib.parse import parse_qs
 
 from micat.calculation import (
@@ -18,8 +19,10 @@ from micat.calculation.economic import (
     eurostat,
     population,
 )
+from micat.calculation.interim_store import InterimStore
 from micat.calculation.social import calculation_social
 from micat.input.data_source import DataSource
+from micat.monitoring.span import span
 from micat.series.annual_series import AnnualSeries
 from micat.table.table import Table
 
@@ -59,13 +62,94 @@ def calculate_energy_produced(
     return final_energy_saving_or_capacities
 
 
-# pylint: disable=too-many-locals
+# Steps of calculate_indicator_data that use the interim tables. An interim
+# table is released as soon as its last consumer has finished.
+_INTERIM_TABLE_CONSUMERS = {
+    "final_energy_saving_or_capacities": [
+        "social_indicators",
+        "ecologic_indicators",
+        "economic_indicators",
+        "cost_benefit_analysis",
+    ],
+    "installed_capacity": ["ecologic_indicators", "economic_indicators"],
+    "interim_data": [
+        "social_indicators",
+        "ecologic_indicators",
+        "economic_indicators",
+    ],
+    "heat_saving_final": ["social_indicators", "ecologic_indicators"],
+    "electricity_saving_final": ["social_indicators", "ecologic_indicators"],
+    "ecologic_indicators": ["economic_indicators", "cost_benefit_analysis"],
+}
+
+
 def calculate_indicator_data(
     http_request,
     database,
     confidential_database,
 ):
+    translated_result_tables = calculate_indicator_tables(
+        http_request,
+        database,
+        confidential_database,
+    )
+    with span("convert_result_tables_to_json"):
+        json_result = _convert_result_tables_to_json(translated_result_tables)
+
+    return json_result
+
+
+def calculate_indicator_tables(
+    http_request,
+    database,
+    confidential_database,
+):
+    # Returns the translated result tables of calculate_indicator_data,
+    # e.g. to serialize them as a stream, see utils.json_stream
     print("Calculating indicator data for request")
+    result_tables = {}
+    data_source = _calculate_indicators(
+        http_request,
+        database,
+        confidential_database,
+        lambda tables, _data_source: result_tables.update(tables),
+    )
+    with span("translate_result_tables"):
+        translated_result_tables = _translate_result_tables(result_tables, data_source)
+    return translated_result_tables
+
+
+def calculate_indicator_data_with_bounded_memory(
+    http_request,
+    database,
+    confidential_database,
+):
+    # Memory-bounded variant of calculate_indicator_data: the result tables of each
+    # indicator group are translated and serialized as soon as they are no longer needed
+    # by the remaining steps. Returns the JSON string (with sorted keys) instead of the
+    # json object, so that only the serialized results are kept until the end.
+    print("Calculating indicator data for request with bounded memory")
+    serializer = _IncrementalSerializer()
+    _calculate_indicators(
+        http_request,
+        database,
+        confidential_database,
+        serializer.add,
+    )
+    return serializer.json_string()
+
+
+# pylint: disable=too-many-locals
+def _calculate_indicators(
+    http_request,
+    database,
+    confidential_database,
+    handle_result_tables,
+):
+    # Calculates the indicator groups and passes their result tables to
+    # handle_result_tables(tables, data_source). The tables are passed in the order
+    # social, economic, ecologic, cost benefit analysis; for duplicate keys, the later
+    # table takes precedence. Returns the data source.
 
     # The arguments include:
     # id_region,
@@ -73,7 +157,8 @@ def calculate_indicator_data(
     # measure_specific_parameters (dictionary using id_measure as key)
     # parameters ( maps parameter_name => dataframe )
     # population_of_municipality (as int)
-    arguments = _front_end_arguments(http_request)
+    with span("front_end_arguments"):
+        arguments = _front_end_arguments(http_request)
 
     id_region = arguments["id_region"]
 
@@ -94,85 +179,72 @@ def calculate_indicator_data(
         parameters,
     )
 
-    final_energy_saving_or_capacities = arguments["final_energy_saving_or_capacities"]
-    installed_capacity = final_energy_saving_or_capacities.copy()
-    years = final_energy_saving_or_capacities.years
+    years = arguments["final_energy_saving_or_capacities"].years
     starting_year = arguments["starting_year"]
-
-    # Check if subsectors belong to renewables (id >= 30) and calculate energy produced
-    if any(
-        id_subsector >= 30
-        for id_subsector in final_energy_saving_or_capacities.unique_index_values(
-            "id_subsector"
-        )
-    ):
-        final_energy_saving_or_capacities = calculate_energy_produced(
-            final_energy_saving_or_capacities,
+    interim_tables = _interim_tables(arguments, data_source, id_region, years)
+    del arguments
+
+    with span("social_indicators"):
+        social_indicators = calculation_social.social_indicators(
+            interim_tables.get("final_energy_saving_or_capacities"),
+            population_of_municipality,
+            interim_tables.get("interim_data"),
             data_source,
             id_region,
+            interim_tables.get("heat_saving_final"),
+            interim_tables.get("electricity_saving_final"),
         )
-
-    interim_data, heat_saving_final, electricity_saving_final = _interim_data(
-        final_energy_saving_or_capacities,
-        data_source,
-        id_region,
-        years,
-    )
-
-    _validate_data(interim_data)
-
-    social_indicators = calculation_social.social_indicators(
-        final_energy_saving_or_capacities,
-        population_of_municipality,
-        interim_data,
-        data_source,
-        id_region,
-        heat_saving_final,
-        electricity_saving_final,
-    )
+    interim_tables.finish("social_indicators")
     _validate_data(social_indicators)
+    handle_result_tables(social_indicators, data_source)
+    del social_indicators
 
-    ecologic_indicators = calculation_ecologic.ecologic_indicators(
-        interim_data,
-        data_source,
-        id_region,
-        heat_saving_final,
-        electricity_saving_final,
-        final_energy_saving_or_capacities,
-        installed_capacity,
-    )
+    with span("ecologic_indicators"):
+        ecologic_indicators = calculation_ecologic.ecologic_indicators(
+            interim_tables.get("interim_data"),
+            data_source,
+            id_region,
+            interim_tables.get("heat_saving_final"),
+            interim_tables.get("electricity_saving_final"),
+            interim_tables.get("final_energy_saving_or_capacities"),
+            interim_tables.get("installed_capacity"),
+        )
+    interim_tables.finish("ecologic_indicators")
     _validate_data(ecologic_indicators)
-
-    economic_indicators = calculation_economic.economic_indicators(
-        final_energy_saving_or_capacities,
-        population_of_municipality,
-        interim_data,
-        ecologic_indicators,
-        data_source,
-        id_region,
-        years,
-        starting_year,
-        installed_capacity,
-    )
+    interim_tables.put("ecologic_indicators", ecologic_indicators)
+    del ecologic_indicators
+
+    with span("economic_indicators"):
+        economic_indicators = calculation_economic.economic_indicators(
+            interim_tables.get("final_energy_saving_or_capacities"),
+            population_of_municipality,
+            interim_tables.get("interim_data"),
+            interim_tables.get("ecologic_indicators"),
+            data_source,
+            id_region,
+            years,
+            starting_year,
+            interim_tables.get("installed_capacity"),
+        )
+    interim_tables.finish("economic_indicators")
     _validate_data(economic_indicators)
+    handle_result_tables(economic_indicators, data_source)
+    del economic_indicators
+
+    ecologic_indicators = interim_tables.get("ecologic_indicators")
+    with span("cost_benefit_analysis"):
+        cost_benefit_analysis_parameters = cost_benefit_analysis.parameters(
+            interim_tables.get("final_energy_saving_or_capacities"),
+            ecologic_indicators,
+            id_region,
+            data_source,
+            starting_year,
+        )
+    interim_tables.finish("cost_benefit_analysis")
+    handle_result_tables(ecologic_indicators, data_source)
+    handle_result_tables(cost_benefit_analysis_parameters, data_source)
 
-    cost_benefit_analysis_parameters = cost_benefit_analysis.parameters(
-        final_energy_saving_or_capacities,
-        ecologic_indicators,
-        id_region,
-        data_source,
-        starting_year,
-    )
-    result_tables = (
-        social_indicators
-        | economic_indicators
-        | ecologic_indicators
-        | cost_benefit_analysis_parameters
-    )
-    translated_result_tables = _translate_result_tables(result_tables, data_source)
-    json_result = _convert_result_tables_to_json(translated_result_tables)
-
-    return json_result
+    return data_source
 
     # mapping of indicators to indicator groups:
     # (helps to find indicators in corresponding calculation modules)
@@ -524,6 +596,44 @@ def _interim_data(
     return results, heat_saving_final, electricity_saving_final
 
 
+def _interim_tables(arguments, data_source, id_region, years):
+    final_energy_saving_or_capacities = arguments["final_energy_saving_or_capacities"]
+    installed_capacity = final_energy_saving_or_capacities.copy()
+
+    # Check if subsectors belong to renewables (id >= 30) and calculate energy produced
+    if any(
+        id_subsector >= 30
+        for id_subsector in final_energy_saving_or_capacities.unique_index_values(
+            "id_subsector"
+        )
+    ):
+        final_energy_saving_or_capacities = calculate_energy_produced(
+            final_energy_saving_or_capacities,
+            data_source,
+            id_region,
+        )
+
+    with span("interim_data"):
+        interim_data, heat_saving_final, electricity_saving_final = _interim_data(
+            final_energy_saving_or_capacities,
+            data_source,
+            id_region,
+            years,
+        )
+
+    _validate_data(interim_data)
+
+    interim_tables = InterimStore(_INTERIM_TABLE_CONSUMERS)
+    interim_tables.put(
+        "final_energy_saving_or_capacities", final_energy_saving_or_capacities
+    )
+    interim_tables.put("installed_capacity", installed_capacity)
+    interim_tables.put("interim_data", interim_data)
+    interim_tables.put("heat_saving_final", heat_saving_final)
+    interim_tables.put("electricity_saving_final", electricity_saving_final)
+    return interim_tables
+
+
 def _mapping_from_final_to_primary_energy_carrier(database):
     mapping_table = database.mapping_table(
         "mapping__final_energy_carrier__primary_energy_carrier"
@@ -646,3 +756,29 @@ def _validate_remaining_index_column_names(table):
                 + "Please translate or remove the column."
             )
             raise KeyError(message)
+
+
+class _IncrementalSerializer:
+    # Translates and serializes result tables as soon as they are passed, so that
+    # only the JSON strings of finished indicators are kept in memory. The result
+    # matches json.dumps(calculate_indicator_data(...), sort_keys=True).
+
+    def __init__(self):
+        # maps result key => serialized table
+        self._serialized_tables = {}
+
+    def add(self, tables, data_source):
+        with span("translate_result_tables"):
+            translated_tables = _translate_result_tables(tables, data_source)
+        with span("convert_result_tables_to_json"):
+            for key, table in translated_tables.items():
+                self._serialized_tables[key] = json.dumps(
+                    table.to_custom_json(), sort_keys=True
+                )
+
+    def json_string(self):
+        entries = [
+            json.dumps(key) + ": " + self._serialized_tables[key]
+            for key in sorted(self._serialized_tables)
+        ]
+        return "{" + ", ".join(entries) + "}"
@@ -11,6 +11,7 @@ from micat.calculation.ecologic import (
     targets,
 )
 from micat.calculation.economic import grid
+from micat.monitoring.span import span
 from micat.table.table import Table
 
 
@@ -156,59 +157,66 @@ def ecologic_indicators(
     ]
     total_primary_energy_saving = interim_data["total_primary_energy_saving"]
 
-    energy_saving_table = energy_saving.energy_saving(total_primary_energy_saving)
+    with span("ecologic.energy_saving"):
+        energy_saving_table = energy_saving.energy_saving(total_primary_energy_saving)
 
-    reduction_of_air_pollution_table = air_pollution.reduction_of_air_pollution(
-        iiasa_final_subsector_parameters,
-        iiasa_final_subsector_parameters_generation,
-        energy_saving_by_final_energy_carrier,
-        heat_saving_final,
-        electricity_saving_final,
-    )
-
-    reduction_of_green_house_gas_emission_table = (
-        air_pollution.reduction_of_green_house_gas_emission(
+    with span("ecologic.reduction_of_air_pollution"):
+        reduction_of_air_pollution_table = air_pollution.reduction_of_air_pollution(
             iiasa_final_subsector_parameters,
             iiasa_final_subsector_parameters_generation,
             energy_saving_by_final_energy_carrier,
             heat_saving_final,
             electricity_saving_final,
         )
-    )
 
-    reduction_of_mortality_morbidity_table = (
-        air_pollution.reduction_of_mortality_morbidity(
-            iiasa_final_subsector_parameters,
-            iiasa_final_subsector_parameters_generation,
-            energy_saving_by_final_energy_carrier,
-            heat_saving_final,
-            electricity_saving_final,
+    with span("ecologic.reduction_of_green_house_gas_emission"):
+        reduction_of_green_house_gas_emission_table = (
+            air_pollution.reduction_of_green_house_gas_emission(
+                iiasa_final_subsector_parameters,
+                iiasa_final_subsector_parameters_generation,
+                energy_saving_by_final_energy_carrier,
+                heat_saving_final,
+                electricity_saving_final,
+            )
         )
-    )
 
-    reduction_of_mortality_morbidity_monetization_table = (
-        air_pollution.reduction_of_mortality_morbidity_monetization(
-            reduction_of_mortality_morbidity_table,
-            data_source,
-            id_region,
+    with span("ecologic.reduction_of_mortality_morbidity"):
+        reduction_of_mortality_morbidity_table = (
+            air_pollution.reduction_of_mortality_morbidity(
+                iiasa_final_subsector_parameters,
+                iiasa_final_subsector_parameters_generation,
+                energy_saving_by_final_energy_carrier,
+                heat_saving_final,
+                electricity_saving_final,
+            )
         )
-    )
 
-    reduction_of_green_house_gas_emission_monetization_table = (
-        reduction_of_green_house_gas_emission_monetization.monetize(
-            reduction_of_green_house_gas_emission_table,
-            data_source,
-            id_region,
+    with span("ecologic.reduction_of_mortality_morbidity_monetization"):
+        reduction_of_mortality_morbidity_monetization_table = (
+            air_pollution.reduction_of_mortality_morbidity_monetization(
+                reduction_of_mortality_morbidity_table,
+                data_source,
+                id_region,
+            )
+        )
+
+    with span("ecologic.reduction_of_green_house_gas_emission_monetization"):
+        reduction_of_green_house_gas_emission_monetization_table = (
+            reduction_of_green_house_gas_emission_monetization.monetize(
+                reduction_of_green_house_gas_emission_table,
+                data_source,
+                id_region,
+            )
         )
-    )
 
     eurostat_primary_parameters = interim_data["eurostat_primary_parameters"]
     gross_available_energy = eurostat_primary_parameters.reduce("id_parameter", 2)
 
-    renewable_energy_directive_targets = targets.impact_on_res_targets(
-        gross_available_energy,
-        total_primary_energy_saving,
-    )
+    with span("ecologic.impact_on_res_targets"):
+        renewable_energy_directive_targets = targets.impact_on_res_targets(
+            gross_available_energy,
+            total_primary_energy_saving,
+        )
 
     fraunhofer_constant_parameters = data_source.table(
         "fraunhofer_constant_parameters", {"id_region": str(id_region)}
@@ -217,25 +225,27 @@ def ecologic_indicators(
         "id_parameter", 61
     )
 
-    impact_on_res_targets_monetization = targets.impact_on_res_targets_monetization(
-        renewable_energy_directive_targets,
-        gross_available_energy,
-        total_primary_energy_saving,
-        cost_of_res_statistical_transfer,
-    )
+    with span("ecologic.impact_on_res_targets_monetization"):
+        impact_on_res_targets_monetization = targets.impact_on_res_targets_monetization(
+            renewable_energy_directive_targets,
+            gross_available_energy,
+            total_primary_energy_saving,
+            cost_of_res_statistical_transfer,
+        )
 
     final_energy_saving_electricity = energy_saving_by_final_energy_carrier.reduce(
         "id_final_energy_carrier", [1]
     )
     del final_energy_saving_electricity["id_final_energy_carrier"]
 
-    reduction_of_additional_capacities_in_grid = (
-        grid.reduction_of_additional_capacities_in_grid(
-            final_energy_saving_electricity,
-            data_source,
-            id_region,
+    with span("ecologic.reduction_of_additional_capacities_in_grid"):
+        reduction_of_additional_capacities_in_grid = (
+            grid.reduction_of_additional_capacities_in_grid(
+                final_energy_saving_electricity,
+                data_source,
+                id_region,
+            )
         )
-    )
 
     results = {
         "energySaving": energy_saving_table,
@@ -252,14 +262,16 @@ def ecologic_indicators(
     # Check if renewables are selected
     subsector_id = energy_produced.unique_index_values("id_subsector")[0]
     if subsector_id >= 30:
-        results["netLandUseChange"] = land_use_change(
-            energy_produced,
-            data_source,
-            interim_data["substitution_factors"],
-        )
-        results["materialDemand"] = material_demand(
-            installed_capacity,
-            data_source,
-        )
+        with span("ecologic.land_use_change"):
+            results["netLandUseChange"] = land_use_change(
+                energy_produced,
+                data_source,
+                interim_data["substitution_factors"],
+            )
+        with span("ecologic.material_demand"):
+            results["materialDemand"] = material_demand(
+                installed_capacity,
+                data_source,
+            )
 
     return results
@@ -14,6 +14,7 @@ from micat.calculation.economic import (
     production,
     renewables,
 )
+from micat.monitoring.span import span
 
 
 def economic_indicators(  # pylint: disable=too-many-locals
@@ -29,35 +30,39 @@ def economic_indicators(  # pylint: disable=too-many-locals
 ):
     total_primary_energy_saving = interim_data["total_primary_energy_saving"]
 
-    scaled_gross_available_energy = gross_available_energy.gross_available_energy(
-        data_source,
-        id_region,
-        years,
-        population_of_municipality,
-    )
+    with span("economic.gross_available_energy"):
+        scaled_gross_available_energy = gross_available_energy.gross_available_energy(
+            data_source,
+            id_region,
+            years,
+            population_of_municipality,
+        )
 
-    primary_production = production.primary_production(
-        data_source,
-        id_region,
-        years,
-    )
+    with span("economic.primary_production"):
+        primary_production = production.primary_production(
+            data_source,
+            id_region,
+            years,
+        )
 
     additional_primary_energy_saving = interim_data["additional_primary_energy_saving"]
 
     reduction_of_energy_cost = interim_data["reduction_of_energy_cost"]
 
-    reduction_of_energy_cost_by_final_energy_carrier = (
-        energy_cost.reduction_of_energy_cost_by_final_energy_carrier(
-            reduction_of_energy_cost,
+    with span("economic.reduction_of_energy_cost_by_final_energy_carrier"):
+        reduction_of_energy_cost_by_final_energy_carrier = (
+            energy_cost.reduction_of_energy_cost_by_final_energy_carrier(
+                reduction_of_energy_cost,
+            )
         )
-    )
 
-    scaled_gross_domestic_product = gross_domestic_product.gross_domestic_product(
-        data_source,
-        id_region,
-        years,
-        population_of_municipality,
-    )
+    with span("economic.gross_domestic_product"):
+        scaled_gross_domestic_product = gross_domestic_product.gross_domestic_product(
+            data_source,
+            id_region,
+            years,
+            population_of_municipality,
+        )
 
     #    scaled_gross_domestic_product_2015 = gross_domestic_product.gross_domestic_product_2015(
     #        data_source,
@@ -65,14 +70,15 @@ def economic_indicators(  # pylint: disable=too-many-locals
     #        population_of_municipality,
     #    )
 
-    impact_on_gross_domestic_product = (
-        gross_domestic_product.impact_on_gross_domestic_product(
-            final_energy_saving_or_capacities,
-            data_source,
-            id_region,
-            starting_year,
+    with span("economic.impact_on_gross_domestic_product"):
+        impact_on_gross_domestic_product = (
+            gross_domestic_product.impact_on_gross_domestic_product(
+                final_energy_saving_or_capacities,
+                data_source,
+                id_region,
+                starting_year,
+            )
         )
-    )
 
     # TO DO: use different sources for non_energy_use, depending on id_mode? #268
     # eurostat_primary_parameters = interim_data["eurostat_primary_parameters"]
@@ -86,36 +92,40 @@ def economic_indicators(  # pylint: disable=too-many-locals
     #        additional_primary_energy_saving,
     #    )
 
-    energy_intensity_difference = energy_intensity.energy_intensity_difference(
-        scaled_gross_available_energy,
-        scaled_gross_domestic_product,
-        impact_on_gross_domestic_product,
-        # primary_non_energy_use,
-        additional_primary_energy_saving,
-    )
-
-    reduction_of_import_dependency_table = (
-        import_dependency.impact_on_import_dependency(
-            total_primary_energy_saving,
-            primary_production,
+    with span("economic.energy_intensity_difference"):
+        energy_intensity_difference = energy_intensity.energy_intensity_difference(
             scaled_gross_available_energy,
+            scaled_gross_domestic_product,
+            impact_on_gross_domestic_product,
             # primary_non_energy_use,
+            additional_primary_energy_saving,
+        )
+
+    with span("economic.impact_on_import_dependency"):
+        reduction_of_import_dependency_table = (
+            import_dependency.impact_on_import_dependency(
+                total_primary_energy_saving,
+                primary_production,
+                scaled_gross_available_energy,
+                # primary_non_energy_use,
+            )
+        )
+
+    with span("economic.additional_employment"):
+        additional_employment = employment.additional_employment(
+            final_energy_saving_or_capacities,
+            data_source,
+            id_region,
+            starting_year,
+        )
+
+    with span("economic.added_asset_value_of_buildings"):
+        added_asset_value_of_buildings = buildings.added_asset_value_of_buildings(
+            reduction_of_energy_cost,
+            data_source,
+            id_region,
+            years,
         )
-    )
-
-    additional_employment = employment.additional_employment(
-        final_energy_saving_or_capacities,
-        data_source,
-        id_region,
-        starting_year,
-    )
-
-    added_asset_value_of_buildings = buildings.added_asset_value_of_buildings(
-        reduction_of_energy_cost,
-        data_source,
-        id_region,
-        years,
-    )
 
     #    change_in_unit_costs_of_production = production.change_in_unit_costs_of_production(
     #        reduction_of_energy_cost,
@@ -134,12 +144,13 @@ def economic_indicators(  # pylint: disable=too-many-locals
         "reductionOfAdditionalCapacitiesInGrid"
     ]
 
-    monetization_of_reduction_of_additional_capacities_in_grid = (
-        grid.monetization_of_reduction_of_additional_capacities_in_grid(
-            reduction_of_additional_capacities_in_grid,
-            data_source,
+    with span("economic.monetization_of_reduction_of_additional_capacities_in_grid"):
+        monetization_of_reduction_of_additional_capacities_in_grid = (
+            grid.monetization_of_reduction_of_additional_capacities_in_grid(
+                reduction_of_additional_capacities_in_grid,
+                data_source,
+            )
         )
-    )
     #
     #    change_in_supplier_diversity_by_energy_efficiency_impact = (
     #        supplier_diversity.change_in_supplier_diversity_by_energy_efficiency_impact(
@@ -167,14 +178,16 @@ def economic_indicators(  # pylint: disable=too-many-locals
         "id_subsector"
     )[0]
     if subsector_id >= 30:
-        results["supplyRiskFactor"] = renewables.supply_risk_factor(
-            installed_capacity,
-            data_source,
-        )
-        results["vreEnergySystemCosts"] = renewables.vre_energy_system_costs(
-            final_energy_saving_or_capacities,
-            data_source,
-            id_region,
-        )
+        with span("economic.supply_risk_factor"):
+            results["supplyRiskFactor"] = renewables.supply_risk_factor(
+                installed_capacity,
+                data_source,
+            )
+        with span("economic.vre_energy_system_costs"):
+            results["vreEnergySystemCosts"] = renewables.vre_energy_system_costs(
+                final_energy_saving_or_capacities,
+                data_source,
+                id_region,
+            )
 
     return results
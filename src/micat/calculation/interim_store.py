@@ -0,0 +1,39 @@
+# © 2024-2026 Fraunhofer-Gesellschaft e.V., München
+#
+# SPDX-License-Identifier: AGPL-3.0-or-later
+
+
+class InterimStore:
+    # Holds the interim tables of a calculation. Each table is released as soon as
+    # the last step that consumes it has finished, so that tables that are no longer
+    # needed do not add to the peak memory of a request.
+
+    def __init__(self, consumers):
+        # consumers maps the name of an interim table => names of the steps that use it
+        self._remaining_consumers = {name: set(steps) for name, steps in consumers.items()}
+        self._tables = {}
+
+    def put(self, name, table):
+        if name not in self._remaining_consumers:
+            raise KeyError('Interim table "' + name + '" has no consumers.')
+        self._tables[name] = table
+
+    def get(self, name):
+        if name not in self._tables:
+            message = 'Interim table "' + name + '" is not available. It has not been put or has already been released.'
+            raise KeyError(message)
+        return self._tables[name]
+
+    def finish(self, step):
+        # Releases the tables that are not needed by any remaining step and returns their names
+        released_names = []
+        for name, steps in self._remaining_consumers.items():
+            steps.discard(step)
+            if not steps and name in self._tables:
+                del self._tables[name]
+                released_names.append(name)
+        return released_names
+
+    @property
+    def names(self):
+        return list(self._tables)
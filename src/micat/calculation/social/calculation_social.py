@@ -10,6 +10,7 @@ from micat.calculation.social import (
     indoor_health,
     lost_working_days_monetization,
 )
+from micat.monitoring.span import span
 
 
 def social_indicators(
@@ -27,59 +28,68 @@ def social_indicators(
     energy_saving_by_final_energy_carrier = interim_data["energy_saving_by_final_energy_carrier"]
     reduction_of_energy_cost = interim_data["reduction_of_energy_cost"]
 
-    alleviation_of_energy_poverty_m2, alleviation_of_energy_poverty_2m = energy_poverty.alleviation_of_energy_poverty(
-        final_energy_saving_or_capacities,
-        population_of_municipality,
-        reduction_of_energy_cost,
-        data_source,
-        id_region,
-    )
-
-    reduction_of_lost_work_days_table = air_pollution.reduction_of_lost_work_days(
-        iiasa_final_subsector_parameters,
-        iiasa_final_subsector_parameters_generation,
-        energy_saving_by_final_energy_carrier,
-        heat_saving_final,
-        electricity_saving_final,
-    )
-
-    lost_working_days_monetization_table = (
-        lost_working_days_monetization.monetization_of_lost_working_days_due_to_air_pollution(
-            reduction_of_lost_work_days_table,
-            data_source,
-            id_region,
+    with span("social.alleviation_of_energy_poverty"):
+        alleviation_of_energy_poverty_m2, alleviation_of_energy_poverty_2m = (
+            energy_poverty.alleviation_of_energy_poverty(
+                final_energy_saving_or_capacities,
+                population_of_municipality,
+                reduction_of_energy_cost,
+                data_source,
+                id_region,
+            )
         )
-    )
 
-    reduction_in_disability_adjusted_life_years_table = air_quality.reduction_in_disability_adjusted_life_years(
-        final_energy_saving_or_capacities,
-        data_source,
-        id_region,
-    )
+    with span("social.reduction_of_lost_work_days"):
+        reduction_of_lost_work_days_table = air_pollution.reduction_of_lost_work_days(
+            iiasa_final_subsector_parameters,
+            iiasa_final_subsector_parameters_generation,
+            energy_saving_by_final_energy_carrier,
+            heat_saving_final,
+            electricity_saving_final,
+        )
 
-    disability_adjusted_life_years_monetization_table = (
-        health_impacts_monetization.monetization_of_health_costs_linked_to_dampness_and_mould_related_asthma_cases(
-            reduction_in_disability_adjusted_life_years_table,
-            data_source,
-            id_region,
+    with span("social.monetization_of_lost_working_days"):
+        lost_working_days_monetization_table = (
+            lost_working_days_monetization.monetization_of_lost_working_days_due_to_air_pollution(
+                reduction_of_lost_work_days_table,
+                data_source,
+                id_region,
+            )
         )
-    )
 
-    avoided_excess_cold_weather_mortality_table = (
-        indoor_health.avoided_excess_cold_weather_mortality_due_to_indoor_cold(
+    with span("social.reduction_in_disability_adjusted_life_years"):
+        reduction_in_disability_adjusted_life_years_table = air_quality.reduction_in_disability_adjusted_life_years(
             final_energy_saving_or_capacities,
             data_source,
             id_region,
         )
-    )
 
-    excess_cold_weather_mortality_monetization_table = (
-        health_impacts_monetization.monetization_of_cold_weather_mortality(
-            avoided_excess_cold_weather_mortality_table,
-            data_source,
-            id_region,
+    with span("social.monetization_of_health_costs"):
+        disability_adjusted_life_years_monetization_table = (
+            health_impacts_monetization.monetization_of_health_costs_linked_to_dampness_and_mould_related_asthma_cases(
+                reduction_in_disability_adjusted_life_years_table,
+                data_source,
+                id_region,
+            )
+        )
+
+    with span("social.avoided_excess_cold_weather_mortality"):
+        avoided_excess_cold_weather_mortality_table = (
+            indoor_health.avoided_excess_cold_weather_mortality_due_to_indoor_cold(
+                final_energy_saving_or_capacities,
+                data_source,
+                id_region,
+            )
+        )
+
+    with span("social.monetization_of_cold_weather_mortality"):
+        excess_cold_weather_mortality_monetization_table = (
+            health_impacts_monetization.monetization_of_cold_weather_mortality(
+                avoided_excess_cold_weather_mortality_table,
+                data_source,
+                id_region,
+            )
         )
-    )
 
     return {
         "alleviationOfEnergyPovertyM2": alleviation_of_energy_poverty_m2,
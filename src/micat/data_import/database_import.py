@@ -5,16 +5,30 @@
 import math
 import os
 import sqlite3
-import subprocess
+import time
 
 import pandas as pd
 
+from micat.data_import import import_metadata, import_orchestrator
+from micat.data_import.import_orchestrator import ImportOrchestrator
 from micat.data_import.table_validator import TableValidator
 from micat.input.database import Database
 from micat.log.logger import Logger
 from micat.table.mapping_table import MappingTable
 from micat.utils import file as file_utils
 
+# Settings of the connection that writes a table with write_to_sqlite. The journal is
+# kept in memory and the writes are not synced to disk while a table is loaded. If the
+# import fails or is interrupted, the database might be corrupt. Therefore, the next
+# import runs all scripts, which recreates the database, see ImportMetadata.begin_run.
+# A negative cache size is given in KiB.
+_BULK_WRITE_PRAGMAS = [
+    "PRAGMA foreign_keys = ON",
+    "PRAGMA journal_mode = MEMORY",
+    "PRAGMA synchronous = OFF",
+    "PRAGMA cache_size = -262144",
+]
+
 
 class DatabaseImport:
     def __init__(self, database_path, validation_database_path=None):
@@ -30,36 +44,19 @@ class DatabaseImport:
         src_path,
         path_to_import_scripts=None,
         excluded_scripts=None,
+        number_of_workers=None,
+        metadata=None,
     ):
+        # Independent scripts are run in parallel processes, see ImportOrchestrator.
+        # If an ImportMetadata is given, scripts with unchanged inputs are skipped.
+        # Returns the durations of the scripts in seconds by script name.
         if path_to_import_scripts is None:
             path_to_import_scripts = os.getcwd()
         Logger.info(f"# Running import scripts in folder {path_to_import_scripts}")
 
         file_names = DatabaseImport._file_names(excluded_scripts, path_to_import_scripts)
-
-        env = os.environ.copy()
-        env["PYTHONPATH"] = src_path
-
-        for file_name in file_names:
-            Logger.info(
-                "## Running file "
-                + str(file_names.index(file_name) + 1)
-                + " of "
-                + str(len(file_names))
-                + ": "
-                + file_name
-            )
-
-            result = subprocess.run(
-                "python " + file_name,
-                shell=True,
-                check=False,
-                cwd=path_to_import_scripts,
-                env=env,
-            )
-            if result.returncode != 0:
-                message = f"Script {file_name} failed with return code {result.returncode}"
-                raise RuntimeError(message)
+        orchestrator = ImportOrchestrator(src_path, file_names, number_of_workers, metadata)
+        return orchestrator.run()
 
     @staticmethod
     def _file_names(excluded_scripts, path_to_import_scripts):
@@ -149,8 +146,10 @@ class DatabaseImport:
         }
         self._table_validator.validate(table, details)
         self._check_if_table_exists(table_name)
-        with sqlite3.connect(self._database_path) as connection:
+        with import_orchestrator.serialized_write(), sqlite3.connect(self._database_path) as connection:
             table.to_sql(table_name, connection, index_label="id", if_exists="append")
+            # the content of the table is not known anymore, see _bulk_write
+            import_metadata.delete_hash(connection, "table", table_name)
 
     def import_id_table(
         self,
@@ -169,7 +168,7 @@ class DatabaseImport:
             Logger.error("Table " + table_name + " at " + directory_or_database + " contains NaN labels.")
             raise exception
 
-        with sqlite3.connect(self._database_path) as target_connection:
+        with import_orchestrator.serialized_write(), sqlite3.connect(self._database_path) as target_connection:
             target_cursor = target_connection.cursor()
             self._delete_table_if_exists(table_name, target_cursor)
 
@@ -213,7 +212,7 @@ class DatabaseImport:
             data_directory,
         )
 
-        with sqlite3.connect(self._database_path) as target_connection:
+        with import_orchestrator.serialized_write(), sqlite3.connect(self._database_path) as target_connection:
             target_cursor = target_connection.cursor()
 
             self._delete_table_if_exists(target_table_name, target_cursor)
@@ -254,10 +253,8 @@ class DatabaseImport:
             self._table_validator.validate(sorted_table, details)  # to be solved
         except AttributeError:
             pass
-        with sqlite3.connect(self._database_path) as connection:
-            DatabaseImport._recreate_data_table(table_name, sorted_table, connection)
-            # hint: to_sql must not use if_exists='replace' but 'append'; otherwise table structure is lost
-            sorted_table.to_sql(table_name, connection, index_label="id", if_exists="append")
+        with import_orchestrator.serialized_write(), sqlite3.connect(self._database_path) as connection:
+            DatabaseImport._bulk_write(table_name, sorted_table, connection)
 
     @staticmethod
     def _check_labels(df):
@@ -388,8 +385,74 @@ class DatabaseImport:
         df = df[[source_column_name, target_id_name]]
         return MappingTable(df, table_name)
 
+    @staticmethod
+    def _bulk_write(table_name, table, connection):
+        # Recreates the table and inserts all rows with a single prepared statement in a
+        # single transaction. The unique index of the id columns is created after the rows
+        # have been inserted, which is faster than updating the index for each row.
+        # If the table already contains the same data, it is not rewritten, see
+        # micat.data_import.import_metadata. Returns the number of written rows.
+        start_time = time.monotonic()
+        id_column_names, _year_column_names, _value_column_names = table.column_names
+        data_frame = table.to_data_frame().reset_index()
+        content_hash = import_metadata.data_frame_hash(data_frame)
+        if import_metadata.table_exists(connection, table_name):
+            if import_metadata.stored_hash(connection, "table", table_name) == content_hash:
+                Logger.info("Table " + table_name + " did not change")
+                return 0
+        cursor = connection.cursor()
+        for pragma in _BULK_WRITE_PRAGMAS:
+            cursor.execute(pragma)
+        cursor.execute("BEGIN")
+        DatabaseImport._recreate_data_table(table_name, table, connection)
+        insert_query, rows = DatabaseImport._insert_query_and_rows(table_name, data_frame)
+        cursor.executemany(insert_query, rows)
+        try:
+            DatabaseImport._create_key_index(table_name, id_column_names, cursor)
+        except sqlite3.IntegrityError as error:
+            duplicated = data_frame[data_frame.duplicated(subset=id_column_names, keep=False)]
+            Logger.warn("!! Duplicate entries in index !!")
+            Logger.warn(duplicated)
+            raise error
+        import_metadata.store_hash(connection, "table", table_name, content_hash)
+        connection.commit()
+
+        duration_in_seconds = max(time.monotonic() - start_time, 1e-6)
+        number_of_rows = len(data_frame)
+        rows_per_second = number_of_rows / duration_in_seconds
+        Logger.info(
+            f"Wrote {number_of_rows} rows to table {table_name} in {duration_in_seconds:.2f} s "
+            + f"({rows_per_second:.0f} rows/s)"
+        )
+        return number_of_rows
+
+    @staticmethod
+    def _create_key_index(table_name, id_column_names, cursor):
+        index_query = (
+            "CREATE UNIQUE INDEX `" + table_name + "__key` ON `" + table_name + "` (" + ", ".join(id_column_names) + ")"
+        )
+        cursor.execute(index_query)
+
+    @staticmethod
+    def _insert_query_and_rows(table_name, data_frame):
+        # The ids are the row numbers, as written by pandas to_sql with index_label="id"
+        column_names = [str(column_name) for column_name in data_frame.columns]
+        quoted_column_names = ["`" + column_name + "`" for column_name in column_names]
+        if "id" in column_names:
+            rows = data_frame.itertuples(index=False, name=None)
+        else:
+            quoted_column_names.insert(0, "id")
+            rows = ((row_id,) + values for row_id, values in enumerate(data_frame.itertuples(index=False, name=None)))
+        placeholders = ", ".join("?" for _ in quoted_column_names)
+        insert_query = (
+            "INSERT INTO `" + table_name + "` (" + ", ".join(quoted_column_names) + ") VALUES (" + placeholders + ")"
+        )
+        return insert_query, rows
+
     @staticmethod
     def _recreate_data_table(table_name, table, connection):
+        # The unique index of the id columns is created after the rows have been
+        # inserted, see _create_key_index
         id_column_names, year_column_names, value_column_names = table.column_names
 
         cursor = connection.cursor()
@@ -397,24 +460,21 @@ class DatabaseImport:
         delete_query = "DROP TABLE IF EXISTS `" + table_name + "`"
         cursor.execute(delete_query)
 
-        create_query = "CREATE TABLE `" + table_name + "` (" + "id integer PRIMARY KEY NOT NULL, "
+        column_definitions = ["id integer PRIMARY KEY NOT NULL"]
 
         for column_name in id_column_names:
-            create_query += column_name + " integer NOT NULL, "
+            column_definitions.append(column_name + " integer NOT NULL")
 
         for column_name in year_column_names:
-            create_query += "`" + str(column_name) + "` real NOT NULL, "
+            column_definitions.append("`" + str(column_name) + "` real NOT NULL")
 
         for column_name in value_column_names:
-            create_query += "`" + str(column_name) + "` real NOT NULL, "
+            column_definitions.append("`" + str(column_name) + "` real NOT NULL")
 
         for column_name in id_column_names:
-            create_query += "FOREIGN KEY (" + column_name + ") REFERENCES " + column_name + "(id), "
+            column_definitions.append("FOREIGN KEY (" + column_name + ") REFERENCES " + column_name + "(id)")
 
-        key_column_names = id_column_names  # table.key_column_names
-        create_query += "UNIQUE (" + ", ".join(key_column_names) + ")"
-
-        create_query += ")"
+        create_query = "CREATE TABLE `" + table_name + "` (" + ", ".join(column_definitions) + ")"
 
         cursor.execute(create_query)
 
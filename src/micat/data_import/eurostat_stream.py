@@ -0,0 +1,162 @@
+# © 2024-2026 Fraunhofer-Gesellschaft e.V., München
+#
+# SPDX-License-Identifier: AGPL-3.0-or-later
+
+# Streaming download and parsing of the Eurostat bulk data, see
+# import/d_download_and_import_eurostat_data.py
+#
+# * DownloadCache keeps the downloaded files in a local folder and only downloads them
+#   again if they changed on the server (conditional requests with ETag and Last-Modified).
+# * stage decompresses a gzipped TSV file line by line, filters the rows while parsing and
+#   writes the filtered rows chunk by chunk to a table of a staging database. As long as
+#   the file and the filter do not change, the table is reused without parsing the file again.
+# * read_staged reads the filtered rows as data frame.
+
+import contextlib
+import gzip
+import hashlib
+import json
+import os
+import sqlite3
+
+import pandas as pd
+import requests
+
+from micat.data_import import import_metadata
+from micat.log.logger import Logger
+
+_NAN_VALUES = {"", "NaN"}
+
+
+class DownloadCache:
+    def __init__(self, folder, is_offline=False):
+        self._folder = folder
+        # If True, only the files in the folder are used; nothing is downloaded
+        self._is_offline = is_offline
+
+    def fetch(self, url, file_name, headers=None, timeout=None):
+        # Returns the path of the cached file after downloading it if it changed
+        file_path = os.path.join(self._folder, file_name)
+        if self._is_offline:
+            if not os.path.exists(file_path):
+                raise FileNotFoundError("Could not find cached download " + file_path)
+            return file_path
+
+        validators_path = file_path + ".validators.json"
+        request_headers = dict(headers or {})
+        if os.path.exists(file_path):
+            request_headers.update(_conditional_headers(validators_path))
+
+        with requests.get(url, headers=request_headers, stream=True, allow_redirects=True, timeout=timeout) as response:
+            if response.status_code == 304:
+                Logger.info("Using cached download " + file_path)
+                return file_path
+            response.raise_for_status()
+            temporary_file_path = file_path + ".part"
+            with open(temporary_file_path, "wb") as file:
+                for chunk in response.iter_content(chunk_size=1024 * 1024):
+                    file.write(chunk)
+            os.replace(temporary_file_path, file_path)
+            _write_validators(validators_path, response.headers)
+        return file_path
+
+
+def filtered_chunks(zip_file_path, row_filter=None, chunk_size=100000):
+    # Decompresses the file incrementally and yields data frames with at most chunk_size rows
+    # that match the filter, e.g. {"freq": "A", "unit": "KTOE"}. All values are strings;
+    # missing values are None. At least one (maybe empty) data frame is yielded.
+    with gzip.open(zip_file_path, "rt", encoding="utf8") as file:
+        column_names = _fields(next(file))
+        column_names = ["geo" if column_name == "geo\\TIME_PERIOD" else column_name for column_name in column_names]
+        filter_positions = [(column_names.index(name), value) for name, value in (row_filter or {}).items()]
+        rows = []
+        is_yielded = False
+        for line in file:
+            fields = _fields(line)
+            if all(fields[position] == value for position, value in filter_positions):
+                rows.append([None if field in _NAN_VALUES else field for field in fields])
+            if len(rows) >= chunk_size:
+                yield pd.DataFrame(rows, columns=column_names)
+                is_yielded = True
+                rows = []
+        if rows or not is_yielded:
+            yield pd.DataFrame(rows, columns=column_names)
+
+
+def stage(zip_file_path, staging_database_path, table_name, row_filter=None, chunk_size=100000):
+    # Writes the filtered rows of the file to a table of the staging database and returns
+    # True if the file has been parsed, False if the staged table has been reused.
+    signature = _signature(zip_file_path, row_filter)
+    with contextlib.closing(sqlite3.connect(staging_database_path)) as connection, connection:
+        is_staged = import_metadata.table_exists(connection, table_name)
+        if is_staged and import_metadata.stored_hash(connection, "staging", table_name) == signature:
+            Logger.info("Using staged table " + table_name)
+            return False
+        connection.execute("DROP TABLE IF EXISTS `" + table_name + "`")
+        number_of_rows = 0
+        for chunk in filtered_chunks(zip_file_path, row_filter, chunk_size):
+            chunk.to_sql(table_name, connection, index=False, if_exists="append", dtype="text")
+            number_of_rows += len(chunk)
+        import_metadata.store_hash(connection, "staging", table_name, signature)
+    Logger.info(f"Staged {number_of_rows} rows of {zip_file_path} in table {table_name}")
+    return True
+
+
+def read_staged(staging_database_path, table_name):
+    # Returns the staged rows with the column types that pandas.read_csv would infer
+    # for the filtered rows
+    with contextlib.closing(sqlite3.connect(staging_database_path)) as connection:
+        data_frame = pd.read_sql_query("SELECT * FROM `" + table_name + "` ORDER BY rowid", connection)
+    for column_name in data_frame.columns:
+        try:
+            data_frame[column_name] = pd.to_numeric(data_frame[column_name])
+        except (ValueError, TypeError):
+            pass
+    return data_frame
+
+
+def _conditional_headers(validators_path):
+    if not os.path.exists(validators_path):
+        return {}
+    with open(validators_path, encoding="utf-8") as file:
+        validators = json.load(file)
+    headers = {}
+    if "ETag" in validators:
+        headers["If-None-Match"] = validators["ETag"]
+    if "Last-Modified" in validators:
+        headers["If-Modified-Since"] = validators["Last-Modified"]
+    return headers
+
+
+def _fields(line):
+    # The format of the tsv files is special because it does not only use tabs
+    # as separators but also commas and spaces. Each data column entry can be a pair
+    # of a value and a flag, separated by a space. If no flag is present, the entry
+    # ends with a space. Also see documentation of the data format at
+    # https://ec.europa.eu/eurostat/estat-navtree-portlet-prod/BulkDownloadListing?file=BulkDownload_Guidelines.pdf
+    # https://ec.europa.eu/eurostat/data/database/information
+    # https://ec.europa.eu/eurostat/statistics-explained/index.php/Tutorial:Symbols_and_abbreviations
+    transformed_line = (
+        line.rstrip("\r\n")
+        .replace(",", "\t")
+        .replace(" \t", "\t")
+        .replace(" ", "")
+        .replace(":z", "NaN")
+        .replace(":", "NaN")
+    )
+    return transformed_line.split("\t")
+
+
+def _signature(zip_file_path, row_filter):
+    digest = hashlib.sha256()
+    digest.update(json.dumps(row_filter or {}, sort_keys=True).encode("utf-8"))
+    with open(zip_file_path, "rb") as file:
+        for chunk in iter(lambda: file.read(1024 * 1024), b""):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+def _write_validators(validators_path, response_headers):
+    validators = {name: response_headers[name] for name in ["ETag", "Last-Modified"] if name in response_headers}
+    with open(validators_path, "w", encoding="utf-8") as file:
+        json.dump(validators, file)
@@ -0,0 +1,252 @@
+# © 2024-2026 Fraunhofer-Gesellschaft e.V., München
+#
+# SPDX-License-Identifier: AGPL-3.0-or-later
+
+# Content hashes for the incremental re-import. The hashes are stored in the table
+# import_metadata of the imported database, with one of the following kinds:
+#
+# * "table": hash of the data that has been written to a table with
+#   DatabaseImport.write_to_sqlite. A table is only rewritten if the hash of its data changes.
+# * "script_input": hash of an import script, the source of the modules it imports from the
+#   micat package and from the folder of the script (directly or indirectly), its raw input
+#   files and the tables it reads
+# * "script_output": hash of the tables an import script has written
+#
+# The raw input files of an import script are declared with a module level list of
+# glob patterns, relative to the raw data folder, for example
+#
+# RAW_INPUTS = ["primes/**"]
+#
+# The ImportOrchestrator skips a script if the hash of its inputs and the hash of its
+# outputs did not change since its last run. Scripts without RAW_INPUTS, e.g. scripts that
+# download their data, are always run. If the database is recreated, its metadata is lost
+# and all scripts are run again.
+# While an import is running, a marker file exists next to the database, see begin_run.
+# If a run failed or has been interrupted, the database might be incomplete or even corrupt
+# (see _BULK_WRITE_PRAGMAS in micat.data_import.database_import). Then, the marker file
+# still exists and the stored hashes are ignored by the next run, so that all scripts are run.
+# As unchanged tables are not rewritten, the fingerprint of the database (see
+# Database.fingerprint) only changes if some data changes.
+
+import ast
+import contextlib
+import fnmatch
+import glob
+import hashlib
+import os
+import sqlite3
+
+import pandas as pd
+
+from micat.log.logger import Logger
+
+METADATA_TABLE_NAME = "import_metadata"
+
+# folder that includes the micat package
+_SRC_PATH = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+
+class ImportMetadata:
+    def __init__(self, database_path, raw_data_path):
+        self._database_path = database_path
+        self._raw_data_path = raw_data_path
+        # source file path => paths of the imported source files, see _imported_file_paths
+        self._imported_file_paths_by_path = {}
+        self._marker_file_path = database_path + ".import-running"
+        # True if the previous run did not finish successfully
+        self._is_invalidated = False
+
+    def begin_run(self):
+        self._is_invalidated = os.path.exists(self._marker_file_path)
+        if self._is_invalidated:
+            Logger.warn("The previous import did not finish successfully; running all import scripts.")
+        with open(self._marker_file_path, "w", encoding="utf-8"):
+            pass
+
+    def finish_run(self):
+        # Is only called if all scripts succeeded
+        if os.path.exists(self._marker_file_path):
+            os.remove(self._marker_file_path)
+
+    def input_hash(self, script):
+        # Returns None if the script does not declare its raw inputs
+        if script.raw_inputs is None:
+            return None
+        digest = hashlib.sha256()
+        for file_path in self._source_file_paths(script.file_path):
+            digest.update(os.path.basename(file_path).encode("utf-8"))
+            _update_with_file(digest, file_path)
+        for file_path in self._raw_input_file_paths(script.raw_inputs):
+            relative_path = os.path.relpath(file_path, self._raw_data_path)
+            digest.update(relative_path.encode("utf-8"))
+            _update_with_file(digest, file_path)
+        digest.update(self._tables_hash(script.reads).encode("utf-8"))
+        return digest.hexdigest()
+
+    def output_hash(self, script):
+        # Only includes the tables that are declared with their explicit names;
+        # wildcards such as ["*"] are used to determine the order of the scripts.
+        table_names = [table_name for table_name in script.writes if not _is_pattern(table_name)]
+        return self._tables_hash(table_names)
+
+    def is_up_to_date(self, script, input_hash):
+        if input_hash is None or self._is_invalidated:
+            return False
+        if not os.path.exists(self._database_path):
+            return False
+        with contextlib.closing(sqlite3.connect(self._database_path)) as connection:
+            if stored_hash(connection, "script_input", script.name) != input_hash:
+                return False
+            output_hash = stored_hash(connection, "script_output", script.name)
+        return output_hash == self.output_hash(script)
+
+    def store(self, script, input_hash):
+        # Stores the hashes after a successful run of the script. Unchanged hashes are not
+        # written again, so that the database file is not modified.
+        if input_hash is None:
+            return
+        output_hash = self.output_hash(script)
+        with contextlib.closing(sqlite3.connect(self._database_path)) as connection, connection:
+            store_hash(connection, "script_input", script.name, input_hash)
+            store_hash(connection, "script_output", script.name, output_hash)
+
+    def _source_file_paths(self, script_file_path):
+        # Returns the path of the script and the paths of the modules that it imports,
+        # directly or indirectly, from the folder of the script or from the micat package.
+        # Modules of other packages, e.g. pandas, are not included.
+        folders = [os.path.dirname(os.path.abspath(script_file_path)), _SRC_PATH]
+        file_paths = set()
+        pending_file_paths = [os.path.abspath(script_file_path)]
+        while pending_file_paths:
+            file_path = pending_file_paths.pop()
+            if file_path in file_paths:
+                continue
+            file_paths.add(file_path)
+            pending_file_paths += self._imported_file_paths(file_path, folders)
+        return sorted(file_paths)
+
+    def _imported_file_paths(self, file_path, folders):
+        if file_path not in self._imported_file_paths_by_path:
+            imported_file_paths = []
+            for module_name in _imported_module_names(file_path):
+                module_file_path = _module_file_path(module_name, folders)
+                if module_file_path is not None:
+                    imported_file_paths.append(module_file_path)
+            self._imported_file_paths_by_path[file_path] = imported_file_paths
+        return self._imported_file_paths_by_path[file_path]
+
+    def _raw_input_file_paths(self, patterns):
+        file_paths = set()
+        for pattern in patterns:
+            for file_path in glob.glob(os.path.join(self._raw_data_path, pattern), recursive=True):
+                if os.path.isfile(file_path):
+                    file_paths.add(file_path)
+        return sorted(file_paths)
+
+    def _tables_hash(self, table_name_patterns):
+        digest = hashlib.sha256()
+        if not os.path.exists(self._database_path):
+            return digest.hexdigest()
+        with contextlib.closing(sqlite3.connect(self._database_path)) as connection:
+            for table_name in _matching_table_names(connection, table_name_patterns):
+                digest.update(table_name.encode("utf-8"))
+                cursor = connection.execute("SELECT * FROM `" + table_name + "` ORDER BY rowid")
+                column_names = [description[0] for description in cursor.description]
+                digest.update(repr(column_names).encode("utf-8"))
+                for row in cursor:
+                    digest.update(repr(row).encode("utf-8"))
+        return digest.hexdigest()
+
+
+def data_frame_hash(data_frame):
+    digest = hashlib.sha256()
+    column_names = [str(column_name) for column_name in data_frame.columns]
+    digest.update(repr(column_names).encode("utf-8"))
+    digest.update(pd.util.hash_pandas_object(data_frame, index=False).values.tobytes())
+    return digest.hexdigest()
+
+
+def delete_hash(connection, kind, name):
+    if not table_exists(connection, METADATA_TABLE_NAME):
+        return
+    connection.execute("DELETE FROM " + METADATA_TABLE_NAME + " WHERE kind = ? AND name = ?", (kind, name))
+
+
+def store_hash(connection, kind, name, hash_value):
+    if stored_hash(connection, kind, name) == hash_value:
+        return
+    connection.execute(
+        "CREATE TABLE IF NOT EXISTS "
+        + METADATA_TABLE_NAME
+        + " (kind text NOT NULL, name text NOT NULL, hash text NOT NULL, PRIMARY KEY (kind, name))"
+    )
+    connection.execute(
+        "INSERT OR REPLACE INTO " + METADATA_TABLE_NAME + " (kind, name, hash) VALUES (?, ?, ?)",
+        (kind, name, hash_value),
+    )
+
+
+def stored_hash(connection, kind, name):
+    if not table_exists(connection, METADATA_TABLE_NAME):
+        return None
+    row = connection.execute(
+        "SELECT hash FROM " + METADATA_TABLE_NAME + " WHERE kind = ? AND name = ?",
+        (kind, name),
+    ).fetchone()
+    if row is None:
+        return None
+    return row[0]
+
+
+def table_exists(connection, table_name):
+    row = connection.execute(
+        "SELECT name FROM sqlite_master WHERE type='table' AND name = ?",
+        (table_name,),
+    ).fetchone()
+    return row is not None
+
+
+def _imported_module_names(file_path):
+    # For "from a.b import c", c might be a module or an attribute of the module a.b;
+    # both are included. Relative imports are not used in this project.
+    with open(file_path, encoding="utf-8") as file:
+        module = ast.parse(file.read(), filename=file_path)
+    module_names = []
+    for node in ast.walk(module):
+        if isinstance(node, ast.Import):
+            module_names += [alias.name for alias in node.names]
+        elif isinstance(node, ast.ImportFrom) and node.level == 0 and node.module is not None:
+            module_names.append(node.module)
+            module_names += [node.module + "." + alias.name for alias in node.names]
+    return module_names
+
+
+def _module_file_path(module_name, folders):
+    # Returns None if the module is not part of the given folders
+    relative_path = os.path.join(*module_name.split("."))
+    for folder in folders:
+        for file_path in [relative_path + ".py", os.path.join(relative_path, "__init__.py")]:
+            absolute_file_path = os.path.join(folder, file_path)
+            if os.path.isfile(absolute_file_path):
+                return absolute_file_path
+    return None
+
+
+def _is_pattern(table_name):
+    return any(character in table_name for character in "*?[")
+
+
+def _matching_table_names(connection, table_name_patterns):
+    rows = connection.execute("SELECT name FROM sqlite_master WHERE type='table' ORDER BY name").fetchall()
+    table_names = [row[0] for row in rows if row[0] != METADATA_TABLE_NAME]
+    return [
+        table_name
+        for table_name in table_names
+        if any(fnmatch.fnmatchcase(table_name, pattern) for pattern in table_name_patterns)
+    ]
+
+
+def _update_with_file(digest, file_path, chunk_size=1024 * 1024):
+    with open(file_path, "rb") as file:
+        for chunk in iter(lambda: file.read(chunk_size), b""):
+            digest.update(chunk)
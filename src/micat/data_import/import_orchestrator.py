@@ -0,0 +1,258 @@
+# © 2024-2026 Fraunhofer-Gesellschaft e.V., München
+#
+# SPDX-License-Identifier: AGPL-3.0-or-later
+
+# Runs the import scripts of a folder in parallel processes, in the order given by
+# the tables they read and write. Each script declares these tables with module level
+# lists of table names, for example
+#
+# READS = ["id_region", "eurostat_final_energy_consumption"]
+# WRITES = ["mixed_final_constant_parameters"]
+#
+# Table names may include wildcards, e.g. ["*"] for a script that reads all tables.
+# A script depends on a previous script (in alphabetical order) if it reads a table
+# that the previous script writes or if it writes a table that the previous script
+# reads or writes. Scripts without declarations depend on all previous scripts and all
+# following scripts depend on them, as if the scripts were run sequentially.
+# The writes to the database are serialized with a lock that is shared by the worker
+# processes, see serialized_write.
+# If an ImportMetadata is given, scripts whose inputs and outputs did not change since
+# their last run are skipped, see micat.data_import.import_metadata.
+
+import ast
+import contextlib
+import fnmatch
+import multiprocessing
+import os
+import runpy
+import sys
+import time
+import traceback
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, wait
+
+from micat.log.logger import Logger
+
+# lock of the worker process, see _initialize_worker
+_write_lock = None
+
+
+@contextlib.contextmanager
+def serialized_write():
+    # Serializes the writes of the import scripts that run in parallel. Outside of
+    # the worker processes of the orchestrator, there is nothing to serialize.
+    if _write_lock is None:
+        yield
+        return
+    with _write_lock:
+        yield
+
+
+class ImportScript:
+    def __init__(self, file_path, reads, writes, raw_inputs=None):
+        self.file_path = file_path
+        self.name = os.path.basename(file_path)
+        self.reads = reads
+        self.writes = writes
+        # glob patterns of the raw input files, None if not declared
+        self.raw_inputs = raw_inputs
+
+    @staticmethod
+    def from_file(file_path):
+        declarations = _module_level_lists(file_path, ["READS", "WRITES", "RAW_INPUTS"])
+        raw_inputs = declarations.get("RAW_INPUTS")
+        if "READS" not in declarations or "WRITES" not in declarations:
+            Logger.warn("Import script " + file_path + " does not declare READS and WRITES; running it exclusively.")
+            return ImportScript(file_path, ["*"], ["*"], raw_inputs)
+        return ImportScript(file_path, declarations["READS"], declarations["WRITES"], raw_inputs)
+
+    def depends_on(self, previous_script):
+        if _overlaps(self.reads, previous_script.writes):
+            return True
+        return _overlaps(self.writes, previous_script.reads + previous_script.writes)
+
+
+class ImportOrchestrator:
+    def __init__(self, src_path, file_paths, number_of_workers=None, import_metadata=None):
+        self._src_path = src_path
+        self._import_metadata = import_metadata
+        self._scripts = [ImportScript.from_file(file_path) for file_path in file_paths]
+        self._number_of_workers = number_of_workers or os.cpu_count()
+        self._dependencies = self._determine_dependencies()
+
+    def dependencies(self):
+        # name of script => names of the scripts that have to finish before it can start
+        return {
+            script.name: [dependency.name for dependency in self._dependencies[script.name]] for script in self._scripts
+        }
+
+    def run(self):
+        # Runs the scripts and returns their durations in seconds by script name;
+        # skipped scripts are not included.
+        # If a script fails, the scripts that depend on it are not started and
+        # a RuntimeError is raised after the running scripts have finished.
+        start_time = time.monotonic()
+        durations = {}
+        failures = {}
+        finished_names = set()
+        skipped_names = []
+        input_hashes = {}
+        pending = list(self._scripts)
+        running = {}
+        context = multiprocessing.get_context("spawn")
+        write_lock = context.Lock()
+        if self._import_metadata is not None:
+            self._import_metadata.begin_run()
+        with ProcessPoolExecutor(
+            max_workers=self._number_of_workers,
+            mp_context=context,
+            initializer=_initialize_worker,
+            initargs=(write_lock, self._src_path),
+            max_tasks_per_child=1,
+        ) as executor:
+            while pending or running:
+                if not failures:
+                    for script in self._skip_unchanged_scripts(pending, finished_names, input_hashes, write_lock):
+                        skipped_names.append(script.name)
+                    for script in self._startable_scripts(pending, running, finished_names):
+                        Logger.info("## Starting " + script.name)
+                        future = executor.submit(_run_script, script.file_path)
+                        running[future] = script
+                        pending.remove(script)
+                if not running:
+                    break
+                finished, _ = wait(running, return_when=FIRST_COMPLETED)
+                for future in finished:
+                    script = running.pop(future)
+                    try:
+                        durations[script.name] = future.result()
+                        Logger.info(f"## Finished {script.name} in {durations[script.name]:.1f} s")
+                        self._store_hashes(script, input_hashes, write_lock)
+                        finished_names.add(script.name)
+                    except Exception as exception:  # pylint: disable=broad-except
+                        failures[script.name] = exception
+                        Logger.error("## Script " + script.name + " failed: " + str(exception))
+
+        total_duration = time.monotonic() - start_time
+        Logger.info(self.report(durations, total_duration, skipped_names))
+        if failures:
+            not_started_names = [script.name for script in pending]
+            message = "Import scripts failed: " + ", ".join(failures)
+            if not_started_names:
+                message += "; not started: " + ", ".join(not_started_names)
+            raise RuntimeError(message)
+        if self._import_metadata is not None:
+            self._import_metadata.finish_run()
+        return durations
+
+    @staticmethod
+    def report(durations, total_duration, skipped_names=()):
+        lines = ["# Durations of import scripts"]
+        for name, duration in sorted(durations.items(), key=lambda item: item[1], reverse=True):
+            lines.append(f"{name:<50} {duration:>10.1f} s")
+        for name in skipped_names:
+            lines.append(f"{name:<50} {'skipped':>12}")
+        lines.append(f"{'sum of script durations':<50} {sum(durations.values()):>10.1f} s")
+        lines.append(f"{'total (parallel)':<50} {total_duration:>10.1f} s")
+        return "\n".join(lines)
+
+    def _determine_dependencies(self):
+        dependencies = {}
+        for index, script in enumerate(self._scripts):
+            previous_scripts = self._scripts[:index]
+            dependencies[script.name] = [
+                previous_script for previous_script in previous_scripts if script.depends_on(previous_script)
+            ]
+        return dependencies
+
+    def _ready_scripts(self, pending, finished_names):
+        ready_scripts = []
+        for script in pending:
+            dependencies = self._dependencies[script.name]
+            if all(dependency.name in finished_names for dependency in dependencies):
+                ready_scripts.append(script)
+        return ready_scripts
+
+    def _skip_unchanged_scripts(self, pending, finished_names, input_hashes, write_lock):
+        # Removes the ready scripts with unchanged inputs and outputs from pending and
+        # returns them. The inputs of a ready script do not change anymore, because the
+        # scripts that write them have finished. Skipping a script might make further
+        # scripts ready.
+        skipped_scripts = []
+        if self._import_metadata is None:
+            return skipped_scripts
+        is_changed = True
+        while is_changed:
+            is_changed = False
+            for script in self._ready_scripts(pending, finished_names):
+                if script.name in input_hashes:
+                    continue
+                with write_lock:
+                    input_hash = self._import_metadata.input_hash(script)
+                    is_up_to_date = self._import_metadata.is_up_to_date(script, input_hash)
+                input_hashes[script.name] = input_hash
+                if is_up_to_date:
+                    Logger.info("## Skipping " + script.name + " because its inputs did not change")
+                    pending.remove(script)
+                    finished_names.add(script.name)
+                    skipped_scripts.append(script)
+                    is_changed = True
+        return skipped_scripts
+
+    def _startable_scripts(self, pending, running, finished_names):
+        ready_scripts = self._ready_scripts(pending, finished_names)
+        number_of_free_workers = self._number_of_workers - len(running)
+        return ready_scripts[:number_of_free_workers]
+
+    def _store_hashes(self, script, input_hashes, write_lock):
+        if self._import_metadata is None:
+            return
+        with write_lock:
+            self._import_metadata.store(script, input_hashes.get(script.name))
+
+
+def _initialize_worker(write_lock, src_path):
+    global _write_lock  # pylint: disable=global-statement
+    _write_lock = write_lock
+    if src_path not in sys.path:
+        sys.path.insert(0, src_path)
+
+
+def _run_script(file_path):
+    # Runs the script like "python file_path" in its folder and returns its duration
+    folder = os.path.dirname(os.path.abspath(file_path))
+    os.chdir(folder)
+    sys.path.insert(0, folder)
+    # the command line of the worker process must not be parsed by the script
+    sys.argv = [file_path]
+    start_time = time.monotonic()
+    try:
+        runpy.run_path(file_path, run_name="__main__")
+    except SystemExit as exit_exception:
+        if exit_exception.code not in (None, 0):
+            raise RuntimeError(f"Script {file_path} exited with code {exit_exception.code}") from None
+    except Exception:  # pylint: disable=broad-except
+        # the exception of the script is not necessarily picklable
+        raise RuntimeError(f"Script {file_path} failed:\n{traceback.format_exc()}") from None
+    return time.monotonic() - start_time
+
+
+def _module_level_lists(file_path, names):
+    # Reads module level assignments of literal lists without executing the script
+    with open(file_path, encoding="utf-8") as file:
+        module = ast.parse(file.read(), filename=file_path)
+    lists = {}
+    for node in module.body:
+        if not isinstance(node, ast.Assign):
+            continue
+        for target in node.targets:
+            if isinstance(target, ast.Name) and target.id in names:
+                lists[target.id] = list(ast.literal_eval(node.value))
+    return lists
+
+
+def _overlaps(table_names, other_table_names):
+    for table_name in table_names:
+        for other_table_name in other_table_names:
+            if fnmatch.fnmatchcase(table_name, other_table_name) or fnmatch.fnmatchcase(other_table_name, table_name):
+                return True
+    return False
@@ -0,0 +1,125 @@
+# © 2024-2026 Fraunhofer-Gesellschaft e.V., München
+#
+# SPDX-License-Identifier: AGPL-3.0-or-later
+
+# Writes stored results of /indicator_data (see ResultStore) as Excel, CSV or Parquet file.
+# The stored JSON maps the name of each indicator to a table in the row format
+# (Table.to_custom_json) or in the columnar format (Table.to_columnar_json).
+# The Excel file includes a sheet for each indicator. The CSV and Parquet files
+# include a single long table with the columns indicator, id columns, year and value.
+
+import base64
+import json
+
+import numpy as np
+import pandas as pd
+import xlsxwriter
+
+from micat.export.results_export import NUMBER_FORMAT, XLSX_MIME_TYPE
+
+MIME_TYPES = {
+    "xlsx": XLSX_MIME_TYPE,
+    "csv": "text/csv",
+    "parquet": "application/vnd.apache.parquet",
+}
+
+# maximum length of the name of an Excel worksheet
+MAX_SHEET_NAME_LENGTH = 31
+
+
+def write_result_tables(json_string, export_format, output):
+    # Writes the stored results to the binary file object output. Raises a
+    # ValueError for unknown formats and an ImportError if Parquet is requested
+    # and no Parquet engine (pyarrow or fastparquet) is installed.
+    if export_format not in MIME_TYPES:
+        raise ValueError('Unknown export format "' + export_format + '"')
+    data_frames = result_data_frames(json_string)
+    if export_format == "xlsx":
+        _write_workbook(data_frames, output)
+        return
+    long_data_frame = _long_data_frame(data_frames)
+    if export_format == "csv":
+        long_data_frame.to_csv(output, index=False, mode="wb", encoding="utf-8")
+    else:
+        long_data_frame.to_parquet(output, index=False)
+
+
+def result_data_frames(json_string):
+    # Returns a data frame with the id columns and the year columns for each indicator
+    result_json = json.loads(json_string)
+    data_frames = {}
+    for name, table_json in result_json.items():
+        if "values" in table_json:
+            data_frame = _columnar_data_frame(table_json)
+        else:
+            column_names = table_json["idColumnNames"] + table_json["yearColumnNames"]
+            data_frame = pd.DataFrame(table_json["rows"], columns=column_names)
+        data_frames[name] = _with_integer_ids(data_frame, table_json["idColumnNames"])
+    return data_frames
+
+
+def _columnar_data_frame(table_json):
+    number_of_rows = table_json["numberOfRows"]
+    values = np.frombuffer(base64.b64decode(table_json["values"]), dtype="<f8")
+    columns = values.reshape(len(table_json["columnNames"]), number_of_rows)
+    data = dict(zip(table_json["idColumnNames"], table_json["idColumns"]))
+    data |= dict(zip(table_json["columnNames"], columns))
+    return pd.DataFrame(data)
+
+
+def _with_integer_ids(data_frame, id_column_names):
+    # The rows of the row format are lists of floats if all columns are numeric and
+    # missing ids of the long table are NaN. Therefore, the ids are converted back to
+    # (nullable) integers.
+    for column_name in id_column_names:
+        column = data_frame[column_name]
+        if pd.api.types.is_float_dtype(column) and (column.dropna() % 1 == 0).all():
+            data_frame[column_name] = column.astype("Int64")
+    return data_frame
+
+
+def _write_workbook(data_frames, output):
+    # NaN and inf can not be written as numbers and are written as Excel errors instead
+    workbook = xlsxwriter.workbook.Workbook(output, {"constant_memory": True, "nan_inf_to_errors": True})
+    bold = workbook.add_format({"bold": True})
+    number_format = workbook.add_format({"num_format": NUMBER_FORMAT})
+    used_sheet_names = set()
+    for name, data_frame in data_frames.items():
+        worksheet = workbook.add_worksheet(_sheet_name(name, used_sheet_names))
+        worksheet.write_row(0, 0, [str(column_name) for column_name in data_frame.columns], bold)
+        for row_index, row in enumerate(data_frame.itertuples(index=False), start=1):
+            worksheet.write_row(row_index, 0, row, number_format)
+    workbook.close()
+
+
+def _sheet_name(name, used_sheet_names):
+    # Excel limits the length of sheet names and compares them case-insensitively
+    sheet_name = name[:MAX_SHEET_NAME_LENGTH]
+    number = 1
+    while sheet_name.lower() in used_sheet_names:
+        number += 1
+        suffix = "~" + str(number)
+        sheet_name = name[: MAX_SHEET_NAME_LENGTH - len(suffix)] + suffix
+    used_sheet_names.add(sheet_name.lower())
+    return sheet_name
+
+
+def _long_data_frame(data_frames):
+    long_data_frames = []
+    for name, data_frame in data_frames.items():
+        id_column_names = [column_name for column_name in data_frame.columns if not _is_year(column_name)]
+        long_data_frame = data_frame.melt(id_vars=id_column_names, var_name="year", value_name="value")
+        long_data_frame.insert(0, "indicator", name)
+        long_data_frames.append(long_data_frame)
+    if not long_data_frames:
+        return pd.DataFrame(columns=["indicator", "year", "value"])
+    result = pd.concat(long_data_frames, ignore_index=True)
+    id_column_names = [column_name for column_name in result.columns if column_name not in ["year", "value"]]
+    result = result[id_column_names + ["year", "value"]]
+    result = _with_integer_ids(result, id_column_names[1:])
+    result["year"] = result["year"].astype(int)
+    return result
+
+
+def _is_year(column_name):
+    return str(column_name).isdigit()
@@ -0,0 +1,177 @@
+# © 2024-2026 Fraunhofer-Gesellschaft e.V., München
+#
+# SPDX-License-Identifier: AGPL-3.0-or-later
+
+# Writes the Excel export of the route /export-results. The workbook is written in the
+# constant_memory mode of xlsxwriter: each worksheet keeps only its current row in memory
+# and flushes it to a temporary file when the next row is started. Therefore, all cells
+# need to be written in row order; cells of previous rows can not be changed afterwards.
+
+import xlsxwriter
+
+XLSX_MIME_TYPE = "application/vnd.openxmlformats-officedocument.spreadsheetml.sheet"
+
+NUMBER_FORMAT = "#,##0.00#######"
+
+
+def write_results_workbook(data, database, output):
+    # data is the JSON of the export request, including programs, results, categories,
+    # years and cbaData. output is a file name or a binary file object.
+    workbook = xlsxwriter.workbook.Workbook(output, {"constant_memory": True})
+    formats = {
+        "bold": workbook.add_format({"bold": True}),
+        "italic": workbook.add_format({"italic": True}),
+        "number": workbook.add_format({"num_format": NUMBER_FORMAT}),
+    }
+    _write_inputs_sheet(workbook, formats, data, database)
+    for program in data["results"]:
+        title_appendix = f" ({program['name']})" if len(data["results"]) > 1 else ""
+        aggregation_measurements = _write_output_sheets(workbook, formats, data["categories"], program, title_appendix)
+        _write_aggregation_sheet(workbook, formats, data["years"], program, aggregation_measurements, title_appendix)
+    for program in data["cbaData"]:
+        title = f"CBA ({program['name']})" if len(data["results"]) > 1 else "CBA"
+        _write_cba_sheet(workbook, formats, program, title)
+    workbook.close()
+
+
+def _write_inputs_sheet(workbook, formats, data, database):
+    worksheet = workbook.add_worksheet("Inputs")
+    bold = formats["bold"]
+    region_label = None
+    row_index = 0
+    for program in data["programs"]:
+        if region_label is None:
+            region_label = _region_label(database, data["region"])
+        rows = [
+            ("Program", program["name"]),
+            ("Unit", program["unitName"]),
+            ("Region", region_label),
+            ("Subsector", program.get("subsectorName", program["subsector"])),
+        ]
+        for label, value in rows:
+            worksheet.write(row_index, 0, label)
+            worksheet.write(row_index, 1, value, bold)
+            row_index += 1
+        row_index += 1
+        for improvement in program["improvements"]:
+            worksheet.write(row_index, 0, improvement.get("name", improvement["id"]), formats["italic"])
+            row_index += 1
+            worksheet.write_row(row_index, 0, list(improvement["values"].keys()), bold)
+            worksheet.write_row(row_index + 1, 0, list(improvement["values"].values()), formats["number"])
+            row_index += 2
+        row_index += 5
+
+
+def _write_output_sheets(workbook, formats, categories, program, title_appendix):
+    # Writes a sheet for the quantification and the monetization and returns the
+    # measurements that are included in the aggregation sheet
+    aggregation_measurements = []
+    for key, category in categories.items():
+        if key not in ["quantification", "monetization"]:
+            continue
+        worksheet = workbook.add_worksheet(f"{category['title']}{title_appendix}")
+        row_index = 0
+        for measurement in category["measurements"]:
+            try:
+                result = program["data"][measurement["identifier"]]
+            except KeyError:
+                continue
+            if key == "monetization" or measurement["identifier"] == "impactOnGrossDomesticProduct":
+                aggregation_measurements.append(measurement)
+            if row_index > 0:
+                row_index += 1
+            row_index = _write_measurement(worksheet, formats, measurement, result, row_index)
+    return aggregation_measurements
+
+
+def _write_measurement(worksheet, formats, measurement, result, row_index):
+    title = (
+        f"[{measurement['subcategory']}] {measurement['title']}"
+        if measurement.get("subcategory")
+        else measurement["title"]
+    )
+    worksheet.write(row_index, 0, title, formats["bold"])
+    row_index += 1
+    worksheet.write(row_index, 0, measurement["yAxis"], formats["italic"])
+    row_index += 1
+    worksheet.write_row(row_index, 1, result["yearColumnNames"], formats["bold"])
+    row_index += 1
+    total = [0 for _year in result["yearColumnNames"]]
+    for row in result["rows"]:
+        first_column, cells, number_of_labels = _result_row_cells(row, result["idColumnNames"])
+        worksheet.write_row(row_index, first_column, cells, formats["number"])
+        for value_index, value in enumerate(cells[number_of_labels:]):
+            total[first_column + number_of_labels + value_index - 1] += value
+        row_index += 1
+    if len(result["rows"]) > 1:
+        worksheet.write(row_index, 0, "Total", formats["bold"])
+        worksheet.write_row(row_index, 1, total, formats["number"])
+    row_index += 1
+    return row_index
+
+
+def _write_aggregation_sheet(workbook, formats, years, program, aggregation_measurements, title_appendix):
+    worksheet = workbook.add_worksheet(f"Aggregation{title_appendix}")
+    worksheet.write_row(0, 1, years, formats["bold"])
+    row_index = 1
+    for measurement in aggregation_measurements:
+        worksheet.write(row_index, 0, measurement["title"], formats["bold"])
+        result = program["data"][measurement["identifier"]]
+        for row in result["rows"]:
+            first_column, cells, _number_of_labels = _result_row_cells(row, result["idColumnNames"])
+            worksheet.write_row(row_index, first_column, cells, formats["number"])
+            row_index += 1
+
+
+def _write_cba_sheet(workbook, formats, program, title):
+    worksheet = workbook.add_worksheet(title)
+    bold = formats["bold"]
+    number_format = formats["number"]
+    worksheet.write(0, 0, "unit", bold)
+    worksheet.write(0, 1, "Euro", formats["italic"])
+    row_index = 1
+
+    list_results = {}
+    for key, result in program.items():
+        if key in ["parameters", "years"]:
+            continue
+        if isinstance(result, list):
+            list_results[key] = result
+            continue
+        worksheet.write(row_index, 0, key, bold)
+        worksheet.write(row_index, 1, result, number_format)
+        row_index += 1
+
+    row_index += 1
+    worksheet.write_row(row_index, 1, program["years"], bold)
+
+    for key, result in list_results.items():
+        row_index += 1
+        worksheet.write(row_index, 0, key, bold)
+        worksheet.write_row(row_index, 1, result, number_format)
+
+    row_index += 2
+    worksheet.write(row_index, 0, "Parameters", bold)
+    row_index += 1
+    for key, value in program["parameters"].items():
+        worksheet.write(row_index, 0, key, bold)
+        worksheet.write(row_index, 1, value)
+        row_index += 1
+
+
+def _result_row_cells(row, id_column_names):
+    # Returns the first column, the cells and the number of labels of a result row.
+    # The labels are the entries of the id columns except id_measure. If there are
+    # no labels, the values start in the second column below the first year.
+    labels = [
+        entry for index, entry in enumerate(row[: len(id_column_names)]) if id_column_names[index] != "id_measure"
+    ]
+    values = row[len(id_column_names) :]
+    first_column = 0 if labels else 1
+    return first_column, labels + values, len(labels)
+
+
+def _region_label(database, id_region):
+    where_clause = {"id": str(id_region)}
+    region = database.table("id_region", where_clause)
+    return region["label"].values[0]
@@ -2,11 +2,16 @@
 #
 # SPDX-License-Identifier: AGPL-3.0-or-later
 
+import hashlib
 import json
+import os
 import sqlite3
+import time
 
 from micat.input.database_exception import DatabaseException
 from micat.log.logger import Logger
+from micat.monitoring.metrics import REGISTRY
+from micat.monitoring.query_profiler import QUERY_PROFILER
 from micat.table.id_table import IdTable
 from micat.table.mapping_table import MappingTable
 from micat.table.table import Table
@@ -16,14 +21,31 @@ from micat.table.value_table import ValueTable
 class Database:
     def __init__(self, database_path):
         self.database_path = database_path
+        self._fingerprint = None
+        self._fingerprint_file_state = None
+        # data of id and mapping tables, see _reference_data_query
+        self._reference_data = {}
+        self._reference_data_file_state = None
 
     def __str__(self) -> str:
         return self.database_path
 
+    def fingerprint(self):
+        # Returns a hash of the content of the database file. It is used to
+        # invalidate cached results when the database is replaced or updated.
+        # The hash is only recalculated if the size or modification time of the file changes.
+        file_state = self._file_state()
+        if file_state is None:
+            return None
+        if file_state != self._fingerprint_file_state:
+            self._fingerprint = self._hash_file(self.database_path)
+            self._fingerprint_file_state = file_state
+        return self._fingerprint
+
     def id_table(self, id_table_name):
         query = "SELECT *  FROM `" + id_table_name + "`"
         where_clause = {}
-        json_data = self._data_query(query, where_clause)
+        json_data = self._reference_data_query(query, where_clause)
         id_table = IdTable.from_json(json_data, id_table_name)
         return id_table
 
@@ -45,17 +67,18 @@ class Database:
         query = "SELECT *  FROM `" + mapping_table_name + "`"
         if where_clause is None:
             where_clause = {}
-        json_data = self._data_query(query, where_clause)
+        json_data = self._reference_data_query(query, where_clause)
         mapping_table = MappingTable.from_json(json_data, mapping_table_name)
         return mapping_table
 
     def query(self, query_string, where_clause):
         json_data = self._data_query(query_string, where_clause)
         headers = json_data["headers"]
-        if "value" in headers:
-            table = ValueTable.from_json(json_data, where_clause)
-        else:
-            table = Table.from_json(json_data, where_clause)
+        with QUERY_PROFILER.build_timer():
+            if "value" in headers:
+                table = ValueTable.from_json(json_data, where_clause)
+            else:
+                table = Table.from_json(json_data, where_clause)
         return table
 
     def table(self, table_name, where_clause):
@@ -98,14 +121,17 @@ class Database:
         return "(" + " or ".join(conditions) + ")"
 
     def _data_query(self, query_string, where_clause):
+        base_query_string = query_string
         query_string = self._append_where_clause(query_string, where_clause)
         query_string = query_string.replace("WHERE LIMIT=", "LIMIT ")
+        start_time = time.perf_counter()
         try:
             with sqlite3.connect(self.database_path) as connection:
                 cursor = connection.cursor()
                 cursor.execute(query_string)
                 headers = list(map(lambda entries: entries[0], cursor.description))
                 rows = cursor.fetchall()
+                fetch_time_in_seconds = time.perf_counter() - start_time
                 if len(rows) < 1:
                     Logger.warn("Fetched empty table with query: " + query_string)
                 data = {
@@ -116,8 +142,47 @@ class Database:
             Logger.error(exception)
             message = "Could not query database for " + query_string
             raise IOError(message, exception) from exception
+        finally:
+            REGISTRY.observe_query(time.perf_counter() - start_time)
+        # The profiling is done outside of the try block because it must not fail a query
+        QUERY_PROFILER.record_query(
+            cursor,
+            base_query_string,
+            where_clause,
+            query_string,
+            len(rows),
+            fetch_time_in_seconds,
+        )
         if len(data["rows"]) == 0:
             raise DatabaseException(
                 f'Fetching data with "{query_string}" did not return any results.'
             )
         return data
+
+    def _reference_data_query(self, query_string, where_clause):
+        # Id and mapping tables are small and used by nearly every request.
+        # Their data is cached until the database file changes.
+        file_state = self._file_state()
+        if file_state != self._reference_data_file_state:
+            self._reference_data = {}
+            self._reference_data_file_state = file_state
+        key = query_string + json.dumps(where_clause, sort_keys=True)
+        is_cached = key in self._reference_data
+        REGISTRY.count_cache_access("reference_data", is_cached)
+        if not is_cached:
+            self._reference_data[key] = self._data_query(query_string, where_clause)
+        return self._reference_data[key]
+
+    def _file_state(self):
+        if not os.path.exists(self.database_path):
+            return None
+        file_state = os.stat(self.database_path)
+        return file_state.st_size, file_state.st_mtime_ns
+
+    @staticmethod
+    def _hash_file(file_path):
+        file_hash = hashlib.sha256()
+        with open(file_path, "rb") as file:
+            for chunk in iter(lambda: file.read(1024 * 1024), b""):
+                file_hash.update(chunk)
+        return file_hash.hexdigest()
@@ -0,0 +1,24 @@
+# © 2024-2026 Fraunhofer-Gesellschaft e.V., München
+#
+# SPDX-License-Identifier: AGPL-3.0-or-later
+
+import json
+import logging
+import time
+
+
+class JsonFormatter(logging.Formatter):
+    # Formats log records as single JSON lines for log shipping
+
+    def format(self, record):
+        entry = {
+            "time": f"{time.strftime('%Y-%m-%dT%H:%M:%S', time.gmtime(record.created))}.{int(record.msecs):03d}Z",
+            "level": record.levelname,
+            "message": record.getMessage(),
+        }
+        caller = getattr(record, "caller", None)
+        if caller is not None:
+            entry.update(caller)
+        if record.exc_info:
+            entry["exception"] = self.formatException(record.exc_info)
+        return json.dumps(entry, default=str)
@@ -2,52 +2,103 @@
 #
 # SPDX-License-Identifier: AGPL-3.0-or-later
 
+import contextlib
+import contextvars
+import functools
 import inspect
 import logging
+import os
+import sys
 import time
 
 from micat.log.color_handler import ColorHandler
+from micat.log.json_formatter import JsonFormatter
+
+# Warnings of the request that is currently processed in this thread/context
+_current_scope = contextvars.ContextVar("log_scope", default=None)
 
 
 class Logger:
+    # The static methods debug, info, warn and error check the log level before
+    # they inspect the calling frame, so that disabled log calls are cheap. Within
+    # a scope (e.g. a request, see Logger.scope), identical warnings are only logged
+    # once and each calling function logs at most max_warnings_per_function warnings.
+    # The number of suppressed warnings is logged when the scope is finished.
+    # The environment variable MICAT_LOG_FORMAT=json switches to JSON lines output.
     wrapped_logger = None
+    is_json_output = False
+    max_warnings_per_function = 10
 
     def __init__(self, is_active=True):
         self._is_active = is_active
         self._start_time = 0
-        if Logger.wrapped_logger is None:
-            Logger.wrapped_logger = Logger._create_logger()
 
     @staticmethod
     def debug(message):
-        logger = Logger()
+        if not Logger._is_enabled_for(logging.DEBUG):
+            return
         func = inspect.currentframe().f_back.f_code
-        logger.log_debug(message, func)
+        _DEFAULT_LOGGER.log_debug(message, func)
 
     @staticmethod
     def info(message):
-        logger = Logger()
+        if not Logger._is_enabled_for(logging.INFO):
+            return
         func = inspect.currentframe().f_back.f_code
-        logger.log_info(message, func)
+        _DEFAULT_LOGGER.log_info(message, func)
 
     @staticmethod
     def warn(message):
-        logger = Logger()
+        if not Logger._is_enabled_for(logging.WARNING):
+            return
         func = inspect.currentframe().f_back.f_code
-        logger.log_warn(str(message), func)
+        _DEFAULT_LOGGER.log_warn(str(message), func)
 
     @staticmethod
     def error(message):
-        logger = Logger()
+        if not Logger._is_enabled_for(logging.ERROR):
+            return
         func = inspect.currentframe().f_back.f_code
-        logger.log_error(str(message), func)
+        _DEFAULT_LOGGER.log_error(str(message), func)
+
+    @staticmethod
+    @contextlib.contextmanager
+    def scope():
+        token = Logger.start_scope()
+        try:
+            yield
+        finally:
+            Logger.finish_scope(token)
+
+    @staticmethod
+    def start_scope():
+        return _current_scope.set(_Scope(Logger.max_warnings_per_function))
+
+    @staticmethod
+    def finish_scope(token):
+        scope = _current_scope.get()
+        _current_scope.reset(token)
+        for func, number_of_suppressed_warnings in scope.suppressed_warnings():
+            message = "Suppressed " + str(number_of_suppressed_warnings) + " repeated warnings"
+            _DEFAULT_LOGGER._log(Logger._wrapped().warning, message, func)
+
+    @staticmethod
+    def _is_enabled_for(level):
+        return Logger._wrapped().isEnabledFor(level)
+
+    @staticmethod
+    def _wrapped():
+        if Logger.wrapped_logger is None:
+            Logger.is_json_output = os.environ.get("MICAT_LOG_FORMAT", "text") == "json"
+            Logger.wrapped_logger = Logger._create_logger(Logger.is_json_output)
+        return Logger.wrapped_logger
 
     @staticmethod
     def _current_time_in_ms():
         return int(round(time.time() * 1000))
 
     @staticmethod
-    def _create_logger():
+    def _create_logger(is_json_output=False):
         # If you do not see any logging output while running tests in PyCharm,
         # add the -s option as "Additional arguments" in the PyCharm run configuration or
         # in pyproject.toml under  [tool.pytest.ini_options] => addopts
@@ -56,13 +107,16 @@ class Logger:
 
         logger.propagate = 0
 
-        # log_handler = logging.StreamHandler(stream=sys.stdout)
-        log_handler = ColorHandler()
+        if is_json_output:
+            log_handler = logging.StreamHandler(stream=sys.stdout)
+            formatter = JsonFormatter()
+        else:
+            log_handler = ColorHandler()
+            formatter = logging.Formatter(
+                "%(asctime)s - %(levelname)s - %(message)s", "%H:%M:%S"
+            )
 
         log_handler.setLevel(logging.DEBUG)
-        formatter = logging.Formatter(
-            "%(asctime)s - %(levelname)s - %(message)s", "%H:%M:%S"
-        )
         log_handler.setFormatter(formatter)
         logger.addHandler(log_handler)
 
@@ -72,33 +126,36 @@ class Logger:
         if self._is_active:
             if func is None:
                 func = inspect.currentframe().f_back.f_code
-            link = 'File "' + func.co_filename + '", line ' + str(func.co_firstlineno)
-            full_message = message + " :\n" + func.co_name + " in " + link
-            Logger.wrapped_logger.debug(full_message)
+            self._log(Logger._wrapped().debug, message, func)
 
     def log_info(self, message="", func=None):
         if self._is_active:
             if func is None:
                 func = inspect.currentframe().f_back.f_code
-            link = 'File "' + func.co_filename + '", line ' + str(func.co_firstlineno)
-            full_message = message + " :\n" + func.co_name + " in " + link
-            Logger.wrapped_logger.info(full_message)
+            self._log(Logger._wrapped().info, message, func)
 
     def log_warn(self, message="", func=None):
         if self._is_active:
             if func is None:
                 func = inspect.currentframe().f_back.f_code
-            link = 'File "' + func.co_filename + '", line ' + str(func.co_firstlineno)
-            full_message = message + " :\n" + func.co_name + " in " + link
-            Logger.wrapped_logger.warning(full_message)
+            scope = _current_scope.get()
+            if scope is not None and not scope.admit(func, message):
+                return
+            self._log(Logger._wrapped().warning, message, func)
 
     def log_error(self, message="", func=None):
         if self._is_active:
             if func is None:
                 func = inspect.currentframe().f_back.f_code
-            link = 'File "' + func.co_filename + '", line ' + str(func.co_firstlineno)
-            full_message = message + " :\n" + func.co_name + " in " + link
-            Logger.wrapped_logger.error(full_message)
+            self._log(Logger._wrapped().error, message, func)
+
+    @staticmethod
+    def _log(log_function, message, func):
+        link, caller = _caller(func)
+        if Logger.is_json_output:
+            log_function(message, extra={"caller": caller})
+        else:
+            log_function(message + link)
 
     def start_timer(self):
         if self._is_active:
@@ -108,3 +165,36 @@ class Logger:
         if self._is_active:
             current_time = self._current_time_in_ms()
             self.log_info(message + str(current_time - self._start_time) + " ms")
+
+
+class _Scope:
+    def __init__(self, max_warnings_per_function):
+        self._max_warnings_per_function = max_warnings_per_function
+        self._messages = set()
+        self._numbers_of_warnings = {}
+        self._numbers_of_suppressed_warnings = {}
+
+    def admit(self, func, message):
+        number_of_warnings = self._numbers_of_warnings.get(func, 0)
+        key = (func, message)
+        if key in self._messages or number_of_warnings >= self._max_warnings_per_function:
+            self._numbers_of_suppressed_warnings[func] = self._numbers_of_suppressed_warnings.get(func, 0) + 1
+            return False
+        self._messages.add(key)
+        self._numbers_of_warnings[func] = number_of_warnings + 1
+        return True
+
+    def suppressed_warnings(self):
+        return list(self._numbers_of_suppressed_warnings.items())
+
+
+@functools.lru_cache(maxsize=1024)
+def _caller(func):
+    # The link to the calling function is only created once for each code object
+    link = ' :\n' + func.co_name + ' in File "' + func.co_filename + '", line ' + str(func.co_firstlineno)
+    caller = {"function": func.co_name, "file": func.co_filename, "line": func.co_firstlineno}
+    return link, caller
+
+
+# Used by the static log methods, so that they do not need to create an instance for each call
+_DEFAULT_LOGGER = Logger()
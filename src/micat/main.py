@@ -55,6 +55,7 @@ def main(arguments=None):
         debug_mode,
         database_path=database_path,
         confidential_database_path=confidential_database_path,
+        settings=settings,
     )
 
     back_end.start(host=host, application_port=port)
@@ -0,0 +1,194 @@
+# © 2024-2026 Fraunhofer-Gesellschaft e.V., München
+#
+# SPDX-License-Identifier: AGPL-3.0-or-later
+
+import bisect
+import os
+import threading
+
+# Upper bounds of the histogram buckets in seconds
+REQUEST_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0, 60.0)
+QUERY_BUCKETS = (0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0)
+# Upper bounds of the histogram buckets in bytes, from 128 MB to 16 GB
+MEMORY_BUCKETS = tuple(2**exponent for exponent in range(27, 35))
+
+CONTENT_TYPE = "text/plain; version=0.0.4; charset=utf-8"
+
+
+class Histogram:
+    def __init__(self, buckets):
+        self._buckets = buckets
+        self._bucket_counts = [0] * len(buckets)
+        self._sum = 0.0
+        self._count = 0
+
+    def observe(self, value):
+        index = bisect.bisect_left(self._buckets, value)
+        if index < len(self._buckets):
+            self._bucket_counts[index] += 1
+        self._sum += value
+        self._count += 1
+
+    def samples(self, name, labels):
+        # cumulative bucket counts, as expected by the text exposition format
+        lines = []
+        cumulative_count = 0
+        for upper_bound, bucket_count in zip(self._buckets, self._bucket_counts):
+            cumulative_count += bucket_count
+            bucket_labels = labels | {"le": _format_value(upper_bound)}
+            lines.append(_sample(name + "_bucket", bucket_labels, cumulative_count))
+        lines.append(_sample(name + "_bucket", labels | {"le": "+Inf"}, self._count))
+        lines.append(_sample(name + "_sum", labels, self._sum))
+        lines.append(_sample(name + "_count", labels, self._count))
+        return lines
+
+
+class Metrics:
+    # Collects metrics of the back end and renders them in the Prometheus
+    # text exposition format. Recording a value only needs a lock and a
+    # dictionary lookup, so that the metrics can stay enabled in production.
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._request_counts = {}
+        self._request_durations = {}
+        self._query_count = 0
+        self._query_durations = Histogram(QUERY_BUCKETS)
+        self._cache_accesses = {}
+        self._process_peak_memory = Histogram(MEMORY_BUCKETS)
+        self._collectors = {}
+
+    def observe_request(self, route, method, status_code, duration_in_seconds):
+        with self._lock:
+            key = (route, method, str(status_code))
+            self._request_counts[key] = self._request_counts.get(key, 0) + 1
+            histogram = self._request_durations.get(route)
+            if histogram is None:
+                histogram = Histogram(REQUEST_BUCKETS)
+                self._request_durations[route] = histogram
+            histogram.observe(duration_in_seconds)
+
+    def observe_query(self, duration_in_seconds):
+        with self._lock:
+            self._query_count += 1
+            self._query_durations.observe(duration_in_seconds)
+
+    def count_cache_access(self, cache_name, is_hit):
+        with self._lock:
+            hits, misses = self._cache_accesses.get(cache_name, (0, 0))
+            if is_hit:
+                hits += 1
+            else:
+                misses += 1
+            self._cache_accesses[cache_name] = (hits, misses)
+
+    def observe_process_peak_memory(self, peak_memory_in_bytes):
+        with self._lock:
+            self._process_peak_memory.observe(peak_memory_in_bytes)
+
+    def register_collector(self, name, metric_type, help_text, collect):
+        # The function collect is called when the metrics are rendered. It returns
+        # a number or a list of (labels, number) tuples. Registering a collector
+        # with an existing name replaces the previous one.
+        with self._lock:
+            self._collectors[name] = (metric_type, help_text, collect)
+
+    def exposition(self):
+        with self._lock:
+            lines = self._request_lines() + self._query_lines() + self._cache_lines() + self._memory_lines()
+            collectors = dict(self._collectors)
+        for name, (metric_type, help_text, collect) in collectors.items():
+            lines += _collector_lines(name, metric_type, help_text, collect())
+        lines += _process_lines()
+        return "\n".join(lines) + "\n"
+
+    def _request_lines(self):
+        lines = _header("micat_http_requests_total", "counter", "Number of handled HTTP requests.")
+        for (route, method, status), count in sorted(self._request_counts.items()):
+            labels = {"route": route, "method": method, "status": status}
+            lines.append(_sample("micat_http_requests_total", labels, count))
+        lines += _header("micat_http_request_duration_seconds", "histogram", "Duration of HTTP requests.")
+        for route, histogram in sorted(self._request_durations.items()):
+            lines += histogram.samples("micat_http_request_duration_seconds", {"route": route})
+        return lines
+
+    def _query_lines(self):
+        lines = _header("micat_sqlite_queries_total", "counter", "Number of SQLite queries.")
+        lines.append(_sample("micat_sqlite_queries_total", {}, self._query_count))
+        lines += _header("micat_sqlite_query_duration_seconds", "histogram", "Duration of SQLite queries.")
+        lines += self._query_durations.samples("micat_sqlite_query_duration_seconds", {})
+        return lines
+
+    def _cache_lines(self):
+        lines = _header("micat_cache_hits_total", "counter", "Number of cache hits.")
+        for cache_name, (hits, _misses) in sorted(self._cache_accesses.items()):
+            lines.append(_sample("micat_cache_hits_total", {"cache": cache_name}, hits))
+        lines += _header("micat_cache_misses_total", "counter", "Number of cache misses.")
+        for cache_name, (_hits, misses) in sorted(self._cache_accesses.items()):
+            lines.append(_sample("micat_cache_misses_total", {"cache": cache_name}, misses))
+        lines += _header("micat_cache_hit_ratio", "gauge", "Ratio of cache hits to all cache accesses.")
+        for cache_name, (hits, misses) in sorted(self._cache_accesses.items()):
+            lines.append(_sample("micat_cache_hit_ratio", {"cache": cache_name}, hits / (hits + misses)))
+        return lines
+
+    def _memory_lines(self):
+        lines = _header(
+            "micat_calculation_process_peak_memory_bytes",
+            "histogram",
+            "Peak resident memory of the process during memory-bounded calculations, "
+            + "including concurrent requests of the same process.",
+        )
+        lines += self._process_peak_memory.samples("micat_calculation_process_peak_memory_bytes", {})
+        return lines
+
+
+def _collector_lines(name, metric_type, help_text, values):
+    lines = _header(name, metric_type, help_text)
+    if isinstance(values, list):
+        for labels, value in values:
+            lines.append(_sample(name, labels, value))
+    else:
+        lines.append(_sample(name, {}, values))
+    return lines
+
+
+def _process_lines():
+    resident_memory = _resident_memory_in_bytes()
+    if resident_memory is None:
+        return []
+    lines = _header("process_resident_memory_bytes", "gauge", "Resident memory size in bytes.")
+    lines.append(_sample("process_resident_memory_bytes", {}, resident_memory))
+    return lines
+
+
+def _resident_memory_in_bytes(statm_path="/proc/self/statm"):
+    # Only available on Linux; there is no dependency on psutil
+    try:
+        with open(statm_path, encoding="utf-8") as file:
+            resident_pages = int(file.read().split()[1])
+    except OSError:
+        return None
+    return resident_pages * os.sysconf("SC_PAGE_SIZE")
+
+
+def _header(name, metric_type, help_text):
+    return ["# HELP " + name + " " + help_text, "# TYPE " + name + " " + metric_type]
+
+
+def _sample(name, labels, value):
+    if not labels:
+        return name + " " + _format_value(value)
+    label_strings = [key + '="' + _escape(str(label)) + '"' for key, label in labels.items()]
+    return name + "{" + ",".join(label_strings) + "} " + _format_value(value)
+
+
+def _escape(label):
+    return label.replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+
+def _format_value(value):
+    return str(value)
+
+
+# Metrics of this process; Database and BackEnd report to this registry
+REGISTRY = Metrics()
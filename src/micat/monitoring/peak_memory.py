@@ -0,0 +1,54 @@
+# © 2024-2026 Fraunhofer-Gesellschaft e.V., München
+#
+# SPDX-License-Identifier: AGPL-3.0-or-later
+
+import contextlib
+
+
+class PeakMemory:
+    def __init__(self):
+        # None if the peak could not be determined, e.g. on other platforms than Linux
+        self.in_bytes = None
+
+
+@contextlib.contextmanager
+def measuring(clear_refs_path="/proc/self/clear_refs", status_path="/proc/self/status"):
+    # Measures the peak resident memory of this process while the block is running,
+    # for example
+    # with measuring() as peak_memory:
+    #     ...
+    # print(peak_memory.in_bytes)
+    # The peak is tracked by the kernel for the whole process. Therefore, it is the peak of
+    # a single request only in a worker of the calculation pool, that runs a single job at
+    # a time. If several calculations run in threads of the same process, it is the peak of
+    # the process: it includes the concurrent requests, and a measurement that starts
+    # meanwhile resets the peak for all running measurements.
+    peak_memory = PeakMemory()
+    is_reset = _reset_peak(clear_refs_path)
+    try:
+        yield peak_memory
+    finally:
+        if is_reset:
+            peak_memory.in_bytes = _peak_resident_memory_in_bytes(status_path)
+
+
+def _reset_peak(clear_refs_path):
+    # Writing 5 to clear_refs resets the peak resident memory (VmHWM), see
+    # https://www.kernel.org/doc/html/latest/filesystems/proc.html
+    try:
+        with open(clear_refs_path, "w", encoding="utf-8") as file:
+            file.write("5")
+    except OSError:
+        return False
+    return True
+
+
+def _peak_resident_memory_in_bytes(status_path):
+    try:
+        with open(status_path, encoding="utf-8") as file:
+            for line in file:
+                if line.startswith("VmHWM:"):
+                    return int(line.split()[1]) * 1024
+    except OSError:
+        return None
+    return None
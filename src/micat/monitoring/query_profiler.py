@@ -0,0 +1,176 @@
+# © 2024-2026 Fraunhofer-Gesellschaft e.V., München
+#
+# SPDX-License-Identifier: AGPL-3.0-or-later
+
+import collections
+import contextlib
+import contextvars
+import os
+import threading
+import time
+
+from micat.log.logger import Logger
+
+# Profile of the request that is currently processed in this thread/context
+_current_profile = contextvars.ContextVar("query_profile", default=None)
+
+
+class QueryProfiler:
+    # Optional profiler for the SQLite queries of Database._data_query. If enabled,
+    # it records each query of a request including its where clause, row count,
+    # fetch time and the time to build the resulting table. For queries that are
+    # slower than the plan threshold, the output of EXPLAIN QUERY PLAN is captured.
+    # The reports of the latest requests list their slowest and most frequent queries.
+
+    def __init__(
+        self,
+        is_enabled=False,
+        plan_threshold_in_seconds=0.05,
+        max_number_of_reports=50,
+        number_of_listed_queries=10,
+    ):
+        self.is_enabled = is_enabled
+        self.plan_threshold_in_seconds = plan_threshold_in_seconds
+        self._number_of_listed_queries = number_of_listed_queries
+        self._lock = threading.Lock()
+        self._reports = collections.deque(maxlen=max_number_of_reports)
+        self._query_plans = {}
+
+    @staticmethod
+    def from_environment(environment=None):
+        # The profiler can be enabled with the environment variable MICAT_QUERY_PROFILER=1
+        if environment is None:
+            environment = os.environ
+        is_enabled = environment.get("MICAT_QUERY_PROFILER", "0") == "1"
+        plan_threshold_in_milliseconds = float(environment.get("MICAT_QUERY_PLAN_THRESHOLD_MS", "50"))
+        return QueryProfiler(is_enabled, plan_threshold_in_milliseconds / 1000)
+
+    @contextlib.contextmanager
+    def profiling(self, name):
+        # Collects the queries that are executed within the context
+        token = self.start_profile(name)
+        try:
+            yield
+        finally:
+            self.finish_profile(token)
+
+    def start_profile(self, name):
+        # Starts collecting the queries of a request; returns None if the profiler is disabled
+        if not self.is_enabled:
+            return None
+        return _current_profile.set(_Profile(name))
+
+    def finish_profile(self, token):
+        if token is None:
+            return
+        profile = _current_profile.get()
+        _current_profile.reset(token)
+        self._add_report(profile)
+
+    def record_query(self, cursor, query_string, where_clause, full_query_string, row_count, fetch_time_in_seconds):
+        profile = _current_profile.get()
+        if not self.is_enabled or profile is None:
+            return
+        query_plan = None
+        if fetch_time_in_seconds >= self.plan_threshold_in_seconds:
+            query_plan = self._query_plan(cursor, full_query_string)
+        profile.add(
+            {
+                "query": query_string,
+                "whereClause": str(where_clause),
+                "rowCount": row_count,
+                "fetchTimeInSeconds": fetch_time_in_seconds,
+                "buildTimeInSeconds": 0.0,
+                "queryPlan": query_plan,
+            }
+        )
+
+    @contextlib.contextmanager
+    def build_timer(self):
+        # Measures the time to build a table from the data of the latest query
+        profile = _current_profile.get()
+        if not self.is_enabled or profile is None:
+            yield
+            return
+        start_time = time.perf_counter()
+        try:
+            yield
+        finally:
+            profile.add_build_time(time.perf_counter() - start_time)
+
+    def reports(self):
+        with self._lock:
+            return list(self._reports)
+
+    def clear(self):
+        with self._lock:
+            self._reports.clear()
+            self._query_plans = {}
+
+    def _add_report(self, profile):
+        report = profile.report(self._number_of_listed_queries)
+        with self._lock:
+            self._reports.append(report)
+
+    def _query_plan(self, cursor, full_query_string):
+        # Query plans are captured only once for each query
+        with self._lock:
+            if full_query_string in self._query_plans:
+                return self._query_plans[full_query_string]
+        try:
+            cursor.execute("EXPLAIN QUERY PLAN " + full_query_string)
+            query_plan = [row[-1] for row in cursor.fetchall()]
+        except Exception as exception:  # pylint: disable=broad-except
+            # A missing query plan must not fail the profiled request
+            Logger.warn("Could not capture query plan for " + full_query_string + ": " + str(exception))
+            return None
+        with self._lock:
+            self._query_plans[full_query_string] = query_plan
+        return query_plan
+
+
+class _Profile:
+    def __init__(self, name):
+        self._name = name
+        self._records = []
+
+    def add(self, record):
+        self._records.append(record)
+
+    def add_build_time(self, build_time_in_seconds):
+        if self._records:
+            self._records[-1]["buildTimeInSeconds"] += build_time_in_seconds
+
+    def report(self, number_of_listed_queries):
+        slowest_queries = sorted(
+            self._records,
+            key=lambda record: record["fetchTimeInSeconds"] + record["buildTimeInSeconds"],
+            reverse=True,
+        )[:number_of_listed_queries]
+
+        frequencies = {}
+        for record in self._records:
+            entry = frequencies.setdefault(
+                record["query"], {"query": record["query"], "count": 0, "totalTimeInSeconds": 0.0}
+            )
+            entry["count"] += 1
+            entry["totalTimeInSeconds"] += record["fetchTimeInSeconds"] + record["buildTimeInSeconds"]
+        most_frequent_queries = sorted(
+            frequencies.values(),
+            key=lambda entry: entry["count"],
+            reverse=True,
+        )[:number_of_listed_queries]
+
+        report = {
+            "name": self._name,
+            "numberOfQueries": len(self._records),
+            "totalFetchTimeInSeconds": sum(record["fetchTimeInSeconds"] for record in self._records),
+            "totalBuildTimeInSeconds": sum(record["buildTimeInSeconds"] for record in self._records),
+            "slowestQueries": slowest_queries,
+            "mostFrequentQueries": most_frequent_queries,
+        }
+        return report
+
+
+# Profiler of this process; it is used by Database._data_query
+QUERY_PROFILER = QueryProfiler.from_environment()
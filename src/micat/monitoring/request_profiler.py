@@ -0,0 +1,140 @@
+# © 2024-2026 Fraunhofer-Gesellschaft e.V., München
+#
+# SPDX-License-Identifier: AGPL-3.0-or-later
+
+import contextlib
+import cProfile
+import json
+import os
+import threading
+import time
+import tracemalloc
+import uuid
+
+PROFILE_MODES = ("cpu", "memory")
+
+_CPU_SUFFIX = ".prof"
+_MEMORY_SUFFIX = ".allocations.json"
+
+
+class RequestProfiler:
+    # Runs single requests under cProfile and/or tracemalloc. The resulting .prof
+    # files and the top allocation sites are stored in a local directory. Only the
+    # latest max_number_of_profiles profiles are kept.
+
+    def __init__(self, directory, max_number_of_profiles=20, number_of_allocation_sites=25):
+        self._directory = directory
+        self._max_number_of_profiles = max_number_of_profiles
+        self._number_of_allocation_sites = number_of_allocation_sites
+        self._lock = threading.Lock()
+        self._number_of_memory_profiles = 0
+
+    @staticmethod
+    def parse_modes(value):
+        # "cpu", "memory" or "cpu,memory"; unknown modes are ignored
+        if not value:
+            return []
+        modes = [mode.strip().lower() for mode in value.split(",")]
+        return [mode for mode in PROFILE_MODES if mode in modes]
+
+    @contextlib.contextmanager
+    def profiling(self, name, modes):
+        # Nothing is recorded and stored if no mode is given
+        if not modes:
+            yield
+            return
+        base_name = time.strftime("%Y%m%d-%H%M%S") + "_" + _sanitize(name) + "_" + uuid.uuid4().hex[:8]
+        cpu_profile = None
+        if "cpu" in modes:
+            cpu_profile = cProfile.Profile()
+        if "memory" in modes:
+            self._start_tracemalloc()
+        try:
+            if cpu_profile is not None:
+                cpu_profile.enable()
+            try:
+                yield
+            finally:
+                if cpu_profile is not None:
+                    cpu_profile.disable()
+        finally:
+            os.makedirs(self._directory, exist_ok=True)
+            if cpu_profile is not None:
+                cpu_profile.dump_stats(os.path.join(self._directory, base_name + _CPU_SUFFIX))
+            if "memory" in modes:
+                self._write_allocations(base_name)
+            self._remove_old_profiles()
+
+    def profiles(self):
+        # Lists the stored profiles, newest first
+        profiles = {}
+        for file_name, modification_time, size in self._files():
+            base_name = _base_name(file_name)
+            profile = profiles.setdefault(base_name, {"name": base_name, "files": [], "sizeInBytes": 0, "created": 0})
+            profile["files"].append(file_name)
+            profile["sizeInBytes"] += size
+            profile["created"] = max(profile["created"], modification_time)
+        return sorted(profiles.values(), key=lambda profile: profile["created"], reverse=True)
+
+    def file_path(self, file_name):
+        # Returns None for files that are not part of a stored profile
+        if file_name not in [entry[0] for entry in self._files()]:
+            return None
+        return os.path.join(self._directory, file_name)
+
+    def _start_tracemalloc(self):
+        with self._lock:
+            if self._number_of_memory_profiles == 0:
+                tracemalloc.start()
+            self._number_of_memory_profiles += 1
+
+    def _write_allocations(self, base_name):
+        snapshot = tracemalloc.take_snapshot()
+        _current_size, peak_size = tracemalloc.get_traced_memory()
+        with self._lock:
+            self._number_of_memory_profiles -= 1
+            if self._number_of_memory_profiles == 0:
+                tracemalloc.stop()
+        statistics = snapshot.statistics("lineno")[: self._number_of_allocation_sites]
+        allocations = {
+            "peakInBytes": peak_size,
+            "topAllocations": [
+                {
+                    "location": str(statistic.traceback),
+                    "sizeInBytes": statistic.size,
+                    "count": statistic.count,
+                }
+                for statistic in statistics
+            ],
+        }
+        file_path = os.path.join(self._directory, base_name + _MEMORY_SUFFIX)
+        with open(file_path, "w", encoding="utf-8") as file:
+            json.dump(allocations, file, indent=2)
+
+    def _remove_old_profiles(self):
+        with self._lock:
+            profiles = self.profiles()
+            for profile in profiles[self._max_number_of_profiles :]:
+                for file_name in profile["files"]:
+                    os.remove(os.path.join(self._directory, file_name))
+
+    def _files(self):
+        if not os.path.isdir(self._directory):
+            return []
+        files = []
+        for entry in os.scandir(self._directory):
+            if entry.is_file() and entry.name.endswith((_CPU_SUFFIX, _MEMORY_SUFFIX)):
+                file_state = entry.stat()
+                files.append((entry.name, file_state.st_mtime, file_state.st_size))
+        return files
+
+
+def _base_name(file_name):
+    for suffix in (_CPU_SUFFIX, _MEMORY_SUFFIX):
+        if file_name.endswith(suffix):
+            return file_name[: -len(suffix)]
+    return file_name
+
+
+def _sanitize(name):
+    return "".join(character if character.isalnum() else "_" for character in name.strip("/"))
@@ -0,0 +1,94 @@
+# © 2024-2026 Fraunhofer-Gesellschaft e.V., München
+#
+# SPDX-License-Identifier: AGPL-3.0-or-later
+
+import contextlib
+import contextvars
+import threading
+import time
+
+# Recorder of the request that is currently processed in this thread/context.
+# If it is None, spans are not recorded at all.
+_current_recorder = contextvars.ContextVar("span_recorder", default=None)
+
+
+@contextlib.contextmanager
+def span(name):
+    # Measures the duration of a calculation stage, for example
+    # with span("interim_data"):
+    #     ...
+    recorder = _current_recorder.get()
+    if recorder is None:
+        yield
+        return
+    start_time = time.perf_counter()
+    try:
+        yield
+    finally:
+        recorder.record(name, time.perf_counter() - start_time)
+
+
+@contextlib.contextmanager
+def recording(statistics=None):
+    # Collects the spans of a single request. If statistics are given,
+    # the spans are added to them when the request has finished.
+    recorder = SpanRecorder()
+    token = _current_recorder.set(recorder)
+    try:
+        yield recorder
+    finally:
+        _current_recorder.reset(token)
+        if statistics is not None:
+            statistics.add(recorder)
+
+
+def record_spans(durations):
+    # Adds spans that have been recorded elsewhere, e.g. in a worker process of the
+    # calculation pool, to the recorder of the current request
+    recorder = _current_recorder.get()
+    if recorder is None:
+        return
+    for name, duration_in_seconds in durations.items():
+        recorder.record(name, duration_in_seconds)
+
+
+class SpanRecorder:
+    def __init__(self):
+        self._durations = {}
+
+    def record(self, name, duration_in_seconds):
+        self._durations[name] = self._durations.get(name, 0.0) + duration_in_seconds
+
+    def breakdown(self):
+        # maps span name => duration in seconds, in the order of the first occurrence
+        return dict(self._durations)
+
+    def server_timing(self):
+        # Value of the standard Server-Timing response header, durations in milliseconds
+        entries = [name + ";dur=" + f"{duration * 1000:.1f}" for name, duration in self._durations.items()]
+        return ", ".join(entries)
+
+
+class SpanStatistics:
+    # Aggregates spans across requests
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._statistics = {}
+
+    def add(self, recorder):
+        with self._lock:
+            for name, duration in recorder.breakdown().items():
+                entry = self._statistics.setdefault(
+                    name,
+                    {"count": 0, "totalInSeconds": 0.0, "maxInSeconds": 0.0},
+                )
+                entry["count"] += 1
+                entry["totalInSeconds"] += duration
+                entry["maxInSeconds"] = max(entry["maxInSeconds"], duration)
+
+    def summary(self):
+        with self._lock:
+            summary = {}
+            for name, entry in self._statistics.items():
+                summary[name] = entry | {"meanInSeconds": entry["totalInSeconds"] / entry["count"]}
+            return summary
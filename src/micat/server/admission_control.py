@@ -0,0 +1,162 @@
+# © 2024-2026 Fraunhofer-Gesellschaft e.V., München
+#
+# SPDX-License-Identifier: AGPL-3.0-or-later
+
+import threading
+import time
+
+# Heavy routes are grouped into route classes. Each route class gets its own
+# concurrency limit and wait queue, so that a burst of calculations can not
+# occupy all server threads and cheap lookups (e.g. /id_region) stay fast.
+DEFAULT_ROUTE_CLASSES = {
+    "calculation": {
+        "routes": ["/indicator_data", "/json_measure", "/json_measures"],
+        "maxConcurrency": 4,
+        "maxQueueLength": 4,
+        "maxWaitInSeconds": 60,
+        "retryAfterInSeconds": 10,
+    },
+    "template": {
+        "routes": ["/parameters", "/json_parameters"],
+        "maxConcurrency": 2,
+        "maxQueueLength": 2,
+        "maxWaitInSeconds": 30,
+        "retryAfterInSeconds": 5,
+    },
+    "export": {
+        "routes": ["/export-results"],
+        "maxConcurrency": 1,
+        "maxQueueLength": 1,
+        "maxWaitInSeconds": 30,
+        "retryAfterInSeconds": 5,
+    },
+}
+
+
+class RouteSaturatedError(Exception):
+    def __init__(self, route_class, status_code, retry_after_in_seconds):
+        self.route_class = route_class
+        self.status_code = status_code
+        self.retry_after_in_seconds = retry_after_in_seconds
+        message = 'Route class "' + route_class + '" is saturated. Please retry later.'
+        super().__init__(message)
+
+
+class AdmissionControl:
+    def __init__(self, route_class_settings=None):
+        route_classes = _merge_route_class_settings(route_class_settings)
+        self._lanes = {name: _Lane(name, settings) for name, settings in route_classes.items()}
+        self._route_classes_by_route = {}
+        for name, settings in route_classes.items():
+            for route in settings["routes"]:
+                self._route_classes_by_route[route] = name
+
+    def route_class(self, path):
+        # A route also includes its sub paths, e.g. "/export-results" includes
+        # "/export-results/<result_id>"
+        route = path
+        while route:
+            if route in self._route_classes_by_route:
+                return self._route_classes_by_route[route]
+            route = route.rpartition("/")[0]
+        return None
+
+    def acquire(self, route_class):
+        # Raises RouteSaturatedError if the request can not be admitted
+        lane = self._lanes[route_class]
+        lane.acquire()
+
+    def release(self, route_class):
+        lane = self._lanes[route_class]
+        lane.release()
+
+    def metrics(self):
+        return {name: lane.metrics() for name, lane in self._lanes.items()}
+
+
+class _Lane:
+    # pylint: disable=too-many-instance-attributes
+    def __init__(self, name, settings):
+        self._name = name
+        self._max_concurrency = settings["maxConcurrency"]
+        self._max_queue_length = settings["maxQueueLength"]
+        self._max_wait_in_seconds = settings["maxWaitInSeconds"]
+        self._retry_after_in_seconds = settings["retryAfterInSeconds"]
+        self._condition = threading.Condition()
+        self._number_of_active_requests = 0
+        self._queue_length = 0
+        self._max_observed_queue_length = 0
+        self._number_of_admitted_requests = 0
+        self._number_of_rejected_requests = 0
+        self._number_of_timed_out_requests = 0
+        self._total_wait_time_in_seconds = 0.0
+        self._max_wait_time_in_seconds = 0.0
+
+    def acquire(self):
+        with self._condition:
+            if self._number_of_active_requests < self._max_concurrency:
+                self._admit(0.0)
+                return
+
+            if self._queue_length >= self._max_queue_length:
+                self._number_of_rejected_requests += 1
+                raise RouteSaturatedError(self._name, 429, self._retry_after_in_seconds)
+
+            self._queue_length += 1
+            self._max_observed_queue_length = max(self._max_observed_queue_length, self._queue_length)
+            start_time = time.monotonic()
+            try:
+                is_admitted = self._condition.wait_for(
+                    lambda: self._number_of_active_requests < self._max_concurrency,
+                    timeout=self._max_wait_in_seconds,
+                )
+            finally:
+                self._queue_length -= 1
+
+            if not is_admitted:
+                self._number_of_timed_out_requests += 1
+                raise RouteSaturatedError(self._name, 503, self._retry_after_in_seconds)
+
+            self._admit(time.monotonic() - start_time)
+
+    def release(self):
+        with self._condition:
+            self._number_of_active_requests -= 1
+            self._condition.notify()
+
+    def metrics(self):
+        with self._condition:
+            number_of_admitted_requests = self._number_of_admitted_requests
+            mean_wait_time_in_seconds = 0.0
+            if number_of_admitted_requests > 0:
+                mean_wait_time_in_seconds = self._total_wait_time_in_seconds / number_of_admitted_requests
+            return {
+                "maxConcurrency": self._max_concurrency,
+                "maxQueueLength": self._max_queue_length,
+                "activeRequests": self._number_of_active_requests,
+                "queueLength": self._queue_length,
+                "maxObservedQueueLength": self._max_observed_queue_length,
+                "admittedRequests": number_of_admitted_requests,
+                "rejectedRequests": self._number_of_rejected_requests,
+                "timedOutRequests": self._number_of_timed_out_requests,
+                "totalWaitTimeInSeconds": self._total_wait_time_in_seconds,
+                "meanWaitTimeInSeconds": mean_wait_time_in_seconds,
+                "maxWaitTimeInSeconds": self._max_wait_time_in_seconds,
+            }
+
+    def _admit(self, wait_time_in_seconds):
+        self._number_of_active_requests += 1
+        self._number_of_admitted_requests += 1
+        self._total_wait_time_in_seconds += wait_time_in_seconds
+        self._max_wait_time_in_seconds = max(self._max_wait_time_in_seconds, wait_time_in_seconds)
+
+
+def _merge_route_class_settings(route_class_settings):
+    # Settings only need to include the entries that differ from the defaults
+    if route_class_settings is None:
+        route_class_settings = {}
+    route_classes = {}
+    for name in set(DEFAULT_ROUTE_CLASSES) | set(route_class_settings):
+        default_settings = DEFAULT_ROUTE_CLASSES.get(name, DEFAULT_ROUTE_CLASSES["calculation"] | {"routes": []})
+        route_classes[name] = default_settings | route_class_settings.get(name, {})
+    return route_classes
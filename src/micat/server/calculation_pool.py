@@ -0,0 +1,95 @@
+# © 2024-2026 Fraunhofer-Gesellschaft e.V., München
+#
+# SPDX-License-Identifier: AGPL-3.0-or-later
+
+import json
+import multiprocessing
+from concurrent.futures import ProcessPoolExecutor
+from urllib.parse import parse_qsl
+
+from werkzeug.datastructures import MultiDict
+
+from micat.input.database import Database
+from micat.log.logger import Logger
+from micat.monitoring.span import record_spans, recording
+
+# Databases of the current worker process, see _initialize_worker
+_worker_databases = {}
+
+
+class CalculationPool:
+    # Dispatches calculation jobs to a pool of worker processes, so that the
+    # pandas-heavy calculations are not serialized on the GIL of the server process.
+    # Each worker keeps its own database connections warm and is replaced by a
+    # fresh process after max_jobs_per_worker jobs, which limits memory growth.
+    # Only the request payload, the (JSON) result and the spans recorded in the worker
+    # cross the process boundary. The spans are added to the spans of the request,
+    # see micat.monitoring.span.
+
+    def __init__(
+        self,
+        database_path,
+        confidential_database_path,
+        number_of_workers=None,
+        max_jobs_per_worker=100,
+    ):
+        self._executor = ProcessPoolExecutor(
+            max_workers=number_of_workers,
+            mp_context=multiprocessing.get_context("spawn"),
+            initializer=_initialize_worker,
+            initargs=(database_path, confidential_database_path),
+            max_tasks_per_child=max_jobs_per_worker,
+        )
+
+    def run(self, job, http_request):
+        # The job needs to be a module level function with the arguments
+        # (request, database, confidential_database), so that it can be pickled
+        payload = WorkerRequest.payload(http_request)
+        future = self._executor.submit(_run_job, job, payload)
+        result, durations = future.result()
+        record_spans(durations)
+        return result
+
+    def shutdown(self):
+        self._executor.shutdown(wait=True, cancel_futures=True)
+
+
+class WorkerRequest:
+    # Replaces the flask request inside the worker processes. It provides the
+    # attributes that are used by the calculation and by the template builders.
+
+    def __init__(self, payload):
+        self.path = payload["path"]
+        self.query_string = payload["queryString"].encode()
+        self.content_type = payload["contentType"]
+        self.args = MultiDict(parse_qsl(payload["queryString"], keep_blank_values=True))
+        self.json = None
+        if self.content_type == "application/json":
+            self.json = json.loads(payload["body"])
+
+    @staticmethod
+    def payload(http_request):
+        payload = {
+            "path": http_request.path,
+            "queryString": http_request.query_string.decode(),
+            "contentType": http_request.content_type,
+            "body": http_request.get_data(as_text=True),
+        }
+        return payload
+
+
+def _initialize_worker(database_path, confidential_database_path):
+    _worker_databases["database"] = Database(database_path)
+    _worker_databases["confidential_database"] = Database(confidential_database_path)
+
+
+def _run_job(job, payload):
+    # Returns the result of the job and the durations of its spans
+    request = WorkerRequest(payload)
+    with Logger.scope(), recording() as recorder:
+        result = job(
+            request,
+            _worker_databases["database"],
+            _worker_databases["confidential_database"],
+        )
+    return result, recorder.breakdown()
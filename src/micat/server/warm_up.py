@@ -0,0 +1,83 @@
+# © 2024-2026 Fraunhofer-Gesellschaft e.V., München
+#
+# SPDX-License-Identifier: AGPL-3.0-or-later
+
+import threading
+import time
+
+from micat.log.logger import Logger
+
+
+class WarmUp:
+    # Preloads reference data after a deploy, so that the first requests for
+    # each region do not have to pay for cold SQLite pages and id table loads:
+    # * the database files are read once, which loads their pages into the page cache
+    #   of the operating system without keeping any table data in memory
+    # * id and mapping tables are loaded into the reference data cache of the databases
+    # * optionally, a synthetic request is run for each region
+    # The warm-up is best effort: errors are logged for each table and region, the
+    # remaining steps are run anyway and the instance is reported as ready afterwards.
+
+    def __init__(self, databases, synthetic_request=None):
+        self._databases = databases
+        self._synthetic_request = synthetic_request
+        self._is_finished = threading.Event()
+        self._duration_in_seconds = None
+        self._errors = []
+
+    def start(self):
+        thread = threading.Thread(target=self.run, name="warm-up", daemon=True)
+        thread.start()
+        return thread
+
+    def run(self):
+        start_time = time.monotonic()
+        try:
+            for database in self._databases:
+                # The fingerprint is calculated from the content of the file
+                self._attempt("pages of " + str(database), database.fingerprint)
+                self._preload_reference_tables(database)
+            if self._synthetic_request is not None:
+                for id_region in self._attempt("id_region", self._id_regions) or []:
+                    self._attempt("region " + str(id_region), self._synthetic_request, id_region)
+        finally:
+            self._duration_in_seconds = time.monotonic() - start_time
+            self._is_finished.set()
+
+    def is_ready(self):
+        return self._is_finished.is_set()
+
+    def status(self):
+        status = {
+            "ready": self.is_ready(),
+            "durationInSeconds": self._duration_in_seconds,
+            "errors": list(self._errors),
+        }
+        return status
+
+    def _attempt(self, description, function, *args):
+        # Returns the result of the function or None if it failed
+        try:
+            return function(*args)
+        except Exception as exception:  # pylint: disable=broad-except
+            message = "Warm-up of " + description + " failed: " + str(exception)
+            Logger.warn(message)
+            self._errors.append(message)
+            return None
+
+    def _id_regions(self):
+        id_region_table = self._databases[0].id_table("id_region")
+        return [int(id_region) for id_region in id_region_table.id_values]
+
+    def _preload_reference_tables(self, database):
+        for table_name in self._attempt("tables of " + str(database), self._table_names, database) or []:
+            if table_name.startswith("id_"):
+                self._attempt("table " + table_name, database.id_table, table_name)
+            elif table_name.startswith("mapping__"):
+                self._attempt("table " + table_name, database.mapping_table, table_name)
+
+    @staticmethod
+    def _table_names(database):
+        query = "SELECT name FROM sqlite_master WHERE type='table'"
+        table = database.query(query, {})
+        return list(table["name"].values)
@@ -2,6 +2,7 @@
 #
 # SPDX-License-Identifier: AGPL-3.0-or-later
 
+import base64
 import json
 
 import numpy as np
@@ -516,6 +517,13 @@ class Table(AbstractTable):
         result_data_frame = self._data_frame.clip(lower=0)
         return self._create(result_data_frame)
 
+    def row_chunks(self, number_of_rows):
+        # Yields the rows (see property rows) in chunks of at most number_of_rows rows,
+        # so that only a single chunk is converted to python lists at a time
+        for start in range(0, len(self._data_frame), number_of_rows):
+            chunk = self._data_frame.iloc[start : start + number_of_rows]
+            yield chunk.reset_index().values.tolist()
+
     def set_index(self, columns):
         for column_name in columns:
             if column_name not in self._data_frame.columns:
@@ -540,6 +548,30 @@ class Table(AbstractTable):
         sum_series = self._data_frame.sum()
         return AnnualSeries(sum_series)
 
+    def to_columnar_json(self):
+        # Compact alternative to to_custom_json: the values of each index column are listed
+        # once and the values of the other columns are encoded as a single base64 string of
+        # little-endian float64 numbers, column by column (numberOfRows values per column)
+        data_frame = self._data_frame
+        id_column_names = []
+        id_columns = []
+        if self._is_indexed(data_frame):
+            id_column_names = list(data_frame.index.names)
+            id_columns = [
+                data_frame.index.get_level_values(level).tolist() for level in range(data_frame.index.nlevels)
+            ]
+        _, year_column_names, _ = self.column_names
+        values = data_frame.to_numpy(dtype="<f8")
+        columnar_json = {
+            "idColumnNames": id_column_names,
+            "idColumns": id_columns,
+            "columnNames": [str(column_name) for column_name in data_frame.columns],
+            "yearColumnNames": year_column_names,
+            "numberOfRows": len(data_frame),
+            "values": base64.b64encode(values.T.tobytes()).decode("ascii"),
+        }
+        return columnar_json
+
     def to_custom_json(self):
         id_column_names, year_column_names, _ = self.column_names
         custom_json = {
@@ -0,0 +1,105 @@
+# © 2024-2026 Fraunhofer-Gesellschaft e.V., München
+#
+# SPDX-License-Identifier: AGPL-3.0-or-later
+
+# In-memory replacement for an xlsxwriter workbook, that only keeps the values of the
+# written cells. It is used to get the content of a template as data frames without
+# writing the workbook to an Excel file and parsing that file with pd.read_excel:
+# formats, data validations and sheet protection are ignored.
+
+import math
+import numbers
+
+import pandas as pd
+from pandas.io.parsers import TextParser
+
+
+class CellWorkbook:
+    def __init__(self):
+        self._sheets = {}
+
+    def add_worksheet(self, name):
+        sheet = CellSheet()
+        self._sheets[name] = sheet
+        return sheet
+
+    def add_format(self, _properties=None):
+        return None
+
+    def close(self):
+        pass
+
+    def data_frames(self):
+        # Returns a data frame for each sheet, as returned by pd.read_excel(..., sheet_name=None)
+        return {name: sheet.data_frame() for name, sheet in self._sheets.items()}
+
+
+class CellSheet:
+    def __init__(self):
+        # (row, col) => value
+        self._cells = {}
+
+    def write(self, row, col, value, _cell_format=None):
+        self._cells[(row, col)] = value
+
+    def write_row(self, row, col, data, _cell_format=None):
+        for index, value in enumerate(data):
+            self.write(row, col + index, value)
+
+    def write_column(self, row, col, data, _cell_format=None):
+        for index, value in enumerate(data):
+            self.write(row + index, col, value)
+
+    def set_row(self, *_args, **_kwargs):
+        pass
+
+    def set_column(self, *_args, **_kwargs):
+        pass
+
+    def data_validation(self, *_args, **_kwargs):
+        pass
+
+    def protect(self, *_args, **_kwargs):
+        pass
+
+    def hide(self):
+        pass
+
+    def data_frame(self):
+        # The first row is the header. Empty cells are read as NaN.
+        rows = self._rows()
+        if not rows:
+            return pd.DataFrame()
+        return TextParser(rows, header=0, skip_blank_lines=False).read()
+
+    def _rows(self):
+        # Rows of cell values up to the last row and column that include a value, as
+        # read by pandas from an Excel file
+        values = {position: _read_value(value) for position, value in self._cells.items()}
+        filled_positions = [position for position, value in values.items() if not _is_empty(value)]
+        if not filled_positions:
+            return []
+        number_of_rows = max(row for row, _col in filled_positions) + 1
+        number_of_cols = max(col for _row, col in filled_positions) + 1
+        return [[values.get((row, col), "") for col in range(number_of_cols)] for row in range(number_of_rows)]
+
+
+def _is_empty(value):
+    return isinstance(value, str) and value == ""
+
+
+def _read_value(value):
+    # Returns the value that is read from an Excel file for the written value:
+    # xlsxwriter stores numbers with 16 significant digits and pandas reads
+    # whole numbers as int; None and empty strings result in empty cells.
+    if value is None or _is_empty(value):
+        return ""
+    if isinstance(value, bool):
+        return value
+    if isinstance(value, numbers.Number):
+        number = float(f"{float(value):.16G}")
+        if not math.isfinite(number):
+            return math.nan
+        integer = int(number)
+        return integer if integer == number else number
+    return value
@@ -2,7 +2,8 @@
 #
 # SPDX-License-Identifier: AGPL-3.0-or-later
 
-from copy import copy
+import json
+from copy import copy, deepcopy
 
 import numpy as np
 import pandas as pd
@@ -29,6 +30,21 @@ def measure_specific_parameters_template(
     )
 
 
+def batch_measure_specific_parameters_template(
+    request,
+    database,
+    confidential_database,
+):
+    # Returns the measure specific parameter templates for a list of measures,
+    # in the order of the measures
+    template_args = _batch_template_args(request)
+    return _get_batch_measure_specific_data(
+        template_args,
+        database,
+        confidential_database,
+    )
+
+
 # pylint:disable=too-many-locals
 def _get_measure_specific_data(
     template_args,
@@ -36,17 +52,10 @@ def _get_measure_specific_data(
     confidential_database,
 ):
     measure = template_args["measure"]
-    population_of_municipality = population.population_of_municipality(measure)
 
     id_region = int(template_args["id_region"])
     results = {}
-    context = {
-        "id_region": id_region,
-        "id_subsector": int(measure["subsector"]["id"]),
-        "id_action_type": int(measure["action_type"]["id"]),
-        "unit": measure["unit"],
-        "population_of_municipality": population_of_municipality,
-    }
+    context = _measure_context(measure, id_region)
 
     final_energy_saving_or_capacities = _final_energy_saving_or_capacities(
         measure, context
@@ -101,13 +110,155 @@ def _get_measure_specific_data(
         is_renewable,
     )
 
-    results["context"] = [
+    results["context"] = _context_data(context)
+    return results
+
+
+def _get_batch_measure_specific_data(
+    template_args,
+    database,
+    confidential_database,
+):
+    # The measures share the data sources and the extrapolated parameters of the
+    # region. The affected fuels, the fuel switch data and the residential data are
+    # calculated once for each group of measures with equal id_subsector,
+    # id_action_type and years. Inside the batch, the position of a measure is used
+    # as id_measure, because the ids of new measures are not necessarily unique.
+    id_region = int(template_args["id_region"])
+    entries = []
+    for index, measure in enumerate(template_args["measures"]):
+        context = _measure_context(measure, id_region)
+        entries.append(
+            {
+                "index": index,
+                "context": context,
+                "savings": _final_energy_saving_or_capacities(
+                    measure | {"id": index}, context
+                ),
+                "global_parameters": measure.get("global_parameters"),
+            }
+        )
+
+    data_sources = {}
+    wuppertal_parameters_by_years = {}
+    results = [{} for _entry in entries]
+    for group_entries in _group_by(entries, _batch_group_key).values():
+        first_entry = group_entries[0]
+        context = first_entry["context"]
+        data_source_key = _data_source_key(first_entry)
+        if data_source_key not in data_sources:
+            data_sources[data_source_key] = DataSource(
+                database,
+                id_region,
+                confidential_database,
+                global_parameters=first_entry["global_parameters"],
+            )
+        data_source = data_sources[data_source_key]
+        years = first_entry["savings"].years
+        wuppertal_key = (data_source_key, tuple(years))
+        if wuppertal_key not in wuppertal_parameters_by_years:
+            wuppertal_parameters_by_years[wuppertal_key] = _wuppertal_parameters(
+                context,
+                first_entry["savings"],
+                data_source,
+            )
+        wuppertal_parameters = wuppertal_parameters_by_years[wuppertal_key]
+        is_renewable = context["id_subsector"] >= 30
+
+        for entry in group_entries:
+            results[entry["index"]]["main"] = _get_main_data(
+                entry["context"],
+                entry["savings"],
+                wuppertal_parameters,
+                data_source,
+                is_renewable,
+            )
+
+        group_savings = Table.concat([entry["savings"] for entry in group_entries])
+        fuel_data = _get_group_fuel_data(
+            context, group_savings, data_source, is_renewable
+        )
+        for entry in group_entries:
+            results[entry["index"]]["affectedFuels"] = fuel_data[entry["index"]]
+
+        if not is_renewable:
+            id_sector = _id_sector(context["id_subsector"], data_source)
+            fuel_switch_data = _get_fuel_switch_data(years, id_sector, data_source)
+            for entry in group_entries:
+                results[entry["index"]]["fuelSwitch"] = deepcopy(fuel_switch_data)
+
+        population_groups = _group_by(
+            group_entries, lambda entry: entry["context"]["population_of_municipality"]
+        )
+        for population_entries in population_groups.values():
+            residential_data = _get_group_residential_data(
+                population_entries[0]["context"],
+                Table.concat([entry["savings"] for entry in population_entries]),
+                wuppertal_parameters,
+                data_source,
+                is_renewable,
+            )
+            for entry in population_entries:
+                results[entry["index"]]["residential"] = residential_data[
+                    entry["index"]
+                ]
+
+    for entry, result in zip(entries, results):
+        result["context"] = _context_data(entry["context"])
+    return results
+
+
+def _batch_group_key(entry):
+    context = entry["context"]
+    return (
+        _data_source_key(entry),
+        context["id_subsector"],
+        context["id_action_type"],
+        tuple(entry["savings"].years),
+    )
+
+
+def _data_source_key(entry):
+    return json.dumps(entry["global_parameters"], sort_keys=True)
+
+
+def _group_by(entries, key_function):
+    # Groups the entries by the given key, keeping the order of first appearance
+    groups = {}
+    for entry in entries:
+        groups.setdefault(key_function(entry), []).append(entry)
+    return groups
+
+
+def _measure_context(measure, id_region):
+    context = {
+        "id_region": id_region,
+        "id_subsector": int(measure["subsector"]["id"]),
+        "id_action_type": int(measure["action_type"]["id"]),
+        "unit": measure["unit"],
+        "population_of_municipality": population.population_of_municipality(measure),
+    }
+    return context
+
+
+def _context_data(context):
+    return [
         {"id_region": "id_region", "0": context["id_region"]},
         {"id_region": "id_subsector", "0": context["id_subsector"]},
         {"id_region": "id_action_type", "0": context["id_action_type"]},
         {"id_region": "population", "0": context["population_of_municipality"]},
     ]
-    return results
+
+
+def _id_sector(id_subsector, data_source):
+    df = data_source.mapping_table("mapping__subsector__sector")._data_frame
+    return df.loc[df["id_subsector"] == id_subsector]["id_sector"].item()
+
+
+def _measure_frame(table, id_measure):
+    # Returns the rows of the given measure from a table that includes several measures
+    data_frame = table._data_frame
+    return data_frame[data_frame.index.get_level_values("id_measure") == id_measure]
 
 
 def _wuppertal_parameters(
@@ -382,57 +533,6 @@ def _get_fuel_data(
             for index, values in factors._data_frame.to_dict(orient="index").items():
                 data[index[2]] = data[index[2]] | values
     else:
-        data = {
-            1: {
-                "id_parameter": 16,
-                "id_final_energy_carrier": 1,
-                "label": "Share of electricity among affected",
-                "unit": "%",
-                "importance": "recommended",
-            },
-            2: {
-                "id_parameter": 16,
-                "id_final_energy_carrier": 2,
-                "label": "Share of oil among affected",
-                "unit": "%",
-                "importance": "recommended",
-            },
-            3: {
-                "id_parameter": 16,
-                "id_final_energy_carrier": 3,
-                "label": "Share of coal among affected",
-                "unit": "%",
-                "importance": "recommended",
-            },
-            4: {
-                "id_parameter": 16,
-                "id_final_energy_carrier": 4,
-                "label": "Share of gas among affected",
-                "unit": "%",
-                "importance": "recommended",
-            },
-            5: {
-                "id_parameter": 16,
-                "id_final_energy_carrier": 5,
-                "label": "Share of biomass and waste among affected",
-                "unit": "%",
-                "importance": "recommended",
-            },
-            6: {
-                "id_parameter": 16,
-                "id_final_energy_carrier": 6,
-                "label": "Share of heat among affected",
-                "unit": "%",
-                "importance": "recommended",
-            },
-            7: {
-                "id_parameter": 16,
-                "id_final_energy_carrier": 7,
-                "label": "Share of H2 and e-fuels among affected",
-                "unit": "%",
-                "importance": "recommended",
-            },
-        }
         share_affected = fuel_split.fuel_split_by_action_type(
             final_energy_saving_or_capacities,
             data_source,
@@ -440,9 +540,94 @@ def _get_fuel_data(
             subsector_ids,
             round=True,
         )
+        return _affected_fuel_data(share_affected._data_frame)
+
+    return list(data.values())
 
-        for index, values in share_affected._data_frame.to_dict(orient="index").items():
-            data[index[2]] = data[index[2]] | values
+
+def _get_group_fuel_data(
+    context,
+    final_energy_saving_or_capacities,
+    data_source,
+    is_renewable,
+):
+    # Returns the affected fuels for each measure of a group with equal id_subsector,
+    # id_action_type and years
+    measure_ids = final_energy_saving_or_capacities.unique_index_values("id_measure")
+    if is_renewable:
+        # The substitution factors do not depend on the savings of the measures
+        fuel_data = _get_fuel_data(
+            context, final_energy_saving_or_capacities, data_source, is_renewable
+        )
+        return {id_measure: deepcopy(fuel_data) for id_measure in measure_ids}
+    share_affected = fuel_split.fuel_split_by_action_type(
+        final_energy_saving_or_capacities,
+        data_source,
+        context["id_region"],
+        [context["id_subsector"]],
+        round=True,
+    )
+    return {
+        id_measure: _affected_fuel_data(_measure_frame(share_affected, id_measure))
+        for id_measure in measure_ids
+    }
+
+
+def _affected_fuel_data(share_affected_frame):
+    data = {
+        1: {
+            "id_parameter": 16,
+            "id_final_energy_carrier": 1,
+            "label": "Share of electricity among affected",
+            "unit": "%",
+            "importance": "recommended",
+        },
+        2: {
+            "id_parameter": 16,
+            "id_final_energy_carrier": 2,
+            "label": "Share of oil among affected",
+            "unit": "%",
+            "importance": "recommended",
+        },
+        3: {
+            "id_parameter": 16,
+            "id_final_energy_carrier": 3,
+            "label": "Share of coal among affected",
+            "unit": "%",
+            "importance": "recommended",
+        },
+        4: {
+            "id_parameter": 16,
+            "id_final_energy_carrier": 4,
+            "label": "Share of gas among affected",
+            "unit": "%",
+            "importance": "recommended",
+        },
+        5: {
+            "id_parameter": 16,
+            "id_final_energy_carrier": 5,
+            "label": "Share of biomass and waste among affected",
+            "unit": "%",
+            "importance": "recommended",
+        },
+        6: {
+            "id_parameter": 16,
+            "id_final_energy_carrier": 6,
+            "label": "Share of heat among affected",
+            "unit": "%",
+            "importance": "recommended",
+        },
+        7: {
+            "id_parameter": 16,
+            "id_final_energy_carrier": 7,
+            "label": "Share of H2 and e-fuels among affected",
+            "unit": "%",
+            "importance": "recommended",
+        },
+    }
+
+    for index, values in share_affected_frame.to_dict(orient="index").items():
+        data[index[2]] = data[index[2]] | values
 
     return list(data.values())
 
@@ -472,6 +657,77 @@ def _get_residential_data(
     wuppertal_parameters,
     data_source,
     is_renewable=None,
+):
+    number_of_affected_dwellings, dwelling_stock = _dwelling_tables(
+        context,
+        final_energy_saving_or_capacities,
+        data_source,
+    )
+    return _residential_data(
+        final_energy_saving_or_capacities.years,
+        number_of_affected_dwellings._data_frame,
+        dwelling_stock._data_frame,
+        wuppertal_parameters,
+        is_renewable,
+    )
+
+
+def _get_group_residential_data(
+    context,
+    final_energy_saving_or_capacities,
+    wuppertal_parameters,
+    data_source,
+    is_renewable,
+):
+    # Returns the residential data for each measure of a group with equal id_subsector,
+    # id_action_type, years and population of municipality
+    number_of_affected_dwellings, dwelling_stock = _dwelling_tables(
+        context,
+        final_energy_saving_or_capacities,
+        data_source,
+    )
+    measure_ids = final_energy_saving_or_capacities.unique_index_values("id_measure")
+    return {
+        id_measure: _residential_data(
+            final_energy_saving_or_capacities.years,
+            _measure_frame(number_of_affected_dwellings, id_measure),
+            _measure_frame(dwelling_stock, id_measure),
+            wuppertal_parameters,
+            is_renewable,
+        )
+        for id_measure in measure_ids
+    }
+
+
+def _dwelling_tables(
+    context,
+    final_energy_saving_or_capacities,
+    data_source,
+):
+    id_region = context["id_region"]
+    population_of_municipality = context["population_of_municipality"]
+
+    number_of_affected_dwellings = dwelling.number_of_affected_dwellings(
+        final_energy_saving_or_capacities,
+        data_source,
+        id_region,
+        population_of_municipality,
+    )
+    dwelling_stock = dwelling.dwelling_stock(
+        final_energy_saving_or_capacities,
+        data_source,
+        id_region,
+        population_of_municipality,
+    )
+    return number_of_affected_dwellings, dwelling_stock
+
+
+def _residential_data(
+    years,
+    number_of_affected_dwellings_frame,
+    dwelling_stock_frame,
+    wuppertal_parameters,
+    is_renewable,
 ):
     data = {
         "number_of_affected_dwellings": {
@@ -499,40 +755,22 @@ def _get_residential_data(
             "importance": "optional",
         },
     }
-    id_region = context["id_region"]
-    population_of_municipality = context["population_of_municipality"]
-
-    number_of_affected_dwellings = dwelling.number_of_affected_dwellings(
-        final_energy_saving_or_capacities,
-        data_source,
-        id_region,
-        population_of_municipality,
-    )
     data["number_of_affected_dwellings"] = (
         data["number_of_affected_dwellings"]
-        | number_of_affected_dwellings._data_frame.to_dict(orient="records")[0]
+        | number_of_affected_dwellings_frame.to_dict(orient="records")[0]
     )
 
     # TODO: Annual renovation rate is not available yet
     data["annual_renovation_rate"] = data["annual_renovation_rate"] | {
-        str(y): 0 for y in final_energy_saving_or_capacities.years
+        str(y): 0 for y in years
     }
     energy_poverty_target = wuppertal_parameters.reduce("id_parameter", 25)
     data["energy_poverty_target"] = (
         data["energy_poverty_target"] | energy_poverty_target._series.to_dict()
     )
 
-    id_region = context["id_region"]
-    population_of_municipality = context["population_of_municipality"]
-    dwelling_stock = dwelling.dwelling_stock(
-        final_energy_saving_or_capacities,
-        data_source,
-        id_region,
-        population_of_municipality,
-    )
     data["total_dwelling_stock"] = (
-        data["total_dwelling_stock"]
-        | dwelling_stock._data_frame.to_dict(orient="records")[0]
+        data["total_dwelling_stock"] | dwelling_stock_frame.to_dict(orient="records")[0]
     )
 
     if not is_renewable:
@@ -747,3 +985,12 @@ def _template_args(request):
         "global_parameters": measure.get("global_parameters"),
     }
     return args
+
+
+def _batch_template_args(request):
+    query_dict = api.parse_request(request)
+    args = {
+        "measures": query_dict["json"],
+        "id_region": query_dict["id_region"],
+    }
+    return args
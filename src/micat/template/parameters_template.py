@@ -10,6 +10,7 @@ import pandas as pd
 
 from micat.table import table
 from micat.template import constants, database_utils, validators, xlsx_utils
+from micat.template.cell_workbook import CellWorkbook
 from micat.utils import api
 from micat.calculation import extrapolation
 
@@ -20,6 +21,15 @@ def parameters_template(request, database, confidential_database=None):
     return template_bytes
 
 
+def parameters_data_frames(request, database, confidential_database=None):
+    # Returns the sheets of the parameters template as data frames, as read with
+    # pd.read_excel(..., sheet_name=None), without writing and parsing an Excel file
+    template_args = _template_args(request)
+    workbook = CellWorkbook()
+    _write_parameter_sheets(workbook, template_args, database, confidential_database)
+    return workbook.data_frames()
+
+
 def _template_args(request):
     query = api.parse_request(request)
     id_region = int(query["id_region"])
@@ -41,6 +51,14 @@ def _template_args(request):
 
 
 def _parameters_template(template_args, database, confidential_database):
+    template_bytes = io.BytesIO()
+    workbook = xlsx_utils.empty_workbook(template_bytes)
+    _write_parameter_sheets(workbook, template_args, database, confidential_database)
+    workbook.close()
+    return template_bytes
+
+
+def _write_parameter_sheets(workbook, template_args, database, confidential_database):
     id_subsector_table = database.id_table("id_subsector")
     id_final_energy_carrier_table = database.id_table("id_final_energy_carrier")
     id_primary_energy_carrier_table = database.id_table("id_primary_energy_carrier")
@@ -50,9 +68,6 @@ def _parameters_template(template_args, database, confidential_database):
         template_args["years"].append("2020")
         template_args["ignore_years"] = ["2020"]
 
-    template_bytes = io.BytesIO()
-    workbook = xlsx_utils.empty_workbook(template_bytes)
-
     for sheet_name in template_args["coefficient_sheets"]:
         if sheet_name == "FuelSplitCoefficient":
             _subsector_final_create_parameter_sheet(
@@ -98,8 +113,6 @@ def _parameters_template(template_args, database, confidential_database):
         id_final_energy_carrier_table,
         id_primary_energy_carrier_table,
     )
-    workbook.close()
-    return template_bytes
 
 
 def _monetization_create_parameter_sheet(
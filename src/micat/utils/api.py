@@ -2,7 +2,9 @@
 #
 # SPDX-License-Identifier: AGPL-3.0-or-later
 
-from urllib.parse import parse_qs
+import hashlib
+import json
+from urllib.parse import parse_qs, parse_qsl
 
 
 def parse_request(http_request):
@@ -18,3 +20,21 @@ def parse_request(http_request):
         else:
             raise AttributeError('Query must include the savings table as an array of arrays in the JSON body')
     return query_dict
+
+
+def request_key(http_request):
+    # Returns a hash that is equal for requests that produce equal results:
+    # The JSON body is canonicalized (sorted keys, no whitespace) and combined
+    # with the route and the sorted query parameters (including id_region).
+    query_parameters = sorted(parse_qsl(http_request.query_string.decode(), keep_blank_values=True))
+    json_body = http_request.get_json(silent=True)
+    if json_body is None:
+        json_body = http_request.get_data(as_text=True)
+    canonical_request = {
+        'path': http_request.path,
+        'query': query_parameters,
+        'body': json_body,
+    }
+    canonical_string = json.dumps(canonical_request, sort_keys=True, separators=(',', ':'))
+    key = hashlib.sha256(canonical_string.encode('utf-8')).hexdigest()
+    return key
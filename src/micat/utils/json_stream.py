@@ -0,0 +1,32 @@
+# © 2024-2026 Fraunhofer-Gesellschaft e.V., München
+#
+# SPDX-License-Identifier: AGPL-3.0-or-later
+
+import json
+
+NUMBER_OF_ROWS_PER_CHUNK = 1000
+
+
+def result_table_chunks(tables, number_of_rows_per_chunk=NUMBER_OF_ROWS_PER_CHUNK):
+    # Yields the JSON of the result tables in chunks. Only the rows of a single chunk
+    # are converted to python lists at a time. The joined chunks equal
+    # json.dumps({key: table.to_custom_json() for key, table in tables.items()}, sort_keys=True)
+    yield "{"
+    for index, key in enumerate(sorted(tables)):
+        if index > 0:
+            yield ", "
+        yield json.dumps(key) + ": "
+        yield from _table_chunks(tables[key], number_of_rows_per_chunk)
+    yield "}"
+
+
+def _table_chunks(table, number_of_rows_per_chunk):
+    id_column_names, year_column_names, _ = table.column_names
+    yield '{"idColumnNames": ' + json.dumps(id_column_names) + ', "rows": ['
+    is_first_chunk = True
+    for rows in table.row_chunks(number_of_rows_per_chunk):
+        separator = "" if is_first_chunk else ", "
+        # strip the brackets of the list, so that the chunks form a single list
+        yield separator + json.dumps(rows)[1:-1]
+        is_first_chunk = False
+    yield '], "yearColumnNames": ' + json.dumps(year_column_names) + "}"
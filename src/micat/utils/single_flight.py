@@ -0,0 +1,62 @@
+# © 2024-2026 Fraunhofer-Gesellschaft e.V., München
+#
+# SPDX-License-Identifier: AGPL-3.0-or-later
+
+import threading
+
+
+class SingleFlight:
+    # Deduplicates concurrent executions of identical work:
+    # The first caller for a key executes the function. Callers that arrive
+    # with the same key while that execution is still running wait for it and
+    # share its result (or its exception) instead of starting a new execution.
+    # Once the execution has finished, the key is released; there is no caching.
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._calls = {}
+        self.number_of_coalesced_calls = 0
+
+    def do(self, key, function):
+        with self._lock:
+            call = self._calls.get(key)
+            is_leader = call is None
+            if is_leader:
+                call = _Call()
+                self._calls[key] = call
+            else:
+                self.number_of_coalesced_calls += 1
+
+        if is_leader:
+            return self._execute(key, call, function)
+        else:
+            return call.wait()
+
+    def number_of_calls_in_flight(self):
+        with self._lock:
+            return len(self._calls)
+
+    def _execute(self, key, call, function):
+        try:
+            call.result = function()
+            return call.result
+        except Exception as exception:
+            call.exception = exception
+            raise
+        finally:
+            with self._lock:
+                del self._calls[key]
+            call.done.set()
+
+
+class _Call:
+    def __init__(self):
+        self.done = threading.Event()
+        self.result = None
+        self.exception = None
+
+    def wait(self):
+        self.done.wait()
+        if self.exception is not None:
+            raise self.exception
+        return self.result
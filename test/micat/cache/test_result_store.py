@@ -0,0 +1,67 @@
+# © 2024-2026 Fraunhofer-Gesellschaft e.V., München
+#
+# SPDX-License-Identifier: AGPL-3.0-or-later
+
+# pylint: disable=protected-access
+import pytest
+
+from micat.cache.result_store import ResultStore
+from micat.log.logger import Logger
+from micat.test_utils.isi_mock import patch
+
+
+@pytest.fixture(name="sut")
+def fixture_sut(tmp_path):
+    return ResultStore(str(tmp_path / "result_store.sqlite"), max_size_in_bytes=1000)
+
+
+class TestKey:
+    def test_depends_on_fingerprints(self):
+        first_key = ResultStore.key("mocked_request_key", ["a", "b"])
+        second_key = ResultStore.key("mocked_request_key", ["a", "c"])
+        assert first_key != second_key
+
+    def test_is_deterministic(self):
+        first_key = ResultStore.key("mocked_request_key", ["a", None])
+        second_key = ResultStore.key("mocked_request_key", ["a", None])
+        assert first_key == second_key
+
+
+class TestGetAndPut:
+    def test_missing_key(self, sut):
+        assert sut.get("missing_key") is None
+        assert sut.get_string("missing_key") is None
+
+    def test_put_and_get(self, sut):
+        sut.put_string("mocked_key", '{"foo": 1}')
+        assert sut.get_string("mocked_key") == '{"foo": 1}'
+
+    def test_survives_new_instance(self, sut, tmp_path):
+        sut.put("mocked_key", b"mocked_value")
+        another_store = ResultStore(str(tmp_path / "result_store.sqlite"))
+        assert another_store.get("mocked_key") == b"mocked_value"
+
+    @patch(Logger.warn)
+    def test_too_large_value(self, sut):
+        sut._max_size_in_bytes = 1
+        sut.put("mocked_key", b"mocked_value")
+        assert sut.get("mocked_key") is None
+        Logger.warn.assert_called_once()  # pylint: disable=no-member
+
+
+class TestEviction:
+    def test_evicts_least_recently_used(self, sut):
+        sut.put("first", b"x" * 10)
+        sut.put("second", b"y" * 10)
+        size_of_two_entries = sut.size()
+        sut._max_size_in_bytes = size_of_two_entries
+        sut.get("first")  # first is now more recently used than second
+        sut.put("third", b"z" * 10)
+
+        assert sut.get("first") == b"x" * 10
+        assert sut.get("second") is None
+        assert sut.get("third") == b"z" * 10
+        assert sut.size() <= size_of_two_entries
+
+    def test_size_of_empty_store(self, sut):
+        assert sut.size() == 0
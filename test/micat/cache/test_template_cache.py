@@ -0,0 +1,119 @@
+# © 2024-2026 Fraunhofer-Gesellschaft e.V., München
+#
+# SPDX-License-Identifier: AGPL-3.0-or-later
+
+# pylint: disable=protected-access
+import threading
+
+import pytest
+
+from micat.cache.template_cache import TemplateCache
+from micat.log.logger import Logger
+from micat.test_utils.isi_mock import MagicMock, Mock, patch
+
+
+@pytest.fixture(name="sut")
+def fixture_sut():
+    return TemplateCache(max_number_of_entries=2)
+
+
+class TestKey:
+    def test_depends_on_fingerprints(self):
+        first_key = TemplateCache.key("xlsx", 2, ["2020"], ["a"])
+        second_key = TemplateCache.key("xlsx", 2, ["2020"], ["b"])
+        assert first_key != second_key
+
+    def test_depends_on_format(self):
+        first_key = TemplateCache.key("xlsx", 2, [], ["a"])
+        second_key = TemplateCache.key("json:records", 2, [], ["a"])
+        assert first_key != second_key
+
+    def test_normalizes_values(self):
+        first_key = TemplateCache.key("xlsx", 2, [2020, 2030], ["a", None])
+        second_key = TemplateCache.key("xlsx", "2", ["2020", "2030"], ["a", "None"])
+        assert first_key == second_key
+
+
+class TestGetOrCreate:
+    def test_creates_once(self, sut):
+        create = MagicMock(return_value=b"mocked_template")
+        assert sut.get_or_create("mocked_key", create) == b"mocked_template"
+        assert sut.get_or_create("mocked_key", create) == b"mocked_template"
+        assert create.call_count == 1
+        assert sut.number_of_hits == 1
+        assert sut.number_of_misses == 1
+
+    def test_does_not_store_errors(self, sut):
+        create = Mock(side_effect=ValueError("mocked_error"))
+        with pytest.raises(ValueError):
+            sut.get_or_create("mocked_key", create)
+        assert len(sut) == 0
+
+    def test_evicts_least_recently_used(self, sut):
+        sut.get_or_create("first", lambda: 1)
+        sut.get_or_create("second", lambda: 2)
+        sut.get_or_create("first", lambda: 1)  # first is now more recently used than second
+        sut.get_or_create("third", lambda: 3)
+        assert list(sut._entries) == ["first", "third"]
+
+    def test_coalesces_concurrent_misses(self, sut):
+        started = threading.Event()
+        release = threading.Event()
+        create = MagicMock()
+
+        def slow_create():
+            create()
+            started.set()
+            release.wait()
+            return "mocked_template"
+
+        thread = threading.Thread(target=sut.get_or_create, args=("mocked_key", slow_create))
+        thread.start()
+        started.wait()
+        results = []
+        follower = threading.Thread(target=lambda: results.append(sut.get_or_create("mocked_key", slow_create)))
+        follower.start()
+        release.set()
+        thread.join()
+        follower.join()
+        assert results == ["mocked_template"]
+        assert create.call_count == 1
+
+
+def test_clear(sut):
+    sut.get_or_create("mocked_key", lambda: 1)
+    sut.clear()
+    assert len(sut) == 0
+
+
+class TestPreGenerate:
+    @patch(Logger.info)
+    def test_generates_all_regions(self, sut):
+        generate = MagicMock()
+        number_of_regions = sut.pre_generate(lambda: [0, 1, 2], generate)
+        assert number_of_regions == 3
+        assert [call.args[0] for call in generate.mock_calls] == [0, 1, 2]
+
+    @patch(Logger.info)
+    @patch(Logger.warn)
+    def test_continues_after_error(self, sut):
+        generate = Mock(side_effect=[ValueError("mocked_error"), None])
+        number_of_regions = sut.pre_generate(lambda: [0, 1], generate)
+        assert number_of_regions == 1
+        Logger.warn.assert_called_once()  # pylint: disable=no-member
+
+    @patch(Logger.info)
+    @patch(Logger.warn)
+    def test_without_regions(self, sut):
+        id_regions_provider = Mock(side_effect=ValueError("mocked_error"))
+        number_of_regions = sut.pre_generate(id_regions_provider, MagicMock())
+        assert number_of_regions == 0
+        Logger.warn.assert_called_once()  # pylint: disable=no-member
+
+    @patch(Logger.info)
+    def test_start_pre_generation(self, sut):
+        generate = MagicMock()
+        thread = sut.start_pre_generation(lambda: [4], generate)
+        thread.join()
+        assert thread.name == "template-cache"
+        generate.assert_called_once_with(4)
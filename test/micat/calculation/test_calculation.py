@@ -3,11 +3,13 @@
 # SPDX-License-Identifier: AGPL-3.0-or-later
 
 # pylint: disable=protected-access
+import json
 import os
 
 from micat.calculation import calculation
 from micat.calculation.ecologic import calculation_ecologic, energy_saving
 from micat.calculation.economic import calculation_economic, eurostat, population
+from micat.calculation.interim_store import InterimStore
 from micat.calculation.social import calculation_social
 from micat.series.annual_series import AnnualSeries
 from micat.table.id_table import IdTable
@@ -143,6 +145,25 @@ class TestPublicApi:
 
         assert result == "mocked_result"
 
+    @patch(print)
+    @patch(calculation._translate_result_tables, Mock(side_effect=lambda tables, _data_source: tables))
+    def test_calculate_indicator_data_with_bounded_memory(self):
+        def mocked_calculate_indicators(_http_request, _database, _confidential_database, handle_result_tables):
+            social_table = Mock()
+            social_table.to_custom_json = Mock({"2020": 1})
+            handle_result_tables({"b_social": social_table}, "mocked_data_source")
+            economic_table = Mock()
+            economic_table.to_custom_json = Mock([2, 3])
+            handle_result_tables({"a_economic": economic_table}, "mocked_data_source")
+
+        with patch(calculation._calculate_indicators, Mock(side_effect=mocked_calculate_indicators)):
+            result = calculation.calculate_indicator_data_with_bounded_memory(
+                "request_mock",
+                "mocked_database",
+                "mocked_confidential_database",
+            )
+        assert result == json.dumps({"b_social": {"2020": 1}, "a_economic": [2, 3]}, sort_keys=True)
+
 
 class TestPrivateApi:
     @patch(
@@ -233,6 +254,62 @@ class TestPrivateApi:
         calculation._add_renewables_and_other,
         Mock("mocked_result"),
     )
+    # <editor-fold desc="Fold @patch">
+    @patch(
+        calculation._front_end_arguments,
+        mocked_front_end_arguments(),
+    )
+    @patch_property(
+        Table.years,
+        [2020, 2025, 2030],
+    )
+    @patch(
+        calculation._interim_data,
+        ("interim_data", "heat_saving_final", "electricity_saving_final"),
+    )
+    @patch(
+        calculation_social.social_indicators,
+        {"mocked_social_indicator": "foo", "mocked_duplicate": "social"},
+    )
+    @patch(
+        calculation_economic.economic_indicators,
+        {"mocked_economic_indicator": "baa"},
+    )
+    @patch(
+        calculation_ecologic.ecologic_indicators,
+        {"mocked_ecologic_indicator": "qux", "mocked_duplicate": "ecologic"},
+    )
+    @patch(
+        calculation.cost_benefit_analysis.parameters,
+        {"mocked_lifetime": "qux"},
+    )
+    @patch(calculation._validate_data)
+    # </editor-fold>
+    def test_calculate_indicators(self, _mocked_year_property):
+        handled_tables = []
+
+        def handle_result_tables(tables, data_source):
+            assert isinstance(data_source, calculation.DataSource)
+            handled_tables.append(tables)
+
+        result = calculation._calculate_indicators(
+            "request_mock",
+            "mocked_database",
+            "mocked_confidential_database",
+            handle_result_tables,
+        )
+        assert isinstance(result, calculation.DataSource)
+        assert [list(tables) for tables in handled_tables] == [
+            ["mocked_social_indicator", "mocked_duplicate"],
+            ["mocked_economic_indicator"],
+            ["mocked_ecologic_indicator", "mocked_duplicate"],
+            ["mocked_lifetime"],
+        ]
+        ecologic_arguments = calculation_ecologic.ecologic_indicators.call_args[0]
+        assert ecologic_arguments[0] == "interim_data"
+        economic_arguments = calculation_economic.economic_indicators.call_args[0]
+        assert economic_arguments[3] == {"mocked_ecologic_indicator": "qux", "mocked_duplicate": "ecologic"}
+
     def test_convert_result_tables_to_json(self):
         mocked_result_table = Mock()
         mocked_result_table.to_custom_json = Mock("mocked_json")
@@ -367,6 +444,40 @@ class TestPrivateApi:
         assert len(result) == 3
         assert len(result[0]) == 8
 
+    class TestInterimTables:
+        @patch(
+            calculation._interim_data,
+            ("interim_data", "heat_saving_final", "electricity_saving_final"),
+        )
+        @patch(calculation._validate_data)
+        @patch(calculation.calculate_energy_produced)
+        def test_without_renewables(self):
+            arguments = {"final_energy_saving_or_capacities": mocked_savings()}
+            result = calculation._interim_tables(arguments, "mocked_data_source", 1, [2020])
+            assert isinstance(result, InterimStore)
+            assert result.get("interim_data") == "interim_data"
+            assert result.get("final_energy_saving_or_capacities") is arguments["final_energy_saving_or_capacities"]
+            assert result.get("installed_capacity") is not arguments["final_energy_saving_or_capacities"]
+            calculation.calculate_energy_produced.assert_not_called()
+
+        @patch(
+            calculation._interim_data,
+            ("interim_data", "heat_saving_final", "electricity_saving_final"),
+        )
+        @patch(calculation._validate_data)
+        @patch(calculation.calculate_energy_produced, "mocked_energy_produced")
+        def test_with_renewables(self):
+            savings = Table(
+                [
+                    {"id_measure": 1, "id_subsector": 30, "id_action_type": 1, "2020": 5},
+                ]
+            )
+            result = calculation._interim_tables(
+                {"final_energy_saving_or_capacities": savings}, "mocked_data_source", 1, [2020]
+            )
+            assert result.get("final_energy_saving_or_capacities") == "mocked_energy_produced"
+            assert result.get("installed_capacity")["2020"][1, 30, 1] == 5
+
     def test_mapping_from_final_to_primary_energy_carrier(self):
         database = Mock()
         database.mapping_table = Mock("mocked_result")
@@ -567,3 +678,29 @@ class TestPrivateApi:
             table = table.insert_index_column("id_foo", 1, 1)
             with raises(KeyError):
                 calculation._validate_remaining_index_column_names(table)
+
+
+class TestIncrementalSerializer:
+    @patch(calculation._translate_result_tables, Mock(side_effect=lambda tables, _data_source: tables))
+    def test_add(self):
+        first_table = Mock()
+        first_table.to_custom_json = Mock({"b": 1, "a": 2})
+        second_table = Mock()
+        second_table.to_custom_json = Mock("second")
+        third_table = Mock()
+        third_table.to_custom_json = Mock("third")
+        serializer = calculation._IncrementalSerializer()
+        serializer.add({"first": first_table, "duplicate": second_table}, "mocked_data_source")
+        serializer.add({"duplicate": third_table}, "mocked_data_source")
+        assert serializer._serialized_tables == {"first": '{"a": 2, "b": 1}', "duplicate": '"third"'}
+
+    def test_json_string(self):
+        serializer = calculation._IncrementalSerializer()
+        serializer._serialized_tables = {"b": "[1]", "a": '{"x": 2}'}
+        result = serializer.json_string()
+        assert result == json.dumps({"a": {"x": 2}, "b": [1]}, sort_keys=True)
+        assert json.loads(result) == {"a": {"x": 2}, "b": [1]}
+
+    def test_json_string_without_tables(self):
+        serializer = calculation._IncrementalSerializer()
+        assert serializer.json_string() == "{}"
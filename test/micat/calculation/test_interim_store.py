@@ -0,0 +1,45 @@
+# © 2024-2026 Fraunhofer-Gesellschaft e.V., München
+#
+# SPDX-License-Identifier: AGPL-3.0-or-later
+
+import pytest
+
+from micat.calculation.interim_store import InterimStore
+from micat.test_utils.isi_mock import raises
+
+
+@pytest.fixture(name="sut")
+def fixture_sut():
+    return InterimStore(
+        {
+            "interim_data": ["social", "ecologic"],
+            "installed_capacity": ["ecologic"],
+            "unused": ["social"],
+        }
+    )
+
+
+class TestPut:
+    def test_with_consumers(self, sut):
+        sut.put("interim_data", "mocked_interim_data")
+        assert sut.get("interim_data") == "mocked_interim_data"
+
+    def test_without_consumers(self, sut):
+        with raises(KeyError):
+            sut.put("mocked_name", "mocked_table")
+
+
+def test_get_without_table(sut):
+    with raises(KeyError):
+        sut.get("interim_data")
+
+
+def test_finish(sut):
+    sut.put("interim_data", "mocked_interim_data")
+    sut.put("installed_capacity", "mocked_installed_capacity")
+    assert sut.finish("social") == []
+    assert sut.names == ["interim_data", "installed_capacity"]
+    assert sut.finish("ecologic") == ["interim_data", "installed_capacity"]
+    assert sut.names == []
+    with raises(KeyError):
+        sut.get("interim_data")
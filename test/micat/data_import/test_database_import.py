@@ -9,8 +9,11 @@ import sqlite3
 import pandas
 
 from micat.data_import.database_import import DatabaseImport
+from micat.data_import.import_orchestrator import ImportOrchestrator
 from micat.input.database import Database
+from micat.log.logger import Logger
 from micat.table.mapping_table import MappingTable
+from micat.table.table import Table
 from micat.test_utils.isi_mock import (
     Mock,
     #disable_stdout,
@@ -131,6 +134,21 @@ class TestPublicApi:
             result = DatabaseImport._is_extra_row("foo", ["baa"])
             assert result is True
 
+    @patch(
+        DatabaseImport._file_names,
+        ["mocked_folder/b_first.py"],
+    )
+    @patch(ImportOrchestrator.__init__, Mock(return_value=None))
+    @patch(ImportOrchestrator.run, Mock(return_value={"b_first.py": 1.0}))
+    def test_execute_import_scripts_in_folder(self):
+        result = DatabaseImport.execute_import_scripts_in_folder(
+            "mocked_src_path",
+            "mocked_folder",
+            number_of_workers=2,
+        )
+        assert result == {"b_first.py": 1.0}
+        ImportOrchestrator.__init__.assert_called_once_with("mocked_src_path", ["mocked_folder/b_first.py"], 2, None)
+
     @patch(sqlite3.connect)
     def test_append_to_sqlite(self, sut):
         sut._table_validator.validate = Mock()
@@ -262,10 +280,10 @@ class TestPublicApi:
 
         mocked_table = Mock()
 
-        with patch(DatabaseImport._recreate_data_table) as mocked_recreate:
+        with patch(DatabaseImport._bulk_write) as mocked_bulk_write:
             sut.write_to_sqlite(mocked_table, "mocked_table_name")
 
-            mocked_recreate.assert_called_once()
+            mocked_bulk_write.assert_called_once()
 
 
 class TestPrivateApi:
@@ -445,6 +463,66 @@ class TestPrivateApi:
 
             assert result._name == "mocked_table_name"
 
+    @fixture(name="connection")
+    def connection_fixture(self):
+        connection = sqlite3.connect(":memory:")
+        connection.execute("CREATE TABLE id_region (id integer PRIMARY KEY NOT NULL, label text)")
+        connection.executemany("INSERT INTO id_region VALUES (?, ?)", [(1, "DE"), (2, "FR")])
+        connection.commit()
+        yield connection
+        connection.close()
+
+    class TestBulkWrite:
+        @patch(Logger.info)
+        def test_normal_usage(self, connection):
+            table = Table(pandas.DataFrame({"id_region": [1, 2], "2020": [1.0, 2.0]}))
+            result = DatabaseImport._bulk_write("mocked_table", table, connection)
+            assert result == 2
+            rows = connection.execute("SELECT * FROM mocked_table").fetchall()
+            assert rows == [(0, 1, 1.0), (1, 2, 2.0)]
+            index_names = connection.execute(
+                "SELECT name FROM sqlite_master WHERE type='index' AND tbl_name='mocked_table'"
+            ).fetchall()
+            assert index_names == [("mocked_table__key",)]
+            assert "rows/s" in Logger.info.call_args[0][0]
+
+        @patch(Logger.info)
+        def test_unchanged_table(self, connection):
+            table = Table(pandas.DataFrame({"id_region": [1, 2], "2020": [1.0, 2.0]}))
+            DatabaseImport._bulk_write("mocked_table", table, connection)
+            result = DatabaseImport._bulk_write("mocked_table", table, connection)
+            assert result == 0
+            assert "did not change" in Logger.info.call_args[0][0]
+            connection.execute("DROP TABLE mocked_table")
+            result = DatabaseImport._bulk_write("mocked_table", table, connection)
+            assert result == 2
+
+        @patch(Logger.warn)
+        def test_duplicated_entries(self, connection):
+            table = Table(pandas.DataFrame({"id_region": [1, 2], "2020": [1.0, 2.0]}))
+            with patch(Logger.info):
+                DatabaseImport._bulk_write("mocked_table", table, connection)
+            duplicated_table = Table(pandas.DataFrame({"id_region": [1, 1], "2020": [1.0, 2.0]}))
+            with raises(sqlite3.IntegrityError):
+                with connection:
+                    DatabaseImport._bulk_write("mocked_table", duplicated_table, connection)
+            assert Logger.warn.call_count == 2
+            rows = connection.execute("SELECT * FROM mocked_table").fetchall()
+            assert rows == [(0, 1, 1.0), (1, 2, 2.0)]
+
+    class TestInsertQueryAndRows:
+        def test_without_id(self):
+            data_frame = pandas.DataFrame({"id_region": [1, 2], "2020": [1.0, 2.0]})
+            query, rows = DatabaseImport._insert_query_and_rows("mocked_table", data_frame)
+            assert query == "INSERT INTO `mocked_table` (id, `id_region`, `2020`) VALUES (?, ?, ?)"
+            assert list(rows) == [(0, 1, 1.0), (1, 2, 2.0)]
+
+        def test_with_id(self):
+            data_frame = pandas.DataFrame({"id": [5, 6], "id_region": [1, 2]})
+            query, rows = DatabaseImport._insert_query_and_rows("mocked_table", data_frame)
+            assert query == "INSERT INTO `mocked_table` (`id`, `id_region`) VALUES (?, ?)"
+            assert list(rows) == [(5, 1), (6, 2)]
+
     @patch(
         DatabaseImport._key_column_names,
         ["mocked_key_column"],
@@ -0,0 +1,138 @@
+# © 2024-2026 Fraunhofer-Gesellschaft e.V., München
+#
+# SPDX-License-Identifier: AGPL-3.0-or-later
+
+# pylint: disable=protected-access
+import gzip
+import json
+import os
+
+from micat.data_import import eurostat_stream
+from micat.data_import.eurostat_stream import DownloadCache
+from micat.log.logger import Logger
+from micat.test_utils.isi_mock import MagicMock, Mock, fixture, patch, patch_by_string, raises
+
+_TSV_LINES = [
+    "freq,siec,unit,geo\\TIME_PERIOD\t2021 \t2020 \n",
+    "A,C0000X0350-0370,KTOE,DE\t1.5 \t: \n",
+    "A,C0000X0350-0370,GWH,DE\t2.5 \t3.5 \n",
+    "A,E7000,KTOE,FR\t4.5 e\t:z \n",
+    "M,E7000,KTOE,FR\t5.5 \t6.5 \n",
+]
+
+
+@fixture(name="zip_file_path")
+def zip_file_path_fixture(tmp_path):
+    zip_file_path = str(tmp_path / "estat_nrg_bal_c.tsv.gz")
+    with gzip.open(zip_file_path, "wt", encoding="utf8") as file:
+        file.writelines(_TSV_LINES)
+    return zip_file_path
+
+
+def _mocked_response(status_code, content=b"", headers=None):
+    response = MagicMock()
+    response.__enter__ = Mock(response)
+    response.status_code = status_code
+    response.headers = headers or {}
+    response.iter_content = Mock([content])
+    return response
+
+
+class TestDownloadCache:
+    def test_download(self, tmp_path):
+        response = _mocked_response(200, b"mocked_content", {"ETag": "mocked_etag"})
+        sut = DownloadCache(str(tmp_path))
+        with patch_by_string("requests.get", response):
+            result = sut.fetch("mocked_url", "mocked_file.gz")
+        assert result == os.path.join(str(tmp_path), "mocked_file.gz")
+        with open(result, "rb") as file:
+            assert file.read() == b"mocked_content"
+        with open(result + ".validators.json", encoding="utf-8") as file:
+            assert json.load(file) == {"ETag": "mocked_etag"}
+
+    @patch(Logger.info)
+    def test_not_modified(self, tmp_path):
+        sut = DownloadCache(str(tmp_path))
+        first_response = _mocked_response(200, b"mocked_content", {"ETag": "a", "Last-Modified": "b"})
+        with patch_by_string("requests.get", first_response):
+            sut.fetch("mocked_url", "mocked_file.gz")
+        with patch_by_string("requests.get", _mocked_response(304)) as mocked_get:
+            result = sut.fetch("mocked_url", "mocked_file.gz", headers={"Accept": "*/*"})
+        headers = mocked_get.call_args[1]["headers"]
+        assert headers == {"Accept": "*/*", "If-None-Match": "a", "If-Modified-Since": "b"}
+        with open(result, "rb") as file:
+            assert file.read() == b"mocked_content"
+
+    def test_cached_file_without_validators(self, tmp_path):
+        file_path = tmp_path / "mocked_file.gz"
+        file_path.write_bytes(b"old_content")
+        sut = DownloadCache(str(tmp_path))
+        with patch_by_string("requests.get", _mocked_response(200, b"new_content")) as mocked_get:
+            sut.fetch("mocked_url", "mocked_file.gz")
+        assert mocked_get.call_args[1]["headers"] == {}
+        assert file_path.read_bytes() == b"new_content"
+
+    def test_offline(self, tmp_path):
+        (tmp_path / "mocked_file.gz").write_bytes(b"mocked_content")
+        sut = DownloadCache(str(tmp_path), is_offline=True)
+        with patch_by_string("requests.get", "mocked_response") as mocked_get:
+            result = sut.fetch("mocked_url", "mocked_file.gz")
+            mocked_get.assert_not_called()
+        assert result == os.path.join(str(tmp_path), "mocked_file.gz")
+
+    def test_offline_without_file(self, tmp_path):
+        sut = DownloadCache(str(tmp_path), is_offline=True)
+        with raises(FileNotFoundError):
+            sut.fetch("mocked_url", "mocked_file.gz")
+
+
+class TestFilteredChunks:
+    def test_with_filter(self, zip_file_path):
+        chunks = list(eurostat_stream.filtered_chunks(zip_file_path, {"freq": "A", "unit": "KTOE"}))
+        assert len(chunks) == 1
+        result = chunks[0]
+        assert list(result.columns) == ["freq", "siec", "unit", "geo", "2021", "2020"]
+        assert result["geo"].to_list() == ["DE", "FR"]
+        assert result["2021"].to_list() == ["1.5", "4.5e"]
+        assert result["2020"].to_list() == [None, None]
+
+    def test_chunks(self, zip_file_path):
+        chunks = list(eurostat_stream.filtered_chunks(zip_file_path, chunk_size=2))
+        assert [len(chunk) for chunk in chunks] == [2, 2]
+
+    def test_without_matching_rows(self, zip_file_path):
+        chunks = list(eurostat_stream.filtered_chunks(zip_file_path, {"freq": "Q"}))
+        assert len(chunks) == 1
+        assert chunks[0].empty
+        assert list(chunks[0].columns) == ["freq", "siec", "unit", "geo", "2021", "2020"]
+
+
+@patch(Logger.info)
+class TestStage:
+    def test_stage_and_read(self, zip_file_path, tmp_path):
+        staging_database_path = str(tmp_path / "staging.sqlite")
+        is_parsed = eurostat_stream.stage(
+            zip_file_path,
+            staging_database_path,
+            "nrg_bal_c",
+            {"freq": "A"},
+            chunk_size=1,
+        )
+        assert is_parsed
+        result = eurostat_stream.read_staged(staging_database_path, "nrg_bal_c")
+        assert result["unit"].to_list() == ["KTOE", "GWH", "KTOE"]
+        assert result["2020"].dtype == float
+        assert result["2021"].to_list() == ["1.5", "2.5", "4.5e"]
+
+    def test_reuse(self, zip_file_path, tmp_path):
+        staging_database_path = str(tmp_path / "staging.sqlite")
+        eurostat_stream.stage(zip_file_path, staging_database_path, "nrg_bal_c", {"freq": "A"})
+        assert not eurostat_stream.stage(zip_file_path, staging_database_path, "nrg_bal_c", {"freq": "A"})
+        assert eurostat_stream.stage(zip_file_path, staging_database_path, "nrg_bal_c", {"unit": "KTOE"})
+        result = eurostat_stream.read_staged(staging_database_path, "nrg_bal_c")
+        assert len(result) == 3
+
+
+def test_fields():
+    result = eurostat_stream._fields("A,E7000,KTOE,FR\t4.5 e\t:z \t: \n")
+    assert result == ["A", "E7000", "KTOE", "FR", "4.5e", "NaN", "NaN"]
@@ -0,0 +1,175 @@
+# © 2024-2026 Fraunhofer-Gesellschaft e.V., München
+#
+# SPDX-License-Identifier: AGPL-3.0-or-later
+
+# pylint: disable=protected-access
+import os
+import sqlite3
+
+import pandas as pd
+
+from micat.data_import import import_metadata
+from micat.data_import.import_metadata import ImportMetadata
+from micat.data_import.import_orchestrator import ImportScript
+from micat.log.logger import Logger
+from micat.test_utils.isi_mock import fixture, patch
+
+
+def _write_file(file_path, content):
+    os.makedirs(os.path.dirname(file_path), exist_ok=True)
+    with open(file_path, "w", encoding="utf-8") as file:
+        file.write(content)
+    return file_path
+
+
+def _execute(database_path, *queries):
+    connection = sqlite3.connect(database_path)
+    for query in queries:
+        connection.execute(query)
+    connection.commit()
+    connection.close()
+
+
+@fixture(name="paths")
+def paths_fixture(tmp_path):
+    database_path = str(tmp_path / "public.sqlite")
+    raw_data_path = str(tmp_path / "raw_data")
+    _write_file(os.path.join(raw_data_path, "primes", "reference.csv"), "1,2")
+    _execute(
+        database_path,
+        "CREATE TABLE id_region (id integer PRIMARY KEY, label text)",
+        "INSERT INTO id_region VALUES (1, 'DE')",
+        "CREATE TABLE primes_parameters (id integer PRIMARY KEY, value real)",
+        "INSERT INTO primes_parameters VALUES (0, 1.5)",
+    )
+    script_path = _write_file(str(tmp_path / "c_import_primes_data.py"), "READS = []\n")
+    return database_path, raw_data_path, script_path
+
+
+@fixture(name="script")
+def script_fixture(paths):
+    _database_path, _raw_data_path, script_path = paths
+    return ImportScript(script_path, ["id_*"], ["primes_parameters"], ["primes/**"])
+
+
+@fixture(name="sut")
+def sut_fixture(paths):
+    database_path, raw_data_path, _script_path = paths
+    return ImportMetadata(database_path, raw_data_path)
+
+
+class TestInputHash:
+    def test_without_raw_inputs(self, sut, paths):
+        script = ImportScript(paths[2], ["id_*"], ["primes_parameters"])
+        assert sut.input_hash(script) is None
+
+    def test_changed_raw_input(self, sut, script, paths):
+        result = sut.input_hash(script)
+        assert result == sut.input_hash(script)
+        _write_file(os.path.join(paths[1], "primes", "reference.csv"), "1,3")
+        assert sut.input_hash(script) != result
+
+    def test_changed_imported_module(self, sut, script, paths):
+        folder = os.path.dirname(paths[2])
+        _write_file(paths[2], "from config import import_config\nimport pandas\n")
+        _write_file(os.path.join(folder, "config", "import_config.py"), "from micat.log import logger\n")
+        result = sut.input_hash(script)
+        assert result == ImportMetadata(paths[0], paths[1]).input_hash(script)
+        _write_file(os.path.join(folder, "config", "import_config.py"), "from micat.table import table\n")
+        assert ImportMetadata(paths[0], paths[1]).input_hash(script) != result
+
+    def test_changed_table(self, sut, script, paths):
+        result = sut.input_hash(script)
+        _execute(paths[0], "INSERT INTO id_region VALUES (2, 'FR')")
+        assert sut.input_hash(script) != result
+
+    def test_unrelated_table(self, sut, script, paths):
+        result = sut.input_hash(script)
+        _execute(paths[0], "INSERT INTO primes_parameters VALUES (1, 2.5)")
+        assert sut.input_hash(script) == result
+
+
+class TestIsUpToDate:
+    def test_without_input_hash(self, sut, script):
+        assert not sut.is_up_to_date(script, None)
+
+    def test_without_database(self, tmp_path, script):
+        sut = ImportMetadata(str(tmp_path / "missing.sqlite"), str(tmp_path))
+        assert not sut.is_up_to_date(script, "mocked_hash")
+        assert sut.output_hash(script) == sut.output_hash(script)
+        assert not os.path.exists(str(tmp_path / "missing.sqlite"))
+
+    def test_stored_hashes(self, sut, script):
+        input_hash = sut.input_hash(script)
+        assert not sut.is_up_to_date(script, input_hash)
+        sut.store(script, input_hash)
+        assert sut.is_up_to_date(script, input_hash)
+        assert not sut.is_up_to_date(script, "mocked_other_hash")
+
+    def test_changed_output(self, sut, script, paths):
+        input_hash = sut.input_hash(script)
+        sut.store(script, input_hash)
+        _execute(paths[0], "DROP TABLE primes_parameters")
+        assert not sut.is_up_to_date(script, input_hash)
+
+    @patch(Logger.warn)
+    def test_unfinished_run(self, sut, script, paths):
+        input_hash = sut.input_hash(script)
+        sut.store(script, input_hash)
+        sut.begin_run()
+        assert sut.is_up_to_date(script, input_hash)
+        assert os.path.exists(paths[0] + ".import-running")
+
+        next_run = ImportMetadata(paths[0], paths[1])
+        next_run.begin_run()
+        assert not next_run.is_up_to_date(script, input_hash)
+        assert Logger.warn.called
+        next_run.finish_run()
+        assert not os.path.exists(paths[0] + ".import-running")
+
+        following_run = ImportMetadata(paths[0], paths[1])
+        following_run.begin_run()
+        assert following_run.is_up_to_date(script, input_hash)
+
+    def test_store_without_input_hash(self, sut, script, paths):
+        sut.store(script, None)
+        connection = sqlite3.connect(paths[0])
+        assert not import_metadata.table_exists(connection, import_metadata.METADATA_TABLE_NAME)
+        connection.close()
+
+
+class TestHashFunctions:
+    def test_store_and_delete_hash(self):
+        connection = sqlite3.connect(":memory:")
+        assert import_metadata.stored_hash(connection, "table", "foo") is None
+        import_metadata.delete_hash(connection, "table", "foo")
+        import_metadata.store_hash(connection, "table", "foo", "mocked_hash")
+        import_metadata.store_hash(connection, "table", "foo", "mocked_hash")
+        assert import_metadata.stored_hash(connection, "table", "foo") == "mocked_hash"
+        import_metadata.delete_hash(connection, "table", "foo")
+        assert import_metadata.stored_hash(connection, "table", "foo") is None
+        connection.close()
+
+    def test_data_frame_hash(self):
+        data_frame = pd.DataFrame({"id_region": [1, 2], "2020": [1.0, 2.0]})
+        result = import_metadata.data_frame_hash(data_frame)
+        assert result == import_metadata.data_frame_hash(data_frame.copy())
+        changed_data_frame = pd.DataFrame({"id_region": [1, 2], "2020": [1.0, 3.0]})
+        assert result != import_metadata.data_frame_hash(changed_data_frame)
+        renamed_data_frame = pd.DataFrame({"id_region": [1, 2], "2030": [1.0, 2.0]})
+        assert result != import_metadata.data_frame_hash(renamed_data_frame)
+
+    def test_source_file_paths(self, sut, paths):
+        folder = os.path.dirname(paths[2])
+        _write_file(paths[2], "import os\nfrom config import import_config\n")
+        _write_file(os.path.join(folder, "config", "import_config.py"), "from micat.log.logger import Logger\n")
+        result = sut._source_file_paths(paths[2])
+        file_names = [os.path.basename(file_path) for file_path in result]
+        assert "c_import_primes_data.py" in file_names
+        assert "import_config.py" in file_names
+        assert "logger.py" in file_names
+        assert "os.py" not in file_names
+
+    def test_is_pattern(self):
+        assert import_metadata._is_pattern("id_*")
+        assert not import_metadata._is_pattern("id_region")
@@ -0,0 +1,332 @@
+# © 2024-2026 Fraunhofer-Gesellschaft e.V., München
+#
+# SPDX-License-Identifier: AGPL-3.0-or-later
+
+# pylint: disable=protected-access
+import os
+import sqlite3
+import sys
+import threading
+
+import micat
+from micat.data_import import import_orchestrator
+from micat.data_import.import_metadata import ImportMetadata
+from micat.data_import.import_orchestrator import ImportOrchestrator, ImportScript
+from micat.log.logger import Logger
+from micat.test_utils.isi_mock import Mock, fixture, patch, raises
+
+
+def _write_script(folder, name, content):
+    file_path = os.path.join(folder, name)
+    with open(file_path, "w", encoding="utf-8") as file:
+        file.write(content)
+    return file_path
+
+
+@fixture(name="scripts")
+def scripts_fixture(tmp_path):
+    folder = str(tmp_path)
+    return [
+        _write_script(folder, "b_create.py", 'READS = []\nWRITES = ["*"]\n'),
+        _write_script(folder, "c_first.py", 'READS = ["id_region"]\nWRITES = ["first_parameters"]\n'),
+        _write_script(folder, "d_second.py", 'READS = ["id_region"]\nWRITES = ["second_parameters"]\n'),
+        _write_script(folder, "e_derived.py", 'READS = ["first_parameters"]\nWRITES = ["derived_parameters"]\n'),
+        _write_script(folder, "z_overview.py", 'READS = ["*"]\nWRITES = []\n'),
+    ]
+
+
+class TestImportScript:
+    def test_from_file(self, tmp_path):
+        file_path = _write_script(str(tmp_path), "c_first.py", 'READS = ["id_region"]\nWRITES = ["first"]\n')
+        result = ImportScript.from_file(file_path)
+        assert result.name == "c_first.py"
+        assert result.reads == ["id_region"]
+        assert result.writes == ["first"]
+        assert result.raw_inputs is None
+
+    @patch(Logger.warn)
+    def test_from_file_without_declarations(self, tmp_path):
+        file_path = _write_script(str(tmp_path), "c_first.py", "print('foo')\n")
+        result = ImportScript.from_file(file_path)
+        assert result.reads == ["*"]
+        assert result.writes == ["*"]
+        assert Logger.warn.called
+
+    def test_depends_on(self):
+        first = ImportScript("c_first.py", ["id_region"], ["first"])
+        derived = ImportScript("e_derived.py", ["first"], ["derived"])
+        second = ImportScript("d_second.py", ["id_region"], ["second"])
+        rewriting = ImportScript("f_rewriting.py", [], ["id_*"])
+        assert derived.depends_on(first)
+        assert not second.depends_on(first)
+        assert rewriting.depends_on(first)
+
+
+class TestImportOrchestrator:
+    def test_dependencies(self, scripts):
+        sut = ImportOrchestrator("mocked_src_path", scripts, number_of_workers=2)
+        result = sut.dependencies()
+        assert result == {
+            "b_create.py": [],
+            "c_first.py": ["b_create.py"],
+            "d_second.py": ["b_create.py"],
+            "e_derived.py": ["b_create.py", "c_first.py"],
+            "z_overview.py": ["b_create.py", "c_first.py", "d_second.py", "e_derived.py"],
+        }
+
+    @patch(Logger.info)
+    def test_run(self, tmp_path):
+        folder = str(tmp_path)
+        scripts = [
+            _write_script(
+                folder,
+                "b_first.py",
+                'READS = []\nWRITES = ["first"]\n'
+                + "if __name__ == '__main__':\n"
+                + "    open('first.txt', 'w', encoding='utf-8').write('first')\n",
+            ),
+            _write_script(
+                folder,
+                "c_second.py",
+                'READS = ["first"]\nWRITES = ["second"]\n'
+                + "if __name__ == '__main__':\n"
+                + "    value = open('first.txt', encoding='utf-8').read()\n"
+                + "    open('second.txt', 'w', encoding='utf-8').write(value + 'second')\n",
+            ),
+        ]
+        sut = ImportOrchestrator(folder, scripts, number_of_workers=2)
+        result = sut.run()
+        assert list(result) == ["b_first.py", "c_second.py"]
+        with open(os.path.join(folder, "second.txt"), encoding="utf-8") as file:
+            assert file.read() == "firstsecond"
+
+    @patch(Logger.info)
+    @patch(Logger.error)
+    def test_run_with_failure(self, tmp_path):
+        folder = str(tmp_path)
+        scripts = [
+            _write_script(folder, "b_first.py", 'READS = []\nWRITES = ["first"]\nraise ValueError("foo")\n'),
+            _write_script(folder, "c_second.py", 'READS = ["first"]\nWRITES = ["second"]\n'),
+        ]
+        sut = ImportOrchestrator(folder, scripts, number_of_workers=2)
+        with raises(RuntimeError, match="failed: b_first.py; not started: c_second.py"):
+            sut.run()
+        assert "ValueError: foo" in Logger.error.call_args[0][0]
+
+    @patch(Logger.info)
+    @patch(Logger.error)
+    def test_run_with_failure_and_import_metadata(self, tmp_path):
+        folder = str(tmp_path)
+        scripts = [_write_script(folder, "b_first.py", 'READS = []\nWRITES = ["first"]\nraise ValueError("foo")\n')]
+        import_metadata = Mock()
+        import_metadata.is_up_to_date = Mock(False)
+        sut = ImportOrchestrator(folder, scripts, number_of_workers=1, import_metadata=import_metadata)
+        with raises(RuntimeError):
+            sut.run()
+        import_metadata.begin_run.assert_called_once()
+        import_metadata.finish_run.assert_not_called()
+
+    @patch(Logger.info)
+    def test_run_with_import_metadata(self, tmp_path):
+        folder = str(tmp_path)
+        scripts = [
+            _write_script(folder, "b_first.py", 'READS = []\nWRITES = ["first"]\nRAW_INPUTS = ["first/**"]\n'),
+            _write_script(folder, "c_second.py", 'READS = ["first"]\nWRITES = ["second"]\nRAW_INPUTS = []\n'),
+            _write_script(folder, "d_third.py", 'READS = ["second"]\nWRITES = ["third"]\n'),
+        ]
+        import_metadata = Mock()
+        import_metadata.input_hash = Mock(side_effect=lambda script: script.name + "_hash")
+        import_metadata.is_up_to_date = Mock(side_effect=lambda script, _input_hash: script.name == "b_first.py")
+        sut = ImportOrchestrator(folder, scripts, number_of_workers=2, import_metadata=import_metadata)
+        result = sut.run()
+        assert list(result) == ["c_second.py", "d_third.py"]
+        assert import_metadata.input_hash.call_count == 3
+        stored_names = [args[0].name for args, _kwargs in import_metadata.store.call_args_list]
+        assert stored_names == ["c_second.py", "d_third.py"]
+        import_metadata.begin_run.assert_called_once()
+        import_metadata.finish_run.assert_called_once()
+        assert "skipped" in Logger.info.call_args[0][0]
+
+    @patch(Logger.info)
+    def test_rerun_with_changed_raw_input(self, tmp_path):
+        folder = str(tmp_path)
+        database_path = os.path.join(folder, "public.sqlite")
+        raw_data_path = os.path.join(folder, "raw_data")
+        os.makedirs(raw_data_path)
+        _write_script(raw_data_path, "id_region.csv", "1,DE\n")
+        _write_script(raw_data_path, "fuel_switch.csv", "1,1.5\n")
+        scripts = [
+            _write_script(
+                folder,
+                "b_create.py",
+                'READS = []\nWRITES = ["*"]\nRAW_INPUTS = ["id_region.csv"]\n'
+                + "import sqlite3\n"
+                + f"connection = sqlite3.connect({database_path!r})\n"
+                + "connection.execute('CREATE TABLE id_region (id INTEGER PRIMARY KEY, label TEXT)')\n"
+                + "connection.execute(\"INSERT INTO id_region VALUES (1, 'DE')\")\n"
+                + "connection.commit()\n"
+                + "connection.close()\n",
+            ),
+            _write_script(
+                folder,
+                "n_fuel_switch.py",
+                'READS = []\nWRITES = ["fuel_switch"]\nRAW_INPUTS = ["fuel_switch.csv"]\n'
+                + "import sqlite3\n"
+                + f"connection = sqlite3.connect({database_path!r})\n"
+                + "connection.execute('DROP TABLE IF EXISTS fuel_switch')\n"
+                + "connection.execute('CREATE TABLE fuel_switch (id INTEGER PRIMARY KEY, value REAL)')\n"
+                + "rows = [line.split(',') for line in open('raw_data/fuel_switch.csv', encoding='utf-8')]\n"
+                + "connection.executemany('INSERT INTO fuel_switch VALUES (?, ?)', rows)\n"
+                + "connection.commit()\n"
+                + "connection.close()\n",
+            ),
+        ]
+        import_metadata = ImportMetadata(database_path, raw_data_path)
+        sut = ImportOrchestrator(folder, scripts, number_of_workers=2, import_metadata=import_metadata)
+        sut.run()
+        _write_script(raw_data_path, "fuel_switch.csv", "1,2.5\n")
+
+        result = sut.run()
+        assert list(result) == ["n_fuel_switch.py"]
+        connection = sqlite3.connect(database_path)
+        assert connection.execute("SELECT * FROM fuel_switch").fetchall() == [(1, 2.5)]
+        connection.close()
+
+    @patch(Logger.info)
+    def test_repeated_import_keeps_database_file(self, tmp_path):
+        folder = str(tmp_path)
+        database_path = os.path.join(folder, "public.sqlite")
+        raw_data_path = os.path.join(folder, "raw_data")
+        os.makedirs(raw_data_path)
+        _write_script(raw_data_path, "extension.csv", "2.5\n")
+        connection = sqlite3.connect(database_path)
+        for id_table_name in ["id_region", "id_parameter"]:
+            connection.execute("CREATE TABLE " + id_table_name + " (id INTEGER PRIMARY KEY, label TEXT)")
+        connection.executemany("INSERT INTO id_parameter VALUES (?, ?)", [(25, "first"), (26, "second")])
+        connection.execute("INSERT INTO id_region VALUES (1, 'DE')")
+        connection.commit()
+        connection.close()
+        header = (
+            "from micat.data_import.database_import import DatabaseImport\n"
+            + "from micat.input.database import Database\n"
+            + "from micat.table.table import Table\n"
+            + f"database_path = {database_path!r}\n"
+        )
+        scripts = [
+            _write_script(
+                folder,
+                "d_download.py",
+                'READS = []\nWRITES = ["base_parameters"]\n'
+                + header
+                + "table = Table([{'id_region': 1, 'id_parameter': 25, '2020': 1.5}])\n"
+                + "DatabaseImport(database_path).write_to_sqlite(table, 'base_parameters')\n",
+            ),
+            _write_script(
+                folder,
+                "i_extend.py",
+                'READS = ["base_parameters"]\nWRITES = ["extended_parameters"]\nRAW_INPUTS = ["extension.csv"]\n'
+                + header
+                + "base = Database(database_path).table('base_parameters', {}).to_data_frame().reset_index()\n"
+                + "value = float(open('raw_data/extension.csv', encoding='utf-8').read())\n"
+                + "extension = [{'id_region': 1, 'id_parameter': 26, '2020': value}]\n"
+                + "table = Table(base.to_dict('records') + extension)\n"
+                + "DatabaseImport(database_path).write_to_sqlite(table, 'extended_parameters')\n",
+            ),
+        ]
+        import_metadata = ImportMetadata(database_path, raw_data_path)
+        src_path = os.path.dirname(list(micat.__path__)[0])
+        sut = ImportOrchestrator(src_path, scripts, number_of_workers=2, import_metadata=import_metadata)
+        sut.run()
+        with open(database_path, "rb") as file:
+            database_bytes = file.read()
+
+        result = sut.run()
+        assert list(result) == ["d_download.py"]
+        with open(database_path, "rb") as file:
+            assert file.read() == database_bytes
+
+    def test_report(self):
+        result = ImportOrchestrator.report({"b_first.py": 1.0, "c_second.py": 2.0}, 2.5)
+        lines = result.split("\n")
+        assert lines[1].startswith("c_second.py")
+        assert lines[2].startswith("b_first.py")
+        assert lines[3].endswith("3.0 s")
+        assert lines[4].endswith("2.5 s")
+
+    def test_report_with_skipped_scripts(self):
+        result = ImportOrchestrator.report({"c_second.py": 2.0}, 2.5, ["b_first.py"])
+        lines = result.split("\n")
+        assert lines[2].startswith("b_first.py")
+        assert lines[2].endswith("skipped")
+
+    def test_startable_scripts(self, scripts):
+        sut = ImportOrchestrator("mocked_src_path", scripts, number_of_workers=2)
+        pending = sut._scripts[1:]
+        result = sut._startable_scripts(pending, {"mocked_future": sut._scripts[0]}, {"b_create.py": 1.0})
+        assert [script.name for script in result] == ["c_first.py"]
+
+    def test_skip_unchanged_scripts(self, scripts):
+        import_metadata = Mock()
+        import_metadata.input_hash = Mock("mocked_hash")
+        import_metadata.is_up_to_date = Mock(False)
+        sut = ImportOrchestrator("mocked_src_path", scripts, number_of_workers=1, import_metadata=import_metadata)
+        pending = sut._scripts[1:]
+        input_hashes = {"c_first.py": "mocked_hash"}
+        result = sut._skip_unchanged_scripts(pending, {"b_create.py"}, input_hashes, threading.Lock())
+        assert result == []
+        assert import_metadata.input_hash.call_count == 1
+        assert input_hashes == {"c_first.py": "mocked_hash", "d_second.py": "mocked_hash"}
+
+
+class TestSerializedWrite:
+    def test_without_lock(self):
+        with import_orchestrator.serialized_write():
+            pass
+
+    def test_with_lock(self):
+        lock = threading.Lock()
+        import_orchestrator._initialize_worker(lock, "mocked_src_path")
+        try:
+            with import_orchestrator.serialized_write():
+                assert lock.locked()
+            assert not lock.locked()
+        finally:
+            import_orchestrator._write_lock = None
+            sys.path.remove("mocked_src_path")
+
+
+class TestRunScript:
+    @fixture(autouse=True)
+    def restore_working_directory(self):
+        current_directory = os.getcwd()
+        original_sys_path = list(sys.path)
+        original_sys_argv = list(sys.argv)
+        yield
+        os.chdir(current_directory)
+        sys.path[:] = original_sys_path
+        sys.argv[:] = original_sys_argv
+
+    def test_exit_code(self, tmp_path):
+        file_path = _write_script(str(tmp_path), "b_first.py", "import sys\nsys.exit(2)\n")
+        with raises(RuntimeError, match="exited with code 2"):
+            import_orchestrator._run_script(file_path)
+
+    def test_exit_without_code(self, tmp_path):
+        file_path = _write_script(str(tmp_path), "b_first.py", "import sys\nsys.exit()\n")
+        result = import_orchestrator._run_script(file_path)
+        assert result >= 0
+
+    def test_exception(self, tmp_path):
+        file_path = _write_script(str(tmp_path), "b_first.py", "raise ValueError('foo')\n")
+        with raises(RuntimeError, match="ValueError: foo"):
+            import_orchestrator._run_script(file_path)
+
+    def test_command_line(self, tmp_path):
+        file_path = _write_script(
+            str(tmp_path),
+            "b_first.py",
+            "import argparse\nargparse.ArgumentParser().parse_args()\n",
+        )
+        sys.argv = ["mocked_worker", "--multiprocessing-fork"]
+        result = import_orchestrator._run_script(file_path)
+        assert result >= 0
@@ -0,0 +1,106 @@
+# © 2024-2026 Fraunhofer-Gesellschaft e.V., München
+#
+# SPDX-License-Identifier: AGPL-3.0-or-later
+
+# pylint: disable=protected-access
+import io
+import json
+
+import openpyxl
+import pandas as pd
+import pytest
+
+from micat.export import result_tables_export
+from micat.table.table import Table
+from micat.test_utils.isi_mock import patch
+
+mocked_tables = {
+    "reductionOfEnergyCost": Table(
+        [
+            {"id_measure": 1, "id_final_energy_carrier": 2, "2020": 1.5, "2030": 2.5},
+            {"id_measure": 1, "id_final_energy_carrier": 3, "2020": 3.5, "2030": 4.5},
+        ]
+    ),
+    "impactOnGrossDomesticProduct": Table([{"id_measure": 1, "2020": 5.0, "2030": 6.0}]),
+}
+
+row_json_string = json.dumps({name: table.to_custom_json() for name, table in mocked_tables.items()})
+columnar_json_string = json.dumps({name: table.to_columnar_json() for name, table in mocked_tables.items()})
+
+
+def written_bytes(json_string, export_format):
+    output = io.BytesIO()
+    result_tables_export.write_result_tables(json_string, export_format, output)
+    return output.getvalue()
+
+
+class TestWriteResultTables:
+    @pytest.mark.parametrize("json_string", [row_json_string, columnar_json_string])
+    def test_xlsx(self, json_string):
+        workbook = openpyxl.load_workbook(io.BytesIO(written_bytes(json_string, "xlsx")))
+        assert workbook.sheetnames == ["reductionOfEnergyCost", "impactOnGrossDomesticProduct"]
+        assert [list(row) for row in workbook["reductionOfEnergyCost"].iter_rows(values_only=True)] == [
+            ["id_measure", "id_final_energy_carrier", "2020", "2030"],
+            [1, 2, 1.5, 2.5],
+            [1, 3, 3.5, 4.5],
+        ]
+
+    def test_xlsx_with_nan_and_inf(self):
+        table = Table([{"id_measure": 1, "2020": float("nan"), "2030": float("inf")}])
+        json_string = json.dumps({"impactOnGrossDomesticProduct": table.to_columnar_json()})
+        workbook = openpyxl.load_workbook(io.BytesIO(written_bytes(json_string, "xlsx")))
+        rows = list(workbook["impactOnGrossDomesticProduct"].iter_rows(values_only=True))
+        assert list(rows[1]) == [1, "=#NUM!", "=1/0"]
+
+    @pytest.mark.parametrize("json_string", [row_json_string, columnar_json_string])
+    def test_csv(self, json_string):
+        lines = written_bytes(json_string, "csv").decode("utf-8").splitlines()
+        assert lines == [
+            "indicator,id_measure,id_final_energy_carrier,year,value",
+            "reductionOfEnergyCost,1,2,2020,1.5",
+            "reductionOfEnergyCost,1,3,2020,3.5",
+            "reductionOfEnergyCost,1,2,2030,2.5",
+            "reductionOfEnergyCost,1,3,2030,4.5",
+            "impactOnGrossDomesticProduct,1,,2020,5.0",
+            "impactOnGrossDomesticProduct,1,,2030,6.0",
+        ]
+
+    @patch(pd.DataFrame.to_parquet)
+    def test_parquet(self):
+        output = io.BytesIO()
+        result_tables_export.write_result_tables(row_json_string, "parquet", output)
+        args = pd.DataFrame.to_parquet.call_args
+        assert args.args[0] is output
+        assert args.kwargs == {"index": False}
+
+    def test_unknown_format(self):
+        with pytest.raises(ValueError):
+            result_tables_export.write_result_tables(row_json_string, "pdf", io.BytesIO())
+
+
+def test_result_data_frames():
+    result = result_tables_export.result_data_frames(row_json_string)
+    data_frame = result["impactOnGrossDomesticProduct"]
+    assert data_frame.columns.tolist() == ["id_measure", "2020", "2030"]
+    assert data_frame["id_measure"].tolist() == [1]
+    assert str(data_frame["id_measure"].dtype) == "Int64"
+
+
+class TestSheetName:
+    def test_short_name(self):
+        used_sheet_names = set()
+        assert result_tables_export._sheet_name("indicator", used_sheet_names) == "indicator"
+        assert used_sheet_names == {"indicator"}
+
+    def test_long_names(self):
+        used_sheet_names = set()
+        first_name = result_tables_export._sheet_name("a" * 40, used_sheet_names)
+        second_name = result_tables_export._sheet_name("A" * 40 + "b", used_sheet_names)
+        assert first_name == "a" * 31
+        assert second_name == "A" * 29 + "~2"
+
+
+def test_long_data_frame_without_tables():
+    result = result_tables_export._long_data_frame({})
+    assert result.columns.tolist() == ["indicator", "year", "value"]
+    assert result.empty
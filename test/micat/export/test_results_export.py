@@ -0,0 +1,205 @@
+# © 2024-2026 Fraunhofer-Gesellschaft e.V., München
+#
+# SPDX-License-Identifier: AGPL-3.0-or-later
+
+# pylint: disable=protected-access
+import io
+
+import openpyxl
+import pandas as pd
+import pytest
+
+from micat.export import results_export
+from micat.test_utils.isi_mock import Mock
+
+
+def mocked_database():
+    database = Mock()
+    database.table = Mock(pd.DataFrame({"id": [1], "label": ["Germany"]}))
+    return database
+
+
+def mocked_result(rows, id_column_names=None):
+    return {
+        "idColumnNames": id_column_names or ["id_measure"],
+        "yearColumnNames": ["2020", "2030"],
+        "rows": rows,
+    }
+
+
+def mocked_data(number_of_results=1):
+    results = [
+        {
+            "name": f"program {index}",
+            "data": {
+                "impactOnGrossDomesticProduct": mocked_result([[1, 1.0, 2.0], [2, 3.0, 4.0]]),
+                "reductionOfEnergyCost": mocked_result(
+                    [[1, "coal", 5.0, 6.0]],
+                    ["id_measure", "id_final_energy_carrier"],
+                ),
+            },
+        }
+        for index in range(number_of_results)
+    ]
+    return {
+        "region": 1,
+        "years": [2020, 2030],
+        "programs": [
+            {
+                "name": "program 0",
+                "unitName": "ktoe",
+                "subsector": 1,
+                "improvements": [{"id": 1, "name": "insulation", "values": {"2020": 1.5, "2030": 2.5}}],
+            }
+        ],
+        "results": results,
+        "categories": {
+            "quantification": {
+                "title": "Quantification",
+                "measurements": [
+                    {"identifier": "impactOnGrossDomesticProduct", "title": "GDP", "yAxis": "M€"},
+                    {"identifier": "missing", "title": "Missing", "yAxis": "-"},
+                ],
+            },
+            "monetization": {
+                "title": "Monetization",
+                "measurements": [
+                    {
+                        "identifier": "reductionOfEnergyCost",
+                        "title": "Energy cost",
+                        "subcategory": "Ecologic",
+                        "yAxis": "M€",
+                    },
+                ],
+            },
+            "other": {"title": "Other", "measurements": []},
+        },
+        "cbaData": [
+            {
+                "name": "program 0",
+                "netPresentValue": 7.0,
+                "annualSavings": [8.0, 9.0],
+                "years": [2020, 2030],
+                "parameters": {"discountRate": 0.03},
+            }
+        ],
+    }
+
+
+def sheet_values(workbook, name):
+    return [list(row) for row in workbook[name].iter_rows(values_only=True)]
+
+
+def written_workbook(data):
+    output = io.BytesIO()
+    results_export.write_results_workbook(data, mocked_database(), output)
+    return openpyxl.load_workbook(output)
+
+
+class TestWriteResultsWorkbook:
+    def test_sheets(self):
+        workbook = written_workbook(mocked_data())
+        assert workbook.sheetnames == ["Inputs", "Quantification", "Monetization", "Aggregation", "CBA"]
+
+    def test_sheets_of_several_programs(self):
+        workbook = written_workbook(mocked_data(number_of_results=2))
+        assert workbook.sheetnames == [
+            "Inputs",
+            "Quantification (program 0)",
+            "Monetization (program 0)",
+            "Aggregation (program 0)",
+            "Quantification (program 1)",
+            "Monetization (program 1)",
+            "Aggregation (program 1)",
+            "CBA (program 0)",
+        ]
+
+    def test_inputs(self):
+        workbook = written_workbook(mocked_data())
+        assert sheet_values(workbook, "Inputs") == [
+            ["Program", "program 0"],
+            ["Unit", "ktoe"],
+            ["Region", "Germany"],
+            ["Subsector", 1],
+            [None, None],
+            ["insulation", None],
+            ["2020", "2030"],
+            [1.5, 2.5],
+        ]
+
+    def test_quantification(self):
+        workbook = written_workbook(mocked_data())
+        assert sheet_values(workbook, "Quantification") == [
+            ["GDP", None, None],
+            ["M€", None, None],
+            [None, "2020", "2030"],
+            [None, 1, 2],
+            [None, 3, 4],
+            ["Total", 4, 6],
+        ]
+
+    def test_monetization(self):
+        workbook = written_workbook(mocked_data())
+        assert sheet_values(workbook, "Monetization") == [
+            ["[Ecologic] Energy cost", None, None],
+            ["M€", None, None],
+            [None, "2020", "2030"],
+            ["coal", 5, 6],
+        ]
+
+    def test_several_measurements(self):
+        data = mocked_data()
+        monetization = data["categories"].pop("monetization")
+        data["categories"]["quantification"]["measurements"] += monetization["measurements"]
+        workbook = written_workbook(data)
+        assert sheet_values(workbook, "Quantification")[5:] == [
+            ["Total", 4, 6],
+            [None, None, None],
+            ["[Ecologic] Energy cost", None, None],
+            ["M€", None, None],
+            [None, "2020", "2030"],
+            ["coal", 5, 6],
+        ]
+
+    def test_aggregation(self):
+        workbook = written_workbook(mocked_data())
+        assert sheet_values(workbook, "Aggregation") == [
+            [None, 2020, 2030],
+            ["GDP", 1, 2],
+            [None, 3, 4],
+            ["coal", 5, 6],
+        ]
+
+    def test_cba(self):
+        workbook = written_workbook(mocked_data())
+        assert sheet_values(workbook, "CBA") == [
+            ["unit", "Euro", None],
+            ["name", "program 0", None],
+            ["netPresentValue", 7, None],
+            [None, None, None],
+            [None, 2020, 2030],
+            ["annualSavings", 8, 9],
+            [None, None, None],
+            ["Parameters", None, None],
+            ["discountRate", 0.03, None],
+        ]
+
+    def test_region_label_is_queried_once(self):
+        data = mocked_data()
+        data["programs"].append(data["programs"][0])
+        database = mocked_database()
+        results_export.write_results_workbook(data, database, io.BytesIO())
+        assert database.table.call_count == 1
+
+
+@pytest.mark.parametrize(
+    "row, id_column_names, expected_result",
+    [
+        ([1, 2.0, 3.0], ["id_measure"], (1, [2.0, 3.0], 0)),
+        ([1, "coal", 2.0], ["id_measure", "id_final_energy_carrier"], (0, ["coal", 2.0], 1)),
+        ([2.0, 3.0], [], (1, [2.0, 3.0], 0)),
+    ],
+)
+def test_result_row_cells(row, id_column_names, expected_result):
+    result = results_export._result_row_cells(row, id_column_names)
+    assert result == expected_result
@@ -10,6 +10,7 @@ import pytest
 from micat.input.database import Database
 from micat.input.database_exception import DatabaseException
 from micat.log.logger import Logger
+from micat.monitoring.query_profiler import QUERY_PROFILER
 from micat.table.id_table import IdTable
 from micat.table.mapping_table import MappingTable
 from micat.table.table import Table
@@ -23,6 +24,28 @@ def fixture_sut():
 
 
 class TestPublicAPI:
+    class TestFingerprint:
+        def test_missing_file(self, sut):
+            assert sut.fingerprint() is None
+
+        def test_existing_file(self, tmp_path):
+            database_path = tmp_path / 'database.sqlite'
+            database_path.write_bytes(b'mocked_content')
+            sut = Database(str(database_path))
+            fingerprint = sut.fingerprint()
+            assert len(fingerprint) == 64
+            with patch(Database._hash_file) as mocked_hash_file:
+                assert sut.fingerprint() == fingerprint
+                mocked_hash_file.assert_not_called()
+
+        def test_changed_file(self, tmp_path):
+            database_path = tmp_path / 'database.sqlite'
+            database_path.write_bytes(b'mocked_content')
+            sut = Database(str(database_path))
+            fingerprint = sut.fingerprint()
+            database_path.write_bytes(b'another_content')
+            assert sut.fingerprint() != fingerprint
+
     @patch(Database._data_query, 'mocked_json_data')
     @patch(IdTable.from_json, 'from_json')
     def test_id_table(self, sut):
@@ -89,6 +112,25 @@ class TestPrivateAPI:
                 query = sut._append_where_clause('SELECT * FROM table', {'id': '3', 'type': 'min'})
                 assert query == 'SELECT * FROM table WHERE mocked_condition AND mocked_condition'
 
+    class TestReferenceDataQuery:
+        def test_is_cached(self, sut):
+            sut._data_query = Mock('mocked_json_data')
+            first_result = sut._reference_data_query('SELECT * FROM `id_region`', {})
+            second_result = sut._reference_data_query('SELECT * FROM `id_region`', {})
+            assert first_result == 'mocked_json_data'
+            assert second_result == 'mocked_json_data'
+            sut._data_query.assert_called_once()
+
+        def test_changed_file(self, tmp_path):
+            database_path = tmp_path / 'database.sqlite'
+            database_path.write_bytes(b'mocked_content')
+            sut = Database(str(database_path))
+            sut._data_query = Mock('mocked_json_data')
+            sut._reference_data_query('SELECT * FROM `id_region`', {})
+            database_path.write_bytes(b'another_content')
+            sut._reference_data_query('SELECT * FROM `id_region`', {})
+            assert sut._data_query.call_count == 2
+
     class TestCreateCondition:
         def test_list(self, sut):
             _create_or_condition_mock = Mock('mocked_condition')
@@ -146,6 +188,30 @@ class TestPrivateAPI:
             result = sut._data_query('SELECT * FROM table', 'where_clause_mock')
             assert list(result.keys()) == ['headers', 'rows']
 
+        @staticmethod
+        def mocked_connect_with_failing_query_plan(_self):
+            mocked_connection = TestPrivateAPI.TestDataQuery.mocked_connect(_self)
+            mocked_cursor = mocked_connection.cursor()
+            mocked_cursor.execute = Mock(side_effect=[None, sqlite3.OperationalError('mocked_error')])
+            mocked_cursor.description = [('id_region',)]
+            return mocked_connection
+
+        @patch(sqlite3.connect, mocked_connect_with_failing_query_plan)
+        @patch(Logger.warn)
+        def test_failing_query_plan(self, sut):
+            sut._append_where_clause = Mock('SELECT * FROM table WHERE 1')
+            QUERY_PROFILER.is_enabled = True
+            QUERY_PROFILER.plan_threshold_in_seconds = 0
+            try:
+                with QUERY_PROFILER.profiling('/indicator_data'):
+                    result = sut._data_query('SELECT * FROM table', 'where_clause_mock')
+                assert result['rows'] == ['mocked_row1', 'mocked_row2']
+                assert QUERY_PROFILER.reports()[0]['slowestQueries'][0]['queryPlan'] is None
+            finally:
+                QUERY_PROFILER.is_enabled = False
+                QUERY_PROFILER.plan_threshold_in_seconds = 0.05
+                QUERY_PROFILER.clear()
+
         @patch(sqlite3.connect, 'invalid_connection')
         @patch(Logger.error)
         def test_error(self, sut):
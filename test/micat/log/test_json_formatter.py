@@ -0,0 +1,39 @@
+# © 2024-2026 Fraunhofer-Gesellschaft e.V., München
+#
+# SPDX-License-Identifier: AGPL-3.0-or-later
+
+import json
+import logging
+import sys
+
+from micat.log.json_formatter import JsonFormatter
+from micat.test_utils.isi_mock import fixture
+
+
+@fixture(name='sut')
+def sut_fixture():
+    return JsonFormatter()
+
+
+def _record(exc_info=None):
+    return logging.LogRecord('micat', logging.WARNING, 'foo.py', 1, 'mocked_%s', ('message',), exc_info)
+
+
+def test_format(sut):
+    record = _record()
+    record.caller = {'function': 'foo', 'file': 'foo.py', 'line': 1}
+    entry = json.loads(sut.format(record))
+    assert entry['level'] == 'WARNING'
+    assert entry['message'] == 'mocked_message'
+    assert entry['function'] == 'foo'
+    assert entry['time'].endswith('Z')
+
+
+def test_format_with_exception(sut):
+    try:
+        raise ValueError('mocked_error')
+    except ValueError:
+        record = _record(sys.exc_info())
+    entry = json.loads(sut.format(record))
+    assert 'function' not in entry
+    assert 'ValueError: mocked_error' in entry['exception']
@@ -9,7 +9,7 @@ import time
 
 import pytest
 
-from micat.log import color_handler, logger
+from micat.log import color_handler, json_formatter, logger
 from micat.test_utils.isi_mock import Mock, patch
 
 
@@ -18,6 +18,18 @@ def fixture_sut():
     return logger.Logger(is_active=True)
 
 
+@pytest.fixture(name="wrapped_logger")
+def fixture_wrapped_logger():
+    original_wrapped_logger = logger.Logger.wrapped_logger
+    logger.Logger.wrapped_logger = Mock()
+    yield logger.Logger.wrapped_logger
+    logger.Logger.wrapped_logger = original_wrapped_logger
+
+
+def mocked_function():
+    return inspect.currentframe().f_code
+
+
 class TestConstruction:
     def test_protected_attributes(self, sut):
         assert sut._is_active is True
@@ -35,7 +47,7 @@ def mocked_inspection_frame():
     inspect.currentframe,
     Mock(mocked_inspection_frame()),
 )
-def test_debug():
+def test_debug(wrapped_logger):
     with patch(logger.Logger.log_debug) as mocked_log_debug:
         mocked_log_debug.assert_not_called()
         logger.Logger.debug("mocked_message")
@@ -46,7 +58,7 @@ def test_debug():
     inspect.currentframe,
     Mock(mocked_inspection_frame()),
 )
-def test_info():
+def test_info(wrapped_logger):
     with patch(logger.Logger.log_info) as mocked_log_info:
         mocked_log_info.assert_not_called()
         logger.Logger.info("mocked_message")
@@ -57,7 +69,7 @@ def test_info():
     inspect.currentframe,
     Mock(mocked_inspection_frame()),
 )
-def test_warn():
+def test_warn(wrapped_logger):
     with patch(logger.Logger.log_warn) as mocked_log_info:
         mocked_log_info.assert_not_called()
         logger.Logger.warn("mocked_message")
@@ -68,13 +80,79 @@ def test_warn():
     inspect.currentframe,
     Mock(mocked_inspection_frame()),
 )
-def test_error():
+def test_error(wrapped_logger):
     with patch(logger.Logger.log_error) as mocked_log_info:
         mocked_log_info.assert_not_called()
         logger.Logger.error("mocked_message")
         mocked_log_info.assert_called_once_with("mocked_message", "mocked_function")
 
 
+@pytest.mark.parametrize("method_name", ["debug", "info", "warn", "error"])
+def test_disabled_level(wrapped_logger, method_name):
+    wrapped_logger.isEnabledFor = Mock(False)
+    getattr(logger.Logger, method_name)("mocked_message")
+    wrapped_logger.debug.assert_not_called()
+    wrapped_logger.info.assert_not_called()
+    wrapped_logger.warning.assert_not_called()
+    wrapped_logger.error.assert_not_called()
+
+
+class TestScope:
+    def test_repeated_warnings(self, wrapped_logger):
+        with logger.Logger.scope():
+            for _index in range(3):
+                logger.Logger.warn("mocked_message")
+        assert wrapped_logger.warning.call_count == 2
+        assert wrapped_logger.warning.call_args.args[0].startswith("Suppressed 2 repeated warnings")
+
+    def test_max_warnings_per_function(self, wrapped_logger):
+        logger.Logger.max_warnings_per_function = 2
+        try:
+            with logger.Logger.scope():
+                for index in range(3):
+                    logger.Logger.warn("mocked_message" + str(index))
+        finally:
+            logger.Logger.max_warnings_per_function = 10
+        assert wrapped_logger.warning.call_count == 3
+
+    def test_without_scope(self, wrapped_logger):
+        for _index in range(3):
+            logger.Logger.warn("mocked_message")
+        assert wrapped_logger.warning.call_count == 3
+
+
+class TestWrapped:
+    def test_existing(self, wrapped_logger):
+        assert logger.Logger._wrapped() == wrapped_logger
+
+    def test_json_output(self, wrapped_logger, monkeypatch):
+        logger.Logger.wrapped_logger = None
+        monkeypatch.setenv("MICAT_LOG_FORMAT", "json")
+        try:
+            with patch(logger.Logger._create_logger, "mocked_logger"):
+                assert logger.Logger._wrapped() == "mocked_logger"
+                assert logger.Logger.is_json_output is True
+        finally:
+            logger.Logger.is_json_output = False
+
+
+class TestLog:
+    def test_text(self):
+        log_function = Mock()
+        logger.Logger._log(log_function, "foo", mocked_function())
+        assert log_function.call_args.args[0].startswith("foo :\nmocked_function in File")
+
+    def test_json(self):
+        log_function = Mock()
+        logger.Logger.is_json_output = True
+        try:
+            logger.Logger._log(log_function, "foo", mocked_function())
+        finally:
+            logger.Logger.is_json_output = False
+        assert log_function.call_args.args[0] == "foo"
+        assert log_function.call_args.kwargs["extra"]["caller"]["function"] == "mocked_function"
+
+
 @patch(time.time, 5.123456)
 def test_current_time_in_ms():
     assert logger.Logger._current_time_in_ms() == 5123
@@ -94,40 +172,52 @@ def test_create_logger():
     assert log.propagate == 0
 
 
+@patch(logging.getLogger)
+def test_create_json_logger():
+    log = logger.Logger._create_logger(is_json_output=True)
+    handler = log.addHandler.call_args.args[0]
+    assert isinstance(handler.formatter, json_formatter.JsonFormatter)
+
+
+class TestLogDebug:
+    def test_active(self, sut, wrapped_logger):
+        sut.log_debug("foo")
+        logger.Logger.wrapped_logger.debug.assert_called_once()
+
+    def test_inactive(self, sut, wrapped_logger):
+        sut._is_active = False
+        sut.log_debug("foo")
+        logger.Logger.wrapped_logger.debug.assert_not_called()
+
+
 class TestLogInfo:
-    def test_active(self, sut):
-        logger.Logger.wrapped_logger = Mock()
+    def test_active(self, sut, wrapped_logger):
         sut.log_info("foo")
         logger.Logger.wrapped_logger.info.assert_called_once()
 
-    def test_inactive(self, sut):
-        logger.Logger.wrapped_logger = Mock()
+    def test_inactive(self, sut, wrapped_logger):
         sut._is_active = False
         sut.log_info("foo")
         logger.Logger.wrapped_logger.info.assert_not_called()
 
 
 class TestLogWarn:
-    def test_active(self, sut):
-        logger.Logger.wrapped_logger = Mock()
+    def test_active(self, sut, wrapped_logger):
         sut.log_warn("baa")
         logger.Logger.wrapped_logger.warning.assert_called_once()
 
-    def test_inactive(self, sut):
-        logger.Logger.wrapped_logger = Mock()
+    def test_inactive(self, sut, wrapped_logger):
         sut._is_active = False
         sut.log_warn("baa")
         logger.Logger.wrapped_logger.warning.assert_not_called()
 
 
 class TestLogError:
-    def test_active(self, sut):
-        logger.Logger.wrapped_logger = Mock()
+    def test_active(self, sut, wrapped_logger):
         sut.log_error("qux")
         logger.Logger.wrapped_logger.error.assert_called_once()
 
-    def test_inactive(self, sut):
-        logger.Logger.wrapped_logger = Mock()
+    def test_inactive(self, sut, wrapped_logger):
         sut._is_active = False
         sut.log_error("qux")
         logger.Logger.wrapped_logger.error.assert_not_called()
@@ -0,0 +1,94 @@
+# © 2024-2026 Fraunhofer-Gesellschaft e.V., München
+#
+# SPDX-License-Identifier: AGPL-3.0-or-later
+
+# pylint: disable=protected-access
+import pytest
+
+from micat.monitoring import metrics
+from micat.monitoring.metrics import Histogram, Metrics
+from micat.test_utils.isi_mock import patch
+
+
+@pytest.fixture(name="sut")
+def fixture_sut():
+    return Metrics()
+
+
+def test_histogram():
+    sut = Histogram((0.1, 1.0))
+    sut.observe(0.05)
+    sut.observe(0.5)
+    sut.observe(5.0)
+    lines = sut.samples("mocked_duration", {"route": "/id_region"})
+    assert lines == [
+        'mocked_duration_bucket{route="/id_region",le="0.1"} 1',
+        'mocked_duration_bucket{route="/id_region",le="1.0"} 2',
+        'mocked_duration_bucket{route="/id_region",le="+Inf"} 3',
+        'mocked_duration_sum{route="/id_region"} 5.55',
+        'mocked_duration_count{route="/id_region"} 3',
+    ]
+
+
+class TestExposition:
+    def test_requests(self, sut):
+        sut.observe_request("/id_region", "GET", 200, 0.01)
+        sut.observe_request("/id_region", "GET", 200, 0.02)
+        text = sut.exposition()
+        assert "# TYPE micat_http_requests_total counter" in text
+        assert 'micat_http_requests_total{route="/id_region",method="GET",status="200"} 2' in text
+        assert 'micat_http_request_duration_seconds_count{route="/id_region"} 2' in text
+
+    def test_queries(self, sut):
+        sut.observe_query(0.002)
+        text = sut.exposition()
+        assert "micat_sqlite_queries_total 1" in text
+        assert "micat_sqlite_query_duration_seconds_count 1" in text
+
+    def test_caches(self, sut):
+        sut.count_cache_access("table", True)
+        sut.count_cache_access("table", True)
+        sut.count_cache_access("table", False)
+        sut.count_cache_access("table", True)
+        text = sut.exposition()
+        assert 'micat_cache_hits_total{cache="table"} 3' in text
+        assert 'micat_cache_misses_total{cache="table"} 1' in text
+        assert 'micat_cache_hit_ratio{cache="table"} 0.75' in text
+
+    def test_collectors(self, sut):
+        sut.register_collector("mocked_gauge", "gauge", "Mocked gauge.", lambda: 3)
+        sut.register_collector(
+            "mocked_labeled_gauge",
+            "gauge",
+            "Mocked labeled gauge.",
+            lambda: [({"route_class": 'with "quotes"'}, 1)],
+        )
+        text = sut.exposition()
+        assert "# HELP mocked_gauge Mocked gauge.\n# TYPE mocked_gauge gauge\nmocked_gauge 3\n" in text
+        assert 'mocked_labeled_gauge{route_class="with \\"quotes\\""} 1' in text
+
+    def test_process_peak_memory(self, sut):
+        sut.observe_process_peak_memory(200 * 1024 * 1024)
+        text = sut.exposition()
+        assert "# TYPE micat_calculation_process_peak_memory_bytes histogram" in text
+        assert 'micat_calculation_process_peak_memory_bytes_bucket{le="134217728"} 0' in text
+        assert 'micat_calculation_process_peak_memory_bytes_bucket{le="268435456"} 1' in text
+        assert "micat_calculation_process_peak_memory_bytes_count 1" in text
+
+    @patch(metrics._resident_memory_in_bytes, 1024)
+    def test_process_memory(self, sut):
+        assert "process_resident_memory_bytes 1024" in sut.exposition()
+
+    @patch(metrics._resident_memory_in_bytes, None)
+    def test_without_process_memory(self, sut):
+        assert "process_resident_memory_bytes" not in sut.exposition()
+
+
+class TestResidentMemoryInBytes:
+    def test_available(self):
+        resident_memory = metrics._resident_memory_in_bytes()
+        assert resident_memory > 0
+
+    def test_not_available(self, tmp_path):
+        statm_path = str(tmp_path / "non_existing_statm")
+        assert metrics._resident_memory_in_bytes(statm_path) is None
@@ -0,0 +1,36 @@
+# © 2024-2026 Fraunhofer-Gesellschaft e.V., München
+#
+# SPDX-License-Identifier: AGPL-3.0-or-later
+
+# pylint: disable=protected-access
+from micat.monitoring import peak_memory
+from micat.test_utils.isi_mock import patch
+
+
+class TestMeasuring:
+    def test_with_reset(self, tmp_path):
+        clear_refs_path = tmp_path / "clear_refs"
+        status_path = tmp_path / "status"
+        status_path.write_text("VmPeak:\t  4096 kB\nVmHWM:\t  2048 kB\n", encoding="utf-8")
+        with peak_memory.measuring(str(clear_refs_path), str(status_path)) as sut:
+            assert sut.in_bytes is None
+        assert clear_refs_path.read_text(encoding="utf-8") == "5"
+        assert sut.in_bytes == 2048 * 1024
+
+    @patch(peak_memory._peak_resident_memory_in_bytes)
+    def test_without_reset(self, tmp_path):
+        clear_refs_path = tmp_path / "non_existing_folder" / "clear_refs"
+        with peak_memory.measuring(str(clear_refs_path)) as sut:
+            pass
+        assert sut.in_bytes is None
+        peak_memory._peak_resident_memory_in_bytes.assert_not_called()
+
+
+class TestPeakResidentMemoryInBytes:
+    def test_without_status_file(self, tmp_path):
+        assert peak_memory._peak_resident_memory_in_bytes(str(tmp_path / "status")) is None
+
+    def test_without_peak(self, tmp_path):
+        status_path = tmp_path / "status"
+        status_path.write_text("VmPeak:\t  4096 kB\n", encoding="utf-8")
+        assert peak_memory._peak_resident_memory_in_bytes(str(status_path)) is None
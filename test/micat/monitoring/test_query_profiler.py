@@ -0,0 +1,130 @@
+# © 2024-2026 Fraunhofer-Gesellschaft e.V., München
+#
+# SPDX-License-Identifier: AGPL-3.0-or-later
+
+# pylint: disable=protected-access
+import sqlite3
+
+import pytest
+
+from micat.log.logger import Logger
+from micat.monitoring.query_profiler import QueryProfiler
+from micat.test_utils.isi_mock import patch
+
+
+@pytest.fixture(name="cursor")
+def fixture_cursor():
+    connection = sqlite3.connect(":memory:")
+    cursor = connection.cursor()
+    cursor.execute("CREATE TABLE foo (id_region integer, value real)")
+    yield cursor
+    connection.close()
+
+
+@pytest.fixture(name="sut")
+def fixture_sut():
+    return QueryProfiler(is_enabled=True, plan_threshold_in_seconds=1.0)
+
+
+class TestFromEnvironment:
+    def test_default(self):
+        sut = QueryProfiler.from_environment({})
+        assert sut.is_enabled is False
+        assert sut.plan_threshold_in_seconds == 0.05
+
+    def test_enabled(self):
+        sut = QueryProfiler.from_environment({"MICAT_QUERY_PROFILER": "1", "MICAT_QUERY_PLAN_THRESHOLD_MS": "10"})
+        assert sut.is_enabled is True
+        assert sut.plan_threshold_in_seconds == 0.01
+
+    def test_os_environment(self):
+        sut = QueryProfiler.from_environment()
+        assert isinstance(sut, QueryProfiler)
+
+
+class TestProfiling:
+    def test_disabled(self, cursor):
+        sut = QueryProfiler()
+        with sut.profiling("/indicator_data"):
+            sut.record_query(cursor, "SELECT * FROM `foo`", {}, "SELECT * FROM `foo`", 1, 0.1)
+            with sut.build_timer():
+                pass
+        assert sut.reports() == []
+
+    def test_outside_of_profile(self, sut, cursor):
+        sut.record_query(cursor, "SELECT * FROM `foo`", {}, "SELECT * FROM `foo`", 1, 0.1)
+        with sut.build_timer():
+            pass
+        assert sut.reports() == []
+
+    def test_report(self, sut, cursor):
+        with sut.profiling("/indicator_data"):
+            sut.record_query(
+                cursor, "SELECT * FROM `foo`", {"id_region": "1"}, "SELECT * FROM `foo` WHERE id_region=1", 3, 0.2
+            )
+            with sut.build_timer():
+                pass
+            sut.record_query(
+                cursor, "SELECT * FROM `foo`", {"id_region": "2"}, "SELECT * FROM `foo` WHERE id_region=2", 3, 0.1
+            )
+            sut.record_query(cursor, "SELECT value FROM `foo`", {}, "SELECT value FROM `foo`", 5, 2.0)
+        report = sut.reports()[0]
+        assert report["name"] == "/indicator_data"
+        assert report["numberOfQueries"] == 3
+        assert report["totalFetchTimeInSeconds"] == pytest.approx(2.3)
+        assert report["totalBuildTimeInSeconds"] > 0
+        slowest_query = report["slowestQueries"][0]
+        assert slowest_query["query"] == "SELECT value FROM `foo`"
+        assert slowest_query["rowCount"] == 5
+        most_frequent_query = report["mostFrequentQueries"][0]
+        assert most_frequent_query["query"] == "SELECT * FROM `foo`"
+        assert most_frequent_query["count"] == 2
+
+    def test_build_time_without_query(self, sut):
+        with sut.profiling("/indicator_data"):
+            with sut.build_timer():
+                pass
+        assert sut.reports()[0]["totalBuildTimeInSeconds"] == 0
+
+
+class TestQueryPlan:
+    def test_above_threshold(self, sut, cursor):
+        with sut.profiling("/indicator_data"):
+            sut.record_query(cursor, "SELECT * FROM `foo`", {}, "SELECT * FROM `foo` WHERE id_region=1", 0, 1.5)
+        query_plan = sut.reports()[0]["slowestQueries"][0]["queryPlan"]
+        assert query_plan == ["SCAN foo"]
+
+    def test_below_threshold(self, sut, cursor):
+        with sut.profiling("/indicator_data"):
+            sut.record_query(cursor, "SELECT * FROM `foo`", {}, "SELECT * FROM `foo`", 0, 0.5)
+        assert sut.reports()[0]["slowestQueries"][0]["queryPlan"] is None
+
+    def test_is_captured_once(self, sut, cursor):
+        with sut.profiling("/indicator_data"):
+            sut.record_query(cursor, "SELECT * FROM `foo`", {}, "SELECT * FROM `foo`", 0, 1.5)
+            cursor.execute("DROP TABLE foo")
+            sut.record_query(cursor, "SELECT * FROM `foo`", {}, "SELECT * FROM `foo`", 0, 1.5)
+        slowest_queries = sut.reports()[0]["slowestQueries"]
+        assert slowest_queries[1]["queryPlan"] == slowest_queries[0]["queryPlan"]
+
+    @patch(Logger.warn)
+    def test_failing_query_plan(self, sut, cursor):
+        with sut.profiling("/indicator_data"):
+            sut.record_query(cursor, "SELECT * FROM `bar`", {}, "SELECT * FROM `bar`", 0, 1.5)
+        assert sut.reports()[0]["slowestQueries"][0]["queryPlan"] is None
+        assert Logger.warn.called
+
+
+def test_clear(sut):
+    with sut.profiling("/indicator_data"):
+        pass
+    sut.clear()
+    assert sut.reports() == []
+
+
+def test_reports_are_bounded():
+    sut = QueryProfiler(is_enabled=True, max_number_of_reports=2)
+    for index in range(3):
+        with sut.profiling("request_" + str(index)):
+            pass
+    assert [report["name"] for report in sut.reports()] == ["request_1", "request_2"]
@@ -0,0 +1,95 @@
+# © 2024-2026 Fraunhofer-Gesellschaft e.V., München
+#
+# SPDX-License-Identifier: AGPL-3.0-or-later
+
+# pylint: disable=protected-access
+import json
+import os
+import pstats
+import tracemalloc
+
+import pytest
+
+from micat.monitoring import request_profiler
+from micat.monitoring.request_profiler import RequestProfiler
+
+
+@pytest.fixture(name="sut")
+def fixture_sut(tmp_path):
+    return RequestProfiler(str(tmp_path / "profiles"), max_number_of_profiles=2, number_of_allocation_sites=3)
+
+
+class TestParseModes:
+    def test_empty(self):
+        assert RequestProfiler.parse_modes(None) == []
+
+    def test_modes(self):
+        assert RequestProfiler.parse_modes(" Memory, cpu,foo") == ["cpu", "memory"]
+
+
+class TestProfiling:
+    def test_without_modes(self, sut):
+        with sut.profiling("/indicator_data", []):
+            pass
+        assert not os.path.exists(sut._directory)
+
+    def test_cpu(self, sut):
+        with sut.profiling("/indicator_data", ["cpu"]):
+            sum(range(100))
+        profile = sut.profiles()[0]
+        assert profile["name"].split("_", 1)[1].startswith("indicator_data_")
+        assert len(profile["files"]) == 1
+        statistics = pstats.Stats(sut.file_path(profile["files"][0]))
+        assert statistics.total_calls > 0
+
+    def test_memory(self, sut):
+        with sut.profiling("/json_parameters", ["memory"]):
+            _data = [str(index) for index in range(1000)]
+        assert not tracemalloc.is_tracing()
+        file_path = sut.file_path(sut.profiles()[0]["files"][0])
+        with open(file_path, encoding="utf-8") as file:
+            allocations = json.load(file)
+        assert allocations["peakInBytes"] > 0
+        assert "test_request_profiler.py" in allocations["topAllocations"][0]["location"]
+
+    def test_nested_memory_profiles(self, sut):
+        with sut.profiling("/foo", ["memory"]):
+            with sut.profiling("/baa", ["memory"]):
+                pass
+            assert tracemalloc.is_tracing()
+        assert not tracemalloc.is_tracing()
+
+    def test_with_error(self, sut):
+        with pytest.raises(ValueError):
+            with sut.profiling("/foo", ["cpu", "memory"]):
+                raise ValueError("mocked_error")
+        assert len(sut.profiles()[0]["files"]) == 2
+
+    def test_old_profiles_are_removed(self, sut):
+        for index in range(3):
+            with sut.profiling("/foo" + str(index), ["cpu"]):
+                pass
+            os.utime(sut.file_path(sut.profiles()[0]["files"][0]), (index, index))
+        names = [profile["name"] for profile in sut.profiles()]
+        assert len(names) == 2
+        assert "foo0" not in " ".join(names)
+
+
+class TestProfiles:
+    def test_without_directory(self, sut):
+        assert sut.profiles() == []
+
+    def test_other_files_are_ignored(self, sut):
+        os.makedirs(sut._directory)
+        with open(os.path.join(sut._directory, "foo.txt"), "w", encoding="utf-8") as file:
+            file.write("foo")
+        assert sut.profiles() == []
+
+
+def test_file_path_of_unknown_file(sut):
+    assert sut.file_path("../foo.prof") is None
+
+
+def test_base_name():
+    assert request_profiler._base_name("foo.allocations.json") == "foo"
+    assert request_profiler._base_name("foo.txt") == "foo.txt"
@@ -0,0 +1,75 @@
+# © 2024-2026 Fraunhofer-Gesellschaft e.V., München
+#
+# SPDX-License-Identifier: AGPL-3.0-or-later
+
+# pylint: disable=protected-access
+import pytest
+
+from micat.monitoring.span import SpanRecorder, SpanStatistics, recording, span
+
+
+class TestSpan:
+    def test_without_recording(self):
+        with span("mocked_span"):
+            pass
+
+    def test_with_recording(self):
+        with recording() as recorder:
+            with span("first"):
+                pass
+            with span("second"):
+                pass
+            with span("first"):
+                pass
+        breakdown = recorder.breakdown()
+        assert list(breakdown.keys()) == ["first", "second"]
+        assert breakdown["first"] >= 0
+
+    def test_with_exception(self):
+        with recording() as recorder:
+            with pytest.raises(ValueError):
+                with span("failing"):
+                    raise ValueError("mocked_error")
+        assert "failing" in recorder.breakdown()
+
+
+def test_recording_adds_to_statistics():
+    statistics = SpanStatistics()
+    with recording(statistics):
+        with span("mocked_span"):
+            pass
+    assert statistics.summary()["mocked_span"]["count"] == 1
+
+    with span("outside_of_recording"):
+        pass
+    assert "outside_of_recording" not in statistics.summary()
+
+
+class TestSpanRecorder:
+    def test_server_timing(self):
+        sut = SpanRecorder()
+        sut.record("interim_data", 0.0123)
+        sut.record("json_serialization", 0.5)
+        assert sut.server_timing() == "interim_data;dur=12.3, json_serialization;dur=500.0"
+
+    def test_empty_server_timing(self):
+        sut = SpanRecorder()
+        assert sut.server_timing() == ""
+
+
+def test_span_statistics():
+    sut = SpanStatistics()
+    first_recorder = SpanRecorder()
+    first_recorder.record("mocked_span", 1.0)
+    second_recorder = SpanRecorder()
+    second_recorder.record("mocked_span", 3.0)
+    sut.add(first_recorder)
+    sut.add(second_recorder)
+    assert sut.summary() == {
+        "mocked_span": {
+            "count": 2,
+            "totalInSeconds": 4.0,
+            "maxInSeconds": 3.0,
+            "meanInSeconds": 2.0,
+        }
+    }
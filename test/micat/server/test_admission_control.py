@@ -0,0 +1,123 @@
+# © 2024-2026 Fraunhofer-Gesellschaft e.V., München
+#
+# SPDX-License-Identifier: AGPL-3.0-or-later
+
+# pylint: disable=protected-access
+import threading
+
+import pytest
+
+from micat.server.admission_control import (
+    DEFAULT_ROUTE_CLASSES,
+    AdmissionControl,
+    RouteSaturatedError,
+    _merge_route_class_settings,
+)
+
+
+def route_class_settings(max_concurrency=1, max_queue_length=1, max_wait_in_seconds=5):
+    return {
+        "calculation": {
+            "maxConcurrency": max_concurrency,
+            "maxQueueLength": max_queue_length,
+            "maxWaitInSeconds": max_wait_in_seconds,
+            "retryAfterInSeconds": 3,
+        }
+    }
+
+
+@pytest.fixture(name="sut")
+def fixture_sut():
+    return AdmissionControl(route_class_settings())
+
+
+class TestRouteClass:
+    def test_heavy_route(self, sut):
+        assert sut.route_class("/indicator_data") == "calculation"
+        assert sut.route_class("/json_parameters") == "template"
+        assert sut.route_class("/export-results") == "export"
+
+    def test_sub_path(self, sut):
+        assert sut.route_class("/export-results/mocked_result_id") == "export"
+        assert sut.route_class("/export-results-foo") is None
+
+    def test_lookup_route(self, sut):
+        assert sut.route_class("/id_region") is None
+        assert sut.route_class("/") is None
+
+
+class TestAcquire:
+    def test_free_slot(self, sut):
+        sut.acquire("calculation")
+        metrics = sut.metrics()["calculation"]
+        assert metrics["activeRequests"] == 1
+        assert metrics["admittedRequests"] == 1
+        sut.release("calculation")
+        assert sut.metrics()["calculation"]["activeRequests"] == 0
+
+    def test_full_queue_is_rejected(self):
+        sut = AdmissionControl(route_class_settings(max_queue_length=0))
+        sut.acquire("calculation")
+        with pytest.raises(RouteSaturatedError) as error_info:
+            sut.acquire("calculation")
+        assert error_info.value.status_code == 429
+        assert error_info.value.retry_after_in_seconds == 3
+        assert error_info.value.route_class == "calculation"
+        assert sut.metrics()["calculation"]["rejectedRequests"] == 1
+
+    def test_wait_time_out(self):
+        sut = AdmissionControl(route_class_settings(max_wait_in_seconds=0.01))
+        sut.acquire("calculation")
+        with pytest.raises(RouteSaturatedError) as error_info:
+            sut.acquire("calculation")
+        assert error_info.value.status_code == 503
+        metrics = sut.metrics()["calculation"]
+        assert metrics["timedOutRequests"] == 1
+        assert metrics["queueLength"] == 0
+        assert metrics["maxObservedQueueLength"] == 1
+
+    def test_queued_request_is_admitted_after_release(self, sut):
+        sut.acquire("calculation")
+
+        admitted = []
+
+        def queued_request():
+            sut.acquire("calculation")
+            admitted.append(1)
+
+        thread = threading.Thread(target=queued_request)
+        thread.start()
+        while sut.metrics()["calculation"]["queueLength"] < 1:
+            pass
+        sut.release("calculation")
+        thread.join()
+
+        assert admitted == [1]
+        metrics = sut.metrics()["calculation"]
+        assert metrics["activeRequests"] == 1
+        assert metrics["admittedRequests"] == 2
+        assert metrics["maxWaitTimeInSeconds"] > 0
+        assert metrics["meanWaitTimeInSeconds"] == metrics["totalWaitTimeInSeconds"] / 2
+
+
+def test_metrics(sut):
+    metrics = sut.metrics()
+    assert set(metrics.keys()) == {"calculation", "template", "export"}
+    assert metrics["template"]["meanWaitTimeInSeconds"] == 0.0
+    assert metrics["calculation"]["maxConcurrency"] == 1
+
+
+class TestMergeRouteClassSettings:
+    def test_without_settings(self):
+        result = _merge_route_class_settings(None)
+        assert result == DEFAULT_ROUTE_CLASSES
+
+    def test_partial_settings(self):
+        result = _merge_route_class_settings({"export": {"maxConcurrency": 3}})
+        assert result["export"]["maxConcurrency"] == 3
+        assert result["export"]["routes"] == ["/export-results"]
+
+    def test_additional_route_class(self):
+        result = _merge_route_class_settings({"lookup": {"routes": ["/id_region"]}})
+        assert result["lookup"]["routes"] == ["/id_region"]
+        assert result["lookup"]["maxConcurrency"] == DEFAULT_ROUTE_CLASSES["calculation"]["maxConcurrency"]
@@ -0,0 +1,93 @@
+# © 2024-2026 Fraunhofer-Gesellschaft e.V., München
+#
+# SPDX-License-Identifier: AGPL-3.0-or-later
+
+# pylint: disable=protected-access
+import flask
+import pytest
+
+from micat.server import calculation_pool
+from micat.monitoring.span import recording, span
+from micat.server.calculation_pool import CalculationPool, WorkerRequest
+from micat.test_utils.isi_mock import Mock
+
+# The job needs to be importable in the spawned worker processes, therefore
+# a bound method of a built-in type is used instead of a test function
+mocked_job = "{0.path}|{0.query_string}|{1}|{2}".format
+
+
+@pytest.fixture(name="http_request")
+def fixture_http_request():
+    app = flask.Flask(__name__)
+    with app.test_request_context(
+        "/indicator_data?id_region=2&years=2020&years=2030",
+        method="POST",
+        json={"measures": []},
+    ):
+        yield flask.request
+
+
+def test_run(http_request):
+    sut = CalculationPool("public.sqlite", "confidential.sqlite", number_of_workers=1, max_jobs_per_worker=1)
+    try:
+        first_result = sut.run(mocked_job, http_request)
+        second_result = sut.run(mocked_job, http_request)
+    finally:
+        sut.shutdown()
+    assert first_result == "/indicator_data|b'id_region=2&years=2020&years=2030'|public.sqlite|confidential.sqlite"
+    assert second_result == first_result
+
+
+def test_run_with_spans(http_request):
+    sut = CalculationPool("public.sqlite", "confidential.sqlite", number_of_workers=1)
+    sut._executor = Mock()
+    sut._executor.submit = Mock(return_value=Mock(result=Mock(("mocked_result", {"mocked_span": 1.5}))))
+    with recording() as recorder:
+        result = sut.run(mocked_job, http_request)
+    assert result == "mocked_result"
+    assert recorder.breakdown() == {"mocked_span": 1.5}
+
+
+class TestWorkerRequest:
+    def test_json_request(self, http_request):
+        payload = WorkerRequest.payload(http_request)
+        request = WorkerRequest(payload)
+        assert request.path == "/indicator_data"
+        assert request.query_string == b"id_region=2&years=2020&years=2030"
+        assert request.content_type == "application/json"
+        assert request.json == {"measures": []}
+        assert request.args.getlist("years") == ["2020", "2030"]
+
+    def test_request_without_body(self):
+        app = flask.Flask(__name__)
+        with app.test_request_context("/json_parameters?id_region=0"):
+            payload = WorkerRequest.payload(flask.request)
+        request = WorkerRequest(payload)
+        assert request.content_type is None
+        assert request.json is None
+
+
+def test_run_job():
+    calculation_pool._initialize_worker("public.sqlite", "confidential.sqlite")
+    payload = {
+        "path": "/json_parameters",
+        "queryString": "id_region=0",
+        "contentType": None,
+        "body": "",
+    }
+    result, durations = calculation_pool._run_job(mocked_job, payload)
+    assert result == "/json_parameters|b'id_region=0'|public.sqlite|confidential.sqlite"
+    assert durations == {}
+
+
+def test_run_job_with_spans():
+    calculation_pool._initialize_worker("public.sqlite", "confidential.sqlite")
+
+    def job(_request, _database, _confidential_database):
+        with span("mocked_span"):
+            return "mocked_result"
+
+    payload = {"path": "/json_parameters", "queryString": "", "contentType": None, "body": ""}
+    result, durations = calculation_pool._run_job(job, payload)
+    assert result == "mocked_result"
+    assert list(durations) == ["mocked_span"]
@@ -0,0 +1,87 @@
+# © 2024-2026 Fraunhofer-Gesellschaft e.V., München
+#
+# SPDX-License-Identifier: AGPL-3.0-or-later
+
+# pylint: disable=protected-access
+import os
+
+import pytest
+
+import micat
+from micat.input.database import Database
+from micat.log.logger import Logger
+from micat.server.warm_up import WarmUp
+from micat.test_utils.isi_mock import MagicMock, Mock, patch
+
+
+@pytest.fixture(name="database")
+def fixture_database():
+    micat_path = list(micat.__path__)[0]
+    database_path = os.path.join(micat_path, "data", "confidential_dummy.sqlite")
+    return Database(database_path)
+
+
+class TestRun:
+    def test_without_synthetic_requests(self, database):
+        sut = WarmUp([database])
+        assert sut.is_ready() is False
+        sut.run()
+        assert sut.is_ready() is True
+        assert 'SELECT *  FROM `id_region`{}' in database._reference_data
+        assert database._fingerprint is not None
+        status = sut.status()
+        assert status["errors"] == []
+        assert status["durationInSeconds"] > 0
+
+    def test_with_synthetic_requests(self, database):
+        synthetic_request = MagicMock()
+        sut = WarmUp([database], synthetic_request)
+        sut.run()
+        id_regions = [call.args[0] for call in synthetic_request.mock_calls]
+        assert id_regions == sut._id_regions()
+
+    @patch(Logger.warn)
+    def test_failed_synthetic_request(self, database):
+        synthetic_request = MagicMock(side_effect=[ValueError("mocked_error")] + [None] * 100)
+        sut = WarmUp([database], synthetic_request)
+        sut.run()
+        assert synthetic_request.call_count == len(sut._id_regions())
+        assert sut.status()["errors"] == ["Warm-up of region 0 failed: mocked_error"]
+
+    @patch(Logger.warn)
+    @patch(Logger.error)
+    def test_error(self, tmp_path):
+        database = Database(str(tmp_path / "empty.sqlite"))
+        sut = WarmUp([database])
+        sut.run()
+        assert sut.is_ready() is True
+        assert len(sut.status()["errors"]) == 1
+
+
+def test_start(database):
+    sut = WarmUp([database])
+    thread = sut.start()
+    thread.join()
+    assert sut.is_ready() is True
+
+
+def test_preload_reference_tables():
+    database = Mock()
+    database.query = Mock(return_value={"name": Mock(values=["id_region", "mapping__subsector__action_type", "other"])})
+    database.id_table = MagicMock()
+    database.mapping_table = MagicMock()
+    sut = WarmUp([database])
+    sut._preload_reference_tables(database)
+    database.id_table.assert_called_once_with("id_region")
+    database.mapping_table.assert_called_once_with("mapping__subsector__action_type")
+
+
+@patch(Logger.warn)
+def test_preload_reference_tables_with_error():
+    database = Mock()
+    database.query = Mock(return_value={"name": Mock(values=["id_region", "id_subsector"])})
+    database.id_table = MagicMock(side_effect=[ValueError("mocked_error"), None])
+    sut = WarmUp([database])
+    sut._preload_reference_tables(database)
+    assert database.id_table.call_count == 2
+    assert sut.status()["errors"] == ["Warm-up of table id_region failed: mocked_error"]
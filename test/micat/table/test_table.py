@@ -5,6 +5,9 @@
 # pylint: disable=protected-access
 # pylint: disable=too-many-public-methods
 # pylint: disable=too-many-lines
+import base64
+import json
+
 import numpy as np
 import pandas as pd
 
@@ -866,6 +869,32 @@ class TestPublicApi:
         assert series["2000"] == 11
         assert series["2020"] == 22
 
+    class TestToColumnarJson:
+        def test_indexed(self):
+            table = Table(
+                [
+                    {"id_measure": 1, "id_parameter": "foo", "2020": 1.5, "2025": 2},
+                    {"id_measure": 2, "id_parameter": "baa", "2020": 3, "2025": 4},
+                ]
+            )
+            columnar_json = table.to_columnar_json()
+            assert columnar_json["idColumnNames"] == ["id_measure", "id_parameter"]
+            assert columnar_json["idColumns"] == [[1, 2], ["foo", "baa"]]
+            assert columnar_json["columnNames"] == ["2020", "2025"]
+            assert columnar_json["yearColumnNames"] == ["2020", "2025"]
+            assert columnar_json["numberOfRows"] == 2
+            values = np.frombuffer(base64.b64decode(columnar_json["values"]), dtype="<f8")
+            assert values.tolist() == [1.5, 3, 2, 4]
+            json.dumps(columnar_json)
+
+        def test_not_indexed(self):
+            table = Table(pd.DataFrame({"2020": [1.5, 2]}))
+            columnar_json = table.to_columnar_json()
+            assert columnar_json["idColumnNames"] == []
+            assert columnar_json["idColumns"] == []
+            values = np.frombuffer(base64.b64decode(columnar_json["values"]), dtype="<f8")
+            assert values.tolist() == [1.5, 2]
+
     def test_to_custom_json(self, sut):
         with patch_property(Table.column_names, (["id_foo", "id_baa"], ["2000"], [])):
             with patch_property(Table.rows, "mocked_rows"):
@@ -1005,6 +1034,21 @@ class TestPublicApi:
         result = sut.where("mocked_condition_table", "mocked_fallback_value_table")
         assert result._data_frame["foo"][0] == 1
 
+    def test_row_chunks(self):
+        table = Table(
+            [
+                {"id_foo": 1, "2000": 33.5},
+                {"id_foo": 2, "2000": 34},
+                {"id_foo": 3, "2000": 35},
+            ]
+        )
+        result = list(table.row_chunks(2))
+        assert result == [
+            [[1, 33.5], [2, 34]],
+            [[3, 35]],
+        ]
+        assert result[0] + result[1] == table.rows
+
     def test_rows(self):
         table = Table(
             [
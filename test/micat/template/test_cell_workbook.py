@@ -0,0 +1,85 @@
+# © 2024-2026 Fraunhofer-Gesellschaft e.V., München
+#
+# SPDX-License-Identifier: AGPL-3.0-or-later
+
+# pylint: disable=protected-access
+import io
+import math
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from micat.template import cell_workbook, xlsx_utils
+from micat.template.cell_workbook import CellWorkbook
+
+
+def write_sheets(workbook):
+    header_format = workbook.add_format({"bold": True})
+    sheet = workbook.add_worksheet("Data")
+    sheet.set_row(row=0, height=None, cell_format=header_format)
+    sheet.write_row(row=0, col=0, data=["id_subsector", "id_final_energy_carrier", "Subsector", "Extra"])
+    sheet.write_row(0, 0, np.array(["id_subsector", "Subsector", "2020", "2030"], dtype=object))
+    sheet.write_row(1, 0, np.array([1, "Industry", 0.1 + 0.2, 1.0], dtype=object))
+    sheet.write_row(2, 0, np.array([np.int64(2), "Residential", "", 2 / 3], dtype=object))
+    sheet.data_validation(first_row=0, first_col=0, last_row=0, last_col=0, options={"validate": "any"})
+    sheet.set_column(first_col=0, last_col=3, width=30)
+
+    options_sheet = workbook.add_worksheet("Options")
+    options_sheet.write_column(row=0, col=0, data=["s1", "s2", "s3"])
+    options_sheet.write_column(row=0, col=1, data=["f1", "f2"])
+    options_sheet.write_column(row=0, col=0, data=["p1", "p2"])
+    options_sheet.protect(password="micat")
+    options_sheet.hide()
+
+    workbook.add_worksheet("Empty")
+    workbook.close()
+
+
+def test_data_frames_equal_read_excel():
+    excel_bytes = io.BytesIO()
+    write_sheets(xlsx_utils.empty_workbook(excel_bytes))
+    expected_data_frames = pd.read_excel(excel_bytes, sheet_name=None)
+
+    workbook = CellWorkbook()
+    write_sheets(workbook)
+    data_frames = workbook.data_frames()
+
+    assert list(data_frames) == list(expected_data_frames)
+    for sheet_name, expected_data_frame in expected_data_frames.items():
+        pd.testing.assert_frame_equal(data_frames[sheet_name], expected_data_frame)
+        for orient in ["split", "records", "index", "columns", "values", "table"]:
+            assert data_frames[sheet_name].to_json(orient=orient) == expected_data_frame.to_json(orient=orient)
+
+
+def test_overwritten_header():
+    workbook = CellWorkbook()
+    sheet = workbook.add_worksheet("Data")
+    sheet.write_row(0, 0, ["a", "b", "c"])
+    sheet.write_row(0, 0, ["x", "2020"])
+    sheet.write_row(1, 0, [1, 2.5])
+    data_frame = workbook.data_frames()["Data"]
+    assert data_frame.columns.tolist() == ["x", "2020", "c"]
+    assert math.isnan(data_frame.loc[0, "c"])
+
+
+@pytest.mark.parametrize(
+    "value, expected_result",
+    [
+        (None, ""),
+        ("", ""),
+        ("label", "label"),
+        (True, True),
+        (2.0, 2),
+        (np.float64(0.1) + np.float64(0.2), 0.3),
+        (1 / 3, 0.3333333333333333),
+    ],
+)
+def test_read_value(value, expected_result):
+    result = cell_workbook._read_value(value)
+    assert result == expected_result
+    assert type(result) is type(expected_result)
+
+
+def test_read_value_of_nan():
+    assert math.isnan(cell_workbook._read_value(np.nan))
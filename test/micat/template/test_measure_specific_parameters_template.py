@@ -6,6 +6,7 @@
 import math
 
 import numpy as np
+import pandas as pd
 
 from micat.calculation import extrapolation
 from micat.calculation.ecologic import fuel_split
@@ -140,6 +141,127 @@ def test_get_measure_specific_data():
     )
 
 
+def _batch_measure(id_measure, id_subsector, id_action_type, saving, population_of_municipality=None):
+    measure = {
+        "id": id_measure,
+        "2020": saving,
+        "2030": 2 * saving,
+        "subsector": {"id": id_subsector},
+        "action_type": {"id": id_action_type},
+        "unit": {"symbol": "ktoe"},
+    }
+    if population_of_municipality is not None:
+        measure["population"] = population_of_municipality
+    return measure
+
+
+def _measure_rows(final_energy_saving_or_capacities, id_column_name, factors):
+    # Table with a row for each measure and id value, derived from the savings
+    rows = []
+    for (id_measure, id_subsector, _id_action_type), savings in final_energy_saving_or_capacities.iterrows():
+        for id_value, factor in factors.items():
+            row = {"id_measure": id_measure, "id_subsector": id_subsector}
+            if id_column_name is not None:
+                row[id_column_name] = id_value
+            for year in final_energy_saving_or_capacities.years:
+                row[str(year)] = savings[str(year)] * factor
+            rows.append(row)
+    return Table(rows)
+
+
+def _mocked_fuel_split(final_energy_saving_or_capacities, _data_source, _id_region, _subsector_ids, round):
+    # pylint: disable=redefined-builtin, unused-argument
+    return _measure_rows(final_energy_saving_or_capacities, "id_final_energy_carrier", {1: 0.25, 4: 0.75})
+
+
+def _mocked_dwellings(final_energy_saving_or_capacities, _data_source, _id_region, population_of_municipality):
+    factor = 1 if population_of_municipality is None else population_of_municipality
+    return _measure_rows(final_energy_saving_or_capacities, None, {None: factor})
+
+
+def _mocked_investment_cost(final_energy_saving_or_capacities, _data_source, id_region):
+    # pylint: disable=unused-argument
+    return Table(final_energy_saving_or_capacities._data_frame * 1000000)
+
+
+@patch(investment.investment_cost_in_euro, Mock(side_effect=_mocked_investment_cost))
+@patch(fuel_split.fuel_split_by_action_type, Mock(side_effect=_mocked_fuel_split))
+@patch(dwelling.number_of_affected_dwellings, Mock(side_effect=_mocked_dwellings))
+@patch(dwelling.dwelling_stock, Mock(side_effect=_mocked_dwellings))
+@patch(
+    measure_specific_parameters_template._wuppertal_parameters,
+    Table(
+        [
+            {"id_parameter": id_parameter, "id_region": 1, "2020": 0.1, "2030": 0.2}
+            for id_parameter in [25, 29, 31, 34, 35]
+        ]
+    ),
+)
+@patch(measure_specific_parameters_template._lifetime, None)
+@patch(measure_specific_parameters_template._id_sector, 4)
+@patch(measure_specific_parameters_template._get_fuel_switch_data, [{"id_sector": 4, "2020": 0.5}])
+def test_get_batch_measure_specific_data():
+    database = Mock()
+    measures = [
+        _batch_measure(1, 2, 3, 10),
+        _batch_measure(1, 17, 1, 20, population_of_municipality=1000),
+        _batch_measure(2, 2, 3, 30),
+        _batch_measure(3, 17, 1, 40),
+    ]
+    result = measure_specific_parameters_template._get_batch_measure_specific_data(
+        {"measures": measures, "id_region": "1"},
+        database,
+        database,
+    )
+
+    # the fuel split is calculated for each group of measures with equal subsector and action type
+    assert fuel_split.fuel_split_by_action_type.call_count == 2
+    # the dwellings are calculated for each group of measures with equal population of municipality
+    assert dwelling.number_of_affected_dwellings.call_count == 3
+    assert measure_specific_parameters_template._wuppertal_parameters.call_count == 1
+
+    for measure, measure_result in zip(measures, result):
+        expected_result = measure_specific_parameters_template._get_measure_specific_data(
+            {
+                "measure": measure,
+                "id_region": "1",
+                "id_subsector": measure["subsector"]["id"],
+                "global_parameters": None,
+            },
+            database,
+            database,
+        )
+        assert measure_result == expected_result
+    assert result[2]["affectedFuels"][3]["2030"] == 45
+
+
+@patch(measure_specific_parameters_template._get_fuel_data, [{"id_parameter": 67}])
+def test_get_group_fuel_data_for_renewables():
+    final_energy_saving_or_capacities = Table(
+        [
+            {"id_measure": 0, "id_subsector": 30, "id_action_type": 37, "2020": 1},
+            {"id_measure": 1, "id_subsector": 30, "id_action_type": 37, "2020": 2},
+        ]
+    )
+    result = measure_specific_parameters_template._get_group_fuel_data(
+        {"id_region": 1, "id_subsector": 30},
+        final_energy_saving_or_capacities,
+        "mocked_data_source",
+        True,
+    )
+    assert result == {0: [{"id_parameter": 67}], 1: [{"id_parameter": 67}]}
+    assert result[0] is not result[1]
+    measure_specific_parameters_template._get_fuel_data.assert_called_once()
+
+
+def test_id_sector():
+    mapping_table = Mock()
+    mapping_table._data_frame = pd.DataFrame({"id_subsector": [2, 4], "id_sector": [3, 5]})
+    data_source = Mock()
+    data_source.mapping_table.return_value = mapping_table
+    assert measure_specific_parameters_template._id_sector(4, data_source) == 5
+
+
 @patch(extrapolation.extrapolate, "mocked_result")
 def test_wuppertal_parameters():
     context = Mock()
@@ -425,3 +547,19 @@ def test_split_sheet():
 def test_template_args():
     result = measure_specific_parameters_template._template_args("mocked_request")
     assert result["id_region"] == "2"
+
+
+@patch(
+    measure_specific_parameters_template._get_batch_measure_specific_data,
+    ["mocked_result"],
+)
+def test_batch_measure_specific_parameters_template():
+    with patch(api.parse_request, {"id_region": "2", "json": ["mocked_measure"]}):
+        result = measure_specific_parameters_template.batch_measure_specific_parameters_template(
+            "mocked_request",
+            "mocked_database",
+            "mocked_confidential_database",
+        )
+    assert result == ["mocked_result"]
+    template_args = measure_specific_parameters_template._get_batch_measure_specific_data.call_args.args[0]
+    assert template_args == {"measures": ["mocked_measure"], "id_region": "2"}
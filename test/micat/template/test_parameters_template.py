@@ -43,6 +43,72 @@ def test_parameters_template():
     assert result == "mocked_result"
 
 
+def _mocked_parameter_data(sheet, *_args, **_kwargs):
+    data_table = table.Table(
+        pd.DataFrame(
+            {
+                "id_subsector": [1, 2],
+                "id_final_energy_carrier": [3, 4],
+                "Subsector": ["Industry", "Residential"],
+                "Final energy carrier": ["Gas", "Oil"],
+                "2025": [0.1 + 0.2, ""],
+                "2030": [1.0, 2 / 3],
+            }
+        )
+    )
+    return parameters_template._write_data_to_sheet(sheet, data_table)
+
+
+def _mocked_database_with_id_tables():
+    database = Mock()
+    database.id_table = Mock(pd.DataFrame({"id": [1, 2], "label": ["first label", "second label"]}))
+    return database
+
+
+@patch(
+    parameters_template._template_args,
+    Mock(
+        side_effect=lambda _request: {
+            "coefficient_sheets": [
+                "FuelSplitCoefficient",
+                "EnergyPrice",
+                "ElectricityGeneration",
+                "HeatGeneration",
+                "MonetisationFactors",
+            ],
+            "id_region": 2,
+            "sheet_password": "micat",
+            "options_sheet_name": "Options",
+            "years": ["2025", "2030"],
+        }
+    ),
+)
+@patch(parameters_template._subsector_final_add_parameter_data, Mock(side_effect=_mocked_parameter_data))
+@patch(parameters_template._primary_add_parameter_data, Mock(side_effect=_mocked_parameter_data))
+@patch(
+    parameters_template._monetization_parameters_table,
+    pd.DataFrame({"Monetisation factor": ["Value of a life year [€]"], "Value": [12.5], "Id_region": [2]}),
+)
+def test_parameters_data_frames():
+    database = _mocked_database_with_id_tables()
+    template_bytes = parameters_template.parameters_template("mocked_request", database)
+    expected_data_frames = pd.read_excel(template_bytes, sheet_name=None)
+
+    result = parameters_template.parameters_data_frames("mocked_request", database)
+
+    assert list(result) == list(expected_data_frames)
+    for sheet_name, expected_data_frame in expected_data_frames.items():
+        pd.testing.assert_frame_equal(result[sheet_name], expected_data_frame)
+    assert result["FuelSplitCoefficient"].columns.tolist() == [
+        "id_subsector",
+        "id_final_energy_carrier",
+        "Subsector",
+        "Final energy carrier",
+        "2025",
+        "2030",
+    ]
+
+
 @patch(
     utils.api.parse_request,
     {"id_region": "2"},
@@ -6,35 +6,51 @@
 import json
 import logging
 import os
+import zlib
 from io import BytesIO
 
 import flask
+import openpyxl
 import pytest
 from mock import MagicMock as OriginalMagicMock
+from werkzeug.datastructures import MIMEAccept
 from werkzeug.exceptions import HTTPException
+from werkzeug.http import parse_accept_header
 
 from micat import back_end
 from micat.back_end import BackEnd
+from micat.cache.result_store import ResultStore
+from micat.cache.template_cache import TemplateCache
+from micat.log.logger import Logger
+from micat.monitoring.metrics import REGISTRY
+from micat.monitoring.query_profiler import QUERY_PROFILER
+from micat.monitoring.request_profiler import RequestProfiler
+from micat.monitoring.span import SpanRecorder
+from micat.server.admission_control import AdmissionControl, RouteSaturatedError
+from micat.server.warm_up import WarmUp
+from micat.table.table import Table
 from micat.calculation import calculation
 from micat.description import descriptions
+from micat.export import result_tables_export, results_export
 from micat.template import (
     measure_specific_parameters_template,
     parameters_template,
     savings_template,
 )
-from micat.test_utils.isi_mock import MagicMock, patch, patch_by_string
+from micat.test_utils.isi_mock import MagicMock, Mock, patch, patch_by_string
 
 APP_REQUEST_CONTEXT = None
 
 MOCKED_SERVE_ARGS = None
 
 
-def mocked_serve(app_to_serve, host, port):
+def mocked_serve(app_to_serve, host, port, threads=None):
     global MOCKED_SERVE_ARGS  # pylint: disable=global-statement
     MOCKED_SERVE_ARGS = {
         "app": app_to_serve,
         "host": host,
         "port": port,
+        "threads": threads,
     }
 
 
@@ -93,6 +109,16 @@ def fixture_app(sut):
     return app
 
 
+@pytest.fixture(name="profiling_sut")
+def fixture_profiling_sut(sut, tmp_path):
+    sut._admin_secret = "mocked_secret"
+    sut._request_profiler = RequestProfiler(str(tmp_path))
+    return sut
+
+
+PROFILE_HEADERS = {"X-Micat-Admin-Secret": "mocked_secret", "X-Micat-Profile": "cpu"}
+
+
 @pytest.fixture(name="client")
 def fixture_client(app):
     with app.app_context():
@@ -111,6 +137,35 @@ class TestPublicApi:
         sut._serve = MagicMock()
         sut.start()
         assert sut._serve.called is True
+        assert sut._serve.call_args.kwargs["threads"] == 16
+
+    def test_start_with_warm_up(self, sut):
+        sut._debug_mode = False
+        sut._serve = MagicMock()
+        sut._warm_up = MagicMock()
+        sut._warm_up.start = MagicMock()
+        sut.start()
+        assert sut._warm_up.start.called is True
+
+    def test_start_with_template_pre_generation(self, sut):
+        sut._debug_mode = False
+        sut._serve = MagicMock()
+        sut._template_cache = MagicMock()
+        sut._template_cache.start_pre_generation = MagicMock()
+        sut._is_template_pre_generation_enabled = True
+        sut.start()
+        sut._template_cache.start_pre_generation.assert_called_once_with(
+            sut._id_regions,
+            sut._pre_generate_templates,
+        )
+
+    def test_start_with_calculation_pool(self, sut):
+        sut._debug_mode = False
+        sut._serve = MagicMock()
+        sut._calculation_pool = MagicMock()
+        sut._calculation_pool.shutdown = MagicMock()
+        sut.start()
+        assert sut._calculation_pool.shutdown.called is True
 
     def test_start_debug(self, sut):
         sut._debug_mode = True
@@ -123,6 +178,12 @@ class TestPublicApi:
     class TestCreateApplication:
         def test_config(self, app):
             assert app.config["PROPAGATE_EXCEPTIONS"] is True
+            assert app.config["COMPRESS_STREAMS"] is True
+
+        def test_config_without_stream_compression(self, sut):
+            sut._is_stream_compression_enabled = False
+            app = sut.create_application()
+            assert app.config["COMPRESS_STREAMS"] is False
 
         def test_handle_preflight_options_request(self, sut, client):  # pylint: disable=unused-argument
             response = client.options(
@@ -136,6 +197,137 @@ class TestPublicApi:
         def test_id_region(self, sut, client):
             assert_table_query(sut, client, "id_region")
 
+        class TestAdmitRequest:
+            @patch(
+                measure_specific_parameters_template.measure_specific_parameters_template,
+                ["mocked_measure"],
+            )
+            def test_admitted(self, sut, client):
+                sut._admission_control = AdmissionControl()
+                response = client.post("/json_measure")
+                assert response.text == '["mocked_measure"]'
+                metrics = sut._admission_control.metrics()["calculation"]
+                assert metrics["admittedRequests"] == 1
+                assert metrics["activeRequests"] == 0
+
+            def test_lookup_is_not_limited(self, sut, client):
+                sut._admission_control = AdmissionControl()
+                assert_table_query(sut, client, "id_region")
+                assert sut._admission_control.metrics()["calculation"]["admittedRequests"] == 0
+
+            def test_saturated(self, sut, client):
+                sut._admission_control = AdmissionControl({"calculation": {"maxConcurrency": 0, "maxQueueLength": 0}})
+                response = client.post("/indicator_data")
+                assert response.status_code == 429
+                assert response.headers["Retry-After"] == "10"
+                assert json.loads(response.text)["error"]["type"] == "RouteSaturatedError"
+
+        class TestReady:
+            def test_without_warm_up(self, client):
+                response = client.get("/ready")
+                assert response.status_code == 200
+                assert json.loads(response.text) == {"ready": True}
+
+            @patch(Logger.warn)
+            @patch(parameters_template._write_parameter_sheets, Mock(side_effect=KeyError("mocked_error")))
+            def test_after_failed_synthetic_request(self, sut, client):
+                sut._warm_up = WarmUp([], lambda _id_region: sut._synthetic_request(2))
+                sut._warm_up._id_regions = Mock([2])
+                sut._warm_up.run()
+                response = client.get("/ready")
+                assert response.status_code == 200
+                assert json.loads(response.text)["errors"] == ["Warm-up of region 2 failed: 'mocked_error'"]
+
+            def test_during_warm_up(self, sut, client):
+                sut._warm_up = WarmUp([])
+                response = client.get("/ready")
+                assert response.status_code == 503
+                assert json.loads(response.text)["ready"] is False
+
+        class TestQueryProfiler:
+            def test_without_admin_secret(self, client):
+                response = client.get("/admin/query_profiler", headers={"X-Micat-Admin-Secret": ""})
+                assert response.status_code == 403
+
+            def test_with_wrong_admin_secret(self, sut, client):
+                sut._admin_secret = "mocked_secret"
+                response = client.get("/admin/query_profiler", headers={"X-Micat-Admin-Secret": "wrong"})
+                assert response.status_code == 403
+
+            def test_enable_and_profile_request(self, sut, client):
+                sut._admin_secret = "mocked_secret"
+                headers = {"X-Micat-Admin-Secret": "mocked_secret"}
+                try:
+                    response = client.post(
+                        "/admin/query_profiler",
+                        json={"enabled": True, "planThresholdInMilliseconds": 20, "clear": True},
+                        headers=headers,
+                    )
+                    assert json.loads(response.text)["enabled"] is True
+                    client.get("/ready")
+                    response = client.get("/admin/query_profiler", headers=headers)
+                    status = json.loads(response.text)
+                    assert status["planThresholdInMilliseconds"] == 20
+                    # the report of the current request is added after the response has been created
+                    assert [report["name"] for report in status["reports"]] == ["/ready"]
+                finally:
+                    QUERY_PROFILER.is_enabled = False
+                    QUERY_PROFILER.plan_threshold_in_seconds = 0.05
+                    QUERY_PROFILER.clear()
+
+        class TestProfiles:
+            def test_without_admin_secret(self, client):
+                response = client.get("/admin/profiles")
+                assert response.status_code == 403
+
+            @patch(calculation.calculate_indicator_data, "mocked_indicator_data")
+            def test_profiled_request(self, profiling_sut, client):
+                client.post("/indicator_data", headers=PROFILE_HEADERS)
+                response = client.get("/admin/profiles", headers=PROFILE_HEADERS)
+                profiles = json.loads(response.text)
+                assert len(profiles) == 1
+                assert profiles[0]["files"][0].endswith("_indicator_data_" + profiles[0]["name"][-8:] + ".prof")
+
+            def test_file_without_admin_secret(self, client):
+                response = client.get("/admin/profiles/foo.prof")
+                assert response.status_code == 403
+
+            def test_file(self, profiling_sut, client):
+                with profiling_sut._request_profiler.profiling("/foo", ["memory"]):
+                    pass
+                file_name = profiling_sut._request_profiler.profiles()[0]["files"][0]
+                response = client.get("/admin/profiles/" + file_name, headers=PROFILE_HEADERS)
+                assert response.status_code == 200
+                assert "peakInBytes" in response.text
+
+            def test_unknown_file(self, profiling_sut, client):
+                response = client.get("/admin/profiles/foo.prof", headers=PROFILE_HEADERS)
+                assert response.status_code == 404
+
+        def test_metrics(self, client):
+            client.get("/ready")
+            response = client.get("/metrics")
+            assert response.content_type == "text/plain; version=0.0.4; charset=utf-8"
+            assert 'micat_http_requests_total{route="/ready",method="GET",status="200"}' in response.text
+            assert "micat_active_calculations 0" in response.text
+
+        def test_timing_metrics(self, sut, client):
+            recorder = SpanRecorder()
+            recorder.record("interim_data", 2.0)
+            sut._span_statistics.add(recorder)
+            response = client.get("/timing_metrics")
+            assert json.loads(response.text)["interim_data"]["meanInSeconds"] == 2.0
+
+        class TestAdmissionMetrics:
+            def test_disabled(self, client):
+                response = client.get("/admission_metrics")
+                assert json.loads(response.text) == {}
+
+            def test_enabled(self, sut, client):
+                sut._admission_control = AdmissionControl()
+                response = client.get("/admission_metrics")
+                assert set(json.loads(response.text).keys()) == {"calculation", "template", "export"}
+
         def test_id_subsector(self, sut, client):
             assert_table_query(sut, client, "id_subsector")
 
@@ -177,6 +369,79 @@ class TestPublicApi:
             def test_without_error(self, client):
                 response = client.post("/indicator_data")
                 assert response.text == '"mocked_indicator_data"'
+                assert "Server-Timing" not in response.headers
+                assert back_end.RESULT_ID_HEADER not in response.headers
+
+            @patch(calculation.calculate_indicator_data, "mocked_indicator_data")
+            def test_with_result_store(self, sut, client, tmp_path):
+                sut._result_store = ResultStore(str(tmp_path / "result_store.sqlite"))
+                sut._result_key = MagicMock(return_value="mocked_result_id")
+                response = client.post("/indicator_data")
+                assert response.headers[back_end.RESULT_ID_HEADER] == "mocked_result_id"
+                assert sut._result_store.get_string("mocked_result_id") == '"mocked_indicator_data"'
+
+            @patch(calculation.calculate_indicator_data, "mocked_indicator_data")
+            def test_with_timing_header(self, sut, client):
+                sut._is_timing_header_enabled = True
+                response = client.post("/indicator_data")
+                assert response.headers["Server-Timing"].startswith("json_serialization;dur=")
+                assert sut._span_statistics.summary()["json_serialization"]["count"] == 1
+
+            @patch(calculation.calculate_indicator_data, {"b": 1, "a": 2})
+            def test_profiled(self, profiling_sut, client):
+                profiling_sut._single_flight = MagicMock()
+                response = client.post("/indicator_data", headers=PROFILE_HEADERS)
+                assert response.text == '{"a": 2, "b": 1}'
+                profiling_sut._single_flight.do.assert_not_called()
+                assert len(profiling_sut._request_profiler.profiles()) == 1
+
+            @patch(calculation.calculate_indicator_tables, {"a": Table([{"id_measure": 2, "2020": 3}])})
+            def test_columnar(self, sut, client):
+                sut._single_flight = MagicMock()
+                sut._single_flight.do = MagicMock(side_effect=lambda _key, function: function())
+                response = client.post("/indicator_data", headers={"Accept": back_end.COLUMNAR_JSON_MIME_TYPE})
+                assert response.headers["Content-Type"] == back_end.COLUMNAR_JSON_MIME_TYPE
+                assert "Accept" in response.headers["Vary"]
+                assert json.loads(response.text)["a"]["idColumns"] == [[2]]
+                assert sut._single_flight.do.call_args.args[0].endswith("|" + back_end.COLUMNAR_JSON_MIME_TYPE)
+
+            @patch(calculation.calculate_indicator_tables, {"a": Table([{"id_measure": 2, "2020": 3}])})
+            def test_columnar_profiled(self, profiling_sut, client):
+                headers = PROFILE_HEADERS | {"Accept": back_end.COLUMNAR_JSON_MIME_TYPE}
+                response = client.post("/indicator_data", headers=headers)
+                assert json.loads(response.text)["a"]["numberOfRows"] == 1
+                assert len(profiling_sut._request_profiler.profiles()) == 1
+
+            @patch(
+                calculation.calculate_indicator_tables,
+                {"b": Table([{"id_measure": 1, "2020": 1.5}]), "a": Table([{"id_measure": 2, "2020": 3}])},
+            )
+            def test_streamed(self, sut, client):
+                sut._is_json_streaming_enabled = True
+                sut._number_of_rows_per_chunk = 1
+                sut._single_flight = MagicMock()
+                response = client.post("/indicator_data")
+                assert json.loads(response.text) == {
+                    "a": {"idColumnNames": ["id_measure"], "rows": [[2, 3]], "yearColumnNames": ["2020"]},
+                    "b": {"idColumnNames": ["id_measure"], "rows": [[1.0, 1.5]], "yearColumnNames": ["2020"]},
+                }
+                sut._single_flight.do.assert_not_called()
+
+            @patch(calculation.calculate_indicator_tables, {"a": Table([{"id_measure": 1, "2020": 1.5}])})
+            def test_streamed_and_compressed(self, sut, client):
+                sut._is_json_streaming_enabled = True
+                response = client.post("/indicator_data", headers={"Accept-Encoding": "deflate"})
+                assert response.headers["Content-Encoding"] == "deflate"
+                assert json.loads(zlib.decompress(response.data))["a"]["rows"] == [[1.0, 1.5]]
+
+            @patch(calculation.calculate_indicator_data, "mocked_indicator_data")
+            def test_streaming_with_calculation_pool(self, sut, client):
+                sut._is_json_streaming_enabled = True
+                sut._calculation_pool = MagicMock()
+                sut._calculation_pool.run = MagicMock(return_value='"mocked_json_string"')
+                response = client.post("/indicator_data")
+                assert response.text == '"mocked_json_string"'
+                assert sut._calculation_pool.run.call_args.args[0] == back_end._indicator_data_job
 
             # noinspection PyMethodParameters
             def mocked_calculate_indicator_data(  # pylint: disable=no-self-argument
@@ -189,23 +454,79 @@ class TestPublicApi:
         class TestParameter:
             @patch(
                 parameters_template.parameters_template,
-                "mocked_parameters_bytes",
+                BytesIO(b"mocked_parameters_bytes"),
             )
             @patch(back_end.BackEnd.create_excel_file_response, "mocked_excel_file")
             def test_parameter(self, client):
                 response = client.get("/parameters")
                 assert response.text == "mocked_excel_file"
 
-        class TestJsonParameters:
+            @patch(
+                parameters_template.parameters_template,
+                BytesIO(b"mocked_parameters_bytes"),
+            )
+            @patch(back_end.BackEnd.create_excel_file_response, "mocked_excel_file")
+            def test_with_template_cache(self, sut, client):
+                sut._template_cache = TemplateCache()
+                client.get("/parameters?id_region=2")
+                response = client.get("/parameters?id_region=2")
+                assert response.text == "mocked_excel_file"
+                assert parameters_template.parameters_template.call_count == 1
+                excel_bytes = back_end.BackEnd.create_excel_file_response.call_args.args[0]
+                assert excel_bytes.getvalue() == b"mocked_parameters_bytes"
+
             @patch(
                 parameters_template.parameters_template,
                 "mocked_parameters_bytes",
             )
+            @patch(back_end.BackEnd.create_excel_file_response, "mocked_excel_file")
+            def test_profiled(self, profiling_sut, client):
+                headers = {"X-Micat-Admin-Secret": "mocked_secret", "X-Micat-Profile": "cpu,memory"}
+                response = client.get("/parameters", headers=headers)
+                assert response.text == "mocked_excel_file"
+                files = profiling_sut._request_profiler.profiles()[0]["files"]
+                assert sorted(file_name[-5:] for file_name in files) == [".json", ".prof"]
+
+        class TestJsonParameters:
+            @patch(
+                parameters_template.parameters_data_frames,
+                "mocked_data_frames",
+            )
             @patch(back_end.BackEnd.create_json_parameters_response, "mocked_json")
             def test_json_parameters(self, client):
                 response = client.get("json_parameters")
                 assert response.text == "mocked_json"
 
+            def test_with_calculation_pool(self, sut, client):
+                sut._calculation_pool = MagicMock()
+                sut._calculation_pool.run = MagicMock(return_value="mocked_json")
+                response = client.get("json_parameters")
+                assert response.text == "mocked_json"
+                assert sut._calculation_pool.run.call_args.args[0] == back_end._json_parameters_job
+
+            def test_with_template_cache(self, sut, client):
+                sut._template_cache = TemplateCache()
+                sut._calculation_pool = MagicMock()
+                sut._calculation_pool.run = MagicMock(return_value="mocked_json")
+                client.get("json_parameters?id_region=2")
+                response = client.get("json_parameters?id_region=2&orient=wrong_orient")
+                assert response.text == "mocked_json"
+                assert sut._calculation_pool.run.call_count == 1
+                client.get("json_parameters?id_region=2&orient=index")
+                assert sut._calculation_pool.run.call_count == 2
+
+            @patch(
+                parameters_template.parameters_data_frames,
+                "mocked_data_frames",
+            )
+            @patch(back_end.BackEnd.create_json_parameters_response, "mocked_json")
+            def test_profiled(self, profiling_sut, client):
+                profiling_sut._calculation_pool = MagicMock()
+                response = client.get("json_parameters", headers=PROFILE_HEADERS)
+                assert response.text == "mocked_json"
+                profiling_sut._calculation_pool.run.assert_not_called()
+                assert len(profiling_sut._request_profiler.profiles()) == 1
+
         class TestSavings:
             @patch(
                 savings_template.savings_template,
@@ -219,13 +540,134 @@ class TestPublicApi:
                 response = client.post("/savings")
                 assert response.text == "mocked_excel_file"
 
+        class TestExportStoredResults:
+            @pytest.fixture(name="result_store")
+            def fixture_result_store(self, sut, tmp_path):
+                sut._result_store = ResultStore(str(tmp_path / "result_store.sqlite"))
+                table = Table([{"id_measure": 1, "2020": 1.5, "2030": 2.5}])
+                sut._result_store.put_string("mocked_result_id", json.dumps({"a": table.to_custom_json()}))
+                return sut._result_store
+
+            def test_xlsx(self, result_store, client):  # pylint: disable=unused-argument
+                response = client.get("/export-results/mocked_result_id")
+                assert response.content_type == results_export.XLSX_MIME_TYPE
+                assert response.headers["Content-Disposition"] == "attachment; filename=MICAT_results.xlsx"
+                workbook = openpyxl.load_workbook(BytesIO(response.data))
+                assert workbook.sheetnames == ["a"]
+
+            def test_csv(self, result_store, client):  # pylint: disable=unused-argument
+                response = client.get("/export-results/mocked_result_id", query_string={"format": "csv"})
+                assert response.content_type.startswith("text/csv")
+                assert response.text.splitlines() == [
+                    "indicator,id_measure,year,value",
+                    "a,1,2020,1.5",
+                    "a,1,2030,2.5",
+                ]
+
+            @patch(
+                result_tables_export.write_result_tables,
+                Mock(side_effect=ImportError("Missing optional dependency 'pyarrow'")),
+            )
+            def test_parquet_without_engine(self, result_store, client):  # pylint: disable=unused-argument
+                response = client.get("/export-results/mocked_result_id", query_string={"format": "parquet"})
+                assert response.status_code == 501
+                assert result_tables_export.write_result_tables.call_args.args[2].closed
+
+            @patch(
+                result_tables_export.write_result_tables,
+                Mock(side_effect=KeyError("rows")),
+            )
+            def test_with_error(self, result_store, client):  # pylint: disable=unused-argument
+                client.get("/export-results/mocked_result_id")
+                assert result_tables_export.write_result_tables.call_args.args[2].closed
+
+            def test_unknown_format(self, result_store, client):  # pylint: disable=unused-argument
+                response = client.get("/export-results/mocked_result_id", query_string={"format": "pdf"})
+                assert response.status_code == 400
+
+            def test_unknown_result(self, result_store, client):  # pylint: disable=unused-argument
+                response = client.get("/export-results/unknown_result_id")
+                assert response.status_code == 404
+
+            def test_without_result_store(self, client):
+                response = client.get("/export-results/mocked_result_id")
+                assert response.status_code == 404
+                assert json.loads(response.text) == {"error": {"type": "NotFound", "code": 404}}
+
+        class TestExportResults:
+            @patch(
+                results_export.write_results_workbook,
+                Mock(side_effect=lambda _data, _database, output: output.write(b"mocked_workbook")),
+            )
+            def test_export_results(self, client):
+                response = client.post("/export-results", json={"programs": []})
+                assert response.data == b"mocked_workbook"
+                assert response.headers["Content-Disposition"] == "attachment; filename=MICAT_results.xlsx"
+                assert response.content_type == results_export.XLSX_MIME_TYPE
+                response.close()
+                write_args = results_export.write_results_workbook.call_args.args
+                assert write_args[0] == {"programs": []}
+                assert write_args[2].closed
+
+            @patch(
+                results_export.write_results_workbook,
+                Mock(side_effect=KeyError("results")),
+            )
+            def test_with_error(self, client):
+                client.post("/export-results", json={})
+                output = results_export.write_results_workbook.call_args.args[2]
+                assert output.closed
+
         @patch(
             measure_specific_parameters_template.measure_specific_parameters_template,
-            "mocked_measure_specific_parameters_bytes",
+            {"mocked_key": "mocked_value"},
         )
         def test_json_measure(self, client):
             response = client.post("json_measure")
-            assert response.text == "mocked_measure_specific_parameters_bytes"
+            assert response.text == '{"mocked_key": "mocked_value"}'
+            assert response.content_type == "application/json"
+
+        def test_json_measure_with_calculation_pool(self, sut, client):
+            sut._calculation_pool = MagicMock()
+            sut._calculation_pool.run = MagicMock(return_value='["mocked_json_measure"]')
+            response = client.post("json_measure")
+            assert response.text == '["mocked_json_measure"]'
+            assert response.content_type == "application/json"
+
+        @patch(
+            measure_specific_parameters_template.measure_specific_parameters_template,
+            ["mocked_measure"],
+        )
+        def test_json_measure_profiled(self, profiling_sut, client):
+            response = client.post("json_measure", headers=PROFILE_HEADERS)
+            assert response.text == '["mocked_measure"]'
+            assert len(profiling_sut._request_profiler.profiles()) == 1
+
+        class TestJsonMeasures:
+            @patch(
+                measure_specific_parameters_template.batch_measure_specific_parameters_template,
+                ["mocked_measure"],
+            )
+            def test_json_measures(self, client):
+                response = client.post("json_measures?id_region=0", json=[{"id": 1}])
+                assert response.text == '["mocked_measure"]'
+                assert response.content_type == "application/json"
+
+            def test_with_calculation_pool(self, sut, client):
+                sut._calculation_pool = MagicMock()
+                sut._calculation_pool.run = MagicMock(return_value='["mocked_json_measure"]')
+                response = client.post("json_measures")
+                assert response.text == '["mocked_json_measure"]'
+                assert sut._calculation_pool.run.call_args.args[0] == back_end._json_measures_job
+
+            @patch(
+                measure_specific_parameters_template.batch_measure_specific_parameters_template,
+                ["mocked_measure"],
+            )
+            def test_profiled(self, profiling_sut, client):
+                response = client.post("json_measures", headers=PROFILE_HEADERS)
+                assert response.text == '["mocked_measure"]'
+                assert len(profiling_sut._request_profiler.profiles()) == 1
 
         @patch(
             back_end.BackEnd._catch_all,
@@ -251,15 +693,14 @@ class TestPublicApi:
             }
 
             @patch(json.dumps, "mocked_json")
-            @patch_by_string("pandas.read_excel", mocked_sheet_to_df_map)
             @patch_by_string("pandas.DataFrame.to_json", "mocked_json")
             @patch_by_string("json.loads", MockedDataFrame)
             @patch(json.dumps, "mocked_json")
             def test_create_json_parameters_response(self, sut):
-                result = sut.create_json_parameters_response("mocked_parameter_bytes", self.MockedRequest)
+                result = sut.create_json_parameters_response(dict(self.mocked_sheet_to_df_map), self.MockedRequest)
                 assert result == "mocked_json"
                 self.MockedRequest.args["orient"] = "wrong_orient"
-                result = sut.create_json_parameters_response("mocked_parameter_bytes", self.MockedRequest)
+                result = sut.create_json_parameters_response(dict(self.mocked_sheet_to_df_map), self.MockedRequest)
                 assert result == "mocked_json"
 
         @patch(back_end.BackEnd._handle_exception, "mocked_exception_response")
@@ -339,6 +780,265 @@ class TestPrivateApi:
         response = unaltered_sut._get_table_directly(table_name, http_request)
         assert response == "mocked_query_result"
 
+    class TestCreateResultStore:
+        def test_disabled(self):
+            result_store = BackEnd._create_result_store({}, "mocked_database_path")
+            assert result_store is None
+
+        def test_default_path(self, tmp_path):
+            database_path = str(tmp_path / "public.sqlite")
+            settings = {"resultStore": {"enabled": True}}
+            result_store = BackEnd._create_result_store(settings, database_path)
+            assert result_store._store_path == str(tmp_path / "result_store.sqlite")
+            assert result_store._max_size_in_bytes == 500 * 1024 * 1024
+
+        def test_explicit_path(self, tmp_path):
+            store_path = str(tmp_path / "custom.sqlite")
+            settings = {"resultStore": {"enabled": True, "path": store_path, "maxSizeInMegabytes": 1}}
+            result_store = BackEnd._create_result_store(settings, "mocked_database_path")
+            assert result_store._store_path == store_path
+            assert result_store._max_size_in_bytes == 1024 * 1024
+
+    class TestCreateTemplateCache:
+        def test_disabled(self):
+            template_cache = BackEnd._create_template_cache({})
+            assert template_cache is None
+
+        def test_enabled(self):
+            settings = {"templateCache": {"enabled": True, "maxNumberOfEntries": 5}}
+            template_cache = BackEnd._create_template_cache(settings)
+            assert template_cache._max_number_of_entries == 5
+
+    class TestCreateAdmissionControl:
+        def test_disabled(self):
+            admission_control = BackEnd._create_admission_control({})
+            assert admission_control is None
+
+        def test_enabled(self):
+            settings = {"admissionControl": {"enabled": True, "routeClasses": {"export": {"maxConcurrency": 2}}}}
+            admission_control = BackEnd._create_admission_control(settings)
+            assert admission_control.metrics()["export"]["maxConcurrency"] == 2
+
+    class TestCreateCalculationPool:
+        def test_disabled(self):
+            calculation_pool = BackEnd._create_calculation_pool({}, "public.sqlite", "confidential.sqlite")
+            assert calculation_pool is None
+
+        def test_enabled(self):
+            settings = {"calculationPool": {"enabled": True, "numberOfWorkers": 2, "maxJobsPerWorker": 5}}
+            calculation_pool = BackEnd._create_calculation_pool(settings, "public.sqlite", "confidential.sqlite")
+            try:
+                assert calculation_pool._executor._max_workers == 2
+                assert calculation_pool._executor._max_tasks_per_child == 5
+            finally:
+                calculation_pool.shutdown()
+
+    class TestCreateWarmUp:
+        def test_disabled(self, unaltered_sut):
+            warm_up = unaltered_sut._create_warm_up({})
+            assert warm_up is None
+
+        def test_without_synthetic_requests(self, unaltered_sut):
+            warm_up = unaltered_sut._create_warm_up({"warmUp": {"enabled": True}})
+            assert warm_up._databases == [unaltered_sut._database, unaltered_sut._confidential_database]
+            assert warm_up._synthetic_request is None
+
+        def test_with_synthetic_requests(self, unaltered_sut):
+            settings = {"warmUp": {"enabled": True, "syntheticRequests": True}}
+            warm_up = unaltered_sut._create_warm_up(settings)
+            assert warm_up._synthetic_request == unaltered_sut._synthetic_request
+
+    @patch(parameters_template._write_parameter_sheets)
+    def test_synthetic_request(self, unaltered_sut):
+        unaltered_sut._calculation_pool = None
+        unaltered_sut._synthetic_request(2)
+        template_args = parameters_template._write_parameter_sheets.call_args.args[1]
+        assert template_args["id_region"] == 2
+        assert template_args["years"] == ["2025", "2030"]
+
+    class TestPreGenerateTemplates:
+        @patch(parameters_template._write_parameter_sheets)
+        def test_cache_hit(self, unaltered_sut):
+            unaltered_sut._template_cache = TemplateCache()
+            unaltered_sut._calculation_pool = None
+            unaltered_sut._admission_control = AdmissionControl()
+            unaltered_sut._pre_generated_orients = ["records", "index"]
+            unaltered_sut._pre_generate_templates(2)
+            assert len(unaltered_sut._template_cache) == 3
+            assert unaltered_sut._admission_control.metrics()["template"]["admittedRequests"] == 0
+            template_args = parameters_template._write_parameter_sheets.call_args.args[1]
+            assert template_args["years"] == ["2025", "2030"]
+
+            client = unaltered_sut._app.test_client()
+            response = client.get("/json_parameters?id_region=2&years=2025&years=2030&orient=index")
+            assert response.status_code == 200
+            assert unaltered_sut._template_cache.number_of_hits == 1
+            assert parameters_template._write_parameter_sheets.call_count == 3
+
+        @patch(parameters_template._write_parameter_sheets, Mock(side_effect=KeyError("mocked_error")))
+        def test_error(self, unaltered_sut):
+            unaltered_sut._template_cache = TemplateCache()
+            with pytest.raises(KeyError, match="mocked_error"):
+                unaltered_sut._pre_generate_templates(2)
+            assert len(unaltered_sut._template_cache) == 0
+
+    def test_id_regions(self, unaltered_sut):
+        unaltered_sut._database = MagicMock()
+        id_region_table = MagicMock()
+        id_region_table.id_values = ["1", "2"]
+        unaltered_sut._database.id_table = MagicMock(return_value=id_region_table)
+        assert unaltered_sut._id_regions() == [1, 2]
+
+    class TestCreateRequestProfiler:
+        def test_default(self):
+            request_profiler = BackEnd._create_request_profiler({}, "data/public.sqlite")
+            assert request_profiler._directory == os.path.join("data", "profiles")
+            assert request_profiler._max_number_of_profiles == 20
+
+        def test_with_settings(self):
+            settings = {"requestProfiler": {"directory": "mocked_directory", "maxNumberOfProfiles": 5}}
+            request_profiler = BackEnd._create_request_profiler(settings, "data/public.sqlite")
+            assert request_profiler._directory == "mocked_directory"
+            assert request_profiler._max_number_of_profiles == 5
+
+    class TestRequestedProfileModes:
+        def test_without_flag(self, profiling_sut):
+            with profiling_sut._app.test_request_context("/", headers={"X-Micat-Admin-Secret": "mocked_secret"}):
+                assert profiling_sut._requested_profile_modes(flask.request) == []
+
+        def test_without_admin_secret(self, profiling_sut):
+            with profiling_sut._app.test_request_context("/?profile=cpu"):
+                assert profiling_sut._requested_profile_modes(flask.request) == []
+
+        def test_with_query_parameter(self, profiling_sut):
+            headers = {"X-Micat-Admin-Secret": "mocked_secret"}
+            with profiling_sut._app.test_request_context("/?profile=memory,cpu", headers=headers):
+                assert profiling_sut._requested_profile_modes(flask.request) == ["cpu", "memory"]
+
+    def test_configure_query_profiler_without_changes(self):
+        BackEnd._configure_query_profiler({})
+        assert QUERY_PROFILER.is_enabled is False
+
+    class TestAdmissionMetric:
+        def test_without_admission_control(self, unaltered_sut):
+            assert unaltered_sut._admission_metric("queueLength") == []
+
+        def test_with_admission_control(self, unaltered_sut):
+            unaltered_sut._admission_control = AdmissionControl()
+            result = unaltered_sut._admission_metric("queueLength")
+            assert ({"route_class": "calculation"}, 0) in result
+
+    class TestTemplateCacheMetric:
+        def test_without_template_cache(self, unaltered_sut):
+            assert unaltered_sut._template_cache_metric() == []
+
+        def test_with_template_cache(self, unaltered_sut):
+            unaltered_sut._template_cache = TemplateCache()
+            unaltered_sut._template_cache.get_or_create("mocked_key", lambda: "mocked_value")
+            result = unaltered_sut._template_cache_metric()
+            assert result == [({"result": "hit"}, 0), ({"result": "miss"}, 1)]
+
+    def test_register_metric_collectors(self, unaltered_sut):
+        unaltered_sut._register_metric_collectors()
+        text = REGISTRY.exposition()
+        assert "micat_coalesced_requests_total 0" in text
+        assert "# TYPE micat_admission_queue_length gauge" in text
+        assert "# TYPE micat_admission_active_requests gauge" in text
+        assert "# TYPE micat_template_cache_requests_total counter" in text
+
+    def test_create_saturated_response(self, unaltered_sut):
+        error = RouteSaturatedError("calculation", 503, 7)
+        response = unaltered_sut._create_saturated_response(error)
+        assert response.status_code == 503
+        assert response.headers["Retry-After"] == "7"
+
+    class TestIndicatorData:
+        @patch(back_end.BackEnd._calculate_indicator_data, "mocked_json_string")
+        def test_without_result_store(self, unaltered_sut):
+            unaltered_sut._result_store = None
+            result = unaltered_sut._indicator_data("mocked_request", "mocked_request_key")
+            assert result == "mocked_json_string"
+
+        def test_with_result_store(self, unaltered_sut, tmp_path):
+            unaltered_sut._result_store = ResultStore(str(tmp_path / "result_store.sqlite"))
+            unaltered_sut._calculate_indicator_data = MagicMock(return_value="mocked_json_string")
+
+            first_result = unaltered_sut._indicator_data("mocked_request", "mocked_request_key")
+            second_result = unaltered_sut._indicator_data("mocked_request", "mocked_request_key")
+
+            assert first_result == "mocked_json_string"
+            assert second_result == "mocked_json_string"
+            unaltered_sut._calculate_indicator_data.assert_called_once()
+
+    class TestCalculateColumnarIndicatorData:
+        @patch(back_end._columnar_indicator_data_job, "mocked_json_string")
+        def test_without_calculation_pool(self, unaltered_sut):
+            result = unaltered_sut._calculate_indicator_data("mocked_request", is_columnar=True)
+            assert result == "mocked_json_string"
+
+        def test_with_calculation_pool(self, unaltered_sut):
+            unaltered_sut._calculation_pool = MagicMock()
+            unaltered_sut._calculation_pool.run = MagicMock(return_value="mocked_json_string")
+            result = unaltered_sut._calculate_indicator_data("mocked_request", is_columnar=True)
+            assert result == "mocked_json_string"
+            assert unaltered_sut._calculation_pool.run.call_args.args == (
+                back_end._columnar_indicator_data_job,
+                "mocked_request",
+            )
+
+    @pytest.mark.parametrize(
+        "accept, expected_result",
+        [
+            ("", False),
+            ("*/*", False),
+            ("application/json", False),
+            ("application/json, " + back_end.COLUMNAR_JSON_MIME_TYPE, False),
+            (back_end.COLUMNAR_JSON_MIME_TYPE, True),
+            (back_end.COLUMNAR_JSON_MIME_TYPE + ", application/json;q=0.9", True),
+        ],
+    )
+    def test_is_columnar_format_accepted(self, accept, expected_result):
+        request = MagicMock()
+        request.accept_mimetypes = parse_accept_header(accept, MIMEAccept)
+        assert BackEnd._is_columnar_format_accepted(request) is expected_result
+
+    def test_calculate_indicator_data_with_calculation_pool(self, unaltered_sut):
+        unaltered_sut._calculation_pool = MagicMock()
+        unaltered_sut._calculation_pool.run = MagicMock(return_value="mocked_json_string")
+        result = unaltered_sut._calculate_indicator_data("mocked_request")
+        assert result == "mocked_json_string"
+        assert unaltered_sut._calculation_pool.run.call_args.args == (back_end._indicator_data_job, "mocked_request")
+
+    class TestCalculateIndicatorDataWithBoundedMemory:
+        @patch(back_end._memory_bounded_indicator_data_job, ("mocked_json_string", 1024))
+        @patch(REGISTRY.observe_process_peak_memory)
+        @patch(Logger.info)
+        def test_without_calculation_pool(self, unaltered_sut):
+            unaltered_sut._is_memory_bounded = True
+            result = unaltered_sut._calculate_indicator_data("mocked_request")
+            assert result == "mocked_json_string"
+            REGISTRY.observe_process_peak_memory.assert_called_once_with(1024)
+            Logger.info.assert_called_once()
+
+        @patch(REGISTRY.observe_process_peak_memory)
+        def test_with_calculation_pool(self, unaltered_sut):
+            unaltered_sut._is_memory_bounded = True
+            unaltered_sut._calculation_pool = MagicMock()
+            unaltered_sut._calculation_pool.run = MagicMock(return_value=("mocked_json_string", None))
+            result = unaltered_sut._calculate_indicator_data("mocked_request")
+            assert result == "mocked_json_string"
+            assert unaltered_sut._calculation_pool.run.call_args.args == (
+                back_end._memory_bounded_indicator_data_job,
+                "mocked_request",
+            )
+            REGISTRY.observe_process_peak_memory.assert_not_called()
+
+    def test_result_key(self, unaltered_sut):
+        unaltered_sut._database.fingerprint = MagicMock(return_value="first")
+        unaltered_sut._confidential_database.fingerprint = MagicMock(return_value="second")
+        result_key = unaltered_sut._result_key("mocked_request_key")
+        assert result_key == ResultStore.key("mocked_request_key", ["first", "second"])
+
     class TestEmptyCacheIfIsFull:
         def test_cache_is_full(self, sut):
             cache = {}
@@ -411,3 +1111,49 @@ class TestPrivateApi:
         unaltered_sut._flask.make_response = OriginalMagicMock(return_value=get_mocked_response())
         response = unaltered_sut.create_excel_file_response(BytesIO(), mocked_request)
         assert "mocked_file_name" in response.headers["Content-Disposition"]
+
+
+class TestCalculationPoolJobs:
+    @patch(calculation.calculate_indicator_data, {"b": 1, "a": 2})
+    def test_indicator_data_job(self):
+        result = back_end._indicator_data_job("mocked_request", "mocked_database", "mocked_confidential_database")
+        assert result == '{"a": 2, "b": 1}'
+
+    @patch(calculation.calculate_indicator_tables, {"b": Table([{"id_measure": 1, "2020": 1.5}])})
+    def test_columnar_indicator_data_job(self):
+        result = back_end._columnar_indicator_data_job(
+            "mocked_request", "mocked_database", "mocked_confidential_database"
+        )
+        assert json.loads(result)["b"]["idColumnNames"] == ["id_measure"]
+
+    @patch(calculation.calculate_indicator_data_with_bounded_memory, '{"a": 2}')
+    def test_memory_bounded_indicator_data_job(self):
+        json_string, peak_memory_in_bytes = back_end._memory_bounded_indicator_data_job(
+            "mocked_request",
+            "mocked_database",
+            "mocked_confidential_database",
+        )
+        assert json_string == '{"a": 2}'
+        assert peak_memory_in_bytes is None or peak_memory_in_bytes > 0
+
+    @patch(parameters_template.parameters_data_frames, "mocked_data_frames")
+    @patch(back_end.BackEnd.create_json_parameters_response, "mocked_json")
+    def test_json_parameters_job(self):
+        result = back_end._json_parameters_job("mocked_request", "mocked_database", "mocked_confidential_database")
+        assert result == "mocked_json"
+
+    @patch(
+        measure_specific_parameters_template.measure_specific_parameters_template,
+        ["mocked_measure"],
+    )
+    def test_json_measure_job(self):
+        result = back_end._json_measure_job("mocked_request", "mocked_database", "mocked_confidential_database")
+        assert result == '["mocked_measure"]'
+
+    @patch(
+        measure_specific_parameters_template.batch_measure_specific_parameters_template,
+        [{"main": []}],
+    )
+    def test_json_measures_job(self):
+        result = back_end._json_measures_job("mocked_request", "mocked_database", "mocked_confidential_database")
+        assert result == '[{"main": []}]'
@@ -29,6 +29,7 @@ def back_end_init_mock(
     debug_mode,  # pylint: disable=unused-argument
     database_path="../data/public.sqlite",  # pylint: disable=unused-argument
     confidential_database_path="../data/confidential.sqlite",  # pylint: disable=unused-argument
+    settings=None,  # pylint: disable=unused-argument
 ):
     self.start = mocked_start
 
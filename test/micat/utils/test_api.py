@@ -5,7 +5,7 @@
 from pytest import raises
 
 from micat.test_utils.isi_mock import MagicMock
-from micat.utils.api import parse_request
+from micat.utils.api import parse_request, request_key
 
 
 class TestParseRequest:
@@ -26,3 +26,39 @@ class TestParseRequest:
         with raises(AttributeError) as exception_info:
             parse_request(http_request_mock)
             assert exception_info.value
+
+
+class TestRequestKey:
+    @staticmethod
+    def mocked_request(query_string=b'id_region=1', json_body=None, data='', path='/indicator_data'):
+        http_request_mock = MagicMock()
+        http_request_mock.query_string = query_string
+        http_request_mock.path = path
+        http_request_mock.get_json = MagicMock(return_value=json_body)
+        http_request_mock.get_data = MagicMock(return_value=data)
+        return http_request_mock
+
+    def test_equal_for_canonically_equal_bodies(self):
+        first_request = self.mocked_request(json_body={'a': 1, 'b': [1, 2]})
+        second_request = self.mocked_request(json_body={'b': [1, 2], 'a': 1})
+        assert request_key(first_request) == request_key(second_request)
+
+    def test_depends_on_region(self):
+        first_request = self.mocked_request(query_string=b'id_region=1', json_body={'a': 1})
+        second_request = self.mocked_request(query_string=b'id_region=2', json_body={'a': 1})
+        assert request_key(first_request) != request_key(second_request)
+
+    def test_independent_of_query_parameter_order(self):
+        first_request = self.mocked_request(query_string=b'id_region=1&orient=index')
+        second_request = self.mocked_request(query_string=b'orient=index&id_region=1')
+        assert request_key(first_request) == request_key(second_request)
+
+    def test_depends_on_path(self):
+        first_request = self.mocked_request(path='/indicator_data')
+        second_request = self.mocked_request(path='/json_measure')
+        assert request_key(first_request) != request_key(second_request)
+
+    def test_without_json_body(self):
+        first_request = self.mocked_request(data='foo')
+        second_request = self.mocked_request(data='baa')
+        assert request_key(first_request) != request_key(second_request)
@@ -0,0 +1,36 @@
+# © 2024-2026 Fraunhofer-Gesellschaft e.V., München
+#
+# SPDX-License-Identifier: AGPL-3.0-or-later
+
+import json
+
+from micat.table.table import Table
+from micat.utils import json_stream
+
+
+def mocked_tables():
+    return {
+        "b_table": Table(
+            [
+                {"id_measure": 1, "id_parameter": "foo", "2020": 1.5, "2025": 2},
+                {"id_measure": 2, "id_parameter": "foo", "2020": 3, "2025": 4},
+                {"id_measure": 3, "id_parameter": "baa", "2020": 5, "2025": 6},
+            ]
+        ),
+        "a_table": Table([{"id_measure": 1, "2020": 7}]),
+    }
+
+
+class TestResultTableChunks:
+    def test_equals_json_dumps(self):
+        tables = mocked_tables()
+        chunks = list(json_stream.result_table_chunks(tables, number_of_rows_per_chunk=2))
+        expected_json = json.dumps(
+            {key: table.to_custom_json() for key, table in tables.items()},
+            sort_keys=True,
+        )
+        assert "".join(chunks) == expected_json
+        assert '[2, "foo", 3.0, 4.0], [3, "baa", 5.0, 6.0]' not in chunks
+
+    def test_without_tables(self):
+        assert "".join(json_stream.result_table_chunks({})) == "{}"
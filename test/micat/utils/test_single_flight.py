@@ -0,0 +1,117 @@
+# © 2024-2026 Fraunhofer-Gesellschaft e.V., München
+#
+# SPDX-License-Identifier: AGPL-3.0-or-later
+
+# pylint: disable=protected-access
+import threading
+
+import pytest
+
+from micat.utils import single_flight
+from micat.utils.single_flight import SingleFlight
+
+
+@pytest.fixture(name="sut")
+def fixture_sut():
+    return SingleFlight()
+
+
+def wait_for_coalesced_calls(monkeypatch, number_of_calls):
+    # Returns a barrier that is passed by the main thread once the given number of
+    # calls has been coalesced, i.e. is about to wait for the result of the leader
+    barrier = threading.Barrier(number_of_calls + 1)
+    original_wait = single_flight._Call.wait
+
+    def wait(call):
+        barrier.wait()
+        return original_wait(call)
+
+    monkeypatch.setattr(single_flight._Call, "wait", wait)
+    return barrier
+
+
+class TestDo:
+    def test_single_call(self, sut):
+        result = sut.do("mocked_key", lambda: "mocked_result")
+        assert result == "mocked_result"
+        assert sut.number_of_calls_in_flight() == 0
+
+    def test_concurrent_calls_share_result(self, sut, monkeypatch):
+        coalesced_calls = wait_for_coalesced_calls(monkeypatch, 3)
+        is_started = threading.Event()
+        is_released = threading.Event()
+        executions = []
+
+        def slow_function():
+            executions.append(1)
+            is_started.set()
+            is_released.wait()
+            return "shared_result"
+
+        results = []
+
+        def leader():
+            results.append(sut.do("mocked_key", slow_function))
+
+        def follower():
+            results.append(sut.do("mocked_key", slow_function))
+
+        leader_thread = threading.Thread(target=leader)
+        leader_thread.start()
+        is_started.wait()
+
+        follower_threads = [threading.Thread(target=follower) for _ in range(3)]
+        for thread in follower_threads:
+            thread.start()
+        coalesced_calls.wait()
+        is_released.set()
+
+        leader_thread.join()
+        for thread in follower_threads:
+            thread.join()
+
+        assert results == ["shared_result"] * 4
+        assert len(executions) == 1
+        assert sut.number_of_coalesced_calls == 3
+        assert sut.number_of_calls_in_flight() == 0
+
+    def test_exception_is_shared(self, sut, monkeypatch):
+        coalesced_calls = wait_for_coalesced_calls(monkeypatch, 1)
+        is_started = threading.Event()
+        is_released = threading.Event()
+
+        def failing_function():
+            is_started.set()
+            is_released.wait()
+            raise ValueError("mocked_error")
+
+        errors = []
+
+        def call():
+            try:
+                sut.do("mocked_key", failing_function)
+            except ValueError as error:
+                errors.append(str(error))
+
+        leader_thread = threading.Thread(target=call)
+        leader_thread.start()
+        is_started.wait()
+        follower_thread = threading.Thread(target=call)
+        follower_thread.start()
+        coalesced_calls.wait()
+        is_released.set()
+        leader_thread.join()
+        follower_thread.join()
+
+        assert errors == ["mocked_error", "mocked_error"]
+        assert sut.number_of_calls_in_flight() == 0
+
+    def test_sequential_calls_are_not_cached(self, sut):
+        executions = []
+
+        def function():
+            executions.append(1)
+            return len(executions)
+
+        assert sut.do("mocked_key", function) == 1
+        assert sut.do("mocked_key", function) == 2